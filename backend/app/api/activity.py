@@ -4,13 +4,12 @@ from __future__ import annotations
 
 import asyncio
 import json
-from collections import deque
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Any
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
-from sqlalchemy import asc, desc, func
+from sqlalchemy import and_, desc, func, or_
 from sqlmodel import col, select
 from sse_starlette.sse import EventSourceResponse
 
@@ -24,6 +23,7 @@ from app.models.boards import Board
 from app.models.tasks import Task
 from app.schemas.activity_events import ActivityEventRead, ActivityTaskCommentFeedItemRead
 from app.schemas.pagination import DefaultLimitOffsetPage
+from app.services.activity_log import board_sequence_cursors, parse_event_sequence
 from app.services.organizations import (
     OrganizationContext,
     get_active_membership,
@@ -38,9 +38,10 @@ if TYPE_CHECKING:
 
 router = APIRouter(prefix="/activity", tags=["activity"])
 
-SSE_SEEN_MAX = 2000
 STREAM_POLL_SECONDS = 2
 TASK_COMMENT_ROW_LEN = 4
+# Boards per comment-feed statement; each board adds one `(board, sequence)` range term.
+COMMENT_FEED_BOARD_BATCH = 100
 SESSION_DEP = Depends(get_session)
 ACTOR_DEP = Depends(require_admin_or_agent)
 ORG_MEMBER_DEP = Depends(require_org_member)
@@ -143,23 +144,76 @@ def _coerce_task_comment_rows(
 
 async def _fetch_task_comment_events(
     session: AsyncSession,
-    since: datetime,
-    *,
-    board_id: UUID | None = None,
+    cursors: dict[UUID, int],
 ) -> Sequence[tuple[ActivityEvent, Task, Board, Agent | None]]:
-    statement = (
-        select(ActivityEvent, Task, Board, Agent)
-        .join(Task, col(ActivityEvent.task_id) == col(Task.id))
-        .join(Board, col(Task.board_id) == col(Board.id))
-        .outerjoin(Agent, col(ActivityEvent.agent_id) == col(Agent.id))
-        .where(col(ActivityEvent.event_type) == "task.comment")
-        .where(col(ActivityEvent.created_at) >= since)
-        .where(func.length(func.trim(col(ActivityEvent.message))) > 0)
-        .order_by(asc(col(ActivityEvent.created_at)))
-    )
-    if board_id is not None:
-        statement = statement.where(col(Task.board_id) == board_id)
-    return _coerce_task_comment_rows(list(await session.exec(statement)))
+    # Sequences are per board, so each board gets its own range term; boards are
+    # batched to keep every statement a bounded size in large organizations.
+    items = list(cursors.items())
+    rows: list[tuple[ActivityEvent, Task, Board, Agent | None]] = []
+    for start in range(0, len(items), COMMENT_FEED_BOARD_BATCH):
+        after_cursors = or_(
+            *(
+                and_(
+                    col(ActivityEvent.board_id) == board_id,
+                    col(ActivityEvent.board_sequence) > sequence,
+                )
+                for board_id, sequence in items[start : start + COMMENT_FEED_BOARD_BATCH]
+            ),
+        )
+        statement = (
+            select(ActivityEvent, Task, Board, Agent)
+            .join(Task, col(ActivityEvent.task_id) == col(Task.id))
+            .join(Board, col(Task.board_id) == col(Board.id))
+            .outerjoin(Agent, col(ActivityEvent.agent_id) == col(Agent.id))
+            .where(col(ActivityEvent.event_type) == "task.comment")
+            .where(after_cursors)
+            .where(func.length(func.trim(col(ActivityEvent.message))) > 0)
+        )
+        rows.extend(_coerce_task_comment_rows(list(await session.exec(statement))))
+    rows.sort(key=lambda row: (row[0].created_at, row[0].board_sequence or 0))
+    return rows
+
+
+def _parse_feed_event_id(value: str | None) -> tuple[UUID, int] | None:
+    """Parse a `<board_id>:<board_sequence>` comment feed event id."""
+    if not value:
+        return None
+    board_part, _, sequence_part = value.strip().partition(":")
+    sequence = parse_event_sequence(sequence_part)
+    if sequence is None:
+        return None
+    try:
+        return UUID(board_part), sequence
+    except ValueError:
+        return None
+
+
+async def _comment_feed_cursors(
+    session: AsyncSession,
+    board_ids: Sequence[UUID],
+    *,
+    since: datetime,
+    last_event_id: str | None,
+) -> dict[UUID, int]:
+    """Starting cursors per board, resuming after `Last-Event-ID` when it names one.
+
+    The id pins its own board exactly; other boards restart from that event's
+    timestamp, so a resume may repeat a comment from another board but never skips one.
+    """
+    resume = _parse_feed_event_id(last_event_id)
+    if resume is not None and resume[0] in board_ids:
+        resumed_at = (
+            await session.exec(
+                select(ActivityEvent.created_at)
+                .where(col(ActivityEvent.board_id) == resume[0])
+                .where(col(ActivityEvent.board_sequence) == resume[1]),
+            )
+        ).first()
+        since = resumed_at or since
+    cursors = await board_sequence_cursors(session, board_ids, since=since)
+    if resume is not None and resume[0] in cursors:
+        cursors[resume[0]] = resume[1]
+    return cursors
 
 
 @router.get("", response_model=DefaultLimitOffsetPage[ActivityEventRead])
@@ -241,36 +295,23 @@ async def stream_task_comment_feed(
     allowed_ids = set(board_ids)
     if board_id is not None and board_id not in allowed_ids:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
-    seen_ids: set[UUID] = set()
-    seen_queue: deque[UUID] = deque()
+    cursors = await _comment_feed_cursors(
+        db_session,
+        [board_id] if board_id is not None else board_ids,
+        since=since_dt,
+        last_event_id=request.headers.get("last-event-id"),
+    )
 
     async def event_generator() -> AsyncIterator[dict[str, str]]:
-        last_seen = since_dt
+        # One cursor per board; each poll returns every comment past them.
         while True:
             if await request.is_disconnected():
                 break
             async with async_session_maker() as stream_session:
-                if board_id is not None:
-                    rows = await _fetch_task_comment_events(
-                        stream_session,
-                        last_seen,
-                        board_id=board_id,
-                    )
-                elif allowed_ids:
-                    rows = await _fetch_task_comment_events(stream_session, last_seen)
-                    rows = [row for row in rows if row[1].board_id in allowed_ids]
-                else:
-                    rows = []
+                rows = await _fetch_task_comment_events(stream_session, cursors)
             for event, task, board, agent in rows:
-                event_id = event.id
-                if event_id in seen_ids:
-                    continue
-                seen_ids.add(event_id)
-                seen_queue.append(event_id)
-                if len(seen_queue) > SSE_SEEN_MAX:
-                    oldest = seen_queue.popleft()
-                    seen_ids.discard(oldest)
-                last_seen = max(event.created_at, last_seen)
+                sequence = event.board_sequence or 0
+                cursors[board.id] = max(cursors.get(board.id, 0), sequence)
                 payload = {
                     "comment": _feed_item(
                         event,
@@ -279,7 +320,11 @@ async def stream_task_comment_feed(
                         agent,
                     ).model_dump(mode="json"),
                 }
-                yield {"event": "comment", "data": json.dumps(payload)}
+                yield {
+                    "id": f"{board.id}:{sequence}",
+                    "event": "comment",
+                    "data": json.dumps(payload),
+                }
             await asyncio.sleep(STREAM_POLL_SECONDS)
 
     return EventSourceResponse(event_generator(), ping=15)
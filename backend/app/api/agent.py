@@ -6,7 +6,7 @@ from enum import Enum
 from typing import TYPE_CHECKING, Any, cast
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy import func
 from sqlmodel import SQLModel, col, select
 
@@ -502,11 +502,13 @@ async def list_agents(
     ),
 )
 async def list_tasks(
+    request: Request,
+    response: Response,
     filters: AgentTaskListFilters = TASK_LIST_FILTERS_DEP,
     board: Board = BOARD_DEP,
     session: AsyncSession = SESSION_DEP,
     agent_ctx: AgentAuthContext = AGENT_CTX_DEP,
-) -> LimitOffsetPage[TaskRead]:
+) -> LimitOffsetPage[TaskRead] | Response:
     """List tasks on a board with status/assignment filters.
 
     Common patterns:
@@ -515,6 +517,8 @@ async def list_tasks(
     """
     _guard_board_access(agent_ctx, board)
     return await tasks_api.list_tasks(
+        request,
+        response,
         status_filter=filters.status_filter,
         assigned_agent_id=filters.assigned_agent_id,
         unassigned=filters.unassigned,
@@ -6,11 +6,12 @@ from dataclasses import dataclass
 from typing import TYPE_CHECKING
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query, Request
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sse_starlette.sse import EventSourceResponse
 
 from app.api.deps import ActorContext, require_admin_or_agent, require_org_admin
 from app.core.auth import AuthContext, get_auth_context
+from app.core.conditional import conditional_response, make_etag
 from app.db.session import get_session
 from app.schemas.agents import (
     AgentCreate,
@@ -23,6 +24,7 @@ from app.schemas.common import OkResponse
 from app.schemas.pagination import DefaultLimitOffsetPage
 from app.services.openclaw.provisioning_db import AgentLifecycleService, AgentUpdateOptions
 from app.services.organizations import OrganizationContext
+from app.services.resource_versions import agent_list_fingerprint
 
 if TYPE_CHECKING:
     from fastapi_pagination.limit_offset import LimitOffsetPage
@@ -60,18 +62,28 @@ AGENT_UPDATE_PARAMS_DEP = Depends(_agent_update_params)
 
 @router.get("", response_model=DefaultLimitOffsetPage[AgentRead])
 async def list_agents(
+    request: Request,
+    response: Response,
     board_id: UUID | None = BOARD_ID_QUERY,
     gateway_id: UUID | None = GATEWAY_ID_QUERY,
     session: AsyncSession = SESSION_DEP,
     ctx: OrganizationContext = ORG_ADMIN_DEP,
-) -> LimitOffsetPage[AgentRead]:
+) -> LimitOffsetPage[AgentRead] | Response:
     """List agents visible to the active organization admin."""
     service = AgentLifecycleService(session)
-    return await service.list_agents(
+    statement = await service.agent_list_statement(
         board_id=board_id,
         gateway_id=gateway_id,
         ctx=ctx,
     )
+    etag = make_etag(
+        ctx.member.id,
+        request.url.query,
+        await agent_list_fingerprint(session, statement),
+    )
+    if (not_modified := conditional_response(request, response, etag)) is not None:
+        return not_modified
+    return await service.paginate_agents(statement)
 
 
 @router.get("/stream")
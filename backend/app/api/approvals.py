@@ -29,7 +29,6 @@ from app.models.approvals import Approval
 from app.models.tasks import Task
 from app.schemas.approvals import ApprovalCreate, ApprovalRead, ApprovalStatus, ApprovalUpdate
 from app.schemas.pagination import DefaultLimitOffsetPage
-from app.services.activity_log import record_activity
 from app.services.approval_task_links import (
     load_task_ids_by_approval,
     lock_tasks_for_approval,
@@ -38,6 +37,7 @@ from app.services.approval_task_links import (
     replace_approval_task_links,
     task_counts_for_board,
 )
+from app.services.notifications import NotificationActivity
 from app.services.openclaw.gateway_dispatch import GatewayDispatchService
 
 if TYPE_CHECKING:
@@ -252,29 +252,26 @@ async def _notify_lead_on_approval_resolution(
         approval=approval,
         task_ids=task_ids_by_approval.get(approval.id, []),
     )
-    error = await dispatch.try_send_agent_message(
+    await dispatch.queue_agent_message(
+        board_id=board.id,
         session_key=lead.openclaw_session_id,
         config=config,
         agent_name=lead.name,
         message=message,
         deliver=False,
-    )
-    if error is None:
-        record_activity(
-            session,
+        on_sent=NotificationActivity(
             event_type="approval.lead_notified",
             message=f"Lead agent notified for {approval.status} approval {approval.id}.",
             agent_id=lead.id,
             task_id=approval.task_id,
-        )
-    else:
-        record_activity(
-            session,
+        ),
+        on_failed=NotificationActivity(
             event_type="approval.lead_notify_failed",
-            message=f"Lead notify failed for approval {approval.id}: {error}",
+            message=f"Lead notify failed for approval {approval.id}",
             agent_id=lead.id,
             task_id=approval.task_id,
-        )
+        ),
+    )
     await session.commit()
 
 
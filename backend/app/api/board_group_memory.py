@@ -4,7 +4,6 @@ from __future__ import annotations
 
 import asyncio
 import json
-from dataclasses import dataclass
 from datetime import UTC, datetime
 from enum import Enum
 from typing import TYPE_CHECKING, cast
@@ -34,7 +33,7 @@ from app.models.users import User
 from app.schemas.board_group_memory import BoardGroupMemoryCreate, BoardGroupMemoryRead
 from app.schemas.pagination import DefaultLimitOffsetPage
 from app.services.mentions import extract_mentions, matches_agent_mention
-from app.services.openclaw.gateway_dispatch import GatewayDispatchService
+from app.services.openclaw.gateway_dispatch import AgentMessageTarget, GatewayDispatchService
 from app.services.organizations import (
     is_org_admin,
     list_accessible_board_ids,
@@ -243,54 +242,30 @@ def _group_header(*, is_broadcast: bool, mentioned: bool) -> str:
     return "GROUP CHAT"
 
 
-@dataclass(frozen=True)
-class _NotifyGroupContext:
-    session: AsyncSession
-    dispatch: GatewayDispatchService
-    group: BoardGroup
-    board_by_id: dict[UUID, Board]
-    mentions: set[str]
-    is_broadcast: bool
-    actor_name: str
-    snippet: str
-    base_url: str
-
-
-async def _notify_group_target(
-    context: _NotifyGroupContext,
+def _group_target_message(
+    *,
     agent: Agent,
-) -> None:
-    session_key = agent.openclaw_session_id
-    board_id = agent.board_id
-    if not session_key or board_id is None:
-        return
-    board = context.board_by_id.get(board_id)
-    if board is None:
-        return
-    config = await context.dispatch.optional_gateway_config_for_board(board)
-    if config is None:
-        return
+    board: Board,
+    group: BoardGroup,
+    mentions: set[str],
+    is_broadcast: bool,
+    actor_name: str,
+    snippet: str,
+    base_url: str,
+) -> str:
     header = _group_header(
-        is_broadcast=context.is_broadcast,
-        mentioned=matches_agent_mention(agent, context.mentions),
+        is_broadcast=is_broadcast,
+        mentioned=matches_agent_mention(agent, mentions),
     )
-    message = (
+    return (
         f"{header}\n"
-        f"Group: {context.group.name}\n"
-        f"From: {context.actor_name}\n\n"
-        f"{context.snippet}\n\n"
+        f"Group: {group.name}\n"
+        f"From: {actor_name}\n\n"
+        f"{snippet}\n\n"
         "Reply via group chat (shared across linked boards):\n"
-        f"POST {context.base_url}/api/v1/boards/{board.id}/group-memory\n"
+        f"POST {base_url}/api/v1/boards/{board.id}/group-memory\n"
         'Body: {"content":"...","tags":["chat"]}'
     )
-    error = await context.dispatch.try_send_agent_message(
-        session_key=session_key,
-        config=config,
-        agent_name=agent.name,
-        message=message,
-    )
-    if error is not None:
-        return
 
 
 async def _notify_group_memory_targets(
@@ -333,19 +308,29 @@ async def _notify_group_memory_targets(
 
     base_url = settings.base_url or "http://localhost:8000"
 
-    context = _NotifyGroupContext(
-        session=session,
-        dispatch=GatewayDispatchService(session),
-        group=group,
-        board_by_id=board_by_id,
-        mentions=mentions,
-        is_broadcast=is_broadcast,
-        actor_name=actor_name,
-        snippet=snippet,
-        base_url=base_url,
-    )
+    messages: list[AgentMessageTarget] = []
     for agent in targets.values():
-        await _notify_group_target(context, agent)
+        board = board_by_id.get(agent.board_id) if agent.board_id is not None else None
+        if board is None or not agent.openclaw_session_id:
+            continue
+        messages.append(
+            AgentMessageTarget(
+                board=board,
+                session_key=agent.openclaw_session_id,
+                agent_name=agent.name,
+                message=_group_target_message(
+                    agent=agent,
+                    board=board,
+                    group=group,
+                    mentions=mentions,
+                    is_broadcast=is_broadcast,
+                    actor_name=actor_name,
+                    snippet=snippet,
+                    base_url=base_url,
+                ),
+            ),
+        )
+    await GatewayDispatchService(session).fan_out_agent_messages(messages)
 
 
 @group_router.get("", response_model=DefaultLimitOffsetPage[BoardGroupMemoryRead])
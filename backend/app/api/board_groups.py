@@ -6,11 +6,12 @@ import re
 from typing import TYPE_CHECKING, Any
 from uuid import UUID, uuid4
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy import func
 from sqlmodel import col, select
 
 from app.api.deps import ActorContext, require_admin_or_agent, require_org_admin, require_org_member
+from app.core.conditional import conditional_response, make_etag
 from app.core.time import utcnow
 from app.db import crud
 from app.db.pagination import paginate
@@ -41,6 +42,7 @@ from app.services.organizations import (
     member_all_boards_read,
     member_all_boards_write,
 )
+from app.services.resource_versions import board_group_snapshot_fingerprint
 
 if TYPE_CHECKING:
     from fastapi_pagination.limit_offset import LimitOffsetPage
@@ -145,13 +147,15 @@ async def get_board_group(
 
 @router.get("/{group_id}/snapshot", response_model=BoardGroupSnapshot)
 async def get_board_group_snapshot(
+    request: Request,
+    response: Response,
     group_id: UUID,
     *,
     include_done: bool = False,
     per_board_task_limit: int = 5,
     session: AsyncSession = SESSION_DEP,
     ctx: OrganizationContext = ORG_MEMBER_DEP,
-) -> BoardGroupSnapshot:
+) -> BoardGroupSnapshot | Response:
     """Get a snapshot across boards in a group."""
     group = await _require_group_access(
         session,
@@ -161,6 +165,24 @@ async def get_board_group_snapshot(
     )
     if per_board_task_limit < 0:
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT)
+    fingerprint = await board_group_snapshot_fingerprint(
+        session,
+        group_id=group.id,
+        organization_id=group.organization_id,
+    )
+    # Restricted members only see their boards, so their access is part of the tag.
+    allowed_ids = (
+        None
+        if member_all_boards_read(ctx.member)
+        else set(await list_accessible_board_ids(session, member=ctx.member, write=False))
+    )
+    etag = make_etag(
+        request.url.query,
+        sorted(str(board_id) for board_id in allowed_ids) if allowed_ids is not None else None,
+        fingerprint,
+    )
+    if (not_modified := conditional_response(request, response, etag)) is not None:
+        return not_modified
     snapshot = await build_group_snapshot(
         session,
         group=group,
@@ -168,10 +190,7 @@ async def get_board_group_snapshot(
         include_done=include_done,
         per_board_task_limit=per_board_task_limit,
     )
-    if not member_all_boards_read(ctx.member) and snapshot.boards:
-        allowed_ids = set(
-            await list_accessible_board_ids(session, member=ctx.member, write=False),
-        )
+    if allowed_ids is not None and snapshot.boards:
         snapshot.boards = [item for item in snapshot.boards if item.board.id in allowed_ids]
     return snapshot
 
@@ -28,8 +28,7 @@ from app.models.board_memory import BoardMemory
 from app.schemas.board_memory import BoardMemoryCreate, BoardMemoryRead
 from app.schemas.pagination import DefaultLimitOffsetPage
 from app.services.mentions import extract_mentions, matches_agent_mention
-from app.services.openclaw.gateway_dispatch import GatewayDispatchService
-from app.services.openclaw.gateway_rpc import GatewayConfig as GatewayClientConfig
+from app.services.openclaw.gateway_dispatch import AgentMessageTarget, GatewayDispatchService
 
 if TYPE_CHECKING:
     from collections.abc import AsyncIterator
@@ -100,7 +99,6 @@ async def _send_control_command(
     board: Board,
     actor: ActorContext,
     dispatch: GatewayDispatchService,
-    config: GatewayClientConfig,
     command: str,
 ) -> None:
     pause_targets: list[Agent] = await Agent.objects.filter_by(
@@ -108,20 +106,20 @@ async def _send_control_command(
     ).all(
         session,
     )
-    for agent in pause_targets:
-        if actor.actor_type == "agent" and actor.agent and agent.id == actor.agent.id:
-            continue
-        if not agent.openclaw_session_id:
-            continue
-        error = await dispatch.try_send_agent_message(
-            session_key=agent.openclaw_session_id,
-            config=config,
-            agent_name=agent.name,
-            message=command,
-            deliver=True,
-        )
-        if error is not None:
-            continue
+    await dispatch.fan_out_agent_messages(
+        [
+            AgentMessageTarget(
+                board=board,
+                session_key=agent.openclaw_session_id,
+                agent_name=agent.name,
+                message=command,
+                deliver=True,
+            )
+            for agent in pause_targets
+            if agent.openclaw_session_id
+            and not (actor.actor_type == "agent" and actor.agent and agent.id == actor.agent.id)
+        ],
+    )
 
 
 def _chat_targets(
@@ -160,10 +158,6 @@ async def _notify_chat_targets(
     if not memory.content:
         return
     dispatch = GatewayDispatchService(session)
-    config = await dispatch.optional_gateway_config_for_board(board)
-    if config is None:
-        return
-
     normalized = memory.content.strip()
     command = normalized.lower()
     # Special-case control commands to reach all board agents.
@@ -174,7 +168,6 @@ async def _notify_chat_targets(
             board=board,
             actor=actor,
             dispatch=dispatch,
-            config=config,
             command=command,
         )
         return
@@ -192,6 +185,7 @@ async def _notify_chat_targets(
     if len(snippet) > MAX_SNIPPET_LENGTH:
         snippet = f"{snippet[: MAX_SNIPPET_LENGTH - 3]}..."
     base_url = settings.base_url or "http://localhost:8000"
+    messages: list[AgentMessageTarget] = []
     for agent in targets.values():
         if not agent.openclaw_session_id:
             continue
@@ -206,14 +200,15 @@ async def _notify_chat_targets(
             f"POST {base_url}/api/v1/agent/boards/{board.id}/memory\n"
             'Body: {"content":"...","tags":["chat"]}'
         )
-        error = await dispatch.try_send_agent_message(
-            session_key=agent.openclaw_session_id,
-            config=config,
-            agent_name=agent.name,
-            message=message,
+        messages.append(
+            AgentMessageTarget(
+                board=board,
+                session_key=agent.openclaw_session_id,
+                agent_name=agent.name,
+                message=message,
+            ),
         )
-        if error is not None:
-            continue
+    await dispatch.fan_out_agent_messages(messages)
 
 
 @router.get("", response_model=DefaultLimitOffsetPage[BoardMemoryRead])
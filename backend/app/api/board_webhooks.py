@@ -2,11 +2,17 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
-from typing import TYPE_CHECKING
+from datetime import timedelta
+from typing import TYPE_CHECKING, cast
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import Table, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.dialects.postgresql import Insert as PostgresInsert
+from sqlalchemy.dialects.sqlite import Insert as SqliteInsert
 from sqlmodel import col, select
 
 from app.api.deps import get_board_for_user_read, get_board_for_user_write, get_board_or_404
@@ -33,7 +39,7 @@ from app.services.openclaw.gateway_dispatch import GatewayDispatchService
 from app.services.webhooks.queue import QueuedInboundDelivery, enqueue_webhook_delivery
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Callable, Sequence
 
     from fastapi_pagination.limit_offset import LimitOffsetPage
     from sqlmodel.ext.asyncio.session import AsyncSession
@@ -67,6 +73,8 @@ def _to_webhook_read(webhook: BoardWebhook) -> BoardWebhookRead:
         agent_id=webhook.agent_id,
         description=webhook.description,
         enabled=webhook.enabled,
+        dedupe_header=webhook.dedupe_header,
+        dedupe_content_hash=webhook.dedupe_content_hash,
         endpoint_path=endpoint_path,
         endpoint_url=_webhook_endpoint_url(endpoint_path),
         created_at=webhook.created_at,
@@ -136,6 +144,79 @@ async def _require_board_webhook_payload(
     return payload
 
 
+def _delivery_dedupe_key(
+    webhook: BoardWebhook,
+    *,
+    request: Request,
+    raw_body: bytes,
+) -> str | None:
+    """Resolve the idempotency key for one inbound delivery, if dedupe is configured.
+
+    A configured delivery-id header wins; the body hash is used when the header is
+    absent (or not configured) and content hashing is enabled for the webhook.
+    """
+    if settings.webhook_dedupe_retention_seconds <= 0:
+        return None
+    if webhook.dedupe_header:
+        delivery_id = (request.headers.get(webhook.dedupe_header) or "").strip()
+        if delivery_id:
+            return f"header:{delivery_id}"
+    if webhook.dedupe_content_hash:
+        return f"sha256:{hashlib.sha256(raw_body).hexdigest()}"
+    return None
+
+
+def _payload_insert(dialect_name: str) -> Callable[[Table], SqliteInsert | PostgresInsert]:
+    if dialect_name == "postgresql":
+        return postgresql.insert
+    if dialect_name == "sqlite":
+        return sqlite.insert
+    msg = f"webhook delivery dedupe is not supported on {dialect_name!r}"
+    raise RuntimeError(msg)
+
+
+async def _claim_delivery(session: AsyncSession, payload: BoardWebhookPayload) -> UUID | None:
+    """Insert a keyed payload unless its key is taken; return the existing payload id if so.
+
+    The unique `(webhook_id, dedupe_key)` index makes this atomic, so concurrent retries
+    of one delivery store it once. Keys older than the retention window are cleared
+    first, which lets a sender reuse them.
+    """
+    cutoff = utcnow() - timedelta(seconds=settings.webhook_dedupe_retention_seconds)
+    await session.exec(
+        update(BoardWebhookPayload)
+        .where(col(BoardWebhookPayload.webhook_id) == payload.webhook_id)
+        .where(col(BoardWebhookPayload.dedupe_key) == payload.dedupe_key)
+        .where(col(BoardWebhookPayload.received_at) < cutoff)
+        .values(dedupe_key=None),
+    )
+    table = cast(Table, BoardWebhookPayload.__table__)  # type: ignore[attr-defined]
+    connection = await session.connection()
+    insert = _payload_insert(connection.dialect.name)
+    statement = (
+        insert(table)
+        .values({column.name: getattr(payload, column.name) for column in table.columns})
+        .on_conflict_do_nothing(index_elements=[table.c.webhook_id, table.c.dedupe_key])
+        .returning(table.c.id)
+    )
+    if (await session.exec(statement)).first() is not None:
+        return None
+    existing_payload_id = (
+        await session.exec(
+            select(BoardWebhookPayload.id)
+            .where(col(BoardWebhookPayload.webhook_id) == payload.webhook_id)
+            .where(col(BoardWebhookPayload.dedupe_key) == payload.dedupe_key),
+        )
+    ).first()
+    if existing_payload_id is None:
+        # The conflicting delivery was rolled back or expired between the two statements.
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A delivery with the same dedupe key is in progress; retry.",
+        )
+    return existing_payload_id
+
+
 def _decode_payload(
     raw_body: bytes,
     *,
@@ -303,6 +384,8 @@ async def create_board_webhook(
         agent_id=payload.agent_id,
         description=payload.description,
         enabled=payload.enabled,
+        dedupe_header=payload.dedupe_header,
+        dedupe_content_hash=payload.dedupe_content_hash,
     )
     await crud.save(session, webhook)
     return _to_webhook_read(webhook)
@@ -433,7 +516,11 @@ async def ingest_board_webhook(
     board: Board = BOARD_OR_404_DEP,
     session: AsyncSession = SESSION_DEP,
 ) -> BoardWebhookIngestResponse:
-    """Open inbound webhook endpoint that stores payloads and nudges the board lead."""
+    """Open inbound webhook endpoint that stores payloads and nudges the board lead.
+
+    Redeliveries matching a recent dedupe key are acknowledged with the original
+    payload id without any writes or gateway traffic.
+    """
     webhook = await _require_board_webhook(
         session,
         board_id=board.id,
@@ -454,10 +541,12 @@ async def ingest_board_webhook(
             detail="Webhook is disabled.",
         )
 
+    raw_body = await request.body()
+    dedupe_key = _delivery_dedupe_key(webhook, request=request, raw_body=raw_body)
     content_type = request.headers.get("content-type")
     headers = _captured_headers(request)
     payload_value = _decode_payload(
-        await request.body(),
+        raw_body,
         content_type=content_type,
     )
     payload = BoardWebhookPayload(
@@ -467,8 +556,29 @@ async def ingest_board_webhook(
         headers=headers,
         source_ip=request.client.host if request.client else None,
         content_type=content_type,
+        dedupe_key=dedupe_key,
     )
-    session.add(payload)
+    if dedupe_key is None:
+        session.add(payload)
+    else:
+        existing_payload_id = await _claim_delivery(session, payload)
+        if existing_payload_id is not None:
+            # Only expired keys may have been cleared; keep that and end the transaction.
+            await session.commit()
+            logger.info(
+                "webhook.ingest.duplicate",
+                extra={
+                    "payload_id": str(existing_payload_id),
+                    "board_id": str(board.id),
+                    "webhook_id": str(webhook.id),
+                },
+            )
+            return BoardWebhookIngestResponse(
+                board_id=board.id,
+                webhook_id=webhook.id,
+                payload_id=existing_payload_id,
+                duplicate=True,
+            )
     memory = BoardMemory(
         board_id=board.id,
         content=_webhook_memory_content(webhook=webhook, payload=payload),
@@ -6,7 +6,7 @@ from enum import Enum
 from typing import TYPE_CHECKING, Literal, cast
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy import func
 from sqlmodel import col, select
 
@@ -17,6 +17,7 @@ from app.api.deps import (
     require_org_admin,
     require_org_member,
 )
+from app.core.conditional import conditional_response, make_etag
 from app.core.logging import get_logger
 from app.core.time import utcnow
 from app.db import crud
@@ -30,14 +31,19 @@ from app.schemas.boards import BoardCreate, BoardRead, BoardUpdate
 from app.schemas.common import OkResponse
 from app.schemas.pagination import DefaultLimitOffsetPage
 from app.schemas.view_models import BoardGroupSnapshot, BoardSnapshot
-from app.services.activity_log import record_activity
 from app.services.board_group_snapshot import build_board_group_snapshot
 from app.services.board_lifecycle import delete_board as delete_board_service
 from app.services.board_snapshot import build_board_snapshot
+from app.services.notifications import NotificationActivity
 from app.services.openclaw.gateway_dispatch import GatewayDispatchService
 from app.services.openclaw.gateway_rpc import GatewayConfig as GatewayClientConfig
 from app.services.openclaw.gateway_rpc import OpenClawGatewayError
 from app.services.organizations import OrganizationContext, board_access_filter
+from app.services.resource_versions import (
+    board_group_snapshot_fingerprint,
+    board_list_fingerprint,
+    board_snapshot_fingerprint,
+)
 
 if TYPE_CHECKING:
     from fastapi_pagination.limit_offset import LimitOffsetPage
@@ -271,8 +277,7 @@ async def _notify_agents_on_board_group_change(
         for recipient_board_id, recipient_board in board_by_id.items()
     }
 
-    notified = 0
-    failed = 0
+    dispatched = 0
     skipped_missing_session = 0
     skipped_missing_config = 0
     skipped_missing_board = 0
@@ -289,49 +294,44 @@ async def _notify_agents_on_board_group_change(
         if config is None or message is None or recipient_board is None:
             skipped_missing_config += 1
             continue
-        error = await dispatch.try_send_agent_message(
+        await dispatch.queue_agent_message(
+            board_id=recipient_board.id,
             session_key=agent.openclaw_session_id,
             config=config,
             agent_name=agent.name,
             message=message,
             deliver=False,
-        )
-        if error is None:
-            notified += 1
-            record_activity(
-                session,
+            on_sent=NotificationActivity(
                 event_type=f"board.group.{action}.notified",
                 message=(
                     f"Board-group {action} notice sent to {agent.name} for board "
                     f"{recipient_board.name} related to {board.name} and {group.name}."
                 ),
                 agent_id=agent.id,
-            )
-        else:
-            failed += 1
-            record_activity(
-                session,
+            ),
+            on_failed=NotificationActivity(
                 event_type=f"board.group.{action}.notify_failed",
                 message=(
                     f"Board-group {action} notify failed for {agent.name} on board "
-                    f"{recipient_board.name}: {error}"
+                    f"{recipient_board.name}"
                 ),
                 agent_id=agent.id,
-            )
+            ),
+        )
+        dispatched += 1
 
-    if notified or failed:
+    if dispatched:
         await session.commit()
     logger.info(
         "board.group.%s.notify_complete board_id=%s group_id=%s boards_total=%s agents_total=%s "
-        "agents_notified=%s agents_failed=%s agents_skipped_no_session=%s "
+        "agents_dispatched=%s agents_skipped_no_session=%s "
         "agents_skipped_no_gateway=%s agents_skipped_no_board=%s",
         action,
         board.id,
         group.id,
         len(board_by_id),
         len(agents),
-        notified,
-        failed,
+        dispatched,
         skipped_missing_session,
         skipped_missing_config,
         skipped_missing_board,
@@ -368,17 +368,26 @@ async def _notify_agents_on_board_group_removal(
 
 @router.get("", response_model=DefaultLimitOffsetPage[BoardRead])
 async def list_boards(
+    request: Request,
+    response: Response,
     gateway_id: UUID | None = GATEWAY_ID_QUERY,
     board_group_id: UUID | None = BOARD_GROUP_ID_QUERY,
     session: AsyncSession = SESSION_DEP,
     ctx: OrganizationContext = ORG_MEMBER_DEP,
-) -> LimitOffsetPage[BoardRead]:
+) -> LimitOffsetPage[BoardRead] | Response:
     """List boards visible to the current organization member."""
     statement = select(Board).where(board_access_filter(ctx.member, write=False))
     if gateway_id is not None:
         statement = statement.where(col(Board.gateway_id) == gateway_id)
     if board_group_id is not None:
         statement = statement.where(col(Board.board_group_id) == board_group_id)
+    etag = make_etag(
+        ctx.member.id,
+        request.url.query,
+        await board_list_fingerprint(session, statement),
+    )
+    if (not_modified := conditional_response(request, response, etag)) is not None:
+        return not_modified
     statement = statement.order_by(
         func.lower(col(Board.name)).asc(),
         col(Board.created_at).desc(),
@@ -402,18 +411,32 @@ async def create_board(
 
 @router.get("/{board_id}", response_model=BoardRead)
 def get_board(
+    request: Request,
+    response: Response,
     board: Board = BOARD_USER_READ_DEP,
-) -> Board:
+) -> Board | Response:
     """Get a board by id."""
+    etag = make_etag(board.id, board.updated_at)
+    if (not_modified := conditional_response(request, response, etag)) is not None:
+        return not_modified
     return board
 
 
 @router.get("/{board_id}/snapshot", response_model=BoardSnapshot)
 async def get_board_snapshot(
+    request: Request,
+    response: Response,
     board: Board = BOARD_ACTOR_READ_DEP,
     session: AsyncSession = SESSION_DEP,
-) -> BoardSnapshot:
-    """Get a board snapshot view model."""
+) -> BoardSnapshot | Response:
+    """Get a board snapshot view model.
+
+    Answers `304 Not Modified` without rebuilding the snapshot while the client's
+    `If-None-Match` still matches.
+    """
+    etag = make_etag(await board_snapshot_fingerprint(session, board))
+    if (not_modified := conditional_response(request, response, etag)) is not None:
+        return not_modified
     return await build_board_snapshot(session, board)
 
 
@@ -423,17 +446,28 @@ async def get_board_snapshot(
     tags=AGENT_BOARD_ROLE_TAGS,
 )
 async def get_board_group_snapshot(
+    request: Request,
+    response: Response,
     *,
     include_self: bool = INCLUDE_SELF_QUERY,
     include_done: bool = INCLUDE_DONE_QUERY,
     per_board_task_limit: int = PER_BOARD_TASK_LIMIT_QUERY,
     board: Board = BOARD_ACTOR_READ_DEP,
     session: AsyncSession = SESSION_DEP,
-) -> BoardGroupSnapshot:
+) -> BoardGroupSnapshot | Response:
     """Get a grouped snapshot across related boards.
 
     Returns high-signal cross-board status for dependency and overlap checks.
     """
+    if board.board_group_id is not None:
+        fingerprint = await board_group_snapshot_fingerprint(
+            session,
+            group_id=board.board_group_id,
+            organization_id=board.organization_id,
+        )
+        etag = make_etag(board.id, request.url.query, fingerprint)
+        if (not_modified := conditional_response(request, response, etag)) is not None:
+            return not_modified
     return await build_board_group_snapshot(
         session,
         board=board,
@@ -30,7 +30,7 @@ from app.db.session import get_session
 from app.models.boards import Board
 from app.models.organizations import Organization
 from app.models.tasks import Task
-from app.services.admin_access import require_admin
+from app.services.admin_access import require_admin, require_super_admin
 from app.services.organizations import (
     OrganizationContext,
     ensure_member_for_user,
@@ -57,6 +57,12 @@ def require_admin_auth(auth: AuthContext = AUTH_DEP) -> AuthContext:
     return auth
 
 
+def require_super_admin_auth(auth: AuthContext = AUTH_DEP) -> AuthContext:
+    """Require an authenticated super-admin user."""
+    require_super_admin(auth)
+    return auth
+
+
 @dataclass
 class ActorContext:
     """Authenticated actor context for user or agent callers."""
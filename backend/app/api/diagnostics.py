@@ -0,0 +1,78 @@
+"""Super-admin diagnostics: on-demand sampling profiles of API and worker processes."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+
+from app.api.deps import require_super_admin_auth
+from app.core.auth import AuthContext
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.profiling import FOLDED_CONTENT_TYPE, ProfilerBusyError, SamplingProfiler
+from app.services.worker_profiling import request_worker_profile
+
+router = APIRouter(prefix="/diagnostics", tags=["diagnostics"], include_in_schema=False)
+SUPER_ADMIN_DEP = Depends(require_super_admin_auth)
+logger = get_logger(__name__)
+
+
+@router.get("/profile")
+async def capture_profile(
+    seconds: float = Query(default=10.0, gt=0),
+    interval_ms: float = Query(default=10.0, ge=1, le=1000),
+    target: Literal["api", "worker"] = Query(default="api"),
+    include_idle: bool = Query(default=False),
+    auth: AuthContext = SUPER_ADMIN_DEP,
+) -> Response:
+    """Sample this API process (or a queue worker) for `seconds` and return folded stacks.
+
+    The output is the collapsed-stack format accepted by flamegraph.pl, inferno and
+    speedscope. Only one capture runs per process at a time.
+    """
+    if not settings.profiling_enabled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    if seconds > settings.profiling_max_seconds:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail=f"seconds must be at most {settings.profiling_max_seconds}",
+        )
+    logger.info(
+        "profiling.capture.start",
+        extra={
+            "target": target,
+            "seconds": seconds,
+            "user_id": str(auth.user.id) if auth.user else None,
+        },
+    )
+    if target == "worker":
+        folded = await asyncio.to_thread(
+            request_worker_profile,
+            seconds,
+            interval_s=interval_ms / 1000,
+        )
+        if folded is None:
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail="No queue worker answered the profile request.",
+            )
+        return Response(content=folded, media_type=FOLDED_CONTENT_TYPE)
+
+    try:
+        profiler = SamplingProfiler(
+            interval_s=interval_ms / 1000,
+            include_idle=include_idle,
+        ).start()
+    except ProfilerBusyError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        profile = profiler.stop()
+    return Response(
+        content=profile.folded(),
+        media_type=FOLDED_CONTENT_TYPE,
+        headers={"X-Profile-Samples": str(profile.samples)},
+    )
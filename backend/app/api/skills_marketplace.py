@@ -2,24 +2,34 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import ipaddress
 import json
 import re
+import shutil
 import subprocess
+import threading
 from dataclasses import dataclass
 from pathlib import Path
-from tempfile import TemporaryDirectory
-from typing import TYPE_CHECKING, Iterator, TextIO
+from tempfile import TemporaryDirectory, gettempdir
+from typing import TYPE_CHECKING, Any, Callable, Iterator, TextIO, cast
 from urllib.parse import unquote, urlparse
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
-from sqlalchemy import func, or_
+from sqlalchemy import ColumnElement, Table, Text
+from sqlalchemy import cast as sql_cast
+from sqlalchemy import func, literal_column, or_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.dialects.postgresql import Insert as PostgresInsert
+from sqlalchemy.dialects.sqlite import Insert as SqliteInsert
 from sqlmodel import col, select
 
 from app.api.deps import require_org_admin
+from app.core.config import settings
 from app.core.time import utcnow
-from app.db.session import get_session
+from app.db.session import async_session_maker, get_session
 from app.models.gateways import Gateway
 from app.models.skills import GatewayInstalledSkill, MarketplaceSkill, SkillPack
 from app.schemas.common import OkResponse
@@ -30,6 +40,7 @@ from app.schemas.skills_marketplace import (
     MarketplaceSkillRead,
     SkillPackCreate,
     SkillPackRead,
+    SkillPackSyncJobRead,
     SkillPackSyncResponse,
 )
 from app.services.openclaw.gateway_dispatch import GatewayDispatchService
@@ -40,6 +51,7 @@ from app.services.openclaw.gateway_resolver import (
 from app.services.openclaw.gateway_rpc import OpenClawGatewayError
 from app.services.openclaw.shared import GatewayAgentIdentity
 from app.services.organizations import OrganizationContext
+from app.services.skill_pack_sync_jobs import SkillPackSyncJob, skill_pack_sync_jobs
 
 if TYPE_CHECKING:
     from sqlmodel.ext.asyncio.session import AsyncSession
@@ -54,6 +66,7 @@ GIT_CLONE_TIMEOUT_SECONDS = 30
 GIT_REV_PARSE_TIMEOUT_SECONDS = 10
 BRANCH_NAME_ALLOWED_RE = r"^[A-Za-z0-9._/\-]+$"
 SKILLS_INDEX_READ_CHUNK_BYTES = 16 * 1024
+PACK_SKILL_UPSERT_CHUNK_SIZE = 500
 
 
 def _normalize_pack_branch(raw_branch: str | None) -> str:
@@ -256,20 +269,14 @@ def _normalize_repo_path(path_value: str) -> str:
     return cleaned
 
 
-def _coerce_index_entries(payload: object) -> list[dict[str, object]]:
-    if isinstance(payload, list):
-        return [entry for entry in payload if isinstance(entry, dict)]
-
-    if isinstance(payload, dict):
-        entries = payload.get("skills")
-        if isinstance(entries, list):
-            return [entry for entry in entries if isinstance(entry, dict)]
-
-    return []
-
-
 class _StreamingJSONReader:
-    """Incrementally decode JSON content from a file object."""
+    """Incrementally decode the skill entries of a `skills_index.json` file.
+
+    Only the unparsed tail of the file is buffered: consumed text is dropped whenever
+    more input is read, and a value that straddles the end of the buffer at least
+    doubles the next read, so decoding is linear in the file size and memory is
+    bounded by the largest single value rather than the whole index.
+    """
 
     def __init__(self, file_obj: TextIO):
         self._file_obj = file_obj
@@ -278,15 +285,16 @@ class _StreamingJSONReader:
         self._eof = False
         self._decoder = json.JSONDecoder()
 
-    def _fill_buffer(self) -> None:
+    def _fill_buffer(self, min_chars: int = 0) -> None:
         if self._eof:
             return
 
-        chunk = self._file_obj.read(SKILLS_INDEX_READ_CHUNK_BYTES)
+        chunk = self._file_obj.read(max(min_chars, SKILLS_INDEX_READ_CHUNK_BYTES))
         if not chunk:
             self._eof = True
             return
-        self._buffer += chunk
+        self._buffer = self._buffer[self._position :] + chunk
+        self._position = 0
 
     def _peek(self) -> str | None:
         self._skip_whitespace()
@@ -299,136 +307,173 @@ class _StreamingJSONReader:
             while self._position < len(self._buffer) and self._buffer[self._position].isspace():
                 self._position += 1
 
-            if self._position < len(self._buffer):
+            if self._position < len(self._buffer) or self._eof:
                 return
-
             self._fill_buffer()
-            if self._position < len(self._buffer):
-                return
-            if self._eof:
-                return
 
     def _decode_value(self) -> object:
         self._skip_whitespace()
 
         while True:
+            pending = len(self._buffer) - self._position
             try:
                 value, end = self._decoder.raw_decode(self._buffer, self._position)
-                self._position = end
-                return value
             except json.JSONDecodeError:
                 if self._eof:
-                    raise RuntimeError("skills_index.json is not valid JSON")
-                self._fill_buffer()
-                self._skip_whitespace()
-                if self._position >= len(self._buffer):
-                    if self._eof:
-                        raise RuntimeError("skills_index.json is not valid JSON")
+                    raise RuntimeError("skills_index.json is not valid JSON") from None
+                self._fill_buffer(pending)
+                continue
+            if end == len(self._buffer) and not self._eof:
+                # A number or literal ending the buffer may continue in the next chunk.
+                self._fill_buffer(pending)
+                continue
+            self._position = end
+            return value
 
     def _consume_char(self, expected: str) -> None:
-        self._skip_whitespace()
-        if self._position >= len(self._buffer):
-            self._fill_buffer()
-            self._skip_whitespace()
-        if self._position >= len(self._buffer):
-            raise RuntimeError("skills_index.json is not valid JSON")
-
-        actual = self._buffer[self._position]
-        if actual != expected:
+        if self._peek() != expected:
             raise RuntimeError("skills_index.json is not valid JSON")
         self._position += 1
 
-    def read_top_level_entries(self) -> list[dict[str, object]]:
-        self._fill_buffer()
-        self._skip_whitespace()
+    def iter_entries(self) -> Iterator[dict[str, object]]:
+        """Yield entries of a top-level array or of an object's `skills` array."""
         first = self._peek()
-        if first is None:
-            raise RuntimeError("skills_index.json is not valid JSON")
-
         if first == "[":
             self._position += 1
-            return list(self._read_array_values())
-        if first == "{":
+            yield from self._read_array_values()
+        elif first == "{":
             self._position += 1
-            return list(self._read_skills_from_object())
-        raise RuntimeError("skills_index.json is not valid JSON")
+            yield from self._read_skills_from_object()
+        else:
+            raise RuntimeError("skills_index.json is not valid JSON")
 
     def _read_array_values(self) -> Iterator[dict[str, object]]:
+        expect_value = True
         while True:
-            self._skip_whitespace()
             current = self._peek()
             if current is None:
-                if self._eof:
-                    raise RuntimeError("skills_index.json is not valid JSON")
-                continue
+                raise RuntimeError("skills_index.json is not valid JSON")
             if current == "]":
                 self._position += 1
                 return
-
-            if current == ",":
+            if current == "," and not expect_value:
                 self._position += 1
+                expect_value = True
                 continue
+            if not expect_value:
+                raise RuntimeError("skills_index.json is not valid JSON")
 
             entry = self._decode_value()
-            if isinstance(entry, dict):
-                yield entry
-            else:
+            if not isinstance(entry, dict):
                 raise RuntimeError("skills_index.json is not valid JSON")
+            expect_value = False
+            yield entry
 
     def _read_skills_from_object(self) -> Iterator[dict[str, object]]:
+        if self._peek() == "}":
+            self._position += 1
+            return
         while True:
-            self._skip_whitespace()
-            current = self._peek()
-            if current is None:
-                if self._eof:
-                    raise RuntimeError("skills_index.json is not valid JSON")
-                continue
-
-            if current == "}":
-                self._position += 1
-                return
-
             key = self._decode_value()
             if not isinstance(key, str):
                 raise RuntimeError("skills_index.json is not valid JSON")
+            self._consume_char(":")
 
-            self._skip_whitespace()
-            if self._peek() == ":":
-                self._position += 1
-            else:
-                self._consume_char(":")
-
-            if key == "skills":
-                self._skip_whitespace()
-                current = self._peek()
-                if current is None:
-                    if self._eof:
-                        raise RuntimeError("skills_index.json is not valid JSON")
-                    continue
-
-                if current != "[":
-                    value = self._decode_value()
-                    if isinstance(value, list):
-                        for entry in value:
-                            if isinstance(entry, dict):
-                                yield entry
-                            else:
-                                raise RuntimeError("skills_index.json is not valid JSON")
-                    continue
-
+            if key == "skills" and self._peek() == "[":
                 self._position += 1
                 yield from self._read_array_values()
             else:
                 self._decode_value()
 
-            self._skip_whitespace()
             current = self._peek()
-            if current == ",":
-                self._position += 1
-                continue
             if current == "}":
                 self._position += 1
                 return
+            self._consume_char(",")
+
+
+def _pack_candidate_from_index_entry(
+    entry: dict[str, object],
+    *,
+    source_url: str,
+    branch: str,
+) -> PackSkillCandidate | None:
+    indexed_path = entry.get("path")
+    has_indexed_path = False
+    rel_path = ""
+    resolved_skill_path: str | None = None
+    if isinstance(indexed_path, str) and indexed_path.strip():
+        has_indexed_path = True
+        rel_path = _normalize_repo_path(indexed_path)
+        resolved_skill_path = rel_path or None
+
+    indexed_source = entry.get("source_url")
+    candidate_source_url: str | None = None
+    resolved_metadata: dict[str, object] = {
+        "discovery_mode": "skills_index",
+        "pack_branch": branch,
+    }
+    if isinstance(indexed_source, str) and indexed_source.strip():
+        source_candidate = indexed_source.strip()
+        resolved_metadata["source_url"] = source_candidate
+        if source_candidate.startswith(("https://", "http://")):
+            parsed = urlparse(source_candidate)
+            if parsed.path:
+                marker = "/tree/"
+                marker_index = parsed.path.find(marker)
+                if marker_index > 0:
+                    tree_suffix = parsed.path[marker_index + len(marker) :]
+                    slash_index = tree_suffix.find("/")
+                    candidate_path = tree_suffix[slash_index + 1 :] if slash_index >= 0 else ""
+                    resolved_skill_path = _normalize_repo_path(candidate_path)
+            candidate_source_url = source_candidate
+        else:
+            indexed_rel = _normalize_repo_path(source_candidate)
+            resolved_skill_path = resolved_skill_path or indexed_rel
+            resolved_metadata["resolved_path"] = indexed_rel
+            if indexed_rel:
+                candidate_source_url = _to_tree_source_url(source_url, branch, indexed_rel)
+    elif has_indexed_path:
+        resolved_metadata["resolved_path"] = rel_path
+        candidate_source_url = _to_tree_source_url(source_url, branch, rel_path)
+        if rel_path:
+            resolved_skill_path = rel_path
+
+    if not candidate_source_url:
+        return None
+
+    indexed_name = entry.get("name")
+    if isinstance(indexed_name, str) and indexed_name.strip():
+        name = indexed_name.strip()
+    else:
+        fallback = Path(rel_path).name if rel_path else "Skill"
+        name = _infer_skill_name(fallback)
+
+    indexed_description = entry.get("description")
+    description = (
+        indexed_description.strip()
+        if isinstance(indexed_description, str) and indexed_description.strip()
+        else None
+    )
+    indexed_category = entry.get("category")
+    category = (
+        indexed_category.strip()
+        if isinstance(indexed_category, str) and indexed_category.strip()
+        else None
+    )
+    indexed_risk = entry.get("risk")
+    risk = indexed_risk.strip() if isinstance(indexed_risk, str) and indexed_risk.strip() else None
+    source_label = resolved_skill_path
+
+    return PackSkillCandidate(
+        name=name,
+        description=description,
+        source_url=candidate_source_url,
+        category=category,
+        risk=risk,
+        source=source_label,
+        metadata=resolved_metadata,
+    )
 
 
 def _collect_pack_skills_from_index(
@@ -442,9 +487,19 @@ def _collect_pack_skills_from_index(
     if not index_file.is_file():
         return None
 
+    # Entries are converted one at a time as they are decoded; only the candidates
+    # (deduplicated by source URL) are kept.
+    found: dict[str, PackSkillCandidate] = {}
     try:
         with index_file.open(encoding="utf-8") as fp:
-            payload = _StreamingJSONReader(fp).read_top_level_entries()
+            for entry in _StreamingJSONReader(fp).iter_entries():
+                candidate = _pack_candidate_from_index_entry(
+                    entry,
+                    source_url=source_url,
+                    branch=branch,
+                )
+                if candidate is not None:
+                    found[candidate.source_url] = candidate
     except OSError as exc:
         raise RuntimeError("unable to read skills_index.json") from exc
     except RuntimeError as exc:
@@ -452,87 +507,6 @@ def _collect_pack_skills_from_index(
             discovery_warnings.append(f"Failed to parse skills_index.json: {exc}")
         return None
 
-    found: dict[str, PackSkillCandidate] = {}
-    for entry in _coerce_index_entries(payload):
-        indexed_path = entry.get("path")
-        has_indexed_path = False
-        rel_path = ""
-        resolved_skill_path: str | None = None
-        if isinstance(indexed_path, str) and indexed_path.strip():
-            has_indexed_path = True
-            rel_path = _normalize_repo_path(indexed_path)
-            resolved_skill_path = rel_path or None
-
-        indexed_source = entry.get("source_url")
-        candidate_source_url: str | None = None
-        resolved_metadata: dict[str, object] = {
-            "discovery_mode": "skills_index",
-            "pack_branch": branch,
-        }
-        if isinstance(indexed_source, str) and indexed_source.strip():
-            source_candidate = indexed_source.strip()
-            resolved_metadata["source_url"] = source_candidate
-            if source_candidate.startswith(("https://", "http://")):
-                parsed = urlparse(source_candidate)
-                if parsed.path:
-                    marker = "/tree/"
-                    marker_index = parsed.path.find(marker)
-                    if marker_index > 0:
-                        tree_suffix = parsed.path[marker_index + len(marker) :]
-                        slash_index = tree_suffix.find("/")
-                        candidate_path = tree_suffix[slash_index + 1 :] if slash_index >= 0 else ""
-                        resolved_skill_path = _normalize_repo_path(candidate_path)
-                candidate_source_url = source_candidate
-            else:
-                indexed_rel = _normalize_repo_path(source_candidate)
-                resolved_skill_path = resolved_skill_path or indexed_rel
-                resolved_metadata["resolved_path"] = indexed_rel
-                if indexed_rel:
-                    candidate_source_url = _to_tree_source_url(source_url, branch, indexed_rel)
-        elif has_indexed_path:
-            resolved_metadata["resolved_path"] = rel_path
-            candidate_source_url = _to_tree_source_url(source_url, branch, rel_path)
-            if rel_path:
-                resolved_skill_path = rel_path
-
-        if not candidate_source_url:
-            continue
-
-        indexed_name = entry.get("name")
-        if isinstance(indexed_name, str) and indexed_name.strip():
-            name = indexed_name.strip()
-        else:
-            fallback = Path(rel_path).name if rel_path else "Skill"
-            name = _infer_skill_name(fallback)
-
-        indexed_description = entry.get("description")
-        description = (
-            indexed_description.strip()
-            if isinstance(indexed_description, str) and indexed_description.strip()
-            else None
-        )
-        indexed_category = entry.get("category")
-        category = (
-            indexed_category.strip()
-            if isinstance(indexed_category, str) and indexed_category.strip()
-            else None
-        )
-        indexed_risk = entry.get("risk")
-        risk = (
-            indexed_risk.strip() if isinstance(indexed_risk, str) and indexed_risk.strip() else None
-        )
-        source_label = resolved_skill_path
-
-        found[candidate_source_url] = PackSkillCandidate(
-            name=name,
-            description=description,
-            source_url=candidate_source_url,
-            category=category,
-            risk=risk,
-            source=source_label,
-            metadata=resolved_metadata,
-        )
-
     return list(found.values())
 
 
@@ -587,92 +561,161 @@ def _collect_pack_skills(
     source_url: str,
     branch: str = "main",
 ) -> list[PackSkillCandidate]:
-    """Clone a pack repository and collect skills from index or `skills/**/SKILL.md`."""
+    """Sync a pack's repository mirror and collect skills from index or `**/SKILL.md`."""
     return _collect_pack_skills_with_warnings(
         source_url=source_url,
         branch=branch,
     )[0]
 
 
+def _pack_mirror_root() -> Path:
+    configured = settings.skill_pack_mirror_dir.strip()
+    if configured:
+        return Path(configured).expanduser()
+    return Path(gettempdir()) / "mission-control-skill-packs"
+
+
+def _pack_mirror_dir(source_url: str) -> Path:
+    digest = hashlib.sha256(source_url.encode("utf-8")).hexdigest()[:32]
+    return _pack_mirror_root() / digest
+
+
+_pack_mirror_locks: dict[Path, threading.Lock] = {}
+_pack_mirror_locks_guard = threading.Lock()
+
+
+def _pack_mirror_lock(mirror_dir: Path) -> threading.Lock:
+    with _pack_mirror_locks_guard:
+        return _pack_mirror_locks.setdefault(mirror_dir, threading.Lock())
+
+
+def _run_git(args: list[str], *, timeout: int) -> str:
+    return subprocess.run(
+        ["git", *args],
+        check=True,
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+    ).stdout
+
+
+def _clone_failure_detail(exc: subprocess.CalledProcessError) -> str:
+    stderr = (exc.stderr or "").strip()
+    detail = "unable to clone pack repository"
+    if stderr:
+        detail = f"{detail}: {stderr.splitlines()[0][:200]}"
+    return detail
+
+
+def _clone_pack_repository(*, source_url: str, branch: str, repo_dir: Path) -> None:
+    """Shallow-clone `branch`, falling back to the default branch when it is missing."""
+    try:
+        _run_git(
+            [
+                "clone",
+                "--depth",
+                "1",
+                "--single-branch",
+                "--branch",
+                branch,
+                source_url,
+                str(repo_dir),
+            ],
+            timeout=GIT_CLONE_TIMEOUT_SECONDS,
+        )
+    except FileNotFoundError as exc:
+        raise RuntimeError("git binary not available on the server") from exc
+    except subprocess.TimeoutExpired as exc:
+        raise RuntimeError("timed out cloning pack repository") from exc
+    except subprocess.CalledProcessError as exc:
+        if branch == "main":
+            raise RuntimeError(_clone_failure_detail(exc)) from exc
+        try:
+            _run_git(
+                ["clone", "--depth", "1", source_url, str(repo_dir)],
+                timeout=GIT_CLONE_TIMEOUT_SECONDS,
+            )
+        except (
+            FileNotFoundError,
+            subprocess.TimeoutExpired,
+            subprocess.CalledProcessError,
+        ):
+            raise RuntimeError(_clone_failure_detail(exc)) from exc
+
+
+def _fetch_pack_mirror(*, mirror_dir: Path, branch: str) -> bool:
+    """Fast-forward an existing mirror to the remote branch tip; False if it must be recloned."""
+    if not (mirror_dir / ".git").is_dir():
+        return False
+    try:
+        _run_git(
+            ["-C", str(mirror_dir), "fetch", "--depth", "1", "origin", branch],
+            timeout=GIT_CLONE_TIMEOUT_SECONDS,
+        )
+        _run_git(
+            ["-C", str(mirror_dir), "checkout", "--force", "-B", branch, "FETCH_HEAD"],
+            timeout=GIT_REV_PARSE_TIMEOUT_SECONDS,
+        )
+        _run_git(
+            ["-C", str(mirror_dir), "clean", "-ffdx"],
+            timeout=GIT_REV_PARSE_TIMEOUT_SECONDS,
+        )
+    except FileNotFoundError as exc:
+        raise RuntimeError("git binary not available on the server") from exc
+    except (subprocess.TimeoutExpired, subprocess.CalledProcessError):
+        return False
+    return True
+
+
+def _replace_pack_mirror(*, source_url: str, branch: str, mirror_dir: Path) -> None:
+    try:
+        mirror_dir.parent.mkdir(parents=True, exist_ok=True)
+        with TemporaryDirectory(prefix=".clone-", dir=mirror_dir.parent) as tmp_dir:
+            repo_dir = Path(tmp_dir) / "repo"
+            _clone_pack_repository(source_url=source_url, branch=branch, repo_dir=repo_dir)
+            shutil.rmtree(mirror_dir, ignore_errors=True)
+            repo_dir.rename(mirror_dir)
+    except OSError as exc:
+        raise RuntimeError("unable to prepare skill pack mirror directory") from exc
+
+
 def _collect_pack_skills_with_warnings(
     *,
     source_url: str,
     branch: str,
 ) -> tuple[list[PackSkillCandidate], list[str]]:
-    """Clone a pack repository and return discovered skills plus sync warnings."""
+    """Update the pack's on-disk mirror and return discovered skills plus sync warnings.
+
+    Each pack source keeps a shallow mirror under `SKILL_PACK_MIRROR_DIR`; repeat syncs
+    run `git fetch` against it and only fall back to a fresh clone when that fails.
+    This does blocking git and file I/O, so async callers run it in a worker thread.
+    """
     # Defense-in-depth: validate again at point of use before invoking git.
     _validate_pack_source_url(source_url)
 
     requested_branch = _normalize_pack_branch(branch)
     discovery_warnings: list[str] = []
+    mirror_dir = _pack_mirror_dir(source_url)
 
-    with TemporaryDirectory(prefix="skill-pack-sync-") as tmp_dir:
-        repo_dir = Path(tmp_dir)
-        used_branch = requested_branch
-        try:
-            subprocess.run(
-                [
-                    "git",
-                    "clone",
-                    "--depth",
-                    "1",
-                    "--single-branch",
-                    "--branch",
-                    requested_branch,
-                    source_url,
-                    str(repo_dir),
-                ],
-                check=True,
-                capture_output=True,
-                text=True,
-                timeout=GIT_CLONE_TIMEOUT_SECONDS,
+    with _pack_mirror_lock(mirror_dir):
+        if not _fetch_pack_mirror(mirror_dir=mirror_dir, branch=requested_branch):
+            _replace_pack_mirror(
+                source_url=source_url,
+                branch=requested_branch,
+                mirror_dir=mirror_dir,
             )
-        except FileNotFoundError as exc:
-            raise RuntimeError("git binary not available on the server") from exc
-        except subprocess.TimeoutExpired as exc:
-            raise RuntimeError("timed out cloning pack repository") from exc
-        except subprocess.CalledProcessError as exc:
-            if requested_branch != "main":
-                try:
-                    subprocess.run(
-                        ["git", "clone", "--depth", "1", source_url, str(repo_dir)],
-                        check=True,
-                        capture_output=True,
-                        text=True,
-                        timeout=GIT_CLONE_TIMEOUT_SECONDS,
-                    )
-                    used_branch = "main"
-                except (
-                    FileNotFoundError,
-                    subprocess.TimeoutExpired,
-                    subprocess.CalledProcessError,
-                ):
-                    stderr = (exc.stderr or "").strip()
-                    detail = "unable to clone pack repository"
-                    if stderr:
-                        detail = f"{detail}: {stderr.splitlines()[0][:200]}"
-                    raise RuntimeError(detail) from exc
-            else:
-                stderr = (exc.stderr or "").strip()
-                detail = "unable to clone pack repository"
-                if stderr:
-                    detail = f"{detail}: {stderr.splitlines()[0][:200]}"
-                raise RuntimeError(detail) from exc
 
         try:
-            discovered_branch = subprocess.run(
-                ["git", "-C", str(repo_dir), "rev-parse", "--abbrev-ref", "HEAD"],
-                check=True,
-                capture_output=True,
-                text=True,
+            discovered_branch = _run_git(
+                ["-C", str(mirror_dir), "rev-parse", "--abbrev-ref", "HEAD"],
                 timeout=GIT_REV_PARSE_TIMEOUT_SECONDS,
-            ).stdout.strip()
+            ).strip()
         except (FileNotFoundError, subprocess.TimeoutExpired, subprocess.CalledProcessError):
-            discovered_branch = used_branch or "main"
+            discovered_branch = requested_branch or "main"
 
         return (
             _collect_pack_skills_from_repo(
-                repo_dir=repo_dir,
+                repo_dir=mirror_dir,
                 source_url=source_url,
                 branch=_normalize_pack_branch(discovered_branch),
                 discovery_warnings=discovery_warnings,
@@ -909,31 +952,92 @@ async def _run_marketplace_skill_action(
     )
 
 
-def _apply_pack_candidate_updates(
+# Weighted tsvector column maintained by PostgreSQL (generated column + GIN index).
+_MARKETPLACE_SEARCH_VECTOR: ColumnElement[Any] = literal_column("marketplace_skills.search_vector")
+_SEARCH_TERM_RE = re.compile(r"\w+")
+
+
+def _marketplace_search_tsquery(search: str) -> ColumnElement[Any] | None:
+    """Build a prefix-matching `simple` tsquery requiring every word in `search`."""
+    terms = _SEARCH_TERM_RE.findall(search.lower())
+    if not terms:
+        return None
+    return func.to_tsquery("simple", " & ".join(f"{term}:*" for term in terms))
+
+
+_PACK_SKILL_TRACKED_COLUMNS = ("name", "description", "category", "risk", "source")
+
+
+def _pack_skill_insert(dialect_name: str) -> Callable[[Table], SqliteInsert | PostgresInsert]:
+    if dialect_name == "postgresql":
+        return postgresql.insert
+    if dialect_name == "sqlite":
+        return sqlite.insert
+    msg = f"pack skill upsert is not supported on {dialect_name!r}"
+    raise RuntimeError(msg)
+
+
+async def _upsert_pack_skills(
+    session: AsyncSession,
     *,
-    existing: MarketplaceSkill,
-    candidate: PackSkillCandidate,
-) -> bool:
-    changed = False
-    if existing.name != candidate.name:
-        existing.name = candidate.name
-        changed = True
-    if existing.description != candidate.description:
-        existing.description = candidate.description
-        changed = True
-    if existing.category != candidate.category:
-        existing.category = candidate.category
-        changed = True
-    if existing.risk != candidate.risk:
-        existing.risk = candidate.risk
-        changed = True
-    if existing.source != candidate.source:
-        existing.source = candidate.source
-        changed = True
-    if existing.metadata_ != (candidate.metadata or {}):
-        existing.metadata_ = candidate.metadata or {}
-        changed = True
-    return changed
+    organization_id: UUID,
+    candidates: list[PackSkillCandidate],
+) -> tuple[int, int]:
+    """Upsert discovered skills in chunks and return `(created, updated)` from the database.
+
+    Rows are keyed on `(organization_id, source_url)`, so only the pack's own skills are
+    touched and no organization-wide rows are loaded. Conflicting rows are updated only
+    when a tracked column actually changed. New rows are recognised by the primary key
+    generated here coming back from `RETURNING`; updated rows keep their existing key.
+    """
+    table = cast(Table, MarketplaceSkill.__table__)  # type: ignore[attr-defined]
+    connection = await session.connection()
+    insert = _pack_skill_insert(connection.dialect.name)
+    unique = list({candidate.source_url: candidate for candidate in candidates}.values())
+    created = 0
+    updated = 0
+    for offset in range(0, len(unique), PACK_SKILL_UPSERT_CHUNK_SIZE):
+        now = utcnow()
+        rows = [
+            {
+                "id": uuid4(),
+                "organization_id": organization_id,
+                "source_url": candidate.source_url,
+                "name": candidate.name,
+                "description": candidate.description,
+                "category": candidate.category,
+                "risk": candidate.risk,
+                "source": candidate.source,
+                "metadata": candidate.metadata or {},
+                "created_at": now,
+                "updated_at": now,
+            }
+            for candidate in unique[offset : offset + PACK_SKILL_UPSERT_CHUNK_SIZE]
+        ]
+        statement = insert(table).values(rows)
+        excluded = statement.excluded
+        changed = or_(
+            *(
+                table.c[name].is_distinct_from(excluded[name])
+                for name in _PACK_SKILL_TRACKED_COLUMNS
+            ),
+            # JSON has no equality operator on PostgreSQL; compare the serialized form.
+            sql_cast(table.c.metadata, Text) != sql_cast(excluded.metadata, Text),
+        )
+        upsert = statement.on_conflict_do_update(
+            index_elements=[table.c.organization_id, table.c.source_url],
+            set_={
+                **{name: excluded[name] for name in _PACK_SKILL_TRACKED_COLUMNS},
+                "metadata": excluded.metadata,
+                "updated_at": excluded.updated_at,
+            },
+            where=changed,
+        ).returning(table.c.id)
+        returned = set((await session.exec(upsert)).scalars().all())
+        inserted = returned & {row["id"] for row in rows}
+        created += len(inserted)
+        updated += len(returned) - len(inserted)
+    return created, updated
 
 
 @router.get("/marketplace", response_model=list[MarketplaceSkillCardRead])
@@ -955,66 +1059,66 @@ async def list_marketplace_skills(
 
     normalized_category = (category or "").strip().lower()
     if normalized_category:
-        if normalized_category == "uncategorized":
-            skills_query = skills_query.filter(
-                or_(
-                    col(MarketplaceSkill.category).is_(None),
-                    func.trim(col(MarketplaceSkill.category)) == "",
-                ),
-            )
-        else:
-            skills_query = skills_query.filter(
-                func.lower(func.trim(col(MarketplaceSkill.category))) == normalized_category,
-            )
+        category_key = "" if normalized_category == "uncategorized" else normalized_category
+        skills_query = skills_query.filter(col(MarketplaceSkill.category_key) == category_key)
 
     normalized_risk = (risk or "").strip().lower()
     if normalized_risk:
-        if normalized_risk == "uncategorized":
-            skills_query = skills_query.filter(
-                or_(
-                    col(MarketplaceSkill.risk).is_(None),
-                    func.trim(col(MarketplaceSkill.risk)) == "",
-                ),
-            )
-        else:
-            skills_query = skills_query.filter(
-                func.lower(func.trim(func.coalesce(col(MarketplaceSkill.risk), "")))
-                == normalized_risk,
-            )
+        risk_key = "" if normalized_risk == "uncategorized" else normalized_risk
+        skills_query = skills_query.filter(col(MarketplaceSkill.risk_key) == risk_key)
 
     if pack_id is not None:
         pack = await _require_skill_pack_for_org(pack_id=pack_id, session=session, ctx=ctx)
         normalized_pack_source = _normalize_pack_source_url(pack.source_url)
         skills_query = skills_query.filter(
-            col(MarketplaceSkill.source_url).ilike(f"{normalized_pack_source}%"),
+            col(MarketplaceSkill.source_url).startswith(normalized_pack_source, autoescape=True),
         )
 
+    order_by: list[ColumnElement[Any]] = []
     normalized_search = (search or "").strip()
     if normalized_search:
-        search_like = f"%{normalized_search}%"
-        skills_query = skills_query.filter(
-            or_(
-                col(MarketplaceSkill.name).ilike(search_like),
-                col(MarketplaceSkill.description).ilike(search_like),
-                col(MarketplaceSkill.category).ilike(search_like),
-                col(MarketplaceSkill.risk).ilike(search_like),
-                col(MarketplaceSkill.source).ilike(search_like),
-            ),
-        )
-
-    if limit is not None:
-        count_statement = select(func.count()).select_from(
-            skills_query.statement.order_by(None).subquery()
-        )
-        total_count = int((await session.exec(count_statement)).one() or 0)
+        dialect_name = (await session.connection()).dialect.name
+        ts_query = _marketplace_search_tsquery(normalized_search)
+        if dialect_name == "postgresql" and ts_query is not None:
+            skills_query = skills_query.filter(_MARKETPLACE_SEARCH_VECTOR.bool_op("@@")(ts_query))
+            order_by.append(func.ts_rank(_MARKETPLACE_SEARCH_VECTOR, ts_query).desc())
+        else:
+            search_like = f"%{normalized_search}%"
+            skills_query = skills_query.filter(
+                or_(
+                    col(MarketplaceSkill.name).ilike(search_like),
+                    col(MarketplaceSkill.description).ilike(search_like),
+                    col(MarketplaceSkill.category).ilike(search_like),
+                    col(MarketplaceSkill.risk).ilike(search_like),
+                    col(MarketplaceSkill.source).ilike(search_like),
+                ),
+            )
+    order_by.append(col(MarketplaceSkill.created_at).desc())
+
+    statement = skills_query.statement.order_by(*order_by)
+    if limit is None:
+        skills = list((await session.exec(statement)).all())
+    else:
+        # The window count rides along with the page, so one query returns both.
+        paged = select(MarketplaceSkill, func.count().over())
+        if statement.whereclause is not None:
+            paged = paged.where(statement.whereclause)
+        paged = paged.order_by(*order_by).offset(offset).limit(limit)
+        rows = (await session.exec(paged)).all()
+        skills = [row[0] for row in rows]
+        if rows:
+            total_count = int(rows[0][1])
+        elif offset == 0:
+            total_count = 0
+        else:
+            count_statement = select(func.count()).select_from(
+                skills_query.statement.order_by(None).subquery()
+            )
+            total_count = int((await session.exec(count_statement)).one() or 0)
         response.headers["X-Total-Count"] = str(total_count)
         response.headers["X-Limit"] = str(limit)
         response.headers["X-Offset"] = str(offset)
 
-    ordered_query = skills_query.order_by(col(MarketplaceSkill.created_at).desc())
-    if limit is not None:
-        ordered_query = ordered_query.offset(offset).limit(limit)
-    skills = await ordered_query.all(session)
     installations = await GatewayInstalledSkill.objects.filter_by(gateway_id=gateway.id).all(
         session
     )
@@ -1272,22 +1376,21 @@ async def delete_skill_pack(
     return OkResponse()
 
 
-@router.post("/packs/{pack_id}/sync", response_model=SkillPackSyncResponse)
-async def sync_skill_pack(
-    pack_id: UUID,
-    session: AsyncSession = SESSION_DEP,
-    ctx: OrganizationContext = ORG_ADMIN_DEP,
+async def _sync_pack_skills(
+    *,
+    session: AsyncSession,
+    pack: SkillPack,
+    organization_id: UUID,
 ) -> SkillPackSyncResponse:
-    """Clone a pack repository and upsert discovered skills from `skills/**/SKILL.md`."""
-    pack = await _require_skill_pack_for_org(pack_id=pack_id, session=session, ctx=ctx)
-
     try:
         _validate_pack_source_url(pack.source_url)
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
     try:
-        discovered = _collect_pack_skills(
+        # Git and filesystem work would otherwise block the event loop for the whole clone.
+        discovered = await asyncio.to_thread(
+            _collect_pack_skills,
             source_url=pack.source_url,
         )
     except RuntimeError as exc:
@@ -1296,37 +1399,11 @@ async def sync_skill_pack(
             detail=str(exc),
         ) from exc
 
-    existing_skills = await MarketplaceSkill.objects.filter_by(
-        organization_id=ctx.organization.id,
-    ).all(session)
-    existing_by_source = {skill.source_url: skill for skill in existing_skills}
-
-    created = 0
-    updated = 0
-    for candidate in discovered:
-        existing = existing_by_source.get(candidate.source_url)
-        if existing is None:
-            session.add(
-                MarketplaceSkill(
-                    organization_id=ctx.organization.id,
-                    source_url=candidate.source_url,
-                    name=candidate.name,
-                    description=candidate.description,
-                    category=candidate.category,
-                    risk=candidate.risk,
-                    source=candidate.source,
-                    metadata_=candidate.metadata or {},
-                ),
-            )
-            created += 1
-            continue
-
-        changed = _apply_pack_candidate_updates(existing=existing, candidate=candidate)
-        if changed:
-            existing.updated_at = utcnow()
-            session.add(existing)
-            updated += 1
-
+    created, updated = await _upsert_pack_skills(
+        session,
+        organization_id=organization_id,
+        candidates=discovered,
+    )
     await session.commit()
 
     return SkillPackSyncResponse(
@@ -1336,3 +1413,93 @@ async def sync_skill_pack(
         updated=updated,
         warnings=[],
     )
+
+
+async def _run_pack_sync_job(*, pack_id: UUID, organization_id: UUID) -> SkillPackSyncResponse:
+    async with async_session_maker() as session:
+        pack = await SkillPack.objects.by_id(pack_id).first(session)
+        if pack is None or pack.organization_id != organization_id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Skill pack not found",
+            )
+        return await _sync_pack_skills(
+            session=session,
+            pack=pack,
+            organization_id=organization_id,
+        )
+
+
+def _start_pack_sync_job(pack: SkillPack) -> SkillPackSyncJob:
+    pack_id = pack.id
+    organization_id = pack.organization_id
+    return skill_pack_sync_jobs.start(
+        pack_id=pack_id,
+        organization_id=organization_id,
+        run=lambda: _run_pack_sync_job(pack_id=pack_id, organization_id=organization_id),
+    )
+
+
+@router.post("/packs/{pack_id}/sync", response_model=SkillPackSyncResponse)
+async def sync_skill_pack(
+    pack_id: UUID,
+    session: AsyncSession = SESSION_DEP,
+    ctx: OrganizationContext = ORG_ADMIN_DEP,
+) -> SkillPackSyncResponse:
+    """Fetch a pack repository and upsert discovered skills from `skills/**/SKILL.md`."""
+    pack = await _require_skill_pack_for_org(pack_id=pack_id, session=session, ctx=ctx)
+    return await _sync_pack_skills(
+        session=session,
+        pack=pack,
+        organization_id=ctx.organization.id,
+    )
+
+
+@router.post(
+    "/packs/sync-jobs",
+    response_model=list[SkillPackSyncJobRead],
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def start_all_skill_pack_sync_jobs(
+    session: AsyncSession = SESSION_DEP,
+    ctx: OrganizationContext = ORG_ADMIN_DEP,
+) -> list[SkillPackSyncJobRead]:
+    """Start background syncs for every pack in the organization."""
+    packs = (
+        await session.exec(
+            select(SkillPack)
+            .where(col(SkillPack.organization_id) == ctx.organization.id)
+            .order_by(col(SkillPack.created_at).asc()),
+        )
+    ).all()
+    return [_start_pack_sync_job(pack).to_read() for pack in packs]
+
+
+@router.post(
+    "/packs/{pack_id}/sync-jobs",
+    response_model=SkillPackSyncJobRead,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def start_skill_pack_sync_job(
+    pack_id: UUID,
+    session: AsyncSession = SESSION_DEP,
+    ctx: OrganizationContext = ORG_ADMIN_DEP,
+) -> SkillPackSyncJobRead:
+    """Start a background sync for one pack, or return its sync already in progress."""
+    pack = await _require_skill_pack_for_org(pack_id=pack_id, session=session, ctx=ctx)
+    return _start_pack_sync_job(pack).to_read()
+
+
+@router.get("/packs/sync-jobs/{job_id}", response_model=SkillPackSyncJobRead)
+async def get_skill_pack_sync_job(
+    job_id: UUID,
+    ctx: OrganizationContext = ORG_ADMIN_DEP,
+) -> SkillPackSyncJobRead:
+    """Return the state of a background pack sync job."""
+    job = skill_pack_sync_jobs.get(job_id)
+    if job is None or job.organization_id != ctx.organization.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Skill pack sync job not found",
+        )
+    return job.to_read()
@@ -4,13 +4,12 @@ from __future__ import annotations
 
 import asyncio
 import json
-from collections import deque
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING, cast
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy import asc, desc, or_
 from sqlmodel import col, select
 from sse_starlette.sse import EventSourceResponse
@@ -23,6 +22,7 @@ from app.api.deps import (
     require_admin_auth,
     require_admin_or_agent,
 )
+from app.core.conditional import conditional_response, make_etag
 from app.core.time import utcnow
 from app.db import crud
 from app.db.pagination import paginate
@@ -51,16 +51,21 @@ from app.schemas.task_custom_fields import (
     validate_custom_field_value,
 )
 from app.schemas.tasks import TaskCommentCreate, TaskCommentRead, TaskCreate, TaskRead, TaskUpdate
-from app.services.activity_log import record_activity
+from app.services.activity_log import (
+    board_sequence_cursors,
+    parse_event_sequence,
+    record_activity,
+)
 from app.services.approval_task_links import (
     load_task_ids_by_approval,
     pending_approval_conflicts_by_task,
 )
 from app.services.mentions import extract_mentions, matches_agent_mention
+from app.services.notifications import NotificationActivity
 from app.services.openclaw.gateway_dispatch import GatewayDispatchService
 from app.services.openclaw.gateway_rpc import GatewayConfig as GatewayClientConfig
-from app.services.openclaw.gateway_rpc import OpenClawGatewayError
 from app.services.organizations import require_board_access
+from app.services.resource_versions import task_list_fingerprint
 from app.services.tags import (
     TagState,
     load_tag_state,
@@ -95,7 +100,6 @@ TASK_EVENT_TYPES = {
     "task.status_changed",
     "task.comment",
 }
-SSE_SEEN_MAX = 2000
 TASK_SNIPPET_MAX_LEN = 500
 TASK_SNIPPET_TRUNCATED_LEN = 497
 TASK_EVENT_ROW_LEN = 2
@@ -477,20 +481,15 @@ async def _reconcile_dependents_for_dependency_toggle(
 async def _fetch_task_events(
     session: AsyncSession,
     board_id: UUID,
-    since: datetime,
+    after_sequence: int,
 ) -> list[tuple[ActivityEvent, Task | None]]:
-    task_ids = list(
-        await session.exec(select(Task.id).where(col(Task.board_id) == board_id)),
-    )
-    if not task_ids:
-        return []
     statement = (
         select(ActivityEvent, Task)
-        .outerjoin(Task, col(ActivityEvent.task_id) == col(Task.id))
-        .where(col(ActivityEvent.task_id).in_(task_ids))
+        .join(Task, col(ActivityEvent.task_id) == col(Task.id))
+        .where(col(ActivityEvent.board_id) == board_id)
+        .where(col(ActivityEvent.board_sequence) > after_sequence)
         .where(col(ActivityEvent.event_type).in_(TASK_EVENT_TYPES))
-        .where(col(ActivityEvent.created_at) >= since)
-        .order_by(asc(col(ActivityEvent.created_at)))
+        .order_by(asc(col(ActivityEvent.board_sequence)))
     )
     result = await session.execute(statement)
     return _coerce_task_event_rows(list(result.tuples().all()))
@@ -503,33 +502,45 @@ def _serialize_comment(event: ActivityEvent) -> dict[str, object]:
 async def _send_lead_task_message(
     *,
     dispatch: GatewayDispatchService,
+    board_id: UUID,
     session_key: str,
     config: GatewayClientConfig,
     message: str,
-) -> OpenClawGatewayError | None:
-    return await dispatch.try_send_agent_message(
+    on_sent: NotificationActivity | None = None,
+    on_failed: NotificationActivity | None = None,
+) -> None:
+    await dispatch.queue_agent_message(
+        board_id=board_id,
         session_key=session_key,
         config=config,
         agent_name="Lead Agent",
         message=message,
         deliver=False,
+        on_sent=on_sent,
+        on_failed=on_failed,
     )
 
 
 async def _send_agent_task_message(
     *,
     dispatch: GatewayDispatchService,
+    board_id: UUID,
     session_key: str,
     config: GatewayClientConfig,
     agent_name: str,
     message: str,
-) -> OpenClawGatewayError | None:
-    return await dispatch.try_send_agent_message(
+    on_sent: NotificationActivity | None = None,
+    on_failed: NotificationActivity | None = None,
+) -> None:
+    await dispatch.queue_agent_message(
+        board_id=board_id,
         session_key=session_key,
         config=config,
         agent_name=agent_name,
         message=message,
         deliver=False,
+        on_sent=on_sent,
+        on_failed=on_failed,
     )
 
 
@@ -560,31 +571,27 @@ async def _notify_agent_on_task_assign(
         + "\n".join(details)
         + ("\n\nTake action: open the task and begin work. " "Post updates as task comments.")
     )
-    error = await _send_agent_task_message(
+    await _send_agent_task_message(
         dispatch=dispatch,
+        board_id=board.id,
         session_key=agent.openclaw_session_id,
         config=config,
         agent_name=agent.name,
         message=message,
-    )
-    if error is None:
-        record_activity(
-            session,
+        on_sent=NotificationActivity(
             event_type="task.assignee_notified",
             message=f"Agent notified for assignment: {agent.name}.",
             agent_id=agent.id,
             task_id=task.id,
-        )
-        await session.commit()
-    else:
-        record_activity(
-            session,
+        ),
+        on_failed=NotificationActivity(
             event_type="task.assignee_notify_failed",
-            message=f"Assignee notify failed: {error}",
+            message="Assignee notify failed",
             agent_id=agent.id,
             task_id=task.id,
-        )
-        await session.commit()
+        ),
+    )
+    await session.commit()
 
 
 async def notify_agent_on_task_assign(
@@ -634,30 +641,26 @@ async def _notify_lead_on_task_create(
         + "\n".join(details)
         + "\n\nTake action: triage, assign, or plan next steps."
     )
-    error = await _send_lead_task_message(
+    await _send_lead_task_message(
         dispatch=dispatch,
+        board_id=board.id,
         session_key=lead.openclaw_session_id,
         config=config,
         message=message,
-    )
-    if error is None:
-        record_activity(
-            session,
+        on_sent=NotificationActivity(
             event_type="task.lead_notified",
             message=f"Lead agent notified for task: {task.title}.",
             agent_id=lead.id,
             task_id=task.id,
-        )
-        await session.commit()
-    else:
-        record_activity(
-            session,
+        ),
+        on_failed=NotificationActivity(
             event_type="task.lead_notify_failed",
-            message=f"Lead notify failed: {error}",
+            message="Lead notify failed",
             agent_id=lead.id,
             task_id=task.id,
-        )
-        await session.commit()
+        ),
+    )
+    await session.commit()
 
 
 async def _notify_lead_on_task_unassigned(
@@ -691,30 +694,26 @@ async def _notify_lead_on_task_unassigned(
         + "\n".join(details)
         + "\n\nTake action: assign a new owner or adjust the plan."
     )
-    error = await _send_lead_task_message(
+    await _send_lead_task_message(
         dispatch=dispatch,
+        board_id=board.id,
         session_key=lead.openclaw_session_id,
         config=config,
         message=message,
-    )
-    if error is None:
-        record_activity(
-            session,
+        on_sent=NotificationActivity(
             event_type="task.lead_unassigned_notified",
             message=f"Lead notified task returned to inbox: {task.title}.",
             agent_id=lead.id,
             task_id=task.id,
-        )
-        await session.commit()
-    else:
-        record_activity(
-            session,
+        ),
+        on_failed=NotificationActivity(
             event_type="task.lead_unassigned_notify_failed",
-            message=f"Lead notify failed: {error}",
+            message="Lead notify failed",
             agent_id=lead.id,
             task_id=task.id,
-        )
-        await session.commit()
+        ),
+    )
+    await session.commit()
 
 
 def _status_values(status_filter: str | None) -> list[str]:
@@ -1179,17 +1178,22 @@ async def _task_event_generator(
     request: Request,
     board_id: UUID,
     since_dt: datetime,
+    last_event_id: str | None,
 ) -> AsyncIterator[dict[str, str]]:
-    last_seen = since_dt
-    seen_ids: set[UUID] = set()
-    seen_queue: deque[UUID] = deque()
+    # Events are read strictly in board-sequence order, so a single cursor replaces
+    # any per-connection record of delivered events.
+    cursor = parse_event_sequence(last_event_id)
+    if cursor is None:
+        async with async_session_maker() as session:
+            cursors = await board_sequence_cursors(session, [board_id], since=since_dt)
+        cursor = cursors.get(board_id, 0)
 
     while True:
         if await request.is_disconnected():
             break
 
         async with async_session_maker() as session:
-            rows = await _fetch_task_events(session, board_id, last_seen)
+            rows = await _fetch_task_events(session, board_id, cursor)
             deps_map, dep_status, tag_state_by_task_id, custom_field_values_by_task_id = (
                 await _stream_task_state(
                     session,
@@ -1199,15 +1203,7 @@ async def _task_event_generator(
             )
 
         for event, task in rows:
-            if event.id in seen_ids:
-                continue
-            seen_ids.add(event.id)
-            seen_queue.append(event.id)
-            if len(seen_queue) > SSE_SEEN_MAX:
-                oldest = seen_queue.popleft()
-                seen_ids.discard(oldest)
-            last_seen = max(event.created_at, last_seen)
-
+            cursor = event.board_sequence or cursor
             payload = _task_event_payload(
                 event,
                 task,
@@ -1216,7 +1212,7 @@ async def _task_event_generator(
                 tag_state_by_task_id=tag_state_by_task_id,
                 custom_field_values_by_task_id=custom_field_values_by_task_id,
             )
-            yield {"event": "task", "data": json.dumps(payload)}
+            yield {"id": str(cursor), "event": "task", "data": json.dumps(payload)}
         await asyncio.sleep(2)
 
 
@@ -1227,13 +1223,18 @@ async def stream_tasks(
     _actor: ActorContext = ACTOR_DEP,
     since: str | None = SINCE_QUERY,
 ) -> EventSourceResponse:
-    """Stream task and task-comment events as SSE payloads."""
+    """Stream task and task-comment events as SSE payloads.
+
+    Each event carries its board sequence as the SSE id; reconnecting clients send it
+    back as `Last-Event-ID` to resume exactly after it (`since` is used otherwise).
+    """
     since_dt = _parse_since(since) or utcnow()
     return EventSourceResponse(
         _task_event_generator(
             request=request,
             board_id=board.id,
             since_dt=since_dt,
+            last_event_id=request.headers.get("last-event-id"),
         ),
         ping=15,
     )
@@ -1241,13 +1242,15 @@ async def stream_tasks(
 
 @router.get("", response_model=DefaultLimitOffsetPage[TaskRead])
 async def list_tasks(
+    request: Request,
+    response: Response,
     status_filter: str | None = STATUS_QUERY,
     assigned_agent_id: UUID | None = None,
     unassigned: bool | None = None,
     board: Board = BOARD_READ_DEP,
     session: AsyncSession = SESSION_DEP,
     _actor: ActorContext = ACTOR_DEP,
-) -> LimitOffsetPage[TaskRead]:
+) -> LimitOffsetPage[TaskRead] | Response:
     """List board tasks with optional status and assignment filters."""
     statement = _task_list_statement(
         board_id=board.id,
@@ -1255,6 +1258,12 @@ async def list_tasks(
         assigned_agent_id=assigned_agent_id,
         unassigned=unassigned,
     )
+    etag = make_etag(
+        request.url.query,
+        await task_list_fingerprint(session, board, statement),
+    )
+    if (not_modified := conditional_response(request, response, etag)) is not None:
+        return not_modified
 
     async def _transform(items: Sequence[object]) -> Sequence[object]:
         tasks = _coerce_task_items(items)
@@ -1649,6 +1658,7 @@ async def _notify_task_comment_targets(
         )
         await _send_agent_task_message(
             dispatch=dispatch,
+            board_id=board.id,
             session_key=agent.openclaw_session_id,
             config=config,
             agent_name=agent.name,
@@ -0,0 +1,288 @@
+"""Negotiated gzip/brotli compression for JSON, text and server-sent event responses.
+
+`CompressionMiddleware` picks an encoding from `Accept-Encoding` (brotli when the
+optional `brotli` package is installed and the client prefers it or ties, else gzip).
+Buffered responses are compressed whole once they reach `minimum_size`; smaller ones
+go out unchanged. Streaming responses are compressed as they are produced.
+
+Server-sent event streams keep one compressor for the life of the stream, so repeated
+keys in successive `TaskRead` payloads compress against each other, and every event is
+followed by a sync flush: the client can decode each event as soon as it arrives, and
+heartbeats still reach it immediately. Weak ETags (see `app.core.conditional`) stay
+valid across encodings, so conditional GETs keep working on compressed responses.
+"""
+
+from __future__ import annotations
+
+import importlib
+import zlib
+from collections.abc import Callable
+from functools import partial
+from typing import TYPE_CHECKING, Any, Final, Literal, Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+
+if TYPE_CHECKING:  # pragma: no cover
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+Encoding = Literal["br", "gzip"]
+
+SSE_CONTENT_TYPE: Final[str] = "text/event-stream"
+_COMPRESSIBLE_PREFIXES: Final[tuple[str, ...]] = (
+    "application/json",
+    "application/problem+json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+_SKIPPED_STATUSES: Final[frozenset[int]] = frozenset({204, 206, 304})
+
+
+def _load_brotli() -> Any | None:
+    try:
+        return importlib.import_module("brotli")
+    except ImportError:
+        return None
+
+
+_brotli = _load_brotli()
+
+
+def available_encodings() -> tuple[Encoding, ...]:
+    """Encodings this process can produce, most preferred first."""
+    return ("br", "gzip") if _brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(
+    accept_encoding: str,
+    available: tuple[Encoding, ...] | None = None,
+) -> Encoding | None:
+    """Return the best encoding `accept_encoding` allows, or `None` for identity."""
+    available = available if available is not None else available_encodings()
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        token, *params = (part.strip() for part in item.split(";"))
+        if not token:
+            continue
+        weight = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[token.lower()] = weight
+    best: Encoding | None = None
+    best_weight = 0.0
+    for encoding in available:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+class Compressor(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+    def finish(self) -> bytes: ...
+
+
+class _GzipCompressor:
+    def __init__(self, level: int) -> None:
+        self._zlib = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._zlib.compress(data)
+
+    def flush(self) -> bytes:
+        return self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._zlib.flush(zlib.Z_FINISH)
+
+
+class _BrotliCompressor:
+    def __init__(self, quality: int) -> None:
+        assert _brotli is not None
+        self._brotli = _brotli.Compressor(mode=_brotli.MODE_TEXT, quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return bytes(self._brotli.process(data))
+
+    def flush(self) -> bytes:
+        return bytes(self._brotli.flush())
+
+    def finish(self) -> bytes:
+        return bytes(self._brotli.finish())
+
+
+def make_compressor(encoding: Encoding, *, gzip_level: int, brotli_quality: int) -> Compressor:
+    """Return an incremental compressor for `encoding`."""
+    if encoding == "br":
+        return _BrotliCompressor(brotli_quality)
+    return _GzipCompressor(gzip_level)
+
+
+def _is_compressible(content_type: str) -> bool:
+    return content_type.lower().startswith(_COMPRESSIBLE_PREFIXES)
+
+
+class CompressionMiddleware:
+    """Compress eligible HTTP responses with the client's preferred encoding."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        compress_sse: bool = True,
+    ) -> None:
+        self._app = app
+        self._minimum_size = minimum_size
+        self._gzip_level = gzip_level
+        self._brotli_quality = brotli_quality
+        self._compress_sse = compress_sse
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope.get("method") == "HEAD":
+            await self._app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self._app(scope, receive, send)
+            return
+        responder = _CompressingSend(
+            send,
+            encoding=encoding,
+            new_compressor=partial(
+                make_compressor,
+                encoding,
+                gzip_level=self._gzip_level,
+                brotli_quality=self._brotli_quality,
+            ),
+            minimum_size=self._minimum_size,
+            compress_sse=self._compress_sse,
+        )
+        await self._app(scope, receive, responder)
+
+
+class _CompressingSend:
+    """Per-response state: hold the start message until the mode is known."""
+
+    def __init__(
+        self,
+        send: Send,
+        *,
+        encoding: Encoding,
+        new_compressor: Callable[[], Compressor],
+        minimum_size: int,
+        compress_sse: bool,
+    ) -> None:
+        self._send = send
+        self._encoding = encoding
+        self._new_compressor = new_compressor
+        self._minimum_size = minimum_size
+        self._compress_sse = compress_sse
+        self._start: Message | None = None
+        self._mode: Literal["identity", "buffer", "stream", "events"] = "buffer"
+        self._buffer = bytearray()
+        self._compressor: Compressor | None = None
+
+    async def __call__(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            self._on_start(message)
+            if self._mode == "identity":
+                await self._send(message)
+            elif self._mode == "events":
+                await self._send(self._compressed_start(message, content_length=None))
+            return
+        if message_type != "http.response.body" or self._mode == "identity":
+            await self._send(message)
+            return
+        body = message.get("body", b"")
+        more_body = bool(message.get("more_body", False))
+        if self._mode == "events":
+            await self._send_events(body, more_body=more_body)
+        elif self._mode == "buffer":
+            await self._send_buffered(body, more_body=more_body)
+        else:
+            await self._send_stream(body, more_body=more_body)
+
+    def _on_start(self, message: Message) -> None:
+        self._start = message
+        headers = MutableHeaders(raw=list(message.get("headers", [])))
+        content_type = headers.get("content-type", "")
+        if (
+            int(message.get("status", 200)) in _SKIPPED_STATUSES
+            or "content-encoding" in headers
+            or not _is_compressible(content_type)
+        ):
+            self._mode = "identity"
+            return
+        # The representation depends on Accept-Encoding even when sent uncompressed.
+        headers.add_vary_header("Accept-Encoding")
+        message["headers"] = headers.raw
+        if content_type.lower().startswith(SSE_CONTENT_TYPE):
+            if not self._compress_sse:
+                self._mode = "identity"
+                return
+            self._mode = "events"
+            self._compressor = self._new_compressor()
+
+    def _compressed_start(self, message: Message, *, content_length: int | None) -> Message:
+        headers = MutableHeaders(raw=list(message.get("headers", [])))
+        headers["Content-Encoding"] = self._encoding
+        if content_length is None:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(content_length)
+        message["headers"] = headers.raw
+        return message
+
+    async def _send_events(self, body: bytes, *, more_body: bool) -> None:
+        assert self._compressor is not None
+        if more_body:
+            chunk = self._compressor.compress(body) + self._compressor.flush()
+        else:
+            chunk = self._compressor.compress(body) + self._compressor.finish()
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    async def _send_buffered(self, body: bytes, *, more_body: bool) -> None:
+        assert self._start is not None
+        self._buffer.extend(body)
+        if more_body and len(self._buffer) < self._minimum_size:
+            return
+        if not more_body and len(self._buffer) < self._minimum_size:
+            self._mode = "identity"
+            await self._send(self._start)
+            await self._send({"type": "http.response.body", "body": bytes(self._buffer)})
+            return
+        compressor = self._new_compressor()
+        if not more_body:
+            compressed = compressor.compress(bytes(self._buffer)) + compressor.finish()
+            await self._send(self._compressed_start(self._start, content_length=len(compressed)))
+            await self._send({"type": "http.response.body", "body": compressed})
+            return
+        # A large streamed body: compress chunks as they come.
+        self._mode = "stream"
+        self._compressor = compressor
+        await self._send(self._compressed_start(self._start, content_length=None))
+        pending = bytes(self._buffer)
+        self._buffer.clear()
+        await self._send_stream(pending, more_body=True)
+
+    async def _send_stream(self, body: bytes, *, more_body: bool) -> None:
+        assert self._compressor is not None
+        chunk = self._compressor.compress(body)
+        if not more_body:
+            chunk += self._compressor.finish()
+        elif not chunk:
+            return
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
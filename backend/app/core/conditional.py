@@ -0,0 +1,55 @@
+"""Conditional GET support: weak ETags from change fingerprints and 304 responses.
+
+Endpoints compute a cheap fingerprint of what they would render (see
+`app.services.resource_versions`), turn it into an ETag and return `304 Not Modified`
+before building the payload when the client's `If-None-Match` still matches. The app
+version is part of every tag so a deploy that changes a response shape invalidates
+cached copies.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import TYPE_CHECKING, Final
+
+from fastapi import Response, status
+
+from app.core.version import APP_VERSION
+
+if TYPE_CHECKING:
+    from starlette.requests import Request
+
+# Clients may keep a copy but must revalidate before every use.
+CACHE_CONTROL: Final[str] = "private, no-cache"
+
+
+def make_etag(*parts: object) -> str:
+    """Return a weak ETag for the given fingerprint parts."""
+    digest = hashlib.sha256(repr((APP_VERSION, *parts)).encode("utf-8")).hexdigest()
+    return f'W/"{digest[:32]}"'
+
+
+def _opaque_tag(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether `If-None-Match` lists `etag` (weak comparison) or `*`."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    expected = _opaque_tag(etag)
+    return any(
+        candidate.strip() == "*" or _opaque_tag(candidate) == expected
+        for candidate in header.split(",")
+    )
+
+
+def conditional_response(request: Request, response: Response, etag: str) -> Response | None:
+    """Attach validators to `response`; return a 304 when the client copy is current."""
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -61,8 +61,65 @@ class Settings(BaseSettings):
     rq_dispatch_retry_base_seconds: float = 10.0
     rq_dispatch_retry_max_seconds: float = 120.0
 
+    # Outbound agent notifications (chat, task, approval messages to agent sessions)
+    agent_notification_queue_enabled: bool = True
+    agent_notification_queue_name: str = "agent-notifications"
+    agent_notification_batch_size: int = Field(default=100, ge=1)
+    agent_notification_concurrency_per_gateway: int = Field(default=4, ge=1)
+    # In-place retry window for a failing lane before it is parked; the worker's batch
+    # waits for its slowest lane, so keep this short.
+    agent_notification_retry_timeout_seconds: float = Field(default=5.0, gt=0)
+
+    # Inbound webhook delivery deduplication
+    webhook_dedupe_retention_seconds: int = Field(default=86400, ge=0)
+
     # OpenClaw gateway runtime compatibility
     gateway_min_version: str = "2026.02.9"
+    # Background health probes of registered gateways (0 disables the monitor).
+    gateway_health_interval_seconds: float = Field(default=60.0, ge=0)
+    # How long a probe result is served to status pages and admin checks.
+    gateway_health_max_age_seconds: float = Field(default=120.0, ge=0)
+    gateway_health_probe_timeout_seconds: float = Field(default=10.0, gt=0)
+    gateway_health_probe_concurrency: int = Field(default=8, ge=1)
+
+    # OpenClaw gateway template sync fan-out
+    gateway_template_sync_concurrency: int = Field(default=8, ge=1)
+    gateway_rpc_max_in_flight: int = Field(default=16, ge=1)
+    # How long an ensured session key is trusted before messaging re-ensures it (0 disables).
+    gateway_session_cache_ttl_seconds: int = Field(default=600, ge=0)
+    # Consecutive transport failures that open a gateway's circuit (0 disables the breaker).
+    gateway_circuit_failure_threshold: int = Field(default=5, ge=0)
+    gateway_circuit_open_seconds: float = Field(default=30.0, gt=0)
+
+    # Gateway-main lead broadcast fan-out
+    lead_broadcast_concurrency: int = Field(default=8, ge=1)
+    lead_broadcast_board_timeout_seconds: float = Field(default=30.0, gt=0)
+
+    # Skill pack sync: parallel background syncs, and where pack repository mirrors live
+    # (empty uses a directory under the system temp dir).
+    skill_pack_sync_concurrency: int = Field(default=4, ge=1)
+    skill_pack_mirror_dir: str = ""
+
+    # souls.directory cache: freshness windows, in-memory soul LRU size, and an optional
+    # on-disk cache directory (empty disables it).
+    souls_directory_sitemap_ttl_seconds: float = Field(default=3600.0, ge=0)
+    souls_directory_soul_ttl_seconds: float = Field(default=3600.0, ge=0)
+    souls_directory_soul_cache_size: int = Field(default=256, ge=1)
+    souls_directory_cache_dir: str = ""
+
+    # Prometheus `/metrics` endpoint and request instrumentation. The endpoint is served on
+    # the API port, so it is off by default; when `metrics_token` is set, scrapes must send
+    # `Authorization: Bearer <metrics_token>`.
+    metrics_enabled: bool = False
+    metrics_token: str = ""
+
+    # Negotiated gzip/brotli response compression (brotli needs the optional `brotli`
+    # package). Server-sent event streams are flushed after every event.
+    compression_enabled: bool = True
+    compression_minimum_size: int = Field(default=1024, ge=0)
+    compression_gzip_level: int = Field(default=6, ge=1, le=9)
+    compression_brotli_quality: int = Field(default=4, ge=0, le=11)
+    compression_sse_enabled: bool = True
 
     # Logging
     log_level: str = "INFO"
@@ -70,6 +127,21 @@ class Settings(BaseSettings):
     log_use_utc: bool = False
     request_log_slow_ms: int = Field(default=1000, ge=0)
     request_log_include_health: bool = False
+    # Format and write log records on a background thread; a full queue drops records
+    # (counted, then reported) instead of blocking the caller.
+    log_async: bool = True
+    log_queue_size: int = Field(default=10000, ge=1)
+    # Comma-separated `event=rate` pairs keeping that fraction of DEBUG/INFO records of
+    # an event, e.g. `rq.queue.enqueued=0.1,queue.worker.success=0.1`.
+    log_sample_rates: str = ""
+    # Per-request SQL statement count/time headers and repeated-statement (N+1) warnings.
+    request_query_debug: bool = False
+    request_query_repeat_threshold: int = Field(default=5, ge=2)
+
+    # Super-admin sampling profiler (`/api/v1/diagnostics/profile`, `X-Profile` header).
+    profiling_enabled: bool = False
+    profiling_max_seconds: int = Field(default=60, ge=1)
+    profiling_request_interval_ms: float = Field(default=1.0, gt=0)
 
     @model_validator(mode="after")
     def _defaults(self) -> Self:
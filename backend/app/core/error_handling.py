@@ -17,6 +17,9 @@ Design notes:
 - The request-id middleware is installed *outermost* so it runs even when other
   middleware returns early.
 - Health endpoints are excluded from request logs by default to reduce noise.
+- With `REQUEST_QUERY_DEBUG=true`, responses carry `X-DB-Query-Count` and
+  `X-DB-Query-Time-Ms`, request logs gain the same fields, and statements repeated
+  `REQUEST_QUERY_REPEAT_THRESHOLD` times in one request are logged as likely N+1s.
 """
 
 from __future__ import annotations
@@ -41,6 +44,12 @@ from app.core.logging import (
     set_request_id,
     set_request_route_context,
 )
+from app.core.query_stats import (
+    SHAPE_PREVIEW_CHARS,
+    QueryStats,
+    start_query_tracking,
+    stop_query_tracking,
+)
 
 if TYPE_CHECKING:  # pragma: no cover
     from starlette.types import ASGIApp, Message, Receive, Scope, Send
@@ -48,6 +57,8 @@ if TYPE_CHECKING:  # pragma: no cover
 logger = get_logger(__name__)
 
 REQUEST_ID_HEADER: Final[str] = "X-Request-Id"
+_QUERY_COUNT_HEADER: Final[bytes] = b"x-db-query-count"
+_QUERY_TIME_HEADER: Final[bytes] = b"x-db-query-time-ms"
 _HEALTH_CHECK_PATHS: Final[frozenset[str]] = frozenset({"/health", "/healthz", "/readyz"})
 
 ExceptionHandler = Callable[[Request, Exception], Response | Awaitable[Response]]
@@ -63,6 +74,8 @@ class RequestIdMiddleware:
         self._header_name_bytes = header_name.lower().encode("latin-1")
         self._slow_request_ms = settings.request_log_slow_ms
         self._include_health_logs = settings.request_log_include_health
+        self._query_debug = settings.request_query_debug
+        self._query_repeat_threshold = settings.request_query_repeat_threshold
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Inject request-id into request state and response headers."""
@@ -83,6 +96,7 @@ class RequestIdMiddleware:
         request_id = self._get_or_create_request_id(scope)
         context_token = set_request_id(request_id)
         route_context_tokens = set_request_route_context(method, path)
+        queries, queries_token = start_query_tracking(track_shapes=self._query_debug)
         if should_log:
             logger.log(
                 TRACE_LEVEL,
@@ -102,6 +116,9 @@ class RequestIdMiddleware:
                 if not any(key.lower() == self._header_name_bytes for key, _ in headers):
                     request_id_bytes = request_id.encode("latin-1")
                     headers.append((self._header_name_bytes, request_id_bytes))
+                if self._query_debug:
+                    headers.append((_QUERY_COUNT_HEADER, str(queries.statements).encode()))
+                    headers.append((_QUERY_TIME_HEADER, str(queries.duration_ms).encode()))
                 status = message.get("status")
                 status_code = status if isinstance(status, int) else 500
                 if should_log:
@@ -113,6 +130,9 @@ class RequestIdMiddleware:
                         "duration_ms": duration_ms,
                         "client_ip": client_ip,
                     }
+                    if self._query_debug:
+                        extra["db_query_count"] = queries.statements
+                        extra["db_query_ms"] = queries.duration_ms
                     if status_code >= 500:
                         logger.error("http.request.complete", extra=extra)
                     elif status_code >= 400:
@@ -142,9 +162,25 @@ class RequestIdMiddleware:
                         "client_ip": client_ip,
                     },
                 )
+            stop_query_tracking(queries_token)
+            if self._query_debug:
+                self._warn_repeated_statements(queries, method=method, path=path)
             reset_request_route_context(route_context_tokens)
             reset_request_id(context_token)
 
+    def _warn_repeated_statements(self, queries: QueryStats, *, method: str, path: str) -> None:
+        for shape, count in queries.repeated_shapes(self._query_repeat_threshold):
+            logger.warning(
+                "db.query.repeated_statement",
+                extra={
+                    "method": method,
+                    "path": path,
+                    "count": count,
+                    "statement": shape[:SHAPE_PREVIEW_CHARS],
+                    "hint": "likely N+1 query pattern",
+                },
+            )
+
     def _get_or_create_request_id(self, scope: Scope) -> str:
         # Accept a client-provided request id if present.
         request_id: str | None = None
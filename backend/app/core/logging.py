@@ -1,18 +1,37 @@
-"""Application logging configuration and formatter utilities."""
+"""Application logging configuration and formatter utilities.
+
+By default records leave the calling thread through a bounded queue: the caller only
+attaches request context, renders the message and enqueues, while a background
+listener thread formats (JSON or key/value) and writes to stdout. When the queue is
+full records are dropped rather than blocking the event loop; drops are counted,
+reported by a `logging.records_dropped` warning once space frees up, and exported as
+metrics. High-volume DEBUG/INFO events can additionally be sampled per event name
+(`LOG_SAMPLE_RATES`).
+"""
 
 from __future__ import annotations
 
+import atexit
+import copy
 import json
 import logging
+import logging.handlers
 import os
+import queue
+import random
 import sys
+import threading
 import time
+from collections import Counter
 from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from types import TracebackType
 from typing import Any
 
 from app.core.config import settings
+from app.core.metrics import Counter as CounterMetric
+from app.core.metrics import Gauge
 from app.core.version import APP_NAME, APP_VERSION
 
 TRACE_LEVEL = 5
@@ -204,6 +223,8 @@ class JsonFormatter(logging.Formatter):
         }
         if record.exc_info:
             payload["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exception"] = record.exc_text
         if record.stack_info:
             payload["stack"] = self.formatStack(record.stack_info)
         for key, value in record.__dict__.items():
@@ -231,10 +252,128 @@ class KeyValueFormatter(logging.Formatter):
         return f"{base} {extra_bits}"
 
 
+def parse_log_sample_rates(raw: str) -> dict[str, float]:
+    """Parse `event=rate` pairs (comma-separated); malformed entries are skipped."""
+    rates: dict[str, float] = {}
+    for item in raw.split(","):
+        event, sep, rate = item.partition("=")
+        event = event.strip()
+        if not sep or not event:
+            continue
+        try:
+            rates[event] = min(1.0, max(0.0, float(rate)))
+        except ValueError:
+            continue
+    return rates
+
+
+class LogSamplingFilter(logging.Filter):
+    """Keep only a fraction of DEBUG/INFO records for configured event names.
+
+    The event name is the first word of the log message (`rq.queue.enqueued`). Kept
+    records carry `sample_rate` so consumers can re-weight counts; WARNING and above
+    are never sampled.
+    """
+
+    def __init__(self, rates: dict[str, float]) -> None:
+        super().__init__()
+        self._rates = rates
+        self._random = random.Random()
+        self.sampled_out: Counter[str] = Counter()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not isinstance(record.msg, str):
+            return True
+        event = record.msg.partition(" ")[0]
+        rate = self._rates.get(event)
+        if rate is None or rate >= 1.0:
+            return True
+        if self._random.random() < rate:
+            record.sample_rate = rate
+            return True
+        self.sampled_out[event] += 1
+        return False
+
+
+_EXCEPTION_FORMATTER = logging.Formatter()
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """Queue records for a background listener without ever blocking the caller."""
+
+    def __init__(self, log_queue: queue.Queue[logging.LogRecord]) -> None:
+        super().__init__(log_queue)
+        self._log_queue = log_queue
+        self._drop_lock = threading.Lock()
+        self._unreported_drops = 0
+        self.dropped = 0
+
+    def queue_depth(self) -> int:
+        return self._log_queue.qsize()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Render the message and traceback now, while the arguments and frames are
+        # still the caller's; formatting the line itself happens on the listener.
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _EXCEPTION_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self._unreported_drops:
+            self._report_drops()
+        try:
+            self._log_queue.put_nowait(record)
+        except queue.Full:
+            with self._drop_lock:
+                self.dropped += 1
+                self._unreported_drops += 1
+
+    def _report_drops(self) -> None:
+        with self._drop_lock:
+            count, self._unreported_drops = self._unreported_drops, 0
+        if not count:
+            return
+        notice = logging.makeLogRecord(
+            {
+                "name": __name__,
+                "levelno": logging.WARNING,
+                "levelname": "WARNING",
+                "msg": "logging.records_dropped",
+                "dropped": count,
+                "queue_size": self._log_queue.maxsize,
+            },
+        )
+        self.filter(notice)
+        try:
+            self._log_queue.put_nowait(notice)
+        except queue.Full:
+            with self._drop_lock:
+                self._unreported_drops += count
+
+
+@dataclass(frozen=True, slots=True)
+class LogPipelineStats:
+    """Counters of the asynchronous logging pipeline (zeros when it is disabled)."""
+
+    queue_depth: int = 0
+    queue_capacity: int = 0
+    dropped: int = 0
+    sampled_out: dict[str, int] = field(default_factory=dict)
+
+
 class AppLogger:
     """Centralized logging setup utility for the backend process."""
 
     _configured = False
+    _listener: logging.handlers.QueueListener | None = None
+    _queue_handler: BoundedQueueHandler | None = None
+    _sampling_filter: LogSamplingFilter | None = None
+    _atexit_registered = False
 
     @classmethod
     def _resolve_level(cls) -> tuple[str, int]:
@@ -253,9 +392,9 @@ class AppLogger:
             return
 
         level_name, level = cls._resolve_level()
+        cls.shutdown()
 
         handler = logging.StreamHandler(sys.stdout)
-        handler.addFilter(AppLogFilter(APP_NAME, APP_VERSION))
         format_name = (settings.log_format or "text").lower()
         if format_name == "json":
             formatter: logging.Formatter = JsonFormatter()
@@ -267,10 +406,31 @@ class AppLogger:
                 formatter.converter = time.gmtime
         handler.setFormatter(formatter)
 
+        root_handler: logging.Handler = handler
+        if settings.log_async:
+            log_queue: queue.Queue[logging.LogRecord] = queue.Queue(settings.log_queue_size)
+            cls._queue_handler = BoundedQueueHandler(log_queue)
+            cls._listener = logging.handlers.QueueListener(
+                log_queue,
+                handler,
+                respect_handler_level=True,
+            )
+            cls._listener.start()
+            root_handler = cls._queue_handler
+            if not cls._atexit_registered:
+                atexit.register(cls.shutdown)
+                cls._atexit_registered = True
+        sample_rates = parse_log_sample_rates(settings.log_sample_rates)
+        cls._sampling_filter = LogSamplingFilter(sample_rates) if sample_rates else None
+        # Request context lives in contextvars, so it is attached on the calling thread.
+        if cls._sampling_filter is not None:
+            root_handler.addFilter(cls._sampling_filter)
+        root_handler.addFilter(AppLogFilter(APP_NAME, APP_VERSION))
+
         root = logging.getLogger()
         root.setLevel(level)
         root.handlers.clear()
-        root.addHandler(handler)
+        root.addHandler(root_handler)
 
         # Uvicorn & HTTP clients
         for logger_name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
@@ -301,9 +461,38 @@ class AppLogger:
             level_name,
             level_name == "TRACE",
         )
+        logging.getLogger(__name__).debug(
+            "logging.pipeline async=%s queue_size=%s sampled_events=%s",
+            settings.log_async,
+            settings.log_queue_size,
+            ",".join(sorted(sample_rates)) or "-",
+        )
 
         cls._configured = True
 
+    @classmethod
+    def shutdown(cls) -> None:
+        """Stop the background listener after it has written every queued record."""
+        listener, cls._listener = cls._listener, None
+        if listener is not None:
+            listener.stop()
+        cls._queue_handler = None
+
+    @classmethod
+    def stats(cls) -> LogPipelineStats:
+        """Return queue depth, drops and sampled-out counts for the current pipeline."""
+        handler = cls._queue_handler
+        sampling = cls._sampling_filter
+        sampled_out = dict(sampling.sampled_out) if sampling is not None else {}
+        if handler is None:
+            return LogPipelineStats(sampled_out=sampled_out)
+        return LogPipelineStats(
+            queue_depth=handler.queue_depth(),
+            queue_capacity=settings.log_queue_size,
+            dropped=handler.dropped,
+            sampled_out=sampled_out,
+        )
+
     @classmethod
     def get_logger(cls, name: str | None = None) -> logging.Logger:
         """Return a logger, ensuring logging has been configured."""
@@ -320,3 +509,26 @@ def configure_logging() -> None:
 def get_logger(name: str | None = None) -> logging.Logger:
     """Return an app logger from the centralized logger configuration."""
     return AppLogger.get_logger(name)
+
+
+def collect_logging_metrics() -> list[Gauge | CounterMetric]:
+    """Scrape-time collector for the asynchronous logging pipeline."""
+    stats = AppLogger.stats()
+    depth = Gauge(
+        "mission_control_log_queue_depth",
+        "Log records waiting for the background logging thread.",
+    )
+    depth.labels().set(stats.queue_depth)
+    dropped = CounterMetric(
+        "mission_control_log_records_dropped_total",
+        "Log records dropped because the logging queue was full.",
+    )
+    dropped.labels().inc(stats.dropped)
+    sampled_out = CounterMetric(
+        "mission_control_log_records_sampled_out_total",
+        "DEBUG/INFO log records skipped by LOG_SAMPLE_RATES, by event name.",
+        ("event",),
+    )
+    for event, count in stats.sampled_out.items():
+        sampled_out.labels(event).inc(count)
+    return [depth, dropped, sampled_out]
@@ -0,0 +1,366 @@
+"""In-process metrics with Prometheus text exposition.
+
+Metrics are plain counters, gauges and fixed-bucket histograms. Each labelled child
+is created once and kept, so recording an observation only bumps numbers already in
+place: no objects are built per observation and nothing is formatted until
+`/metrics` is scraped. Values are per process; with several API workers, scrape each
+worker (or aggregate in Prometheus) as usual.
+
+`MetricsMiddleware` records per-route HTTP latency, in-flight requests, open SSE
+streams and SQL statements per request (via `app.core.query_stats`); other modules record into the metrics
+defined at the bottom of this file.
+"""
+
+from __future__ import annotations
+
+import math
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Sequence
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Final, Generic, TypeVar
+
+from app.core.query_stats import track_queries
+
+if TYPE_CHECKING:  # pragma: no cover
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+_ChildT = TypeVar("_ChildT", bound="_Child")
+_MetricT = TypeVar("_MetricT", bound="_Metric[Any]")
+
+PROMETHEUS_CONTENT_TYPE: Final[str] = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_LATENCY_BUCKETS: Final[tuple[float, ...]] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Child(ABC):
+    __slots__ = ()
+
+    @abstractmethod
+    def reset(self) -> None:
+        """Zero this series in place."""
+
+
+class CounterChild(_Child):
+    """One labelled counter series."""
+
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def reset(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class GaugeChild(_Child):
+    """One labelled gauge series."""
+
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def reset(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class HistogramChild(_Child):
+    """One labelled histogram series with fixed upper bounds."""
+
+    __slots__ = ("_bounds", "buckets", "count", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self._bounds = bounds
+        # Non-cumulative per-bucket counts; the last slot is the +Inf bucket.
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.buckets[bisect_left(self._bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def reset(self) -> None:
+        self.buckets = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+
+class _Metric(ABC, Generic[_ChildT]):
+    kind: str = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], _ChildT] = {}
+
+    @abstractmethod
+    def _new_child(self) -> _ChildT:
+        """Create an empty child series for a new label set."""
+
+    def labels(self, *values: str) -> _ChildT:
+        """Return (creating once) the child series for these label values."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def reset(self) -> None:
+        # Zero in place: callers may hold on to children returned by `labels()`.
+        for child in self._children.values():
+            child.reset()
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.kind}"
+        for values, child in list(self._children.items()):
+            yield from self._render_child(values, child)
+
+    def _render_child(self, values: tuple[str, ...], child: _ChildT) -> Iterable[str]:
+        value = getattr(child, "value", 0.0)
+        yield f"{self.name}{_label_text(self.labelnames, values)} {_format_value(value)}"
+
+
+class Counter(_Metric[CounterChild]):
+    """Monotonic counter."""
+
+    kind = "counter"
+
+    def _new_child(self) -> CounterChild:
+        return CounterChild()
+
+
+class Gauge(_Metric[GaugeChild]):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def _new_child(self) -> GaugeChild:
+        return GaugeChild()
+
+
+class Histogram(_Metric[HistogramChild]):
+    """Distribution of observations over fixed buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        *,
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.bounds = tuple(sorted(float(bound) for bound in buckets))
+
+    def _new_child(self) -> HistogramChild:
+        return HistogramChild(self.bounds)
+
+    def _render_child(self, values: tuple[str, ...], child: HistogramChild) -> Iterable[str]:
+        cumulative = 0
+        for bound, count in zip((*self.bounds, math.inf), list(child.buckets)):
+            cumulative += count
+            labels = _label_text(self.labelnames, values, f'le="{_format_value(bound)}"')
+            yield f"{self.name}_bucket{labels} {cumulative}"
+        labels = _label_text(self.labelnames, values)
+        yield f"{self.name}_sum{labels} {_format_value(child.sum)}"
+        yield f"{self.name}_count{labels} {child.count}"
+
+
+MetricsCollector = Callable[[], Iterable[_Metric[Any]]]
+
+
+class MetricsRegistry:
+    """Named metrics plus collectors that produce extra metrics at scrape time."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric[Any]] = {}
+        self._collectors: list[MetricsCollector] = []
+
+    def _register(self, metric: _MetricT) -> _MetricT:
+        if metric.name in self._metrics:
+            raise ValueError(f"metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        *,
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets=buckets))
+
+    def register_collector(self, collector: MetricsCollector) -> None:
+        """Add a callable evaluated on every scrape (e.g. pool or queue gauges)."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+        lines: list[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        for collector in list(self._collectors):
+            for metric in collector():
+                lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Zero every recorded series (tests)."""
+        for metric in self._metrics.values():
+            metric.reset()
+
+
+metrics = MetricsRegistry()
+
+HTTP_REQUEST_DURATION = metrics.histogram(
+    "mission_control_http_request_duration_seconds",
+    "Time until the response started, by route template.",
+    ("method", "route", "status"),
+)
+HTTP_REQUESTS_IN_FLIGHT = metrics.gauge(
+    "mission_control_http_requests_in_flight",
+    "Requests currently being handled, including open streams.",
+).labels()
+HTTP_SSE_STREAMS_OPEN = metrics.gauge(
+    "mission_control_sse_streams_open",
+    "Server-sent event streams currently open, by route template.",
+    ("route",),
+)
+HTTP_REQUEST_SQL_STATEMENTS = metrics.histogram(
+    "mission_control_http_request_sql_statements",
+    "SQL statements executed while handling one request.",
+    ("method", "route"),
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200),
+)
+DB_POOL_CHECKOUT_WAIT = metrics.histogram(
+    "mission_control_db_pool_checkout_wait_seconds",
+    "Time spent obtaining a pooled database connection, including opening new ones.",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+).labels()
+GATEWAY_RPC_DURATION = metrics.histogram(
+    "mission_control_gateway_rpc_duration_seconds",
+    "Gateway RPC latency by method and gateway.",
+    ("method", "gateway"),
+)
+GATEWAY_RPC_ERRORS = metrics.counter(
+    "mission_control_gateway_rpc_errors_total",
+    "Failed gateway RPCs by method, gateway and kind "
+    "(gateway_error, transport_error, circuit_open).",
+    ("method", "gateway", "kind"),
+)
+
+
+def _route_template(scope: Scope) -> str:
+    route = scope.get("route")
+    path = getattr(route, "path_format", None) or getattr(route, "path", None)
+    # Unmatched paths share one label so scanners cannot explode cardinality.
+    return path if isinstance(path, str) else "unmatched"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording HTTP latency, in-flight requests and SSE streams."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self._app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self._app(scope, receive, send)
+            return
+
+        method = str(scope.get("method") or "UNKNOWN").upper()
+        started_at = perf_counter()
+        status_code = 500
+        responded = False
+        stream: GaugeChild | None = None
+
+        async def send_with_metrics(message: Message) -> None:
+            nonlocal status_code, responded, stream
+            if message["type"] == "http.response.start":
+                responded = True
+                status = message.get("status")
+                status_code = status if isinstance(status, int) else 500
+                route = _route_template(scope)
+                HTTP_REQUEST_DURATION.labels(method, route, f"{status_code // 100}xx").observe(
+                    perf_counter() - started_at,
+                )
+                for key, value in message.get("headers", ()):
+                    if key.lower() == b"content-type" and value.startswith(b"text/event-stream"):
+                        stream = HTTP_SSE_STREAMS_OPEN.labels(route)
+                        stream.inc()
+                        break
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        with track_queries() as queries:
+            try:
+                await self._app(scope, receive, send_with_metrics)
+            finally:
+                HTTP_REQUESTS_IN_FLIGHT.dec()
+                route = _route_template(scope)
+                if not responded:
+                    HTTP_REQUEST_DURATION.labels(method, route, "5xx").observe(
+                        perf_counter() - started_at,
+                    )
+                if stream is not None:
+                    stream.dec()
+                HTTP_REQUEST_SQL_STATEMENTS.labels(method, route).observe(queries.statements)
@@ -0,0 +1,294 @@
+"""Opt-in wall-clock sampling profiler with flamegraph-compatible output.
+
+`SamplingProfiler` runs a daemon thread that snapshots the Python stacks of the
+process's threads (`sys._current_frames`) at a fixed interval and counts identical
+stacks. It needs no tracing hooks, so the code being profiled runs unmodified and
+overhead is bounded by the interval. `Profile.folded()` renders the counts in the
+collapsed-stack format read by flamegraph.pl, inferno and speedscope, one
+`root;caller;callee count` line per distinct stack.
+
+Samples are wall-clock: a coroutine awaiting the database shows up on the event loop
+thread only while Python code runs. Threads parked in an idle wait (the event loop's
+selector, an idle pool worker) are dropped unless `include_idle` is set.
+
+Only one capture runs per process at a time (`ProfilerBusyError` otherwise).
+`RequestProfilingMiddleware` profiles a single request for super admins who send
+`X-Profile: folded`, answering with the profile instead of the normal response.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import sysconfig
+import threading
+from collections import Counter
+from collections.abc import Collection
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import perf_counter
+from types import CodeType, FrameType
+from typing import TYPE_CHECKING, Final
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+if TYPE_CHECKING:  # pragma: no cover
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = get_logger(__name__)
+
+PROFILE_HEADER: Final[str] = "x-profile"
+FOLDED_CONTENT_TYPE: Final[str] = "text/plain; charset=utf-8"
+MAX_STACK_DEPTH: Final[int] = 128
+
+_BACKEND_ROOT = str(Path(__file__).resolve().parents[2]) + os.sep
+_PATH_PREFIXES = tuple(
+    sorted(
+        {
+            _BACKEND_ROOT,
+            *(
+                str(Path(path)) + os.sep
+                for key in ("purelib", "platlib", "stdlib")
+                if (path := sysconfig.get_paths().get(key))
+            ),
+        },
+        key=len,
+        reverse=True,
+    ),
+)
+# Leaf frames of threads that are parked waiting for work rather than running.
+_IDLE_LEAVES: Final[frozenset[tuple[str, str]]] = frozenset(
+    {
+        ("selectors.py", "select"),
+        ("threading.py", "wait"),
+        ("threading.py", "_wait_for_tstate_lock"),
+        ("queue.py", "get"),
+        ("thread.py", "_worker"),
+    },
+)
+
+_capture_lock = threading.Lock()
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when another profile capture is already running in this process."""
+
+
+@dataclass(slots=True)
+class Profile:
+    """Stack counts from one capture."""
+
+    interval_s: float
+    duration_s: float = 0.0
+    ticks: int = 0
+    stacks: Counter[tuple[str, ...]] = field(default_factory=Counter)
+
+    @property
+    def samples(self) -> int:
+        return sum(self.stacks.values())
+
+    def folded(self) -> str:
+        """Collapsed stacks, heaviest first, for flamegraph tooling."""
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def _short_path(filename: str) -> str:
+    for prefix in _PATH_PREFIXES:
+        if filename.startswith(prefix):
+            return filename[len(prefix) :]
+    return filename
+
+
+class SamplingProfiler:
+    """Sample thread stacks every `interval_s` until stopped."""
+
+    def __init__(
+        self,
+        *,
+        interval_s: float = 0.01,
+        thread_ids: Collection[int] | None = None,
+        include_idle: bool = False,
+    ) -> None:
+        self._interval_s = interval_s
+        self._thread_ids = frozenset(thread_ids) if thread_ids is not None else None
+        self._include_idle = include_idle
+        self._labels: dict[CodeType, str] = {}
+        self._idle_codes: dict[CodeType, bool] = {}
+        self._raw: Counter[tuple[str, tuple[CodeType, ...]]] = Counter()
+        self._ticks = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._started_at = 0.0
+        self._profile: Profile | None = None
+
+    def start(self) -> SamplingProfiler:
+        if not _capture_lock.acquire(blocking=False):
+            raise ProfilerBusyError("a profile capture is already running")
+        self._started_at = perf_counter()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="mission-control-profiler",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> Profile:
+        """Stop sampling and return the profile (idempotent)."""
+        if self._profile is not None:
+            return self._profile
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        duration_s = perf_counter() - self._started_at
+        _capture_lock.release()
+        profile = Profile(interval_s=self._interval_s, duration_s=duration_s, ticks=self._ticks)
+        for (thread_name, codes), count in self._raw.items():
+            stack = (thread_name, *(self._label(code) for code in codes))
+            profile.stacks[stack] += count
+        self._profile = profile
+        return profile
+
+    def _label(self, code: CodeType) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = f"{code.co_qualname} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+            label = self._labels[code] = label.replace(";", ",")
+        return label
+
+    def _is_idle(self, code: CodeType) -> bool:
+        idle = self._idle_codes.get(code)
+        if idle is None:
+            key = (os.path.basename(code.co_filename), code.co_name)
+            idle = self._idle_codes[code] = key in _IDLE_LEAVES
+        return idle
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        names: dict[int, str] = {}
+        while not self._stop.wait(self._interval_s):
+            self._ticks += 1
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                if self._thread_ids is not None and thread_id not in self._thread_ids:
+                    continue
+                if not self._include_idle and self._is_idle(frame.f_code):
+                    continue
+                name = names.get(thread_id)
+                if name is None:
+                    names = {
+                        thread.ident: thread.name
+                        for thread in threading.enumerate()
+                        if thread.ident is not None
+                    }
+                    name = names.get(thread_id, f"thread-{thread_id}")
+                self._raw[(name, _code_stack(frame))] += 1
+
+
+def _code_stack(frame: FrameType | None) -> tuple[CodeType, ...]:
+    codes: list[CodeType] = []
+    while frame is not None and len(codes) < MAX_STACK_DEPTH:
+        codes.append(frame.f_code)
+        frame = frame.f_back
+    codes.reverse()
+    return tuple(codes)
+
+
+def _wants_profile(scope: Scope) -> bool:
+    for key, value in scope.get("headers", ()):
+        if key == PROFILE_HEADER.encode("latin-1"):
+            return value.strip().lower() in {b"1", b"true", b"folded"}
+    return False
+
+
+async def _is_super_admin(scope: Scope) -> bool:
+    from starlette.requests import Request
+
+    from app.core.auth import get_auth_context_optional
+    from app.db.session import async_session_maker
+
+    try:
+        async with async_session_maker() as session:
+            auth = await get_auth_context_optional(Request(scope), None, session)
+    except Exception:
+        return False
+    return bool(auth is not None and auth.user is not None and auth.user.is_super_admin)
+
+
+class RequestProfilingMiddleware:
+    """Profile one request for a super admin sending `X-Profile: folded`.
+
+    The handler runs as usual; its response is replaced by the folded profile of the
+    event loop thread for the time the request was in flight, so anything else the loop
+    ran meanwhile is included. Streaming (SSE) responses are passed through unprofiled.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self._app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not settings.profiling_enabled
+            or not _wants_profile(scope)
+            or not await _is_super_admin(scope)
+        ):
+            await self._app(scope, receive, send)
+            return
+        try:
+            profiler = SamplingProfiler(
+                interval_s=settings.profiling_request_interval_ms / 1000,
+                thread_ids={threading.get_ident()},
+            ).start()
+        except ProfilerBusyError:
+            await self._app(scope, receive, send)
+            return
+
+        status_code = 500
+        streaming = False
+
+        async def capture_send(message: Message) -> None:
+            nonlocal status_code, streaming
+            if streaming:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                status_code = int(message.get("status", 500))
+                for key, value in message.get("headers", ()):
+                    if key.lower() == b"content-type" and value.startswith(b"text/event-stream"):
+                        streaming = True
+                        profiler.stop()
+                        await send(message)
+                        return
+
+        try:
+            await self._app(scope, receive, capture_send)
+        finally:
+            profile = profiler.stop()
+        if streaming:
+            return
+        logger.info(
+            "profiling.request.captured",
+            extra={
+                "path": scope.get("path"),
+                "status_code": status_code,
+                "samples": profile.samples,
+                "duration_ms": round(profile.duration_s * 1000, 1),
+            },
+        )
+        body = profile.folded().encode("utf-8")
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", FOLDED_CONTENT_TYPE.encode("latin-1")),
+                    (b"content-length", str(len(body)).encode("latin-1")),
+                    (b"x-profile-status-code", str(status_code).encode("latin-1")),
+                    (b"x-profile-samples", str(profile.samples).encode("latin-1")),
+                ],
+            },
+        )
+        await send({"type": "http.response.body", "body": body})
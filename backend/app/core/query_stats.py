@@ -0,0 +1,118 @@
+"""Per-request SQL statement counting, timing and repeated-statement detection.
+
+SQLAlchemy cursor events feed whichever `QueryStats` is bound to the current context.
+`RequestIdMiddleware` binds one per request, next to the request id used in logs, and
+tests bind their own through the `query_budget` fixture. Scopes nest: a statement
+counts towards every enclosing scope, so a test budget also sees the queries of the
+requests it makes.
+
+Statement *shapes* are the parameterized SQL text SQLAlchemy sends to the driver, so
+the same query issued in a loop with different ids has one shape. Shapes are only
+tallied when asked for (debug mode and tests); counting and timing are always on.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_STARTED_AT_ATTR = "_mission_control_started_at"
+SHAPE_PREVIEW_CHARS = 300
+
+
+@dataclass(slots=True)
+class QueryStats:
+    """Statements executed within one tracking scope."""
+
+    track_shapes: bool = False
+    statements: int = 0
+    duration_s: float = 0.0
+    shapes: Counter[str] = field(default_factory=Counter)
+    parent: QueryStats | None = None
+
+    @property
+    def duration_ms(self) -> float:
+        return round(self.duration_s * 1000, 2)
+
+    def repeated_shapes(self, threshold: int) -> list[tuple[str, int]]:
+        """Shapes executed at least `threshold` times, most frequent first."""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def start_query_tracking(
+    *,
+    track_shapes: bool = False,
+) -> tuple[QueryStats, Token[QueryStats | None]]:
+    """Bind a new tracking scope, nested inside any active one."""
+    stats = QueryStats(track_shapes=track_shapes, parent=_current.get())
+    return stats, _current.set(stats)
+
+
+def stop_query_tracking(token: Token[QueryStats | None]) -> None:
+    """Restore the scope that was active before `start_query_tracking`."""
+    _current.reset(token)
+
+
+@contextmanager
+def track_queries(*, track_shapes: bool = False) -> Iterator[QueryStats]:
+    """Track the statements executed within the block."""
+    stats, token = start_query_tracking(track_shapes=track_shapes)
+    try:
+        yield stats
+    finally:
+        stop_query_tracking(token)
+
+
+def record_statement(statement: str, duration_s: float) -> None:
+    """Count one executed statement against every active scope."""
+    stats = _current.get()
+    while stats is not None:
+        stats.statements += 1
+        stats.duration_s += duration_s
+        if stats.track_shapes:
+            stats.shapes[statement] += 1
+        stats = stats.parent
+
+
+def _before_cursor_execute(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    if context is not None and _current.get() is not None:
+        setattr(context, _STARTED_AT_ATTR, perf_counter())
+
+
+def _after_cursor_execute(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    if _current.get() is None:
+        return
+    started_at = getattr(context, _STARTED_AT_ATTR, None)
+    record_statement(statement, perf_counter() - started_at if started_at is not None else 0.0)
+
+
+def install_query_tracking() -> None:
+    """Listen for cursor executions on every engine (idempotent)."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
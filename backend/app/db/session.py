@@ -4,17 +4,23 @@ from __future__ import annotations
 
 import asyncio
 from pathlib import Path
-from typing import TYPE_CHECKING
+from time import perf_counter
+from typing import TYPE_CHECKING, Any
 
 from alembic.config import Config
+from sqlalchemy.engine import make_url
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, QueuePool
 from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app import models as _models
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.core.metrics import DB_POOL_CHECKOUT_WAIT, Gauge, metrics
+from app.core.query_stats import install_query_tracking
+from app.services.activity_log import install_activity_sequencing
 
 if TYPE_CHECKING:
     from collections.abc import AsyncGenerator
@@ -32,9 +38,27 @@ def _normalize_database_url(database_url: str) -> str:
     return database_url
 
 
+class _InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that records how long checkouts wait for a connection."""
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started_at = perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(perf_counter() - started_at)
+
+
+def _engine_options(database_url: str) -> dict[str, Any]:
+    if make_url(database_url).get_backend_name() == "postgresql":
+        return {"poolclass": _InstrumentedQueuePool}
+    return {}
+
+
 async_engine: AsyncEngine = create_async_engine(
     _normalize_database_url(settings.database_url),
     pool_pre_ping=True,
+    **_engine_options(_normalize_database_url(settings.database_url)),
 )
 async_session_maker = async_sessionmaker(
     async_engine,
@@ -44,6 +68,29 @@ async_session_maker = async_sessionmaker(
 logger = get_logger(__name__)
 
 
+install_query_tracking()
+install_activity_sequencing()
+
+
+def _collect_pool_metrics() -> list[Gauge]:
+    pool = async_engine.sync_engine.pool
+    if not isinstance(pool, QueuePool):
+        return []
+    gauge = Gauge(
+        "mission_control_db_pool_connections",
+        "Database pool connections by state.",
+        ("state",),
+    )
+    gauge.labels("checked_out").set(pool.checkedout())
+    gauge.labels("idle").set(pool.checkedin())
+    gauge.labels("overflow").set(max(0, pool.overflow()))
+    gauge.labels("size").set(pool.size())
+    return [gauge]
+
+
+metrics.register_collector(_collect_pool_metrics)
+
+
 def _alembic_config() -> Config:
     alembic_ini = Path(__file__).resolve().parents[2] / "alembic.ini"
 
@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from hmac import compare_digest
 from typing import TYPE_CHECKING, Any
 
-from fastapi import APIRouter, FastAPI, status
+from fastapi import APIRouter, FastAPI, HTTPException, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
 from fastapi_pagination import add_pagination
@@ -21,6 +23,7 @@ from app.api.board_memory import router as board_memory_router
 from app.api.board_onboarding import router as board_onboarding_router
 from app.api.board_webhooks import router as board_webhooks_router
 from app.api.boards import router as boards_router
+from app.api.diagnostics import router as diagnostics_router
 from app.api.gateway import router as gateway_router
 from app.api.gateways import router as gateways_router
 from app.api.metrics import router as metrics_router
@@ -31,11 +34,18 @@ from app.api.tags import router as tags_router
 from app.api.task_custom_fields import router as task_custom_fields_router
 from app.api.tasks import router as tasks_router
 from app.api.users import router as users_router
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
 from app.core.error_handling import install_error_handling
-from app.core.logging import configure_logging, get_logger
+from app.core.logging import collect_logging_metrics, configure_logging, get_logger
+from app.core.metrics import PROMETHEUS_CONTENT_TYPE, MetricsMiddleware, metrics
+from app.core.profiling import RequestProfilingMiddleware
 from app.db.session import init_db
 from app.schemas.health import HealthStatusResponse
+from app.services import souls_directory
+from app.services.openclaw.gateway_health import gateway_health
+from app.services.queue import collect_queue_metrics
+from app.services.skill_pack_sync_jobs import skill_pack_sync_jobs
 
 if TYPE_CHECKING:
     from collections.abc import AsyncIterator
@@ -427,6 +437,10 @@ class MissionControlFastAPI(FastAPI):
         return _build_custom_openapi(self)
 
 
+# Background skill pack syncs get this long to finish before shutdown cancels them.
+_SKILL_PACK_SYNC_SHUTDOWN_TIMEOUT_S = 30.0
+
+
 @asynccontextmanager
 async def lifespan(_: FastAPI) -> AsyncIterator[None]:
     """Initialize application resources before serving requests."""
@@ -436,10 +450,20 @@ async def lifespan(_: FastAPI) -> AsyncIterator[None]:
         settings.db_auto_migrate,
     )
     await init_db()
+    health_monitor: asyncio.Task[None] | None = None
+    if settings.gateway_health_interval_seconds > 0:
+        health_monitor = asyncio.create_task(gateway_health.run())
     logger.info("app.lifecycle.started")
     try:
         yield
     finally:
+        if health_monitor is not None:
+            health_monitor.cancel()
+            with suppress(asyncio.CancelledError):
+                await health_monitor
+        if not await skill_pack_sync_jobs.wait(timeout=_SKILL_PACK_SYNC_SHUTDOWN_TIMEOUT_S):
+            logger.warning("app.lifecycle.skill_pack_syncs_cancelled")
+        await souls_directory.close_http_client()
         logger.info("app.lifecycle.stopped")
 
 
@@ -450,6 +474,15 @@ app = MissionControlFastAPI(
     openapi_tags=OPENAPI_TAGS,
 )
 
+if settings.compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_minimum_size,
+        gzip_level=settings.compression_gzip_level,
+        brotli_quality=settings.compression_brotli_quality,
+        compress_sse=settings.compression_sse_enabled,
+    )
+
 origins = [o.strip() for o in settings.cors_origins.split(",") if o.strip()]
 if origins:
     app.add_middleware(
@@ -458,12 +491,20 @@ if origins:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
-        expose_headers=["X-Total-Count", "X-Limit", "X-Offset"],
+        expose_headers=["X-Total-Count", "X-Limit", "X-Offset", "ETag"],
     )
     logger.info("app.cors.enabled origins_count=%s", len(origins))
 else:
     logger.info("app.cors.disabled")
 
+if settings.profiling_enabled:
+    app.add_middleware(RequestProfilingMiddleware)
+
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+    metrics.register_collector(collect_queue_metrics)
+    metrics.register_collector(collect_logging_metrics)
+
 install_error_handling(app)
 
 
@@ -521,6 +562,22 @@ def readyz() -> HealthStatusResponse:
     return HealthStatusResponse(ok=True)
 
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics(request: Request) -> Response:
+    """Prometheus scrape endpoint for this API process."""
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    expected = settings.metrics_token.strip()
+    if expected and not compare_digest(
+        request.headers.get("Authorization", "").encode(),
+        f"Bearer {expected}".encode(),
+    ):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+    # Collectors read the pool and Redis synchronously; keep them off the event loop.
+    body = await asyncio.to_thread(metrics.render)
+    return Response(content=body, media_type=PROMETHEUS_CONTENT_TYPE)
+
+
 api_v1 = APIRouter(prefix="/api/v1")
 api_v1.include_router(auth_router)
 api_v1.include_router(agent_router)
@@ -543,6 +600,7 @@ api_v1.include_router(tasks_router)
 api_v1.include_router(task_custom_fields_router)
 api_v1.include_router(tags_router)
 api_v1.include_router(users_router)
+api_v1.include_router(diagnostics_router)
 app.include_router(api_v1)
 
 add_pagination(app)
@@ -5,6 +5,7 @@ from __future__ import annotations
 from datetime import datetime
 from uuid import UUID, uuid4
 
+from sqlalchemy import Index
 from sqlmodel import Field
 
 from app.core.time import utcnow
@@ -17,6 +18,13 @@ class ActivityEvent(QueryModel, table=True):
     """Discrete activity event tied to tasks and agents."""
 
     __tablename__ = "activity_events"  # pyright: ignore[reportAssignmentType]
+    __table_args__ = (
+        Index(
+            "ix_activity_events_board_id_board_sequence",
+            "board_id",
+            "board_sequence",
+        ),
+    )
 
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     event_type: str = Field(index=True)
@@ -24,3 +32,7 @@ class ActivityEvent(QueryModel, table=True):
     agent_id: UUID | None = Field(default=None, foreign_key="agents.id", index=True)
     task_id: UUID | None = Field(default=None, foreign_key="tasks.id", index=True)
     created_at: datetime = Field(default_factory=utcnow)
+    # Board of the event's task and its per-board stream position, both assigned at
+    # flush for events on board tasks.
+    board_id: UUID | None = Field(default=None, foreign_key="boards.id")
+    board_sequence: int | None = None
@@ -37,6 +37,11 @@ class Agent(QueryModel, table=True):
     )
     identity_template: str | None = Field(default=None, sa_column=Column(Text))
     soul_template: str | None = Field(default=None, sa_column=Column(Text))
+    # sha256 of each workspace file as last pushed to the gateway, keyed by file name.
+    workspace_file_hashes: dict[str, str] | None = Field(
+        default=None,
+        sa_column=Column(JSON),
+    )
     provision_requested_at: datetime | None = Field(default=None)
     provision_confirm_token_hash: str | None = Field(default=None, index=True)
     provision_action: str | None = Field(default=None, index=True)
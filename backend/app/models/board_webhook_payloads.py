@@ -5,7 +5,7 @@ from __future__ import annotations
 from datetime import datetime
 from uuid import UUID, uuid4
 
-from sqlalchemy import JSON, Column
+from sqlalchemy import JSON, Column, Index
 from sqlmodel import Field
 
 from app.core.time import utcnow
@@ -18,6 +18,16 @@ class BoardWebhookPayload(QueryModel, table=True):
     """Captured inbound webhook payload with request metadata."""
 
     __tablename__ = "board_webhook_payloads"  # pyright: ignore[reportAssignmentType]
+    __table_args__ = (
+        # One stored payload per delivery key; keys past the retention window are
+        # cleared so a sender may reuse them.
+        Index(
+            "uq_board_webhook_payloads_webhook_id_dedupe_key",
+            "webhook_id",
+            "dedupe_key",
+            unique=True,
+        ),
+    )
 
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     board_id: UUID = Field(foreign_key="boards.id", index=True)
@@ -29,4 +39,5 @@ class BoardWebhookPayload(QueryModel, table=True):
     headers: dict[str, str] | None = Field(default=None, sa_column=Column(JSON))
     source_ip: str | None = None
     content_type: str | None = None
+    dedupe_key: str | None = None
     received_at: datetime = Field(default_factory=utcnow, index=True)
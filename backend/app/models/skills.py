@@ -5,7 +5,7 @@ from __future__ import annotations
 from datetime import datetime
 from uuid import UUID, uuid4
 
-from sqlalchemy import JSON, Column, UniqueConstraint
+from sqlalchemy import JSON, Column, Computed, Index, String, UniqueConstraint
 from sqlmodel import Field
 
 from app.core.time import utcnow
@@ -25,6 +25,8 @@ class MarketplaceSkill(TenantScoped, table=True):
             "source_url",
             name="uq_marketplace_skills_org_source_url",
         ),
+        Index("ix_marketplace_skills_org_category_key", "organization_id", "category_key"),
+        Index("ix_marketplace_skills_org_risk_key", "organization_id", "risk_key"),
     )
 
     id: UUID = Field(default_factory=uuid4, primary_key=True)
@@ -39,6 +41,24 @@ class MarketplaceSkill(TenantScoped, table=True):
         default_factory=dict,
         sa_column=Column("metadata", JSON, nullable=False),
     )
+    # Database-maintained lower/trimmed facets ("" when unset) so filters can use an index.
+    # PostgreSQL also keeps a weighted `search_vector` tsvector column (see migrations).
+    category_key: str | None = Field(
+        default=None,
+        sa_column=Column(
+            String,
+            Computed("lower(trim(coalesce(category, '')))", persisted=True),
+            nullable=False,
+        ),
+    )
+    risk_key: str | None = Field(
+        default=None,
+        sa_column=Column(
+            String,
+            Computed("lower(trim(coalesce(risk, '')))", persisted=True),
+            nullable=False,
+        ),
+    )
     created_at: datetime = Field(default_factory=utcnow)
     updated_at: datetime = Field(default_factory=utcnow)
 
@@ -18,6 +18,8 @@ class BoardWebhookCreate(SQLModel):
     description: NonEmptyStr
     enabled: bool = True
     agent_id: UUID | None = None
+    dedupe_header: NonEmptyStr | None = None
+    dedupe_content_hash: bool = False
 
 
 class BoardWebhookUpdate(SQLModel):
@@ -26,6 +28,8 @@ class BoardWebhookUpdate(SQLModel):
     description: NonEmptyStr | None = None
     enabled: bool | None = None
     agent_id: UUID | None = None
+    dedupe_header: NonEmptyStr | None = None
+    dedupe_content_hash: bool | None = None
 
 
 class BoardWebhookRead(SQLModel):
@@ -36,6 +40,8 @@ class BoardWebhookRead(SQLModel):
     agent_id: UUID | None = None
     description: str
     enabled: bool
+    dedupe_header: str | None = None
+    dedupe_content_hash: bool = False
     endpoint_path: str
     endpoint_url: str | None = None
     created_at: datetime
@@ -52,6 +58,7 @@ class BoardWebhookPayloadRead(SQLModel):
     headers: dict[str, str] | None = None
     source_ip: str | None = None
     content_type: str | None = None
+    dedupe_key: str | None = None
     received_at: datetime
 
 
@@ -62,3 +69,4 @@ class BoardWebhookIngestResponse(SQLModel):
     board_id: UUID
     webhook_id: UUID
     payload_id: UUID
+    duplicate: bool = False
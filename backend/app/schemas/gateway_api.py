@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
+from datetime import datetime
+
 from sqlmodel import SQLModel
 
 from app.schemas.common import NonEmptyStr
 
-RUNTIME_ANNOTATION_TYPES = (NonEmptyStr,)
+RUNTIME_ANNOTATION_TYPES = (datetime, NonEmptyStr)
 
 
 class GatewaySessionMessageRequest(SQLModel):
@@ -30,6 +32,10 @@ class GatewaysStatusResponse(SQLModel):
 
     connected: bool
     gateway_url: str
+    gateway_version: str | None = None
+    latency_ms: float | None = None
+    checked_at: datetime | None = None
+    circuit_state: str | None = None
     sessions_count: int | None = None
     sessions: list[object] | None = None
     main_session: object | None = None
@@ -96,3 +96,16 @@ class SkillPackSyncResponse(SQLModel):
     created: int
     updated: int
     warnings: list[str] = Field(default_factory=list)
+
+
+class SkillPackSyncJobRead(SQLModel):
+    """Background skill pack sync job state."""
+
+    id: UUID
+    pack_id: UUID
+    status: str
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    result: SkillPackSyncResponse | None = None
+    error: str | None = None
@@ -1,16 +1,36 @@
-"""Utilities for recording normalized activity events."""
+"""Utilities for recording normalized activity events.
+
+Events on board tasks get their task's `board_id` and a per-board `board_sequence`
+when they are flushed, so streams read them through the `(board_id, board_sequence)`
+index without joining tasks. The counter lives on `boards.last_event_sequence` and
+is bumped with a single `UPDATE ... RETURNING`, which holds the board row lock until
+the transaction commits, so sequence numbers on a board become visible in order and
+a stream that reads `board_sequence > cursor` never skips an event that commits
+late. Task SSE streams emit the sequence as the event id and resume from
+`Last-Event-ID`.
+"""
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import event as sa_event
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+from sqlmodel import col, select
+
+from app.models.activity_events import ActivityEvent
+from app.models.boards import Board
+from app.models.tasks import Task
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from datetime import datetime
     from uuid import UUID
 
     from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.models.activity_events import ActivityEvent
-
 
 def record_activity(
     session: AsyncSession,
@@ -29,3 +49,81 @@ def record_activity(
     )
     session.add(event)
     return event
+
+
+def _task_board_id(session: Session, task_id: UUID) -> UUID | None:
+    for obj in session.new:
+        if isinstance(obj, Task) and obj.id == task_id:
+            return obj.board_id
+    task = session.identity_map.get(session.identity_key(Task, task_id))
+    if isinstance(task, Task):
+        return task.board_id
+    statement = select(col(Task.board_id)).where(col(Task.id) == task_id)
+    board_id: UUID | None = session.connection().execute(statement).scalar_one_or_none()
+    return board_id
+
+
+def _assign_board_sequences(session: Session, _flush_context: Any, _instances: Any) -> None:
+    pending: dict[UUID, list[ActivityEvent]] = defaultdict(list)
+    for obj in session.new:
+        if isinstance(obj, ActivityEvent) and obj.board_sequence is None and obj.task_id:
+            board_id = _task_board_id(session, obj.task_id)
+            if board_id is not None:
+                pending[board_id].append(obj)
+    for board_id, events in pending.items():
+        statement = (
+            update(Board)
+            .where(col(Board.id) == board_id)
+            .values(last_event_sequence=col(Board.last_event_sequence) + len(events))
+            .returning(col(Board.last_event_sequence))
+        )
+        last = session.connection().execute(statement).scalar_one_or_none()
+        if last is None:
+            continue
+        events.sort(key=lambda item: item.created_at)
+        for offset, event in enumerate(events, start=last - len(events) + 1):
+            event.board_id = board_id
+            event.board_sequence = offset
+
+
+def install_activity_sequencing() -> None:
+    """Assign board sequences to activity events on every session flush (idempotent)."""
+    if not sa_event.contains(Session, "before_flush", _assign_board_sequences):
+        sa_event.listen(Session, "before_flush", _assign_board_sequences)
+
+
+def parse_event_sequence(value: str | None) -> int | None:
+    """Parse a numeric `Last-Event-ID`; anything else means "no resume point"."""
+    if value is None:
+        return None
+    value = value.strip()
+    return int(value) if value.isdigit() else None
+
+
+async def board_sequence_cursors(
+    session: AsyncSession,
+    board_ids: Sequence[UUID],
+    *,
+    since: datetime,
+) -> dict[UUID, int]:
+    """Per-board cursors just before the first task event created at or after `since`.
+
+    Boards with no such event start at their current counter, i.e. only new events.
+    """
+    if not board_ids:
+        return {}
+    counters = await session.exec(
+        select(col(Board.id), col(Board.last_event_sequence)).where(col(Board.id).in_(board_ids)),
+    )
+    cursors = {board_id: sequence for board_id, sequence in counters}
+    firsts = await session.exec(
+        select(col(ActivityEvent.board_id), func.min(col(ActivityEvent.board_sequence)))
+        .where(col(ActivityEvent.board_id).in_(board_ids))
+        .where(col(ActivityEvent.created_at) >= since)
+        .where(col(ActivityEvent.board_sequence).is_not(None))
+        .group_by(col(ActivityEvent.board_id)),
+    )
+    for board_id, first in firsts:
+        if board_id is not None and first is not None:
+            cursors[board_id] = first - 1
+    return cursors
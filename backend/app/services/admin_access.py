@@ -14,3 +14,10 @@ def require_admin(auth: AuthContext) -> None:
     """Raise HTTP 403 unless the authenticated actor is a user admin."""
     if auth.actor_type != "user" or auth.user is None:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
+
+
+def require_super_admin(auth: AuthContext) -> None:
+    """Raise HTTP 403 unless the authenticated actor is a super-admin user."""
+    require_admin(auth)
+    if auth.user is None or not auth.user.is_super_admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
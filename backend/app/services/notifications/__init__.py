@@ -0,0 +1,21 @@
+"""Outbound agent notification queueing utilities.
+
+Prefer importing from this package when used by other modules. The worker lives in
+`app.services.notifications.dispatch`, which depends on the OpenClaw dispatch layer.
+"""
+
+from app.services.notifications.queue import (
+    NotificationActivity,
+    QueuedAgentNotification,
+    enqueue_agent_notification,
+    enqueue_agent_notifications,
+    new_agent_notification,
+)
+
+__all__ = [
+    "NotificationActivity",
+    "QueuedAgentNotification",
+    "enqueue_agent_notification",
+    "enqueue_agent_notifications",
+    "new_agent_notification",
+]
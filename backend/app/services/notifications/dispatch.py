@@ -0,0 +1,291 @@
+"""Outbound agent notification worker routines.
+
+The worker drains notifications in batches and delivers them concurrently across
+agent sessions while keeping messages to the same session in enqueue order:
+
+- notifications are grouped into per-session lanes; each lane is sent sequentially;
+- lanes on the same gateway share a bounded in-flight budget, taken per send attempt;
+- transient gateway errors are retried in place with `GatewayBackoff` for a short
+  window; a lane holds no gateway slot while it sleeps, so it only blocks itself;
+- when that window is exhausted, or the gateway's circuit breaker is open, the
+  failed notification and everything queued behind it in its lane are parked together
+  and resumed later; until then, newer notifications for that session are held behind
+  the parked lane instead of overtaking it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from collections.abc import Coroutine
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.db.session import async_session_maker
+from app.models.boards import Board
+from app.services.activity_log import record_activity
+from app.services.notifications.queue import (
+    LANE_TASK_TYPE,
+    TASK_TYPE,
+    NotificationActivity,
+    QueuedAgentNotification,
+    decode_notification_task,
+    divert_to_parked_lanes,
+    park_agent_notifications,
+    resume_parked_lane,
+    with_next_attempt,
+)
+from app.services.openclaw.constants import (
+    _COORDINATION_GATEWAY_BASE_DELAY_S,
+    _COORDINATION_GATEWAY_MAX_DELAY_S,
+)
+from app.services.openclaw.gateway_dispatch import GatewayDispatchService
+from app.services.openclaw.gateway_resolver import gateway_configs_for_boards
+from app.services.openclaw.gateway_rpc import GatewayCircuitOpenError
+from app.services.openclaw.gateway_rpc import GatewayConfig as GatewayClientConfig
+from app.services.openclaw.gateway_rpc import OpenClawGatewayError
+from app.services.openclaw.internal.retry import GatewayBackoff
+from app.services.queue import dequeue_task, record_queue_outcome
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class _Lane:
+    config: GatewayClientConfig
+    items: list[QueuedAgentNotification]
+
+
+def _record_outcome(
+    session: AsyncSession,
+    activity: NotificationActivity | None,
+    *,
+    error: Exception | None = None,
+) -> None:
+    if activity is None:
+        return
+    message = activity.message if error is None else f"{activity.message}: {error}"
+    record_activity(
+        session,
+        event_type=activity.event_type,
+        message=message,
+        agent_id=activity.agent_id,
+        task_id=activity.task_id,
+    )
+
+
+def _count_outcome(outcome: str) -> None:
+    record_queue_outcome(
+        settings.agent_notification_queue_name,
+        TASK_TYPE,
+        outcome,
+        redis_url=settings.rq_redis_url,
+    )
+
+
+def _retry_delay(attempts: int) -> float:
+    return float(
+        min(
+            settings.rq_dispatch_retry_base_seconds * (2 ** max(0, attempts)),
+            settings.rq_dispatch_retry_max_seconds,
+        ),
+    )
+
+
+def _build_lanes(
+    items: list[QueuedAgentNotification],
+    configs: dict[UUID, GatewayClientConfig],
+) -> dict[str, list[_Lane]]:
+    lanes: dict[tuple[str, str], _Lane] = {}
+    for item in items:
+        config = configs.get(item.board_id)
+        if config is None:
+            logger.info(
+                "notification.dispatch.gateway_missing",
+                extra={"board_id": str(item.board_id), "session_key": item.session_key},
+            )
+            _count_outcome("dropped")
+            continue
+        key = (config.url, item.session_key)
+        lane = lanes.get(key)
+        if lane is None:
+            lane = _Lane(config=config, items=[])
+            lanes[key] = lane
+        lane.items.append(item)
+    by_gateway: dict[str, list[_Lane]] = defaultdict(list)
+    for (gateway_url, _session_key), lane in lanes.items():
+        by_gateway[gateway_url].append(lane)
+    return by_gateway
+
+
+def _reschedule_lane(
+    failed: QueuedAgentNotification,
+    pending: list[QueuedAgentNotification],
+) -> bool:
+    """Park a failed notification and its lane.
+
+    Returns False once retries are exhausted or when the lane could not be parked.
+    """
+    retry = with_next_attempt(failed)
+    if retry.attempts > settings.rq_dispatch_max_retries:
+        logger.warning(
+            "notification.dispatch.drop",
+            extra={"session_key": failed.session_key, "attempts": retry.attempts},
+        )
+        return False
+    return park_agent_notifications(
+        [retry, *pending],
+        delay_seconds=_retry_delay(failed.attempts),
+    )
+
+
+async def _deliver_lane(
+    session: AsyncSession,
+    dispatch: GatewayDispatchService,
+    lane: _Lane,
+    semaphore: asyncio.Semaphore,
+) -> int:
+    delivered = 0
+    for index, item in enumerate(lane.items):
+
+        async def _do_send(item: QueuedAgentNotification = item) -> bool:
+            async with semaphore:
+                await dispatch.send_agent_message(
+                    session_key=item.session_key,
+                    config=lane.config,
+                    agent_name=item.agent_name,
+                    message=item.message,
+                    deliver=item.deliver,
+                )
+            return True
+
+        backoff = GatewayBackoff(
+            timeout_s=settings.agent_notification_retry_timeout_seconds,
+            base_delay_s=_COORDINATION_GATEWAY_BASE_DELAY_S,
+            max_delay_s=_COORDINATION_GATEWAY_MAX_DELAY_S,
+            jitter=0.15,
+            timeout_context="agent notification",
+        )
+        try:
+            await backoff.run(_do_send)
+        except (TimeoutError, GatewayCircuitOpenError) as exc:
+            # Transient failure outlasted in-place retries, or the gateway's circuit is
+            # open: park this lane for later.
+            _count_outcome("failed")
+            if _reschedule_lane(item, lane.items[index + 1 :]):
+                _count_outcome("retried")
+                return delivered
+            _count_outcome("dropped")
+            _record_outcome(session, item.on_failed, error=exc)
+            continue
+        except OpenClawGatewayError as exc:
+            logger.warning(
+                "notification.dispatch.failed",
+                extra={"session_key": item.session_key, "error": str(exc)},
+            )
+            _count_outcome("failed")
+            _count_outcome("dropped")
+            _record_outcome(session, item.on_failed, error=exc)
+            continue
+        delivered += 1
+        _count_outcome("processed")
+        _record_outcome(session, item.on_sent)
+    return delivered
+
+
+async def deliver_agent_notifications(items: list[QueuedAgentNotification]) -> int:
+    """Deliver a batch of notifications; return how many were sent."""
+    if not items:
+        return 0
+    async with async_session_maker() as session:
+        boards = await Board.objects.by_ids({item.board_id for item in items}).all(session)
+        configs = await gateway_configs_for_boards(session, boards)
+        dispatch = GatewayDispatchService(session)
+        jobs: list[Coroutine[Any, Any, int]] = []
+        for lanes in _build_lanes(items, configs).values():
+            semaphore = asyncio.Semaphore(settings.agent_notification_concurrency_per_gateway)
+            jobs.extend(_deliver_lane(session, dispatch, lane, semaphore) for lane in lanes)
+        delivered = sum(await asyncio.gather(*jobs))
+        await session.commit()
+    return delivered
+
+
+def _dequeue_batch(*, block: bool, block_timeout: float) -> list[QueuedAgentNotification]:
+    while True:
+        resumed: list[QueuedAgentNotification] = []
+        fresh: list[QueuedAgentNotification] = []
+        while len(resumed) + len(fresh) < settings.agent_notification_batch_size:
+            task = dequeue_task(
+                settings.agent_notification_queue_name,
+                redis_url=settings.rq_redis_url,
+                block=block and not (resumed or fresh),
+                block_timeout=block_timeout,
+            )
+            if task is None:
+                break
+            try:
+                if task.task_type == LANE_TASK_TYPE:
+                    resumed.extend(resume_parked_lane(task))
+                else:
+                    fresh.append(decode_notification_task(task))
+            except (KeyError, TypeError, ValueError):
+                logger.exception(
+                    "notification.queue.decode_failed",
+                    extra={"task_type": task.task_type},
+                )
+        # Resumed lanes go first; fresh items for a still-parked session wait behind it.
+        items = [*resumed, *divert_to_parked_lanes(fresh)]
+        # Keep pulling when everything was held back, so the queue is not seen as empty.
+        if items or not fresh:
+            return items
+
+
+async def flush_agent_notification_queue(
+    *,
+    block: bool = False,
+    block_timeout: float = 0,
+) -> int:
+    """Drain queued notifications batch by batch until the queue is empty."""
+    delivered = 0
+    while True:
+        items = _dequeue_batch(block=block, block_timeout=block_timeout)
+        if not items:
+            break
+        delivered += await deliver_agent_notifications(items)
+        logger.info(
+            "notification.dispatch.batch_complete",
+            extra={"count": len(items), "delivered": delivered},
+        )
+    return delivered
+
+
+async def _run_notification_worker_loop() -> None:
+    while True:
+        try:
+            await flush_agent_notification_queue(block=True, block_timeout=0)
+        except Exception:
+            logger.exception(
+                "notification.worker.loop_failed",
+                extra={"queue_name": settings.agent_notification_queue_name},
+            )
+            await asyncio.sleep(1)
+
+
+def run_notification_worker() -> None:
+    """Entrypoint for the outbound agent notification worker."""
+    logger.info(
+        "notification.worker.started",
+        extra={"queue_name": settings.agent_notification_queue_name},
+    )
+    try:
+        asyncio.run(_run_notification_worker_loop())
+    finally:
+        logger.info(
+            "notification.worker.stopped",
+            extra={"queue_name": settings.agent_notification_queue_name},
+        )
@@ -0,0 +1,247 @@
+"""Outbound agent notification queue persistence helpers."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from datetime import UTC, datetime
+from typing import Any
+from uuid import UUID
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.services.queue import (
+    QueuedTask,
+    enqueue_task,
+    enqueue_tasks,
+    held_keys,
+    hold_tasks,
+    schedule_task,
+    take_held_tasks,
+)
+
+logger = get_logger(__name__)
+TASK_TYPE = "agent_notification"
+# Wake-up token that resumes a parked session lane; see `park_agent_notifications`.
+LANE_TASK_TYPE = "agent_notification_lane"
+
+
+@dataclass(frozen=True)
+class NotificationActivity:
+    """Activity event recorded once a queued notification is delivered or fails.
+
+    For failures, the gateway error is appended to `message` as `"<message>: <error>"`.
+    """
+
+    event_type: str
+    message: str
+    agent_id: UUID | None = None
+    task_id: UUID | None = None
+
+    def to_payload(self) -> dict[str, Any]:
+        return {
+            "event_type": self.event_type,
+            "message": self.message,
+            "agent_id": str(self.agent_id) if self.agent_id else None,
+            "task_id": str(self.task_id) if self.task_id else None,
+        }
+
+    @classmethod
+    def from_payload(cls, payload: object) -> NotificationActivity | None:
+        if not isinstance(payload, dict):
+            return None
+        agent_id = payload.get("agent_id")
+        task_id = payload.get("task_id")
+        return cls(
+            event_type=str(payload["event_type"]),
+            message=str(payload["message"]),
+            agent_id=UUID(agent_id) if agent_id else None,
+            task_id=UUID(task_id) if task_id else None,
+        )
+
+
+@dataclass(frozen=True)
+class QueuedAgentNotification:
+    """One chat message waiting to be delivered to an agent session."""
+
+    board_id: UUID
+    session_key: str
+    agent_name: str
+    message: str
+    created_at: datetime
+    deliver: bool = False
+    on_sent: NotificationActivity | None = None
+    on_failed: NotificationActivity | None = None
+    attempts: int = 0
+
+
+def _task_from_notification(item: QueuedAgentNotification) -> QueuedTask:
+    return QueuedTask(
+        task_type=TASK_TYPE,
+        payload={
+            "board_id": str(item.board_id),
+            "session_key": item.session_key,
+            "agent_name": item.agent_name,
+            "message": item.message,
+            "deliver": item.deliver,
+            "on_sent": item.on_sent.to_payload() if item.on_sent else None,
+            "on_failed": item.on_failed.to_payload() if item.on_failed else None,
+        },
+        created_at=item.created_at,
+        attempts=item.attempts,
+    )
+
+
+def decode_notification_task(task: QueuedTask) -> QueuedAgentNotification:
+    if task.task_type != TASK_TYPE:
+        raise ValueError(f"Unexpected task_type={task.task_type!r}; expected {TASK_TYPE!r}")
+    payload: dict[str, Any] = task.payload
+    return QueuedAgentNotification(
+        board_id=UUID(payload["board_id"]),
+        session_key=str(payload["session_key"]),
+        agent_name=str(payload["agent_name"]),
+        message=str(payload["message"]),
+        created_at=task.created_at,
+        deliver=bool(payload.get("deliver", False)),
+        on_sent=NotificationActivity.from_payload(payload.get("on_sent")),
+        on_failed=NotificationActivity.from_payload(payload.get("on_failed")),
+        attempts=task.attempts,
+    )
+
+
+def enqueue_agent_notification(item: QueuedAgentNotification) -> bool:
+    """Persist an outbound agent notification; return False when the queue is unavailable."""
+    queued = enqueue_task(
+        _task_from_notification(item),
+        settings.agent_notification_queue_name,
+        redis_url=settings.rq_redis_url,
+    )
+    if not queued:
+        logger.warning(
+            "notification.queue.enqueue_failed",
+            extra={"board_id": str(item.board_id), "session_key": item.session_key},
+        )
+    return queued
+
+
+def enqueue_agent_notifications(items: list[QueuedAgentNotification]) -> bool:
+    """Persist a batch of notifications in one round trip; False when the queue is unavailable."""
+    return enqueue_tasks(
+        [_task_from_notification(item) for item in items],
+        settings.agent_notification_queue_name,
+        redis_url=settings.rq_redis_url,
+    )
+
+
+def new_agent_notification(
+    *,
+    board_id: UUID,
+    session_key: str,
+    agent_name: str,
+    message: str,
+    deliver: bool = False,
+    on_sent: NotificationActivity | None = None,
+    on_failed: NotificationActivity | None = None,
+) -> QueuedAgentNotification:
+    """Build a notification envelope stamped with the current time."""
+    return QueuedAgentNotification(
+        board_id=board_id,
+        session_key=session_key,
+        agent_name=agent_name,
+        message=message,
+        created_at=datetime.now(UTC),
+        deliver=deliver,
+        on_sent=on_sent,
+        on_failed=on_failed,
+    )
+
+
+def with_next_attempt(item: QueuedAgentNotification) -> QueuedAgentNotification:
+    return replace(item, attempts=item.attempts + 1)
+
+
+def park_agent_notifications(
+    items: list[QueuedAgentNotification],
+    *,
+    delay_seconds: float,
+) -> bool:
+    """Hold a session's failed lane, in order, and resume it after `delay_seconds`.
+
+    While the lane is parked, `divert_to_parked_lanes` holds newer notifications for
+    the same session behind it, so the session still receives messages in order.
+    Returns False when the queue is unavailable.
+    """
+    if not items:
+        return True
+    session_key = items[0].session_key
+    queue_name = settings.agent_notification_queue_name
+    token = QueuedTask(
+        task_type=LANE_TASK_TYPE,
+        payload={"session_key": session_key},
+        created_at=datetime.now(UTC),
+    )
+    try:
+        # Schedule the wake-up first: a stray token only resumes an empty lane.
+        schedule_task(
+            token,
+            queue_name,
+            delay_seconds=delay_seconds,
+            redis_url=settings.rq_redis_url,
+        )
+        # A lane parked again goes ahead of anything diverted behind it meanwhile.
+        hold_tasks(
+            [_task_from_notification(item) for item in items],
+            queue_name,
+            hold_key=session_key,
+            at_front=True,
+            redis_url=settings.rq_redis_url,
+        )
+    except Exception as exc:
+        logger.warning(
+            "notification.queue.park_failed",
+            extra={"session_key": session_key, "count": len(items), "error": str(exc)},
+        )
+        return False
+    return True
+
+
+def resume_parked_lane(token: QueuedTask) -> list[QueuedAgentNotification]:
+    """Take every notification held for the token's session, oldest first."""
+    tasks = take_held_tasks(
+        settings.agent_notification_queue_name,
+        hold_key=str(token.payload["session_key"]),
+        redis_url=settings.rq_redis_url,
+    )
+    return [decode_notification_task(task) for task in tasks]
+
+
+def divert_to_parked_lanes(
+    items: list[QueuedAgentNotification],
+) -> list[QueuedAgentNotification]:
+    """Hold items whose session lane is parked; return the ones to deliver now."""
+    queue_name = settings.agent_notification_queue_name
+    try:
+        parked = held_keys(
+            queue_name,
+            list(dict.fromkeys(item.session_key for item in items)),
+            redis_url=settings.rq_redis_url,
+        )
+        if not parked:
+            return items
+        for session_key in parked:
+            hold_tasks(
+                [
+                    _task_from_notification(item)
+                    for item in items
+                    if item.session_key == session_key
+                ],
+                queue_name,
+                hold_key=session_key,
+                redis_url=settings.rq_redis_url,
+            )
+    except Exception as exc:
+        logger.warning(
+            "notification.queue.divert_failed",
+            extra={"count": len(items), "error": str(exc)},
+        )
+        return items
+    return [item for item in items if item.session_key not in parked]
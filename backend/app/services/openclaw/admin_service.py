@@ -27,8 +27,7 @@ from app.services.openclaw.db_agent_state import (
     mint_agent_token,
 )
 from app.services.openclaw.db_service import OpenClawDBService
-from app.services.openclaw.error_messages import normalize_gateway_error_message
-from app.services.openclaw.gateway_compat import check_gateway_version_compatibility
+from app.services.openclaw.gateway_health import gateway_health
 from app.services.openclaw.gateway_rpc import GatewayConfig as GatewayClientConfig
 from app.services.openclaw.gateway_rpc import OpenClawGatewayError, openclaw_call
 from app.services.openclaw.provisioning import OpenClawGatewayProvisioner
@@ -199,18 +198,16 @@ class GatewayAdminLifecycleService(OpenClawDBService):
             allow_insecure_tls=allow_insecure_tls,
             disable_device_pairing=disable_device_pairing,
         )
-        try:
-            result = await check_gateway_version_compatibility(config)
-        except OpenClawGatewayError as exc:
-            detail = normalize_gateway_error_message(str(exc))
+        health = await gateway_health.get(config, trust_failures=False)
+        if not health.connected:
             raise HTTPException(
                 status_code=status.HTTP_502_BAD_GATEWAY,
-                detail=f"Gateway compatibility check failed: {detail}",
-            ) from exc
-        if not result.compatible:
+                detail=f"Gateway compatibility check failed: {health.error}",
+            )
+        if not health.compatible:
             raise HTTPException(
                 status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
-                detail=result.message or "Gateway runtime version is not supported.",
+                detail=health.message or "Gateway runtime version is not supported.",
             )
 
     async def provision_main_agent_record(
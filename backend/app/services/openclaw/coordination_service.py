@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 from abc import ABC
-from collections.abc import Awaitable, Callable
+from collections.abc import AsyncIterator, Awaitable, Callable
 from typing import TypeVar
 from uuid import UUID
 
@@ -14,6 +15,7 @@ from sqlmodel import col, select
 from app.core.config import settings
 from app.core.logging import TRACE_LEVEL
 from app.core.time import utcnow
+from app.db.session import async_session_maker
 from app.models.agents import Agent
 from app.models.boards import Board
 from app.models.gateways import Gateway
@@ -671,40 +673,23 @@ class GatewayCoordinationService(AbstractGatewayMessagingService):
         results: list[GatewayLeadBroadcastBoardResult] = []
         sent = 0
         failed = 0
-
-        for board in boards:
-            message = self._build_gateway_lead_message(
-                board=board,
-                actor_agent_name=actor_agent.name,
-                kind=payload.kind,
-                content=payload.content,
-                correlation_id=payload.correlation_id,
-                reply_tags=payload.reply_tags,
-                reply_source=payload.reply_source,
+        async for board_result in self.iter_gateway_lead_broadcast(
+            actor_agent=actor_agent,
+            gateway=gateway,
+            config=config,
+            boards=boards,
+            payload=payload,
+        ):
+            self.logger.log(
+                TRACE_LEVEL,
+                "gateway.coordination.lead_broadcast.board trace_id=%s board_id=%s ok=%s",
+                trace_id,
+                board_result.board_id,
+                board_result.ok,
             )
-            try:
-                lead, _lead_created = await self._ensure_and_message_board_lead(
-                    gateway=gateway,
-                    config=config,
-                    board=board,
-                    message=message,
-                )
-                board_result = GatewayLeadBroadcastBoardResult(
-                    board_id=board.id,
-                    lead_agent_id=lead.id,
-                    lead_agent_name=lead.name,
-                    ok=True,
-                )
+            if board_result.ok:
                 sent += 1
-            except (HTTPException, OpenClawGatewayError, TimeoutError, ValueError) as exc:
-                board_result = GatewayLeadBroadcastBoardResult(
-                    board_id=board.id,
-                    ok=False,
-                    error=map_gateway_error_message(
-                        GatewayOperation.LEAD_BROADCAST_DISPATCH,
-                        exc,
-                    ),
-                )
+            else:
                 failed += 1
             results.append(board_result)
 
@@ -729,3 +714,99 @@ class GatewayCoordinationService(AbstractGatewayMessagingService):
             failed=failed,
             results=results,
         )
+
+    async def iter_gateway_lead_broadcast(
+        self,
+        *,
+        actor_agent: Agent,
+        gateway: Gateway,
+        config: GatewayClientConfig,
+        boards: list[Board],
+        payload: GatewayLeadBroadcastRequest,
+        concurrency: int | None = None,
+        board_timeout_seconds: float | None = None,
+    ) -> AsyncIterator[GatewayLeadBroadcastBoardResult]:
+        """Message every board lead concurrently, yielding results as they complete.
+
+        Existing lead agents for all boards are loaded and reconciled up front in one
+        batched DB pass. Each board then runs with at most `concurrency` boards in flight
+        and is bounded by `board_timeout_seconds`, including provisioning a missing lead,
+        so one unreachable board cannot stall the rest.
+        """
+        limit = max(1, concurrency or settings.lead_broadcast_concurrency)
+        deadline = board_timeout_seconds or settings.lead_broadcast_board_timeout_seconds
+        requests = [
+            LeadAgentRequest(
+                board=board,
+                gateway=gateway,
+                config=config,
+                user=None,
+                options=LeadAgentOptions(action="provision"),
+            )
+            for board in boards
+        ]
+        leads = await OpenClawProvisioningService(self.session).reconcile_board_lead_agents(
+            requests,
+        )
+        semaphore = asyncio.Semaphore(limit)
+
+        async def _deliver(request: LeadAgentRequest) -> Agent:
+            board = request.board
+            lead = leads.get(board.id)
+            if lead is None:
+                # Boards run concurrently, so provisioning gets its own session.
+                async with async_session_maker() as board_session:
+                    service = OpenClawProvisioningService(board_session)
+                    lead, _ = await service.ensure_board_lead_agent(request=request)
+            if not lead.openclaw_session_id:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+                    detail="Lead agent has no session key",
+                )
+            message = self._build_gateway_lead_message(
+                board=board,
+                actor_agent_name=actor_agent.name,
+                kind=payload.kind,
+                content=payload.content,
+                correlation_id=payload.correlation_id,
+                reply_tags=payload.reply_tags,
+                reply_source=payload.reply_source,
+            )
+            await self._dispatch_gateway_message(
+                session_key=lead.openclaw_session_id,
+                config=config,
+                agent_name=lead.name,
+                message=message,
+                deliver=False,
+            )
+            return lead
+
+        async def _send(request: LeadAgentRequest) -> GatewayLeadBroadcastBoardResult:
+            board = request.board
+            try:
+                async with semaphore:
+                    lead = await asyncio.wait_for(_deliver(request), timeout=deadline)
+            except (HTTPException, OpenClawGatewayError, TimeoutError, ValueError) as exc:
+                return GatewayLeadBroadcastBoardResult(
+                    board_id=board.id,
+                    ok=False,
+                    error=map_gateway_error_message(
+                        GatewayOperation.LEAD_BROADCAST_DISPATCH,
+                        exc,
+                    ),
+                )
+            return GatewayLeadBroadcastBoardResult(
+                board_id=board.id,
+                lead_agent_id=lead.id,
+                lead_agent_name=lead.name,
+                ok=True,
+            )
+
+        tasks = [asyncio.create_task(_send(request)) for request in requests]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
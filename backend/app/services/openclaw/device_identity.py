@@ -1,11 +1,18 @@
-"""OpenClaw-compatible device identity and connect-signature helpers."""
+"""OpenClaw-compatible device identity and connect-signature helpers.
+
+Every gateway connect signs a payload with the device key, so the identity and the
+parsed key objects are cached for the life of the process. The identity file is
+only `stat`-ed on each lookup; it is re-read when its mtime, size or inode change.
+"""
 
 from __future__ import annotations
 
 import hashlib
 import json
 import os
+import threading
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from time import time
 from typing import Any, cast
@@ -41,6 +48,7 @@ def _base64url_encode(raw: bytes) -> str:
     return base64.urlsafe_b64encode(raw).decode("utf-8").rstrip("=")
 
 
+@lru_cache(maxsize=8)
 def _derive_public_key_raw(public_key_pem: str) -> bytes:
     loaded = serialization.load_pem_public_key(public_key_pem.encode("utf-8"))
     if not isinstance(loaded, Ed25519PublicKey):
@@ -96,9 +104,52 @@ def _generate_identity() -> DeviceIdentity:
     )
 
 
+_FileFingerprint = tuple[int, int, int]
+
+
+@dataclass(frozen=True)
+class _CachedIdentity:
+    path: Path
+    fingerprint: _FileFingerprint
+    identity: DeviceIdentity
+
+
+_identity_cache: _CachedIdentity | None = None
+_identity_lock = threading.Lock()
+
+
+def _file_fingerprint(path: Path) -> _FileFingerprint | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
 def load_or_create_device_identity() -> DeviceIdentity:
-    """Load persisted device identity or create a new one when missing/invalid."""
+    """Load persisted device identity or create a new one when missing/invalid.
+
+    Returns the cached identity while the identity file is unchanged on disk.
+    """
+    global _identity_cache
     path = _identity_path()
+    cached = _identity_cache
+    if cached is not None and cached.path == path:
+        if cached.fingerprint == _file_fingerprint(path):
+            return cached.identity
+    with _identity_lock:
+        identity = _load_or_create_device_identity_uncached(path)
+        fingerprint = _file_fingerprint(path)
+        if fingerprint is not None:
+            _identity_cache = _CachedIdentity(
+                path=path,
+                fingerprint=fingerprint,
+                identity=identity,
+            )
+    return identity
+
+
+def _load_or_create_device_identity_uncached(path: Path) -> DeviceIdentity:
     try:
         if path.exists():
             payload = cast(dict[str, Any], json.loads(path.read_text(encoding="utf-8")))
@@ -124,18 +175,24 @@ def load_or_create_device_identity() -> DeviceIdentity:
     return identity
 
 
+@lru_cache(maxsize=8)
 def public_key_raw_base64url_from_pem(public_key_pem: str) -> str:
     """Return raw Ed25519 public key in base64url form expected by OpenClaw."""
     return _base64url_encode(_derive_public_key_raw(public_key_pem))
 
 
-def sign_device_payload(private_key_pem: str, payload: str) -> str:
-    """Sign a device payload with Ed25519 and return base64url signature."""
+@lru_cache(maxsize=8)
+def _load_private_key(private_key_pem: str) -> Ed25519PrivateKey:
     loaded = serialization.load_pem_private_key(private_key_pem.encode("utf-8"), password=None)
     if not isinstance(loaded, Ed25519PrivateKey):
         msg = "device identity private key is not Ed25519"
         raise ValueError(msg)
-    signature = loaded.sign(payload.encode("utf-8"))
+    return loaded
+
+
+def sign_device_payload(private_key_pem: str, payload: str) -> str:
+    """Sign a device payload with Ed25519 and return base64url signature."""
+    signature = _load_private_key(private_key_pem).sign(payload.encode("utf-8"))
     return _base64url_encode(signature)
 
 
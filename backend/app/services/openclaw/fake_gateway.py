@@ -0,0 +1,558 @@
+"""In-process fake OpenClaw gateway for tests, benchmarks and local load testing.
+
+`FakeGateway` speaks the same websocket protocol as a real gateway (a
+`connect.challenge` event, a `connect` request negotiating protocol version 3, then
+`req`/`res` frames) and keeps just enough in-memory state for the methods Mission
+Control uses: `sessions.*`, `agents.*`, `agents.files.*`, `chat.*` and `config.*`.
+Latency, injected failures and per-method request accounting are configurable, so
+provisioning, broadcast and notification paths can be driven end to end through the
+real client in `gateway_rpc`.
+
+Device signatures are accepted without verification; use `disable_device_pairing`
+configs (the default from `FakeGateway.config()`) to skip device identity entirely.
+
+Run standalone with `python -m app.services.openclaw.fake_gateway --port 18789`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import fnmatch
+import hashlib
+import json
+import random
+from collections import Counter
+from dataclasses import dataclass, field
+from time import perf_counter, time
+from typing import Any, Literal
+from urllib.parse import parse_qs, urlparse
+from uuid import uuid4
+
+from websockets.asyncio.server import Server, ServerConnection, serve
+from websockets.exceptions import ConnectionClosed
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.services.openclaw.gateway_rpc import (
+    GATEWAY_EVENTS,
+    GATEWAY_METHODS,
+    PROTOCOL_VERSION,
+    GatewayConfig,
+)
+
+logger = get_logger(__name__)
+
+# websockets logs every connection at INFO; one per RPC is noise under load.
+_server_logger = get_logger(f"{__name__}.server")
+_server_logger.setLevel("WARNING")
+FaultKind = Literal["error", "disconnect"]
+
+
+class FakeGatewayRequestError(Exception):
+    """Answer the current request with `ok: false` and this message."""
+
+
+@dataclass
+class GatewayFault:
+    """Failure injected into requests whose method matches a pattern.
+
+    `error` answers with `ok: false` (a gateway error); `disconnect` closes the socket
+    without answering (a transport error). `rate` is the probability a matching request
+    fails and `remaining` caps how many times the fault fires (`None` is unlimited).
+    """
+
+    kind: FaultKind = "error"
+    message: str = "injected failure"
+    rate: float = 1.0
+    remaining: int | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class RecordedRequest:
+    """One request received by the fake gateway."""
+
+    method: str
+    params: dict[str, Any]
+    received_at: float
+    outcome: str = "ok"
+
+
+@dataclass
+class FakeGatewayStats:
+    """Request accounting since start (or the last `reset_stats`)."""
+
+    connections: int = 0
+    open_connections: int = 0
+    peak_open_connections: int = 0
+    calls: Counter[str] = field(default_factory=Counter)
+    errors: Counter[str] = field(default_factory=Counter)
+    requests: list[RecordedRequest] = field(default_factory=list)
+
+    def params_for(self, method: str) -> list[dict[str, Any]]:
+        """Params of every recorded request for `method`, oldest first."""
+        return [request.params for request in self.requests if request.method == method]
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "connections": self.connections,
+            "peak_open_connections": self.peak_open_connections,
+            "calls": dict(self.calls),
+            "errors": dict(self.errors),
+        }
+
+
+def _config_hash(config: dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _merge_patch(target: dict[str, Any], patch: dict[str, Any]) -> dict[str, Any]:
+    """Apply a JSON merge patch (RFC 7386): objects merge, `null` deletes, rest replaces."""
+    merged = dict(target)
+    for key, value in patch.items():
+        if value is None:
+            merged.pop(key, None)
+        elif isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge_patch(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def _required_str(params: dict[str, Any], key: str) -> str:
+    value = params.get(key)
+    if not isinstance(value, str) or not value:
+        raise FakeGatewayRequestError(f"invalid params: {key} is required")
+    return value
+
+
+class FakeGateway:
+    """Websocket server emulating an OpenClaw gateway."""
+
+    def __init__(
+        self,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        token: str | None = None,
+        version: str | None = None,
+        latency_s: float = 0.0,
+        latency_jitter_s: float = 0.0,
+        seed: int | None = None,
+        record_requests: bool = True,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.token = token
+        # Report the minimum supported version so compatibility checks pass by default.
+        self.version = version or settings.gateway_min_version
+        self.latency_s = latency_s
+        self.latency_jitter_s = latency_jitter_s
+        self.method_latency_s: dict[str, float] = {}
+        self.faults: dict[str, GatewayFault] = {}
+        self.record_requests = record_requests
+        self.stats = FakeGatewayStats()
+        self.sessions: dict[str, dict[str, Any]] = {}
+        self.agents: dict[str, dict[str, Any]] = {}
+        self.files: dict[tuple[str, str], str] = {}
+        self.chat: dict[str, list[dict[str, Any]]] = {}
+        self.config_data: dict[str, Any] = {
+            "meta": {"lastTouchedVersion": self.version},
+            "agents": {"list": []},
+        }
+        self._rng = random.Random(seed)
+        self._server: Server | None = None
+
+    # Lifecycle
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    def config(self, *, disable_device_pairing: bool = True) -> GatewayConfig:
+        """Client configuration pointing at this gateway."""
+        return GatewayConfig(
+            url=self.url,
+            token=self.token,
+            disable_device_pairing=disable_device_pairing,
+        )
+
+    async def start(self) -> FakeGateway:
+        server_options: dict[str, Any] = {"logger": _server_logger}
+        self._server = await serve(self._handle_connection, self.host, self.port, **server_options)
+        sockets = list(self._server.sockets)
+        if sockets:
+            self.port = int(sockets[0].getsockname()[1])
+        logger.info("fake_gateway.started", extra={"url": self.url})
+        return self
+
+    async def stop(self) -> None:
+        if self._server is None:
+            return
+        self._server.close()
+        await self._server.wait_closed()
+        self._server = None
+
+    async def __aenter__(self) -> FakeGateway:
+        return await self.start()
+
+    async def __aexit__(self, *_: object) -> None:
+        await self.stop()
+
+    # Behaviour knobs
+
+    def set_latency(self, pattern: str, seconds: float) -> None:
+        """Delay answers to methods matching a glob pattern (e.g. `agents.files.*`)."""
+        self.method_latency_s[pattern] = seconds
+
+    def inject_fault(self, pattern: str, fault: GatewayFault | None = None) -> GatewayFault:
+        """Fail requests whose method matches a glob pattern; `connect` covers handshakes."""
+        fault = fault or GatewayFault()
+        self.faults[pattern] = fault
+        return fault
+
+    def clear_faults(self) -> None:
+        self.faults.clear()
+
+    def reset_stats(self) -> None:
+        self.stats = FakeGatewayStats(open_connections=self.stats.open_connections)
+
+    def _latency_for(self, method: str) -> float:
+        latency = self.latency_s
+        for pattern, seconds in self.method_latency_s.items():
+            if fnmatch.fnmatchcase(method, pattern):
+                latency = seconds
+        if self.latency_jitter_s:
+            latency += self._rng.uniform(0, self.latency_jitter_s)
+        return latency
+
+    def _fault_for(self, method: str) -> GatewayFault | None:
+        for pattern, fault in self.faults.items():
+            if not fnmatch.fnmatchcase(method, pattern):
+                continue
+            if fault.remaining is not None and fault.remaining <= 0:
+                continue
+            if fault.rate < 1.0 and self._rng.random() >= fault.rate:
+                continue
+            if fault.remaining is not None:
+                fault.remaining -= 1
+            return fault
+        return None
+
+    def _record(self, method: str, params: dict[str, Any], outcome: str) -> None:
+        self.stats.calls[method] += 1
+        if outcome != "ok":
+            self.stats.errors[method] += 1
+        if self.record_requests:
+            self.stats.requests.append(RecordedRequest(method, params, time(), outcome))
+
+    # Protocol
+
+    async def _handle_connection(self, ws: ServerConnection) -> None:
+        self.stats.connections += 1
+        self.stats.open_connections += 1
+        self.stats.peak_open_connections = max(
+            self.stats.peak_open_connections,
+            self.stats.open_connections,
+        )
+        try:
+            await ws.send(
+                json.dumps(
+                    {
+                        "type": "event",
+                        "event": "connect.challenge",
+                        "payload": {"nonce": uuid4().hex, "ts": int(time() * 1000)},
+                    },
+                ),
+            )
+            if not await self._handshake(ws):
+                return
+            async for raw in ws:
+                if not await self._handle_frame(ws, raw):
+                    return
+        except ConnectionClosed:
+            pass
+        finally:
+            self.stats.open_connections -= 1
+
+    async def _handshake(self, ws: ServerConnection) -> bool:
+        frame = json.loads(await ws.recv())
+        request_id = frame.get("id")
+        params = frame.get("params") if isinstance(frame.get("params"), dict) else {}
+        if frame.get("type") != "req" or frame.get("method") != "connect":
+            await self._respond_error(ws, request_id, "first request must be connect")
+            await ws.close()
+            return False
+        await asyncio.sleep(self._latency_for("connect"))
+        error = self._connect_error(params, ws)
+        fault = self._fault_for("connect") if error is None else None
+        if fault is not None and fault.kind == "disconnect":
+            self._record("connect", params, "disconnect")
+            await ws.close(code=1011, reason=fault.message)
+            return False
+        if fault is not None:
+            error = fault.message
+        if error is not None:
+            self._record("connect", params, "error")
+            await self._respond_error(ws, request_id, error)
+            await ws.close()
+            return False
+        self._record("connect", params, "ok")
+        await self._respond(ws, request_id, self._hello_payload())
+        return True
+
+    def _connect_error(self, params: dict[str, Any], ws: ServerConnection) -> str | None:
+        min_protocol = params.get("minProtocol")
+        max_protocol = params.get("maxProtocol")
+        if not (
+            isinstance(min_protocol, int)
+            and isinstance(max_protocol, int)
+            and min_protocol <= PROTOCOL_VERSION <= max_protocol
+        ):
+            return f"protocol mismatch: server speaks {PROTOCOL_VERSION}"
+        if self.token is not None:
+            auth = params.get("auth")
+            presented = {auth.get("token")} if isinstance(auth, dict) else set()
+            if ws.request is not None:
+                presented.update(parse_qs(urlparse(ws.request.path).query).get("token", []))
+            if self.token not in presented:
+                return "unauthorized: gateway token mismatch"
+        return None
+
+    def _hello_payload(self) -> dict[str, Any]:
+        return {
+            "type": "hello-ok",
+            "protocol": PROTOCOL_VERSION,
+            "server": {"version": self.version, "connId": uuid4().hex},
+            "features": {"methods": list(GATEWAY_METHODS), "events": list(GATEWAY_EVENTS)},
+            "snapshot": {"sessions": len(self.sessions), "agents": len(self.agents)},
+        }
+
+    async def _handle_frame(self, ws: ServerConnection, raw: str | bytes) -> bool:
+        frame = json.loads(raw)
+        if frame.get("type") != "req":
+            return True
+        request_id = frame.get("id")
+        method = str(frame.get("method") or "")
+        params = frame.get("params") if isinstance(frame.get("params"), dict) else {}
+        await asyncio.sleep(self._latency_for(method))
+        fault = self._fault_for(method)
+        if fault is not None and fault.kind == "disconnect":
+            self._record(method, params, "disconnect")
+            await ws.close(code=1011, reason=fault.message)
+            return False
+        if fault is not None:
+            self._record(method, params, "error")
+            await self._respond_error(ws, request_id, fault.message)
+            return True
+        try:
+            payload = self._dispatch(method, params)
+        except FakeGatewayRequestError as exc:
+            self._record(method, params, "error")
+            await self._respond_error(ws, request_id, str(exc))
+            return True
+        self._record(method, params, "ok")
+        await self._respond(ws, request_id, payload)
+        return True
+
+    async def _respond(self, ws: ServerConnection, request_id: object, payload: object) -> None:
+        await ws.send(json.dumps({"type": "res", "id": request_id, "ok": True, "payload": payload}))
+
+    async def _respond_error(self, ws: ServerConnection, request_id: object, message: str) -> None:
+        await ws.send(
+            json.dumps(
+                {
+                    "type": "res",
+                    "id": request_id,
+                    "ok": False,
+                    "error": {"code": "INVALID_REQUEST", "message": message},
+                },
+            ),
+        )
+
+    # Methods
+
+    def _dispatch(self, method: str, params: dict[str, Any]) -> object:
+        handler = getattr(self, "_m_" + method.replace(".", "_").replace("-", "_"), None)
+        if handler is None:
+            raise FakeGatewayRequestError(f"unknown method: {method}")
+        return handler(params)
+
+    def _m_health(self, params: dict[str, Any]) -> object:
+        return {"ok": True, "ts": int(time() * 1000)}
+
+    def _m_status(self, params: dict[str, Any]) -> object:
+        return {"version": self.version, "sessions": len(self.sessions), "agents": len(self.agents)}
+
+    def _m_sessions_list(self, params: dict[str, Any]) -> object:
+        return {"sessions": [dict(session) for session in self.sessions.values()]}
+
+    def _m_sessions_patch(self, params: dict[str, Any]) -> object:
+        key = _required_str(params, "key")
+        session = self.sessions.setdefault(key, {"key": key, "createdAt": int(time() * 1000)})
+        if isinstance(params.get("label"), str):
+            session["label"] = params["label"]
+        return {"ok": True, "key": key}
+
+    def _m_sessions_reset(self, params: dict[str, Any]) -> object:
+        key = _required_str(params, "key")
+        self.chat.pop(key, None)
+        return {"ok": True, "key": key}
+
+    def _m_sessions_delete(self, params: dict[str, Any]) -> object:
+        key = _required_str(params, "key")
+        self.sessions.pop(key, None)
+        self.chat.pop(key, None)
+        return {"ok": True, "key": key}
+
+    def _m_chat_send(self, params: dict[str, Any]) -> object:
+        key = _required_str(params, "sessionKey")
+        message = _required_str(params, "message")
+        self.sessions.setdefault(key, {"key": key, "createdAt": int(time() * 1000)})
+        self.chat.setdefault(key, []).append(
+            {"role": "user", "content": message, "ts": int(time() * 1000)},
+        )
+        run_id = params.get("idempotencyKey") or uuid4().hex
+        return {"runId": run_id, "status": "started"}
+
+    def _m_chat_history(self, params: dict[str, Any]) -> object:
+        key = _required_str(params, "sessionKey")
+        messages = self.chat.get(key, [])
+        limit = params.get("limit")
+        if isinstance(limit, int) and limit > 0:
+            messages = messages[-limit:]
+        return {"sessionKey": key, "messages": list(messages)}
+
+    def _m_agents_list(self, params: dict[str, Any]) -> object:
+        return {"agents": [dict(agent) for agent in self.agents.values()]}
+
+    def _m_agents_create(self, params: dict[str, Any]) -> object:
+        agent_id = _required_str(params, "name")
+        if agent_id in self.agents:
+            raise FakeGatewayRequestError(f"agent {agent_id} already exists")
+        self.agents[agent_id] = {
+            "id": agent_id,
+            "name": agent_id,
+            "workspace": params.get("workspace"),
+        }
+        return {"ok": True, "agentId": agent_id}
+
+    def _m_agents_update(self, params: dict[str, Any]) -> object:
+        agent = self._agent(params)
+        for key in ("name", "workspace"):
+            if isinstance(params.get(key), str):
+                agent[key] = params[key]
+        return {"ok": True, "agentId": agent["id"]}
+
+    def _m_agents_delete(self, params: dict[str, Any]) -> object:
+        agent = self._agent(params)
+        del self.agents[agent["id"]]
+        if params.get("deleteFiles", True):
+            for file_key in [key for key in self.files if key[0] == agent["id"]]:
+                del self.files[file_key]
+        return {"ok": True, "agentId": agent["id"]}
+
+    def _m_agents_files_list(self, params: dict[str, Any]) -> object:
+        agent = self._agent(params)
+        files = [
+            {"name": name, "size": len(content.encode("utf-8")), "missing": False}
+            for (agent_id, name), content in sorted(self.files.items())
+            if agent_id == agent["id"]
+        ]
+        return {"agentId": agent["id"], "files": files}
+
+    def _m_agents_files_get(self, params: dict[str, Any]) -> object:
+        agent = self._agent(params)
+        name = _required_str(params, "name")
+        content = self.files.get((agent["id"], name))
+        if content is None:
+            raise FakeGatewayRequestError(f"file {name} not found")
+        return {"agentId": agent["id"], "file": {"name": name, "content": content}}
+
+    def _m_agents_files_set(self, params: dict[str, Any]) -> object:
+        agent = self._agent(params)
+        name = _required_str(params, "name")
+        content = params.get("content")
+        if not isinstance(content, str):
+            raise FakeGatewayRequestError("invalid params: content is required")
+        self.files[(agent["id"], name)] = content
+        return {"ok": True, "agentId": agent["id"], "name": name}
+
+    def _m_agents_files_delete(self, params: dict[str, Any]) -> object:
+        agent = self._agent(params)
+        name = _required_str(params, "name")
+        self.files.pop((agent["id"], name), None)
+        return {"ok": True, "agentId": agent["id"], "name": name}
+
+    def _m_config_get(self, params: dict[str, Any]) -> object:
+        return {"config": self.config_data, "hash": _config_hash(self.config_data), "exists": True}
+
+    def _m_config_patch(self, params: dict[str, Any]) -> object:
+        base_hash = params.get("baseHash")
+        if base_hash is not None and base_hash != _config_hash(self.config_data):
+            raise FakeGatewayRequestError("config changed since last load; re-run config.get")
+        try:
+            patch = json.loads(_required_str(params, "raw"))
+        except json.JSONDecodeError as exc:
+            raise FakeGatewayRequestError(f"invalid config patch: {exc}") from exc
+        if not isinstance(patch, dict):
+            raise FakeGatewayRequestError("invalid config patch: expected an object")
+        self.config_data = _merge_patch(self.config_data, patch)
+        return {"ok": True, "hash": _config_hash(self.config_data)}
+
+    def _agent(self, params: dict[str, Any]) -> dict[str, Any]:
+        agent_id = _required_str(params, "agentId")
+        agent = self.agents.get(agent_id)
+        if agent is None:
+            raise FakeGatewayRequestError(f"unknown agent: {agent_id}")
+        return agent
+
+
+async def _serve_forever(args: argparse.Namespace) -> None:
+    gateway = FakeGateway(
+        host=args.host,
+        port=args.port,
+        token=args.token,
+        latency_s=args.latency_ms / 1000,
+        latency_jitter_s=args.jitter_ms / 1000,
+        seed=args.seed,
+        record_requests=False,
+    )
+    if args.error_rate > 0:
+        gateway.inject_fault("*", GatewayFault(rate=args.error_rate))
+    async with gateway:
+        started_at = perf_counter()
+        try:
+            while True:
+                await asyncio.sleep(args.report_seconds)
+                logger.info(
+                    "fake_gateway.stats",
+                    extra={
+                        "uptime_s": round(perf_counter() - started_at),
+                        **gateway.stats.as_dict(),
+                    },
+                )
+        finally:
+            logger.info("fake_gateway.stopped", extra=gateway.stats.as_dict())
+
+
+def main() -> None:
+    """Run a fake gateway until interrupted."""
+    parser = argparse.ArgumentParser(description="Fake OpenClaw gateway.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18789)
+    parser.add_argument("--token")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--report-seconds", type=float, default=30.0)
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve_forever(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
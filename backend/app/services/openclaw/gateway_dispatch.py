@@ -6,19 +6,43 @@ directly orchestrate gateway RPC calls.
 
 from __future__ import annotations
 
-from uuid import uuid4
+import asyncio
+from collections.abc import Sequence
+from dataclasses import dataclass
+from uuid import UUID, uuid4
 
+from app.core.config import settings
 from app.models.boards import Board
 from app.models.gateways import Gateway
+from app.services.activity_log import record_activity
+from app.services.notifications.queue import (
+    NotificationActivity,
+    enqueue_agent_notification,
+    enqueue_agent_notifications,
+    new_agent_notification,
+)
 from app.services.openclaw.db_service import OpenClawDBService
 from app.services.openclaw.gateway_resolver import (
     gateway_client_config,
+    gateway_configs_for_boards,
     get_gateway_for_board,
     optional_gateway_client_config,
     require_gateway_for_board,
 )
 from app.services.openclaw.gateway_rpc import GatewayConfig as GatewayClientConfig
 from app.services.openclaw.gateway_rpc import OpenClawGatewayError, ensure_session, send_message
+from app.services.openclaw.internal.session_cache import is_missing_session_error, known_sessions
+
+
+@dataclass(frozen=True, slots=True)
+class AgentMessageTarget:
+    """One agent session that should receive a fan-out message."""
+
+    board: Board
+    session_key: str
+    agent_name: str
+    message: str
+    deliver: bool = False
 
 
 class GatewayDispatchService(OpenClawDBService):
@@ -47,6 +71,20 @@ class GatewayDispatchService(OpenClawDBService):
         message: str,
         deliver: bool = False,
     ) -> None:
+        if known_sessions.is_known(config.url, session_key, label=agent_name):
+            # Steady state: the session was ensured recently, so send in one RPC.
+            try:
+                await send_message(
+                    message,
+                    session_key=session_key,
+                    config=config,
+                    deliver=deliver,
+                )
+                return
+            except OpenClawGatewayError as exc:
+                if not is_missing_session_error(exc):
+                    raise
+                known_sessions.forget(config.url, session_key)
         await ensure_session(session_key, config=config, label=agent_name)
         await send_message(message, session_key=session_key, config=config, deliver=deliver)
 
@@ -71,6 +109,103 @@ class GatewayDispatchService(OpenClawDBService):
             return exc
         return None
 
+    async def queue_agent_message(
+        self,
+        *,
+        board_id: UUID,
+        session_key: str,
+        config: GatewayClientConfig,
+        agent_name: str,
+        message: str,
+        deliver: bool = False,
+        on_sent: NotificationActivity | None = None,
+        on_failed: NotificationActivity | None = None,
+    ) -> bool:
+        """Hand a message to the outbound notification worker; return True when queued.
+
+        The worker records `on_sent`/`on_failed` activity once delivery settles. When the
+        queue is disabled or unavailable the message is sent inline instead and the
+        outcome activity is added to this session for the caller to commit.
+        """
+        if settings.agent_notification_queue_enabled and enqueue_agent_notification(
+            new_agent_notification(
+                board_id=board_id,
+                session_key=session_key,
+                agent_name=agent_name,
+                message=message,
+                deliver=deliver,
+                on_sent=on_sent,
+                on_failed=on_failed,
+            ),
+        ):
+            return True
+        error = await self.try_send_agent_message(
+            session_key=session_key,
+            config=config,
+            agent_name=agent_name,
+            message=message,
+            deliver=deliver,
+        )
+        activity = on_sent if error is None else on_failed
+        if activity is not None:
+            record_activity(
+                self.session,
+                event_type=activity.event_type,
+                message=activity.message if error is None else f"{activity.message}: {error}",
+                agent_id=activity.agent_id,
+                task_id=activity.task_id,
+            )
+        return False
+
+    async def fan_out_agent_messages(self, targets: Sequence[AgentMessageTarget]) -> int:
+        """Deliver one message per target; return how many targets had a usable gateway.
+
+        Gateway configs are resolved once for all target boards. Messages are queued in a
+        single batch when the outbound queue is available; otherwise they are sent inline
+        concurrently, bounded per gateway by `AGENT_NOTIFICATION_CONCURRENCY_PER_GATEWAY`.
+        """
+        configs = await gateway_configs_for_boards(
+            self.session,
+            {target.board.id: target.board for target in targets}.values(),
+        )
+        deliverable = [
+            (target, configs[target.board.id]) for target in targets if target.board.id in configs
+        ]
+        if not deliverable:
+            return 0
+        if settings.agent_notification_queue_enabled and enqueue_agent_notifications(
+            [
+                new_agent_notification(
+                    board_id=target.board.id,
+                    session_key=target.session_key,
+                    agent_name=target.agent_name,
+                    message=target.message,
+                    deliver=target.deliver,
+                )
+                for target, _config in deliverable
+            ],
+        ):
+            return len(deliverable)
+
+        limits: dict[str, asyncio.Semaphore] = {}
+
+        async def _send(target: AgentMessageTarget, config: GatewayClientConfig) -> None:
+            limit = limits.setdefault(
+                config.url,
+                asyncio.Semaphore(settings.agent_notification_concurrency_per_gateway),
+            )
+            async with limit:
+                await self.try_send_agent_message(
+                    session_key=target.session_key,
+                    config=config,
+                    agent_name=target.agent_name,
+                    message=target.message,
+                    deliver=target.deliver,
+                )
+
+        await asyncio.gather(*(_send(target, config) for target, config in deliverable))
+        return len(deliverable)
+
     @staticmethod
     def resolve_trace_id(correlation_id: str | None, *, prefix: str) -> str:
         normalized = (correlation_id or "").strip()
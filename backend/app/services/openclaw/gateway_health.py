@@ -0,0 +1,203 @@
+"""Cached gateway connectivity, version and compatibility state.
+
+Probing a gateway costs at least one dedicated websocket handshake (plus a
+`config.get` fallback for older runtimes), so status pages and admin checks read
+the most recent probe result from an in-process cache instead. A background
+monitor started with the API refreshes every registered gateway each
+`GATEWAY_HEALTH_INTERVAL_SECONDS`; callers can still force a live probe.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from time import monotonic, perf_counter
+
+from sqlmodel import select
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.db.session import async_session_maker
+from app.models.gateways import Gateway
+from app.services.openclaw.error_messages import normalize_gateway_error_message
+from app.services.openclaw.gateway_compat import check_gateway_version_compatibility
+from app.services.openclaw.gateway_resolver import optional_gateway_client_config
+from app.services.openclaw.gateway_rpc import GatewayConfig as GatewayClientConfig
+from app.services.openclaw.gateway_rpc import OpenClawGatewayError
+from app.services.openclaw.internal.circuit_breaker import gateway_circuits
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class GatewayHealthSnapshot:
+    """Result of one gateway probe."""
+
+    gateway_url: str
+    connected: bool
+    compatible: bool
+    checked_at: datetime
+    latency_ms: float | None = None
+    current_version: str | None = None
+    minimum_version: str | None = None
+    message: str | None = None
+    error: str | None = None
+
+    @property
+    def healthy(self) -> bool:
+        return self.connected and self.compatible
+
+    @property
+    def problem(self) -> str | None:
+        """Return the user-facing reason this gateway is unusable, if any."""
+        if not self.connected:
+            return self.error
+        if not self.compatible:
+            return self.message
+        return None
+
+
+@dataclass(slots=True)
+class _Entry:
+    snapshot: GatewayHealthSnapshot
+    recorded_at: float
+
+
+class GatewayHealthMonitor:
+    """Bounded in-memory store of probe results keyed by gateway connection config."""
+
+    def __init__(self, *, max_entries: int = 1024) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[GatewayClientConfig, _Entry] = OrderedDict()
+        self._inflight: dict[GatewayClientConfig, asyncio.Task[GatewayHealthSnapshot]] = {}
+
+    def cached(self, config: GatewayClientConfig) -> GatewayHealthSnapshot | None:
+        """Return the last probe result if it is newer than `GATEWAY_HEALTH_MAX_AGE_SECONDS`."""
+        entry = self._entries.get(config)
+        if entry is None:
+            return None
+        if monotonic() - entry.recorded_at > settings.gateway_health_max_age_seconds:
+            return None
+        self._entries.move_to_end(config)
+        return entry.snapshot
+
+    def invalidate(self, config: GatewayClientConfig) -> None:
+        """Drop the cached state so the next read probes the gateway again."""
+        self._entries.pop(config, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _record(self, config: GatewayClientConfig, snapshot: GatewayHealthSnapshot) -> None:
+        self._entries[config] = _Entry(snapshot=snapshot, recorded_at=monotonic())
+        self._entries.move_to_end(config)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def _probe_once(self, config: GatewayClientConfig) -> GatewayHealthSnapshot:
+        started = perf_counter()
+        try:
+            # Probe through an open circuit breaker so a recovered gateway is noticed.
+            with gateway_circuits.bypass():
+                result = await asyncio.wait_for(
+                    check_gateway_version_compatibility(config),
+                    timeout=settings.gateway_health_probe_timeout_seconds,
+                )
+        except (OpenClawGatewayError, TimeoutError) as exc:
+            if isinstance(exc, TimeoutError):
+                error = "Gateway did not respond before the health probe timed out."
+            else:
+                error = normalize_gateway_error_message(str(exc))
+            snapshot = GatewayHealthSnapshot(
+                gateway_url=config.url,
+                connected=False,
+                compatible=False,
+                checked_at=datetime.now(UTC),
+                error=error,
+            )
+        else:
+            snapshot = GatewayHealthSnapshot(
+                gateway_url=config.url,
+                connected=True,
+                compatible=result.compatible,
+                checked_at=datetime.now(UTC),
+                latency_ms=round((perf_counter() - started) * 1000, 1),
+                current_version=result.current_version,
+                minimum_version=result.minimum_version,
+                message=result.message,
+            )
+        self._record(config, snapshot)
+        logger.debug(
+            "gateway.health.probed",
+            extra={
+                "gateway_url": config.url,
+                "connected": snapshot.connected,
+                "compatible": snapshot.compatible,
+                "latency_ms": snapshot.latency_ms,
+            },
+        )
+        return snapshot
+
+    async def probe(self, config: GatewayClientConfig) -> GatewayHealthSnapshot:
+        """Probe the gateway now; concurrent callers share one in-flight probe."""
+        task = self._inflight.get(config)
+        if task is None:
+            task = asyncio.ensure_future(self._probe_once(config))
+            self._inflight[config] = task
+            task.add_done_callback(lambda _: self._inflight.pop(config, None))
+        return await asyncio.shield(task)
+
+    async def get(
+        self,
+        config: GatewayClientConfig,
+        *,
+        refresh: bool = False,
+        trust_failures: bool = True,
+    ) -> GatewayHealthSnapshot:
+        """Return cached state, probing when it is stale, missing or `refresh` is set.
+
+        With `trust_failures=False` a cached unhealthy result is re-probed, so callers
+        that gate writes on the result never reject a gateway that has since recovered.
+        """
+        if not refresh:
+            snapshot = self.cached(config)
+            if snapshot is not None and (trust_failures or snapshot.healthy):
+                return snapshot
+        return await self.probe(config)
+
+    async def probe_registered_gateways(self) -> int:
+        """Refresh the cached state of every gateway row; return how many were probed."""
+        async with async_session_maker() as session:
+            gateways = (await session.exec(select(Gateway))).all()
+            configs = {
+                config
+                for config in (optional_gateway_client_config(gateway) for gateway in gateways)
+                if config is not None
+            }
+        semaphore = asyncio.Semaphore(settings.gateway_health_probe_concurrency)
+
+        async def _probe(config: GatewayClientConfig) -> None:
+            async with semaphore:
+                await self.probe(config)
+
+        await asyncio.gather(*(_probe(config) for config in configs))
+        return len(configs)
+
+    async def run(self) -> None:
+        """Refresh registered gateways forever; cancel the task to stop."""
+        interval = settings.gateway_health_interval_seconds
+        logger.info("gateway.health.monitor.started", extra={"interval_seconds": interval})
+        try:
+            while True:
+                try:
+                    await self.probe_registered_gateways()
+                except Exception:
+                    logger.exception("gateway.health.monitor.loop_failed")
+                await asyncio.sleep(interval)
+        finally:
+            logger.info("gateway.health.monitor.stopped")
+
+
+gateway_health = GatewayHealthMonitor()
@@ -11,7 +11,9 @@ Goals:
 
 from __future__ import annotations
 
+from collections.abc import Iterable
 from typing import TYPE_CHECKING
+from uuid import UUID
 
 from fastapi import HTTPException, status
 
@@ -83,6 +85,33 @@ async def get_gateway_for_board(
     return gateway
 
 
+async def gateway_configs_for_boards(
+    session: AsyncSession,
+    boards: Iterable[Board],
+) -> dict[UUID, GatewayClientConfig]:
+    """Resolve gateway configs for many boards with a single gateway lookup.
+
+    Returns a mapping of board id to config; boards without a usable gateway are omitted.
+    Applies the same org-scoping guard as `get_gateway_for_board`.
+    """
+    boards = list(boards)
+    gateway_ids = {board.gateway_id for board in boards if board.gateway_id is not None}
+    if not gateway_ids:
+        return {}
+    gateways = {
+        gateway.id: gateway for gateway in await Gateway.objects.by_ids(gateway_ids).all(session)
+    }
+    configs: dict[UUID, GatewayClientConfig] = {}
+    for board in boards:
+        gateway = gateways.get(board.gateway_id) if board.gateway_id is not None else None
+        if gateway is None or gateway.organization_id != board.organization_id:
+            continue
+        config = optional_gateway_client_config(gateway)
+        if config is not None:
+            configs[board.id] = config
+    return configs
+
+
 async def require_gateway_for_board(
     session: AsyncSession,
     board: Board,
@@ -10,9 +10,10 @@ from __future__ import annotations
 import asyncio
 import json
 import ssl
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 from time import perf_counter, time
-from typing import Any, Literal
+from typing import Any, Literal, TypeVar
 from urllib.parse import urlencode, urlparse, urlunparse
 from uuid import uuid4
 
@@ -20,15 +21,19 @@ import websockets
 from websockets.exceptions import WebSocketException
 
 from app.core.logging import TRACE_LEVEL, get_logger
+from app.core.metrics import GATEWAY_RPC_DURATION, GATEWAY_RPC_ERRORS
 from app.services.openclaw.device_identity import (
     build_device_auth_payload,
     load_or_create_device_identity,
     public_key_raw_base64url_from_pem,
     sign_device_payload,
 )
+from app.services.openclaw.internal.circuit_breaker import gateway_circuits
+from app.services.openclaw.internal.session_cache import known_sessions
 
 PROTOCOL_VERSION = 3
 logger = get_logger(__name__)
+_T = TypeVar("_T")
 GATEWAY_OPERATOR_SCOPES = (
     "operator.read",
     "operator.admin",
@@ -166,6 +171,10 @@ class OpenClawGatewayError(RuntimeError):
     """Raised when OpenClaw gateway calls fail."""
 
 
+class GatewayCircuitOpenError(OpenClawGatewayError):
+    """Raised without contacting a gateway whose circuit breaker is open."""
+
+
 @dataclass(frozen=True)
 class GatewayConfig:
     """Connection configuration for the OpenClaw gateway."""
@@ -427,6 +436,87 @@ async def _openclaw_connect_metadata_once(
         return await _ensure_connected(ws, first_message, config)
 
 
+_TRANSPORT_ERRORS = (
+    TimeoutError,
+    ConnectionError,
+    OSError,
+    ValueError,
+    WebSocketException,
+)
+
+
+def _gateway_metric_label(gateway: str) -> str:
+    """Scheme and host of a gateway URL; paths and query strings stay out of metrics."""
+    parsed = urlparse(gateway)
+    return f"{parsed.scheme}://{parsed.netloc.rpartition('@')[2]}"
+
+
+async def _call_through_circuit(
+    config: GatewayConfig,
+    fn: Callable[[], Awaitable[_T]],
+    *,
+    method: str,
+) -> _T:
+    """Run one gateway exchange, failing fast while the gateway's circuit is open."""
+    gateway = config.url
+    gateway_label = _gateway_metric_label(gateway)
+    if not gateway_circuits.allow(gateway):
+        GATEWAY_RPC_ERRORS.labels(method, gateway_label, "circuit_open").inc()
+        circuit = gateway_circuits.state(gateway)
+        retry_at = circuit.retry_at.isoformat() if circuit.retry_at else "later"
+        raise GatewayCircuitOpenError(
+            f"Gateway circuit open after {circuit.consecutive_failures} consecutive "
+            f"transport failures; next attempt allowed at {retry_at}.",
+        )
+    started_at = perf_counter()
+    try:
+        result = await fn()
+    except OpenClawGatewayError:
+        # The gateway answered, so the transport is healthy.
+        gateway_circuits.record_success(gateway)
+        GATEWAY_RPC_ERRORS.labels(method, gateway_label, "gateway_error").inc()
+        raise
+    except _TRANSPORT_ERRORS:
+        gateway_circuits.record_failure(gateway)
+        GATEWAY_RPC_ERRORS.labels(method, gateway_label, "transport_error").inc()
+        raise
+    except BaseException:
+        gateway_circuits.release(gateway)
+        raise
+    finally:
+        GATEWAY_RPC_DURATION.labels(method, gateway_label).observe(perf_counter() - started_at)
+    gateway_circuits.record_success(gateway)
+    return result
+
+
+def _record_session_state(
+    method: str,
+    params: dict[str, Any] | None,
+    payload: object,
+    config: GatewayConfig,
+) -> None:
+    """Keep the known-session cache in step with session RPCs that succeeded."""
+    gateway = config.url
+    key = params.get("key") if params else None
+    if method == "sessions.patch" and isinstance(key, str):
+        label = params.get("label") if params else None
+        known_sessions.remember(gateway, key, label=label if isinstance(label, str) else None)
+    elif method in {"sessions.delete", "sessions.reset"} and isinstance(key, str):
+        known_sessions.forget(gateway, key)
+    elif method == "sessions.list":
+        entries = payload.get("sessions") if isinstance(payload, dict) else payload
+        if not isinstance(entries, list):
+            return
+        for entry in entries:
+            if isinstance(entry, dict) and isinstance(entry.get("key"), str):
+                label = entry.get("label")
+                known_sessions.remember(
+                    gateway,
+                    entry["key"],
+                    label=label if isinstance(label, str) else None,
+                )
+
+
 async def openclaw_call(
     method: str,
     params: dict[str, Any] | None = None,
@@ -447,17 +537,22 @@ async def openclaw_call(
         config.disable_device_pairing,
     )
     try:
-        payload = await _openclaw_call_once(
-            method,
-            params,
-            config=config,
-            gateway_url=gateway_url,
+        payload = await _call_through_circuit(
+            config,
+            lambda: _openclaw_call_once(
+                method,
+                params,
+                config=config,
+                gateway_url=gateway_url,
+            ),
+            method=method,
         )
         logger.debug(
             "gateway.rpc.call.success method=%s duration_ms=%s",
             method,
             int((perf_counter() - started_at) * 1000),
         )
+        _record_session_state(method, params, payload, config)
         return payload
     except OpenClawGatewayError:
         logger.warning(
@@ -466,13 +561,7 @@ async def openclaw_call(
             int((perf_counter() - started_at) * 1000),
         )
         raise
-    except (
-        TimeoutError,
-        ConnectionError,
-        OSError,
-        ValueError,
-        WebSocketException,
-    ) as exc:  # pragma: no cover - network/protocol errors
+    except _TRANSPORT_ERRORS as exc:  # pragma: no cover - network/protocol errors
         logger.error(
             "gateway.rpc.call.transport_error method=%s duration_ms=%s error_type=%s",
             method,
@@ -491,9 +580,13 @@ async def openclaw_connect_metadata(*, config: GatewayConfig) -> object:
         _redacted_url_for_log(gateway_url),
     )
     try:
-        metadata = await _openclaw_connect_metadata_once(
-            config=config,
-            gateway_url=gateway_url,
+        metadata = await _call_through_circuit(
+            config,
+            lambda: _openclaw_connect_metadata_once(
+                config=config,
+                gateway_url=gateway_url,
+            ),
+            method="connect",
         )
         logger.debug(
             "gateway.rpc.connect_metadata.success duration_ms=%s",
@@ -506,13 +599,7 @@ async def openclaw_connect_metadata(*, config: GatewayConfig) -> object:
             int((perf_counter() - started_at) * 1000),
         )
         raise
-    except (
-        TimeoutError,
-        ConnectionError,
-        OSError,
-        ValueError,
-        WebSocketException,
-    ) as exc:  # pragma: no cover - network/protocol errors
+    except _TRANSPORT_ERRORS as exc:  # pragma: no cover - network/protocol errors
         logger.error(
             "gateway.rpc.connect_metadata.transport_error duration_ms=%s error_type=%s",
             int((perf_counter() - started_at) * 1000),
@@ -0,0 +1,131 @@
+"""Per-gateway circuit breaker for RPC transport failures.
+
+After `GATEWAY_CIRCUIT_FAILURE_THRESHOLD` consecutive transport failures (refused
+connections, timeouts, handshake errors) against one gateway URL the circuit
+opens and calls fail immediately instead of waiting on a dead host. Once
+`GATEWAY_CIRCUIT_OPEN_SECONDS` have passed, a single call is let through as a
+probe: success closes the circuit, another transport failure re-opens it.
+
+Gateway-level errors (the gateway answered with an error frame) prove the host is
+reachable and count as successes here.
+
+Health probes run inside `bypass()`: they reach the gateway even while its circuit
+is open, and their outcome still counts, so a successful probe closes the circuit.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from time import monotonic
+from typing import Literal
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+CircuitStateName = Literal["closed", "open", "half_open"]
+
+_bypassing: ContextVar[bool] = ContextVar("gateway_circuit_bypass", default=False)
+
+
+@dataclass(frozen=True, slots=True)
+class GatewayCircuitState:
+    """Point-in-time view of one gateway circuit."""
+
+    state: CircuitStateName
+    consecutive_failures: int = 0
+    retry_at: datetime | None = None
+
+
+@dataclass(slots=True)
+class _Circuit:
+    failures: int = 0
+    opened_at: float | None = None
+    probe_in_flight: bool = False
+
+
+class GatewayCircuitBreaker:
+    """Track consecutive transport failures and gate calls per gateway URL."""
+
+    def __init__(self) -> None:
+        self._circuits: dict[str, _Circuit] = {}
+
+    @staticmethod
+    def _enabled() -> bool:
+        return settings.gateway_circuit_failure_threshold > 0
+
+    @contextmanager
+    def bypass(self) -> Iterator[None]:
+        """Let calls in this context through an open circuit; their outcomes still count."""
+        token = _bypassing.set(True)
+        try:
+            yield
+        finally:
+            _bypassing.reset(token)
+
+    def allow(self, gateway: str) -> bool:
+        """Return whether a call may go out; claims the probe slot when half-open."""
+        if not self._enabled() or _bypassing.get():
+            return True
+        circuit = self._circuits.get(gateway)
+        if circuit is None or circuit.opened_at is None:
+            return True
+        if monotonic() - circuit.opened_at < settings.gateway_circuit_open_seconds:
+            return False
+        if circuit.probe_in_flight:
+            return False
+        circuit.probe_in_flight = True
+        return True
+
+    def record_success(self, gateway: str) -> None:
+        circuit = self._circuits.pop(gateway, None)
+        if circuit is not None and circuit.opened_at is not None:
+            logger.info("gateway.circuit.closed", extra={"gateway_url": gateway})
+
+    def record_failure(self, gateway: str) -> None:
+        if not self._enabled():
+            return
+        circuit = self._circuits.setdefault(gateway, _Circuit())
+        circuit.failures += 1
+        was_open = circuit.opened_at is not None
+        if was_open or circuit.failures >= settings.gateway_circuit_failure_threshold:
+            circuit.opened_at = monotonic()
+            circuit.probe_in_flight = False
+            if not was_open:
+                logger.warning(
+                    "gateway.circuit.opened",
+                    extra={"gateway_url": gateway, "failures": circuit.failures},
+                )
+
+    def release(self, gateway: str) -> None:
+        """Give back a probe slot whose call ended without a verdict (e.g. cancelled)."""
+        if _bypassing.get():
+            # Bypassing calls never claim the slot, so they must not free another's.
+            return
+        circuit = self._circuits.get(gateway)
+        if circuit is not None:
+            circuit.probe_in_flight = False
+
+    def state(self, gateway: str) -> GatewayCircuitState:
+        circuit = self._circuits.get(gateway)
+        if circuit is None:
+            return GatewayCircuitState(state="closed")
+        if circuit.opened_at is None:
+            return GatewayCircuitState(state="closed", consecutive_failures=circuit.failures)
+        remaining = settings.gateway_circuit_open_seconds - (monotonic() - circuit.opened_at)
+        return GatewayCircuitState(
+            state="open" if remaining > 0 else "half_open",
+            consecutive_failures=circuit.failures,
+            retry_at=datetime.now(UTC) + timedelta(seconds=max(0.0, remaining)),
+        )
+
+    def clear(self) -> None:
+        self._circuits.clear()
+
+
+gateway_circuits = GatewayCircuitBreaker()
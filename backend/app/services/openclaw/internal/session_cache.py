@@ -0,0 +1,88 @@
+"""Process-local cache of gateway session keys known to exist.
+
+Sending a chat message normally costs two gateway round trips: `sessions.patch` to
+ensure the session, then `chat.send`. Once a session has been ensured (or seen in
+`sessions.list`) it is recorded here so steady-state messaging is a single RPC.
+Entries are dropped on `sessions.delete`/`sessions.reset`, on "missing session"
+errors, and after `GATEWAY_SESSION_CACHE_TTL_SECONDS`.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import monotonic
+
+from app.core.config import settings
+
+_MISSING_SESSION_MARKERS = (
+    "not found",
+    "unknown session",
+    "no such session",
+    "session does not exist",
+)
+
+
+def is_missing_session_error(exc: Exception) -> bool:
+    """Return whether a gateway error indicates the target session does not exist."""
+    message = str(exc).lower()
+    if not message:
+        return False
+    return any(marker in message for marker in _MISSING_SESSION_MARKERS)
+
+
+@dataclass(frozen=True, slots=True)
+class _KnownSession:
+    label: str | None
+    seen_at: float
+
+
+class KnownSessionCache:
+    """Bounded per-gateway LRU of session keys known to exist on the gateway."""
+
+    def __init__(self, *, max_entries_per_gateway: int = 4096) -> None:
+        self._max_entries = max_entries_per_gateway
+        self._gateways: dict[str, OrderedDict[str, _KnownSession]] = {}
+
+    def is_known(self, gateway: str, session_key: str, *, label: str | None = None) -> bool:
+        """Return whether `session_key` exists (with `label`, when one is given)."""
+        ttl = settings.gateway_session_cache_ttl_seconds
+        if ttl <= 0:
+            return False
+        sessions = self._gateways.get(gateway)
+        entry = sessions.get(session_key) if sessions is not None else None
+        if entry is None or sessions is None:
+            return False
+        if monotonic() - entry.seen_at > ttl:
+            del sessions[session_key]
+            return False
+        if label is not None and entry.label != label:
+            return False
+        sessions.move_to_end(session_key)
+        return True
+
+    def remember(self, gateway: str, session_key: str, *, label: str | None = None) -> None:
+        """Record that `session_key` exists on `gateway`."""
+        sessions = self._gateways.setdefault(gateway, OrderedDict())
+        if label is None and session_key in sessions:
+            label = sessions[session_key].label
+        sessions[session_key] = _KnownSession(label=label, seen_at=monotonic())
+        sessions.move_to_end(session_key)
+        while len(sessions) > self._max_entries:
+            sessions.popitem(last=False)
+
+    def forget(self, gateway: str, session_key: str) -> None:
+        """Drop `session_key` so the next send re-ensures it."""
+        sessions = self._gateways.get(gateway)
+        if sessions is not None:
+            sessions.pop(session_key, None)
+
+    def clear(self, gateway: str | None = None) -> None:
+        """Drop every entry, or only the entries for one gateway."""
+        if gateway is None:
+            self._gateways.clear()
+        else:
+            self._gateways.pop(gateway, None)
+
+
+known_sessions = KnownSessionCache()
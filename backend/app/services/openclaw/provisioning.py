@@ -7,14 +7,25 @@ DB-backed workflows (template sync, lead-agent record creation) live in
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
 import re
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
-from jinja2 import Environment, FileSystemLoader, StrictUndefined, select_autoescape
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    StrictUndefined,
+    Template,
+    TemplateNotFound,
+    select_autoescape,
+)
 
 from app.core.config import settings
 from app.models.agents import Agent
@@ -45,6 +56,7 @@ from app.services.openclaw.gateway_rpc import (
 )
 from app.services.openclaw.internal.agent_key import agent_key as _agent_key
 from app.services.openclaw.internal.agent_key import slugify
+from app.services.openclaw.internal.session_cache import is_missing_session_error
 from app.services.openclaw.internal.session_keys import (
     board_agent_session_key,
     board_lead_session_key,
@@ -69,18 +81,7 @@ _ROLE_SOUL_WORD_RE = re.compile(r"[a-z0-9]+")
 
 
 def _is_missing_session_error(exc: OpenClawGatewayError) -> bool:
-    message = str(exc).lower()
-    if not message:
-        return False
-    return any(
-        marker in message
-        for marker in (
-            "not found",
-            "unknown session",
-            "no such session",
-            "session does not exist",
-        )
-    )
+    return is_missing_session_error(exc)
 
 
 def _is_missing_agent_error(exc: OpenClawGatewayError) -> bool:
@@ -130,14 +131,86 @@ def _channel_heartbeat_visibility_patch(config_data: dict[str, Any]) -> dict[str
     return {"defaults": {"heartbeat": merged}}
 
 
+_OVERRIDE_TEMPLATE_CACHE_MAX = 256
+_template_env_cache: Environment | None = None
+_override_template_cache: OrderedDict[str, Template] = OrderedDict()
+
+
+def _template_bytecode_cache() -> FileSystemBytecodeCache | None:
+    try:
+        return FileSystemBytecodeCache()
+    except (OSError, RuntimeError):
+        # Read-only or shared temp dirs: fall back to the in-memory template cache.
+        return None
+
+
 def _template_env() -> Environment:
-    return Environment(
-        loader=FileSystemLoader(_templates_root()),
-        # Render markdown verbatim (HTML escaping makes it harder for agents to read).
-        autoescape=select_autoescape(default=False),
-        undefined=StrictUndefined,
-        keep_trailing_newline=True,
-    )
+    """Return the process-wide Jinja environment for workspace templates.
+
+    Compiled templates are kept in the environment cache and persisted to a
+    bytecode cache so new worker processes skip recompilation. In dev, templates
+    are reloaded when their file mtime changes; elsewhere they are compiled once.
+    """
+    global _template_env_cache
+    if _template_env_cache is None:
+        _template_env_cache = Environment(
+            loader=FileSystemLoader(_templates_root()),
+            # Render markdown verbatim (HTML escaping makes it harder for agents to read).
+            autoescape=select_autoescape(default=False),
+            undefined=StrictUndefined,
+            keep_trailing_newline=True,
+            auto_reload=settings.environment == "dev",
+            bytecode_cache=_template_bytecode_cache(),
+        )
+    return _template_env_cache
+
+
+def _override_template(env: Environment, source: str) -> Template:
+    """Compile a per-agent template override once per distinct content (LRU-bounded)."""
+    key = _content_hash(source)
+    template = _override_template_cache.get(key)
+    if template is None:
+        template = env.from_string(source)
+        _override_template_cache[key] = template
+        while len(_override_template_cache) > _OVERRIDE_TEMPLATE_CACHE_MAX:
+            _override_template_cache.popitem(last=False)
+    else:
+        _override_template_cache.move_to_end(key)
+    return template
+
+
+def _load_template(env: Environment, template_name: str) -> Template:
+    try:
+        return env.get_template(template_name)
+    except TemplateNotFound as exc:
+        msg = f"Missing template file: {template_name}"
+        raise FileNotFoundError(msg) from exc
+
+
+def _content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _is_unchanged_on_gateway(
+    entry: dict[str, Any] | None,
+    *,
+    content: str,
+    content_hash: str,
+    last_pushed_hash: str | None,
+) -> bool:
+    """Return whether the gateway copy still matches the content we last pushed.
+
+    The recorded hash alone is not enough: the file must still exist on the gateway, and
+    when the listing reports a size it must match, so deleted or drifted files get rewritten.
+    """
+    if last_pushed_hash != content_hash:
+        return False
+    if not entry or bool(entry.get("missing")):
+        return False
+    size = entry.get("size")
+    if isinstance(size, int) and size != len(content.encode("utf-8")):
+        return False
+    return True
 
 
 def _heartbeat_template_name(agent: Agent) -> str:
@@ -410,15 +483,11 @@ def _render_agent_files(
                 if template_overrides and name in template_overrides
                 else _heartbeat_template_name(agent)
             )
-            heartbeat_path = _templates_root() / heartbeat_template
-            if not heartbeat_path.exists():
-                msg = f"Missing template file: {heartbeat_template}"
-                raise FileNotFoundError(msg)
-            rendered[name] = env.get_template(heartbeat_template).render(**context).strip()
+            rendered[name] = _load_template(env, heartbeat_template).render(**context).strip()
             continue
         override = overrides.get(name)
         if override:
-            rendered[name] = env.from_string(override).render(**context).strip()
+            rendered[name] = _override_template(env, override).render(**context).strip()
             continue
         template_name = (
             template_overrides[name] if template_overrides and name in template_overrides else name
@@ -426,11 +495,7 @@ def _render_agent_files(
         if template_name == "SOUL.md":
             # Use shared Jinja soul template as the default implementation.
             template_name = "BOARD_SOUL.md.j2"
-        path = _templates_root() / template_name
-        if not path.exists():
-            msg = f"Missing template file: {template_name}"
-            raise FileNotFoundError(msg)
-        rendered[name] = env.get_template(template_name).render(**context).strip()
+        rendered[name] = _load_template(env, template_name).render(**context).strip()
     return rendered
 
 
@@ -498,11 +563,22 @@ class GatewayControlPlane(ABC):
 class OpenClawGatewayControlPlane(GatewayControlPlane):
     """OpenClaw gateway RPC implementation of the lifecycle control-plane contract."""
 
-    def __init__(self, config: GatewayClientConfig) -> None:
+    def __init__(self, config: GatewayClientConfig, *, max_in_flight: int | None = None) -> None:
         self._config = config
+        # Optional per-gateway backpressure shared by every RPC issued through this instance.
+        self._in_flight = asyncio.Semaphore(max_in_flight) if max_in_flight else None
+        # config.get + config.patch is a read-modify-write guarded by baseHash; serialize it
+        # so concurrent agent upserts through one control plane don't race each other.
+        self._config_lock = asyncio.Lock()
+
+    async def _call(self, method: str, params: dict[str, Any] | None = None) -> object:
+        if self._in_flight is None:
+            return await openclaw_call(method, params, config=self._config)
+        async with self._in_flight:
+            return await openclaw_call(method, params, config=self._config)
 
     async def health(self) -> object:
-        return await openclaw_call("health", config=self._config)
+        return await self._call("health")
 
     async def ensure_agent_session(self, session_key: str, *, label: str | None = None) -> None:
         if not session_key:
@@ -512,25 +588,24 @@ class OpenClawGatewayControlPlane(GatewayControlPlane):
     async def reset_agent_session(self, session_key: str) -> None:
         if not session_key:
             return
-        await openclaw_call("sessions.reset", {"key": session_key}, config=self._config)
+        await self._call("sessions.reset", {"key": session_key})
 
     async def delete_agent_session(self, session_key: str) -> None:
         if not session_key:
             return
-        await openclaw_call("sessions.delete", {"key": session_key}, config=self._config)
+        await self._call("sessions.delete", {"key": session_key})
 
     async def upsert_agent(self, registration: GatewayAgentRegistration) -> None:
         # Prefer an idempotent "create then update" flow.
         # - Avoids enumerating gateway agents for existence checks.
         # - Ensures we always hit the "create" RPC first, per lifecycle expectations.
         try:
-            await openclaw_call(
+            await self._call(
                 "agents.create",
                 {
                     "name": registration.agent_id,
                     "workspace": registration.workspace_path,
                 },
-                config=self._config,
             )
         except OpenClawGatewayError as exc:
             message = str(exc).lower()
@@ -538,31 +613,28 @@ class OpenClawGatewayControlPlane(GatewayControlPlane):
                 marker in message for marker in ("already", "exist", "duplicate", "conflict")
             ):
                 raise
-        await openclaw_call(
+        await self._call(
             "agents.update",
             {
                 "agentId": registration.agent_id,
                 "name": registration.name,
                 "workspace": registration.workspace_path,
             },
-            config=self._config,
         )
         await self.patch_agent_heartbeats(
             [(registration.agent_id, registration.workspace_path, registration.heartbeat)],
         )
 
     async def delete_agent(self, agent_id: str, *, delete_files: bool = True) -> None:
-        await openclaw_call(
+        await self._call(
             "agents.delete",
             {"agentId": agent_id, "deleteFiles": delete_files},
-            config=self._config,
         )
 
     async def list_agent_files(self, agent_id: str) -> dict[str, dict[str, Any]]:
-        payload = await openclaw_call(
+        payload = await self._call(
             "agents.files.list",
             {"agentId": agent_id},
-            config=self._config,
         )
         if not isinstance(payload, dict):
             return {}
@@ -581,48 +653,46 @@ class OpenClawGatewayControlPlane(GatewayControlPlane):
         return index
 
     async def get_agent_file_payload(self, *, agent_id: str, name: str) -> object:
-        return await openclaw_call(
+        return await self._call(
             "agents.files.get",
             {"agentId": agent_id, "name": name},
-            config=self._config,
         )
 
     async def set_agent_file(self, *, agent_id: str, name: str, content: str) -> None:
-        await openclaw_call(
+        await self._call(
             "agents.files.set",
             {"agentId": agent_id, "name": name, "content": content},
-            config=self._config,
         )
 
     async def delete_agent_file(self, *, agent_id: str, name: str) -> None:
-        await openclaw_call(
+        await self._call(
             "agents.files.delete",
             {"agentId": agent_id, "name": name},
-            config=self._config,
         )
 
     async def patch_agent_heartbeats(
         self,
         entries: list[tuple[str, str, dict[str, Any]]],
     ) -> None:
-        base_hash, raw_list, config_data = await _gateway_config_agent_list(self._config)
-        entry_by_id = _heartbeat_entry_map(entries)
-        new_list = _updated_agent_list(raw_list, entry_by_id)
-
-        patch: dict[str, Any] = {"agents": {"list": new_list}}
-        channels_patch = _channel_heartbeat_visibility_patch(config_data)
-        if channels_patch is not None:
-            patch["channels"] = channels_patch
-        params = {"raw": json.dumps(patch)}
-        if base_hash:
-            params["baseHash"] = base_hash
-        await openclaw_call("config.patch", params, config=self._config)
-
-
-async def _gateway_config_agent_list(
-    config: GatewayClientConfig,
+        async with self._config_lock:
+            cfg = await self._call("config.get")
+            base_hash, raw_list, config_data = _gateway_config_agent_list(cfg)
+            entry_by_id = _heartbeat_entry_map(entries)
+            new_list = _updated_agent_list(raw_list, entry_by_id)
+
+            patch: dict[str, Any] = {"agents": {"list": new_list}}
+            channels_patch = _channel_heartbeat_visibility_patch(config_data)
+            if channels_patch is not None:
+                patch["channels"] = channels_patch
+            params = {"raw": json.dumps(patch)}
+            if base_hash:
+                params["baseHash"] = base_hash
+            await self._call("config.patch", params)
+
+
+def _gateway_config_agent_list(
+    cfg: object,
 ) -> tuple[str | None, list[object], dict[str, Any]]:
-    cfg = await openclaw_call("config.get", config=config)
     if not isinstance(cfg, dict):
         msg = "config.get returned invalid payload"
         raise OpenClawGatewayError(msg)
@@ -747,7 +817,9 @@ class BaseAgentLifecycleManager(ABC):
             self._preserve_files(agent) if agent is not None else set(PRESERVE_AGENT_EDITABLE_FILES)
         )
         target_file_names = desired_file_names or set(rendered.keys())
-        unsupported_names: list[str] = []
+        last_pushed_hashes = dict(agent.workspace_file_hashes or {}) if agent is not None else {}
+        pushed_hashes = dict(last_pushed_hashes)
+        writes: list[tuple[str, str, str]] = []
 
         for name, content in rendered.items():
             if content == "":
@@ -759,6 +831,19 @@ class BaseAgentLifecycleManager(ABC):
                 entry = existing_files.get(name)
                 if entry and not bool(entry.get("missing")):
                     continue
+            content_hash = _content_hash(content)
+            # Skip files whose rendered content matches what we last pushed; most syncs
+            # after a deploy then become near no-ops. `overwrite` always re-pushes.
+            if not overwrite and _is_unchanged_on_gateway(
+                existing_files.get(name),
+                content=content,
+                content_hash=content_hash,
+                last_pushed_hash=last_pushed_hashes.get(name),
+            ):
+                continue
+            writes.append((name, content, content_hash))
+
+        async def _write(name: str, content: str) -> str | None:
             try:
                 await self._control_plane.set_agent_file(
                     agent_id=agent_id,
@@ -767,9 +852,30 @@ class BaseAgentLifecycleManager(ABC):
                 )
             except OpenClawGatewayError as exc:
                 if "unsupported file" in str(exc).lower():
-                    unsupported_names.append(name)
-                    continue
+                    return name
                 raise
+            return None
+
+        # Files are independent; push them concurrently and let the control plane apply
+        # per-gateway backpressure. Wait for every write before surfacing the first error.
+        outcomes = await asyncio.gather(
+            *(_write(name, content) for name, content, _hash in writes),
+            return_exceptions=True,
+        )
+        unsupported_names: list[str] = []
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                raise outcome
+            if outcome is not None:
+                unsupported_names.append(outcome)
+        for name, _content, content_hash in writes:
+            if name in unsupported_names:
+                pushed_hashes.pop(name, None)
+            else:
+                pushed_hashes[name] = content_hash
+        if agent is not None and pushed_hashes != last_pushed_hashes:
+            # Assign a new dict so the JSON column is flagged dirty; callers persist the agent.
+            agent.workspace_file_hashes = pushed_hashes
 
         if agent is not None and agent.is_board_lead and unsupported_names:
             unsupported_sorted = ", ".join(sorted(set(unsupported_names)))
@@ -801,6 +907,10 @@ class BaseAgentLifecycleManager(ABC):
                 ):
                     continue
                 raise
+        if stale_names & pushed_hashes.keys():
+            agent.workspace_file_hashes = {
+                name: value for name, value in pushed_hashes.items() if name not in stale_names
+            }
 
     async def provision(
         self,
@@ -1047,6 +1157,7 @@ class OpenClawGatewayProvisioner:
         wake: bool = True,
         deliver_wakeup: bool = True,
         wakeup_verb: str | None = None,
+        control_plane: OpenClawGatewayControlPlane | None = None,
     ) -> None:
         """Create/update an agent, sync all template files, and optionally wake the agent.
 
@@ -1054,6 +1165,9 @@ class OpenClawGatewayProvisioner:
         1) create agent (idempotent)
         2) set/update all template files
         3) wake the agent session (chat.send)
+
+        Bulk callers may pass a shared `control_plane` so every agent's RPCs draw from the
+        same per-gateway in-flight budget.
         """
 
         if not gateway.url:
@@ -1078,7 +1192,8 @@ class OpenClawGatewayProvisioner:
             session_key = _session_key(agent)
             manager_type = BoardAgentLifecycleManager
 
-        control_plane = _control_plane_for_gateway(gateway)
+        if control_plane is None:
+            control_plane = _control_plane_for_gateway(gateway)
         manager = manager_type(gateway, control_plane)
         await manager.provision(
             agent=agent,
@@ -11,7 +11,7 @@ from __future__ import annotations
 import asyncio
 import json
 import re
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Any, Literal, Protocol, TypeVar
 from uuid import UUID, uuid4
@@ -22,6 +22,7 @@ from sqlmodel import col, select
 from sse_starlette.sse import EventSourceResponse
 
 from app.core.agent_tokens import verify_agent_token
+from app.core.config import settings
 from app.core.logging import TRACE_LEVEL
 from app.core.time import utcnow
 from app.db import crud
@@ -91,7 +92,7 @@ from app.services.organizations import (
 )
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncIterator, Sequence
+    from collections.abc import AsyncIterator, Callable, Sequence
 
     from fastapi_pagination.limit_offset import LimitOffsetPage
     from sqlalchemy.sql.elements import ColumnElement
@@ -102,6 +103,20 @@ if TYPE_CHECKING:
 
 
 _T = TypeVar("_T")
+GatewayTemplateSyncStatus = Literal["updated", "skipped", "failed"]
+
+
+@dataclass(frozen=True, slots=True)
+class GatewayTemplateSyncProgress:
+    """Per-agent outcome reported as a gateway template sync makes progress."""
+
+    agent_id: UUID
+    agent_name: str
+    board_id: UUID | None
+    status: GatewayTemplateSyncStatus
+    completed: int
+    total: int
+    message: str | None = None
 
 
 @dataclass(frozen=True)
@@ -116,6 +131,9 @@ class GatewayTemplateSyncOptions:
     force_bootstrap: bool = False
     overwrite: bool = False
     board_id: UUID | None = None
+    # Agents synced in parallel; defaults to `settings.gateway_template_sync_concurrency`.
+    concurrency: int | None = None
+    on_progress: Callable[[GatewayTemplateSyncProgress], None] | None = None
 
 
 @dataclass(frozen=True, slots=True)
@@ -160,8 +178,6 @@ class OpenClawProvisioningService(OpenClawDBService):
     ) -> tuple[Agent, bool]:
         """Ensure a board has a lead agent; return `(agent, created)`."""
         board = request.board
-        config_options = request.options
-
         existing = (
             await self.session.exec(
                 select(Agent)
@@ -170,25 +186,70 @@ class OpenClawProvisioningService(OpenClawDBService):
             )
         ).first()
         if existing:
-            desired_name = config_options.agent_name or self.lead_agent_name(board)
-            changed = False
-            if existing.name != desired_name:
-                existing.name = desired_name
-                changed = True
-            if existing.gateway_id != request.gateway.id:
-                existing.gateway_id = request.gateway.id
-                changed = True
-            desired_session_key = self.lead_session_key(board)
-            if existing.openclaw_session_id != desired_session_key:
-                existing.openclaw_session_id = desired_session_key
-                changed = True
-            if changed:
-                existing.updated_at = utcnow()
+            if self._reconcile_existing_lead(existing, request):
                 self.session.add(existing)
                 await self.session.commit()
                 await self.session.refresh(existing)
             return existing, False
 
+        return await self._create_board_lead_agent(request)
+
+    async def reconcile_board_lead_agents(
+        self,
+        requests: list[LeadAgentRequest],
+    ) -> dict[UUID, Agent]:
+        """Load and reconcile existing lead agents for many boards in one DB pass.
+
+        Existing leads are loaded with one query and reconciled in one commit. Boards
+        without a lead are left out of the result; provisioning one makes gateway RPCs,
+        so callers run `ensure_board_lead_agent` for them under their own bounds.
+        """
+        if not requests:
+            return {}
+        board_ids = [request.board.id for request in requests]
+        leads = await self.session.exec(
+            select(Agent)
+            .where(col(Agent.board_id).in_(board_ids))
+            .where(col(Agent.is_board_lead).is_(True)),
+        )
+        existing_by_board: dict[UUID, Agent] = {}
+        for lead in leads:
+            if lead.board_id is not None:
+                existing_by_board.setdefault(lead.board_id, lead)
+
+        changed: list[Agent] = []
+        for request in requests:
+            existing = existing_by_board.get(request.board.id)
+            if existing is not None and self._reconcile_existing_lead(existing, request):
+                self.session.add(existing)
+                changed.append(existing)
+        if changed:
+            await self.session.commit()
+            for agent in changed:
+                await self.session.refresh(agent)
+        return existing_by_board
+
+    def _reconcile_existing_lead(self, existing: Agent, request: LeadAgentRequest) -> bool:
+        board = request.board
+        desired_name = request.options.agent_name or self.lead_agent_name(board)
+        changed = False
+        if existing.name != desired_name:
+            existing.name = desired_name
+            changed = True
+        if existing.gateway_id != request.gateway.id:
+            existing.gateway_id = request.gateway.id
+            changed = True
+        desired_session_key = self.lead_session_key(board)
+        if existing.openclaw_session_id != desired_session_key:
+            existing.openclaw_session_id = desired_session_key
+            changed = True
+        if changed:
+            existing.updated_at = utcnow()
+        return changed
+
+    async def _create_board_lead_agent(self, request: LeadAgentRequest) -> tuple[Agent, bool]:
+        board = request.board
+        config_options = request.options
         merged_identity_profile: dict[str, Any] = {
             "role": "Board Lead",
             "communication_style": "direct, concise, practical",
@@ -239,23 +300,19 @@ class OpenClawProvisioningService(OpenClawDBService):
         gateway: Gateway,
         options: GatewayTemplateSyncOptions,
     ) -> GatewayTemplatesSyncResult:
-        """Synchronize AGENTS/TOOLS/etc templates to gateway-connected agents."""
+        """Synchronize AGENTS/TOOLS/etc templates to gateway-connected agents.
+
+        Board agents are synced concurrently (bounded by `options.concurrency`) while every
+        RPC shares one per-gateway in-flight budget. Per-agent outcomes are reported through
+        `options.on_progress` as they complete.
+        """
         template_user = options.user
         if template_user is None:
             template_user = await get_org_owner_user(
                 self.session,
                 organization_id=gateway.organization_id,
             )
-            options = GatewayTemplateSyncOptions(
-                user=template_user,
-                include_main=options.include_main,
-                lead_only=options.lead_only,
-                reset_sessions=options.reset_sessions,
-                rotate_tokens=options.rotate_tokens,
-                force_bootstrap=options.force_bootstrap,
-                overwrite=options.overwrite,
-                board_id=options.board_id,
-            )
+            options = replace(options, user=template_user)
 
         if template_user is None:
             result = _base_result(
@@ -291,14 +348,17 @@ class OpenClawProvisioningService(OpenClawDBService):
                 allow_insecure_tls=gateway.allow_insecure_tls,
                 disable_device_pairing=gateway.disable_device_pairing,
             ),
+            max_in_flight=settings.gateway_rpc_max_in_flight,
         )
         ctx = _SyncContext(
             session=self.session,
             gateway=gateway,
             control_plane=control_plane,
-            backoff=GatewayBackoff(timeout_s=10 * 60, timeout_context="template sync"),
+            backoff=_template_sync_backoff(),
             options=options,
             provisioner=self._gateway,
+            session_lock=asyncio.Lock(),
+            progress=_SyncProgress(on_progress=options.on_progress),
         )
         if not await _ping_gateway(ctx, result):
             return result
@@ -322,7 +382,8 @@ class OpenClawProvisioningService(OpenClawDBService):
         else:
             agents = []
 
-        stop_sync = False
+        ctx.progress.total = len(agents) + (1 if options.include_main else 0)
+        targets: list[tuple[Agent, Board]] = []
         for agent in agents:
             board = boards_by_id.get(agent.board_id) if agent.board_id is not None else None
             if board is None:
@@ -332,19 +393,57 @@ class OpenClawProvisioningService(OpenClawDBService):
                     agent=agent,
                     message="Skipping agent: board not found for agent.",
                 )
+                ctx.progress.report(agent, "skipped")
                 continue
             if board.id in paused_board_ids:
                 result.agents_skipped += 1
+                ctx.progress.report(agent, "skipped", message="Board is paused.")
                 continue
-            stop_sync = await _sync_one_agent(ctx, result, agent, board)
-            if stop_sync:
-                break
+            targets.append((agent, board))
 
+        stop_sync = await _sync_agents_concurrently(
+            ctx,
+            result,
+            targets,
+            concurrency=options.concurrency or settings.gateway_template_sync_concurrency,
+        )
         if not stop_sync and options.include_main:
             await _sync_main_agent(ctx, result)
+        # Persist the workspace file hashes recorded while provisioning, in one commit.
+        async with ctx.session_lock:
+            await self.session.commit()
         return result
 
 
+@dataclass
+class _SyncProgress:
+    on_progress: Callable[[GatewayTemplateSyncProgress], None] | None
+    total: int = 0
+    completed: int = 0
+
+    def report(
+        self,
+        agent: Agent,
+        status: GatewayTemplateSyncStatus,
+        *,
+        message: str | None = None,
+    ) -> None:
+        self.completed += 1
+        if self.on_progress is None:
+            return
+        self.on_progress(
+            GatewayTemplateSyncProgress(
+                agent_id=agent.id,
+                agent_name=agent.name,
+                board_id=agent.board_id,
+                status=status,
+                completed=self.completed,
+                total=self.total,
+                message=message,
+            ),
+        )
+
+
 @dataclass(frozen=True)
 class _SyncContext:
     session: AsyncSession
@@ -353,6 +452,13 @@ class _SyncContext:
     backoff: GatewayBackoff
     options: GatewayTemplateSyncOptions
     provisioner: OpenClawGatewayProvisioner
+    # The sync shares one AsyncSession across concurrent agent tasks; DB writes take this lock.
+    session_lock: asyncio.Lock
+    progress: _SyncProgress
+
+
+def _template_sync_backoff() -> GatewayBackoff:
+    return GatewayBackoff(timeout_s=10 * 60, timeout_context="template sync")
 
 
 def _parse_tools_md(content: str) -> dict[str, str]:
@@ -459,12 +565,13 @@ def _append_sync_error(
     )
 
 
-async def _rotate_agent_token(session: AsyncSession, agent: Agent) -> str:
-    token = mint_agent_token(agent)
-    agent.updated_at = utcnow()
-    session.add(agent)
-    await session.commit()
-    await session.refresh(agent)
+async def _rotate_agent_token(ctx: _SyncContext, agent: Agent) -> str:
+    async with ctx.session_lock:
+        token = mint_agent_token(agent)
+        agent.updated_at = utcnow()
+        ctx.session.add(agent)
+        await ctx.session.commit()
+        await ctx.session.refresh(agent)
     return token
 
 
@@ -543,14 +650,14 @@ async def _resolve_agent_auth_token(
                 ),
             )
             return None, False
-        auth_token = await _rotate_agent_token(ctx.session, agent)
+        auth_token = await _rotate_agent_token(ctx, agent)
 
     if agent.agent_token_hash and not verify_agent_token(
         auth_token,
         agent.agent_token_hash,
     ):
         if ctx.options.rotate_tokens:
-            auth_token = await _rotate_agent_token(ctx.session, agent)
+            auth_token = await _rotate_agent_token(ctx, agent)
         else:
             _append_sync_error(
                 result,
@@ -564,6 +671,43 @@ async def _resolve_agent_auth_token(
     return auth_token, False
 
 
+async def _sync_agents_concurrently(
+    ctx: _SyncContext,
+    result: GatewayTemplatesSyncResult,
+    targets: list[tuple[Agent, Board]],
+    *,
+    concurrency: int,
+) -> bool:
+    """Sync board agents with bounded parallelism; return True when the sync must stop.
+
+    A gateway timeout on any agent stops new agents from starting (in-flight agents finish),
+    mirroring the sequential behavior of aborting the remaining sync.
+    """
+    if not targets:
+        return False
+    slots = asyncio.Semaphore(max(1, concurrency))
+    stop = asyncio.Event()
+
+    async def _run(agent: Agent, board: Board) -> None:
+        async with slots:
+            if stop.is_set():
+                return
+            # Backoff state is per call chain; give each agent its own.
+            agent_ctx = replace(ctx, backoff=_template_sync_backoff())
+            if await _sync_one_agent(agent_ctx, result, agent, board):
+                stop.set()
+
+    tasks = [asyncio.create_task(_run(agent, board)) for agent, board in targets]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    return stop.is_set()
+
+
 async def _sync_one_agent(
     ctx: _SyncContext,
     result: GatewayTemplatesSyncResult,
@@ -578,8 +722,10 @@ async def _sync_one_agent(
         agent_gateway_id=_agent_key(agent),
     )
     if fatal:
+        ctx.progress.report(agent, "failed")
         return True
     if not auth_token:
+        ctx.progress.report(agent, "skipped")
         return False
     try:
 
@@ -595,6 +741,7 @@ async def _sync_one_agent(
                 overwrite=ctx.options.overwrite,
                 reset_session=ctx.options.reset_sessions,
                 wake=False,
+                control_plane=ctx.control_plane,
             )
             return True
 
@@ -603,17 +750,16 @@ async def _sync_one_agent(
     except TimeoutError as exc:  # pragma: no cover - gateway/network dependent
         result.agents_skipped += 1
         _append_sync_error(result, agent=agent, board=board, message=str(exc))
+        ctx.progress.report(agent, "failed", message=str(exc))
         return True
     except (OSError, RuntimeError, ValueError) as exc:  # pragma: no cover
         result.agents_skipped += 1
-        _append_sync_error(
-            result,
-            agent=agent,
-            board=board,
-            message=f"Failed to sync templates: {exc}",
-        )
+        message = f"Failed to sync templates: {exc}"
+        _append_sync_error(result, agent=agent, board=board, message=message)
+        ctx.progress.report(agent, "failed", message=message)
         return False
     else:
+        ctx.progress.report(agent, "updated")
         return False
 
 
@@ -643,6 +789,7 @@ async def _sync_main_agent(
         agent_gateway_id=main_gateway_agent_id,
     )
     if fatal:
+        ctx.progress.report(main_agent, "failed")
         return True
     if not token:
         _append_sync_error(
@@ -650,6 +797,7 @@ async def _sync_main_agent(
             agent=main_agent,
             message="Skipping gateway agent: unable to read AUTH_TOKEN from TOOLS.md.",
         )
+        ctx.progress.report(main_agent, "skipped")
         return True
     stop_sync = False
     try:
@@ -666,21 +814,22 @@ async def _sync_main_agent(
                 overwrite=ctx.options.overwrite,
                 reset_session=ctx.options.reset_sessions,
                 wake=False,
+                control_plane=ctx.control_plane,
             )
             return True
 
         await ctx.backoff.run(_do_provision_main)
     except TimeoutError as exc:  # pragma: no cover - gateway/network dependent
         _append_sync_error(result, agent=main_agent, message=str(exc))
+        ctx.progress.report(main_agent, "failed", message=str(exc))
         stop_sync = True
     except (OSError, RuntimeError, ValueError) as exc:  # pragma: no cover
-        _append_sync_error(
-            result,
-            agent=main_agent,
-            message=f"Failed to sync gateway agent templates: {exc}",
-        )
+        message = f"Failed to sync gateway agent templates: {exc}"
+        _append_sync_error(result, agent=main_agent, message=message)
+        ctx.progress.report(main_agent, "failed", message=message)
     else:
         result.main_updated = True
+        ctx.progress.report(main_agent, "updated")
     return stop_sync
 
 
@@ -1450,6 +1599,20 @@ class AgentLifecycleService(OpenClawDBService):
         gateway_id: UUID | None,
         ctx: OrganizationContext,
     ) -> LimitOffsetPage[AgentRead]:
+        statement = await self.agent_list_statement(
+            board_id=board_id,
+            gateway_id=gateway_id,
+            ctx=ctx,
+        )
+        return await self.paginate_agents(statement)
+
+    async def agent_list_statement(
+        self,
+        *,
+        board_id: UUID | None,
+        gateway_id: UUID | None,
+        ctx: OrganizationContext,
+    ) -> SelectOfScalar[Agent]:
         board_ids = await list_accessible_board_ids(self.session, member=ctx.member, write=False)
         if board_id is not None:
             OpenClawAuthorizationPolicy.require_board_write_access(
@@ -1487,8 +1650,9 @@ class AgentLifecycleService(OpenClawDBService):
                     (col(Agent.gateway_id) == gateway_id) & (col(Agent.board_id).is_(None)),
                 ),
             )
-        statement = statement.order_by(col(Agent.created_at).desc())
+        return statement.order_by(col(Agent.created_at).desc())
 
+    async def paginate_agents(self, statement: SelectOfScalar[Agent]) -> LimitOffsetPage[AgentRead]:
         def _transform(items: Sequence[Any]) -> Sequence[Any]:
             agents = self.coerce_agent_items(items)
             return [self.to_agent_read(self.with_computed_status(agent)) for agent in agents]
@@ -21,7 +21,7 @@ from app.schemas.gateway_api import (
 )
 from app.services.openclaw.db_service import OpenClawDBService
 from app.services.openclaw.error_messages import normalize_gateway_error_message
-from app.services.openclaw.gateway_compat import check_gateway_version_compatibility
+from app.services.openclaw.gateway_health import gateway_health
 from app.services.openclaw.gateway_resolver import gateway_client_config, require_gateway_for_board
 from app.services.openclaw.gateway_rpc import GatewayConfig as GatewayClientConfig
 from app.services.openclaw.gateway_rpc import (
@@ -31,6 +31,7 @@ from app.services.openclaw.gateway_rpc import (
     openclaw_call,
     send_message,
 )
+from app.services.openclaw.internal.circuit_breaker import gateway_circuits
 from app.services.openclaw.policies import OpenClawAuthorizationPolicy
 from app.services.openclaw.shared import GatewayAgentIdentity
 from app.services.organizations import require_board_access
@@ -193,22 +194,19 @@ class GatewaySessionService(OpenClawDBService):
         params: GatewayResolveQuery,
         organization_id: UUID,
         user: User | None,
+        refresh: bool = False,
     ) -> GatewaysStatusResponse:
         board, config, main_session = await self.resolve_gateway(params, user=user)
         self._require_same_org(board, organization_id)
-        try:
-            compatibility = await check_gateway_version_compatibility(config)
-        except OpenClawGatewayError as exc:
-            return GatewaysStatusResponse(
-                connected=False,
-                gateway_url=config.url,
-                error=normalize_gateway_error_message(str(exc)),
-            )
-        if not compatibility.compatible:
+        health = await gateway_health.get(config, refresh=refresh)
+        if not health.healthy:
             return GatewaysStatusResponse(
                 connected=False,
                 gateway_url=config.url,
-                error=compatibility.message,
+                gateway_version=health.current_version,
+                checked_at=health.checked_at,
+                circuit_state=gateway_circuits.state(config.url).state,
+                error=health.problem,
             )
         try:
             sessions = await openclaw_call("sessions.list", config=config)
@@ -232,15 +230,21 @@ class GatewaySessionService(OpenClawDBService):
             return GatewaysStatusResponse(
                 connected=True,
                 gateway_url=config.url,
+                gateway_version=health.current_version,
+                latency_ms=health.latency_ms,
+                checked_at=health.checked_at,
+                circuit_state=gateway_circuits.state(config.url).state,
                 sessions_count=len(sessions_list),
                 sessions=sessions_list,
                 main_session=main_session_entry,
                 main_session_error=main_session_error,
             )
         except OpenClawGatewayError as exc:
+            gateway_health.invalidate(config)
             return GatewaysStatusResponse(
                 connected=False,
                 gateway_url=config.url,
+                circuit_state=gateway_circuits.state(config.url).state,
                 error=normalize_gateway_error_message(str(exc)),
             )
 
@@ -12,10 +12,14 @@ import redis
 
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.core.metrics import Counter, Gauge
 
 logger = get_logger(__name__)
 
 _SCHEDULED_SUFFIX = ":scheduled"
+_HELD_INFIX = ":held:"
+_STATS_SUFFIX = ":stats"
+_STATS_FIELD_SEPARATOR = ":"
 _DRY_RUN_BATCH_SIZE = 100
 
 
@@ -150,6 +154,100 @@ def enqueue_task(
         return False
 
 
+def enqueue_tasks(
+    tasks: list[QueuedTask],
+    queue_name: str,
+    *,
+    redis_url: str | None = None,
+) -> bool:
+    """Persist several task envelopes with one Redis round trip, keeping their order."""
+    if not tasks:
+        return True
+    try:
+        client = _redis_client(redis_url=redis_url)
+        client.lpush(queue_name, *(task.to_json() for task in tasks))
+        logger.info(
+            "rq.queue.enqueued_batch",
+            extra={"queue_name": queue_name, "count": len(tasks)},
+        )
+        return True
+    except Exception as exc:
+        logger.warning(
+            "rq.queue.enqueue_failed",
+            extra={"queue_name": queue_name, "count": len(tasks), "error": str(exc)},
+        )
+        return False
+
+
+def schedule_task(
+    task: QueuedTask,
+    queue_name: str,
+    *,
+    delay_seconds: float,
+    redis_url: str | None = None,
+) -> bool:
+    """Persist a task that becomes visible to consumers after `delay_seconds`."""
+    if delay_seconds <= 0:
+        return enqueue_task(task, queue_name, redis_url=redis_url)
+    return _schedule_for_later(task, queue_name, delay_seconds, redis_url=redis_url)
+
+
+def _held_list_name(queue_name: str, hold_key: str) -> str:
+    return f"{queue_name}{_HELD_INFIX}{hold_key}"
+
+
+def hold_tasks(
+    tasks: list[QueuedTask],
+    queue_name: str,
+    *,
+    hold_key: str,
+    at_front: bool = False,
+    redis_url: str | None = None,
+) -> None:
+    """Set tasks aside, in order, in a side list that consumers do not pop.
+
+    `at_front` puts them ahead of tasks already held under `hold_key`.
+    """
+    if not tasks:
+        return
+    client = _redis_client(redis_url=redis_url)
+    held = _held_list_name(queue_name, hold_key)
+    if at_front:
+        client.lpush(held, *(task.to_json() for task in reversed(tasks)))
+    else:
+        client.rpush(held, *(task.to_json() for task in tasks))
+
+
+def take_held_tasks(
+    queue_name: str,
+    *,
+    hold_key: str,
+    redis_url: str | None = None,
+) -> list[QueuedTask]:
+    """Remove and return every task held under `hold_key`, oldest first."""
+    held = _held_list_name(queue_name, hold_key)
+    pipe = _redis_client(redis_url=redis_url).pipeline(transaction=True)
+    pipe.lrange(held, 0, -1)
+    pipe.delete(held)
+    raw_items, _ = pipe.execute()
+    return [_decode_task(raw, queue_name) for raw in cast(list[str | bytes], raw_items)]
+
+
+def held_keys(
+    queue_name: str,
+    hold_keys: list[str],
+    *,
+    redis_url: str | None = None,
+) -> set[str]:
+    """Return which of `hold_keys` currently have held tasks (one round trip)."""
+    if not hold_keys:
+        return set()
+    pipe = _redis_client(redis_url=redis_url).pipeline(transaction=False)
+    for hold_key in hold_keys:
+        pipe.exists(_held_list_name(queue_name, hold_key))
+    return {key for key, exists in zip(hold_keys, pipe.execute(), strict=True) if exists}
+
+
 def _coerce_datetime(raw: object | None) -> datetime:
     if raw is None:
         return datetime.now(UTC)
@@ -272,3 +370,95 @@ def requeue_if_failed(
         queue_name,
         redis_url=redis_url,
     )
+
+
+def _stats_key(queue_name: str) -> str:
+    return f"{queue_name}{_STATS_SUFFIX}"
+
+
+def record_queue_outcome(
+    queue_name: str,
+    task_type: str,
+    outcome: str,
+    *,
+    redis_url: str | None = None,
+) -> None:
+    """Count a worker outcome (`processed`, `failed`, `retried`, `dropped`) in Redis.
+
+    Workers run in their own processes, so their counters live in a Redis hash next to
+    the queue where the API's `/metrics` endpoint can read them.
+    """
+    try:
+        _redis_client(redis_url=redis_url).hincrby(
+            _stats_key(queue_name),
+            f"{task_type}{_STATS_FIELD_SEPARATOR}{outcome}",
+            1,
+        )
+    except Exception as exc:
+        logger.debug(
+            "rq.queue.stats_failed",
+            extra={"queue_name": queue_name, "error": str(exc)},
+        )
+
+
+@dataclass(frozen=True)
+class QueueStats:
+    """Point-in-time depth and cumulative worker outcomes for one queue."""
+
+    ready: int
+    scheduled: int
+    outcomes: dict[tuple[str, str], int]
+
+
+def read_queue_stats(
+    queue_name: str,
+    *,
+    redis_url: str | None = None,
+    timeout_seconds: float = 1.0,
+) -> QueueStats:
+    """Read queue depth and worker outcome counters in one Redis round trip."""
+    client = redis.Redis.from_url(
+        redis_url or settings.rq_redis_url,
+        socket_connect_timeout=timeout_seconds,
+        socket_timeout=timeout_seconds,
+    )
+    pipe = client.pipeline(transaction=False)
+    pipe.llen(queue_name)
+    pipe.zcard(_scheduled_queue_name(queue_name))
+    pipe.hgetall(_stats_key(queue_name))
+    ready, scheduled, raw_outcomes = pipe.execute()
+    outcomes: dict[tuple[str, str], int] = {}
+    for raw_field, raw_count in cast(dict[bytes, bytes], raw_outcomes).items():
+        task_type, _, outcome = raw_field.decode("utf-8").rpartition(_STATS_FIELD_SEPARATOR)
+        outcomes[(task_type, outcome)] = int(raw_count)
+    return QueueStats(ready=int(ready), scheduled=int(scheduled), outcomes=outcomes)
+
+
+def collect_queue_metrics() -> list[Gauge | Counter]:
+    """Scrape-time collector for the webhook and agent notification queues."""
+    depth = Gauge(
+        "mission_control_queue_depth",
+        "Tasks waiting in a queue; scheduled tasks are delayed retries.",
+        ("queue", "state"),
+    )
+    outcomes = Counter(
+        "mission_control_queue_tasks_total",
+        "Tasks handled by queue workers by task type and outcome.",
+        ("queue", "task_type", "outcome"),
+    )
+    for queue_name in dict.fromkeys(
+        (settings.rq_queue_name, settings.agent_notification_queue_name),
+    ):
+        try:
+            stats = read_queue_stats(queue_name)
+        except Exception as exc:
+            logger.debug(
+                "rq.queue.stats_unavailable",
+                extra={"queue_name": queue_name, "error": str(exc)},
+            )
+            continue
+        depth.labels(queue_name, "ready").set(stats.ready)
+        depth.labels(queue_name, "scheduled").set(stats.scheduled)
+        for (task_type, outcome), count in stats.outcomes.items():
+            outcomes.labels(queue_name, task_type, outcome).inc(count)
+    return [depth, outcomes]
@@ -9,12 +9,13 @@ from dataclasses import dataclass
 
 from app.core.config import settings
 from app.core.logging import get_logger
-from app.services.queue import QueuedTask, dequeue_task
+from app.services.queue import QueuedTask, dequeue_task, record_queue_outcome
 from app.services.webhooks.dispatch import (
     process_webhook_queue_task,
     requeue_webhook_queue_task,
 )
 from app.services.webhooks.queue import TASK_TYPE as WEBHOOK_TASK_TYPE
+from app.services.worker_profiling import start_worker_profile_listener
 
 logger = get_logger(__name__)
 
@@ -42,6 +43,15 @@ def _compute_jitter(base_delay: float) -> float:
     return random.uniform(0, min(settings.rq_dispatch_retry_max_seconds / 10, base_delay * 0.1))
 
 
+def _record_outcome(task: QueuedTask, outcome: str) -> None:
+    record_queue_outcome(
+        settings.rq_queue_name,
+        task.task_type,
+        outcome,
+        redis_url=settings.rq_redis_url,
+    )
+
+
 async def flush_queue(*, block: bool = False, block_timeout: float = 0) -> int:
     """Consume one queue batch and dispatch by task type."""
     processed = 0
@@ -77,6 +87,7 @@ async def flush_queue(*, block: bool = False, block_timeout: float = 0) -> int:
         try:
             await handler.handler(task)
             processed += 1
+            _record_outcome(task, "processed")
             logger.info(
                 "queue.worker.success",
                 extra={
@@ -93,9 +104,13 @@ async def flush_queue(*, block: bool = False, block_timeout: float = 0) -> int:
                     "error": str(exc),
                 },
             )
+            _record_outcome(task, "failed")
             base_delay = handler.attempts_to_delay(task.attempts)
             delay = base_delay + _compute_jitter(base_delay)
-            if not handler.requeue(task, delay):
+            if handler.requeue(task, delay):
+                _record_outcome(task, "retried")
+            else:
+                _record_outcome(task, "dropped")
                 logger.warning(
                     "queue.worker.drop_task",
                     extra={
@@ -131,6 +146,8 @@ def run_worker() -> None:
         "queue.worker.batch_started",
         extra={"throttle_seconds": settings.rq_dispatch_throttle_seconds},
     )
+    if settings.profiling_enabled:
+        start_worker_profile_listener()
     try:
         asyncio.run(_run_worker_loop())
     finally:
@@ -0,0 +1,221 @@
+"""Change fingerprints for polled board reads, used to answer conditional GETs.
+
+A fingerprint is a tuple of `count(*)` and `max(<timestamp>)` aggregates over every
+table an endpoint renders, evaluated as scalar subqueries in a single statement.
+Inserts and updates move a maximum timestamp and deletes move a count, so an
+unchanged fingerprint means an unchanged payload without loading or serializing any
+rows. Agent status is derived from `last_seen_at` and the clock, so agent aggregates
+also count the agents seen within `OFFLINE_AFTER`; approvals are also counted by
+status because reopening one moves no timestamp.
+
+`app.core.conditional` turns fingerprints into ETags.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import func
+from sqlalchemy import select as sa_select
+from sqlmodel import col, select
+
+from app.core.time import utcnow
+from app.models.agents import Agent
+from app.models.approval_task_links import ApprovalTaskLink
+from app.models.approvals import Approval
+from app.models.board_groups import BoardGroup
+from app.models.board_memory import BoardMemory
+from app.models.boards import Board
+from app.models.tag_assignments import TagAssignment
+from app.models.tags import Tag
+from app.models.task_custom_fields import (
+    BoardTaskCustomField,
+    TaskCustomFieldDefinition,
+    TaskCustomFieldValue,
+)
+from app.models.task_dependencies import TaskDependency
+from app.models.tasks import Task
+from app.services.openclaw.constants import OFFLINE_AFTER
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from uuid import UUID
+
+    from sqlalchemy.sql.elements import ColumnElement
+    from sqlalchemy.sql.selectable import ScalarSelect
+    from sqlmodel.ext.asyncio.session import AsyncSession
+    from sqlmodel.sql.expression import SelectOfScalar
+
+Fingerprint = tuple[object, ...]
+
+
+def _aggregates(
+    model: type[Any],
+    where: ColumnElement[bool],
+    *timestamps: Any,
+) -> list[ScalarSelect[Any]]:
+    """Row count plus the maximum of each timestamp column, as scalar subqueries."""
+    return [
+        sa_select(func.count()).select_from(model).where(where).scalar_subquery(),
+        *(
+            sa_select(func.max(column)).select_from(model).where(where).scalar_subquery()
+            for column in timestamps
+        ),
+    ]
+
+
+def _agent_aggregates(where: ColumnElement[bool]) -> list[ScalarSelect[Any]]:
+    online = col(Agent.last_seen_at) >= utcnow() - OFFLINE_AFTER
+    return [
+        *_aggregates(Agent, where, col(Agent.updated_at), col(Agent.last_seen_at)),
+        sa_select(func.count()).select_from(Agent).where(where, online).scalar_subquery(),
+    ]
+
+
+def _task_detail_aggregates(
+    board_ids: Sequence[UUID],
+    organization_id: UUID,
+) -> list[ScalarSelect[Any]]:
+    """Tags, dependencies and custom field values rendered alongside board tasks."""
+    board_task_ids = select(Task.id).where(col(Task.board_id).in_(board_ids))
+    return [
+        *_aggregates(Task, col(Task.board_id).in_(board_ids), col(Task.updated_at)),
+        *_aggregates(
+            TaskDependency,
+            col(TaskDependency.board_id).in_(board_ids),
+            col(TaskDependency.created_at),
+        ),
+        *_aggregates(
+            TagAssignment,
+            col(TagAssignment.task_id).in_(board_task_ids),
+            col(TagAssignment.created_at),
+        ),
+        *_aggregates(Tag, col(Tag.organization_id) == organization_id, col(Tag.updated_at)),
+        *_aggregates(
+            TaskCustomFieldValue,
+            col(TaskCustomFieldValue.task_id).in_(board_task_ids),
+            col(TaskCustomFieldValue.updated_at),
+        ),
+        *_aggregates(
+            BoardTaskCustomField,
+            col(BoardTaskCustomField.board_id).in_(board_ids),
+            col(BoardTaskCustomField.created_at),
+        ),
+        *_aggregates(
+            TaskCustomFieldDefinition,
+            col(TaskCustomFieldDefinition.organization_id) == organization_id,
+            col(TaskCustomFieldDefinition.updated_at),
+        ),
+    ]
+
+
+async def _evaluate(session: AsyncSession, aggregates: list[ScalarSelect[Any]]) -> Fingerprint:
+    row = (await session.exec(select(*aggregates))).one()
+    return tuple(row)
+
+
+async def board_snapshot_fingerprint(session: AsyncSession, board: Board) -> Fingerprint:
+    """Fingerprint everything `build_board_snapshot` renders for `board`."""
+    board_ids = [board.id]
+    approval_ids = select(Approval.id).where(col(Approval.board_id) == board.id)
+    aggregates = [
+        *_task_detail_aggregates(board_ids, board.organization_id),
+        *_agent_aggregates(col(Agent.board_id) == board.id),
+        *_aggregates(
+            Approval,
+            col(Approval.board_id) == board.id,
+            col(Approval.created_at),
+            col(Approval.resolved_at),
+        ),
+        # Reopening an approval changes only its status, not a timestamp.
+        *(
+            sa_select(func.count())
+            .select_from(Approval)
+            .where(col(Approval.board_id) == board.id, col(Approval.status) == approval_status)
+            .scalar_subquery()
+            for approval_status in ("pending", "approved")
+        ),
+        *_aggregates(
+            ApprovalTaskLink,
+            col(ApprovalTaskLink.approval_id).in_(approval_ids),
+            col(ApprovalTaskLink.created_at),
+        ),
+        *_aggregates(
+            BoardMemory,
+            (col(BoardMemory.board_id) == board.id) & col(BoardMemory.is_chat).is_(True),
+            col(BoardMemory.created_at),
+        ),
+    ]
+    return (board.id, board.updated_at, *await _evaluate(session, aggregates))
+
+
+async def task_list_fingerprint(
+    session: AsyncSession,
+    board: Board,
+    statement: SelectOfScalar[Task],
+) -> Fingerprint:
+    """Fingerprint a filtered board task list and the task details it renders."""
+    listed = statement.order_by(None).subquery()
+    aggregates = [
+        sa_select(func.count()).select_from(listed).scalar_subquery(),
+        sa_select(func.max(listed.c.updated_at)).scalar_subquery(),
+        *_task_detail_aggregates([board.id], board.organization_id),
+    ]
+    return (board.id, *await _evaluate(session, aggregates))
+
+
+async def board_group_snapshot_fingerprint(
+    session: AsyncSession,
+    *,
+    group_id: UUID,
+    organization_id: UUID,
+) -> Fingerprint:
+    """Fingerprint the group, its boards and their tasks, agents and tags."""
+    group_board_ids = select(Board.id).where(col(Board.board_group_id) == group_id)
+    group_task_ids = select(Task.id).where(col(Task.board_id).in_(group_board_ids))
+    aggregates = [
+        *_aggregates(BoardGroup, col(BoardGroup.id) == group_id, col(BoardGroup.updated_at)),
+        *_aggregates(Board, col(Board.board_group_id) == group_id, col(Board.updated_at)),
+        *_aggregates(Task, col(Task.board_id).in_(group_board_ids), col(Task.updated_at)),
+        *_aggregates(Agent, col(Agent.board_id).in_(group_board_ids), col(Agent.updated_at)),
+        *_aggregates(
+            TagAssignment,
+            col(TagAssignment.task_id).in_(group_task_ids),
+            col(TagAssignment.created_at),
+        ),
+        *_aggregates(Tag, col(Tag.organization_id) == organization_id, col(Tag.updated_at)),
+    ]
+    return (group_id, *await _evaluate(session, aggregates))
+
+
+async def board_list_fingerprint(
+    session: AsyncSession,
+    statement: SelectOfScalar[Board],
+) -> Fingerprint:
+    """Fingerprint the boards matched by a (visibility-filtered) list statement."""
+    listed = statement.order_by(None).subquery()
+    return await _evaluate(
+        session,
+        [
+            sa_select(func.count()).select_from(listed).scalar_subquery(),
+            sa_select(func.max(listed.c.updated_at)).scalar_subquery(),
+        ],
+    )
+
+
+async def agent_list_fingerprint(
+    session: AsyncSession,
+    statement: SelectOfScalar[Agent],
+) -> Fingerprint:
+    """Fingerprint the agents matched by a list statement, including computed status."""
+    listed = statement.order_by(None).subquery()
+    online = listed.c.last_seen_at >= utcnow() - OFFLINE_AFTER
+    return await _evaluate(
+        session,
+        [
+            sa_select(func.count()).select_from(listed).scalar_subquery(),
+            sa_select(func.max(listed.c.updated_at)).scalar_subquery(),
+            sa_select(func.max(listed.c.last_seen_at)).scalar_subquery(),
+            sa_select(func.count()).select_from(listed).where(online).scalar_subquery(),
+        ],
+    )
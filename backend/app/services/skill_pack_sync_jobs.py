@@ -0,0 +1,156 @@
+"""In-process background jobs for skill pack syncs.
+
+Pack syncs clone or fetch a git repository and can take tens of seconds, so the API
+starts them here and returns immediately. Jobs are tracked in memory by the API
+process that started them; at most `SKILL_PACK_SYNC_CONCURRENCY` run at once and a
+pack never has more than one active job.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Literal
+from uuid import UUID, uuid4
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.time import utcnow
+from app.schemas.skills_marketplace import SkillPackSyncJobRead, SkillPackSyncResponse
+
+logger = get_logger(__name__)
+
+SkillPackSyncJobStatus = Literal["queued", "running", "succeeded", "failed"]
+SkillPackSyncRunner = Callable[[], Awaitable[SkillPackSyncResponse]]
+
+
+@dataclass
+class SkillPackSyncJob:
+    """Mutable state of one background pack sync."""
+
+    id: UUID
+    pack_id: UUID
+    organization_id: UUID
+    created_at: datetime
+    status: SkillPackSyncJobStatus = "queued"
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    result: SkillPackSyncResponse | None = None
+    error: str | None = None
+
+    @property
+    def active(self) -> bool:
+        return self.status in {"queued", "running"}
+
+    def to_read(self) -> SkillPackSyncJobRead:
+        return SkillPackSyncJobRead(
+            id=self.id,
+            pack_id=self.pack_id,
+            status=self.status,
+            created_at=self.created_at,
+            started_at=self.started_at,
+            finished_at=self.finished_at,
+            result=self.result,
+            error=self.error,
+        )
+
+
+class SkillPackSyncJobRegistry:
+    """Start, deduplicate and look up background pack sync jobs."""
+
+    def __init__(self, *, max_jobs: int = 256) -> None:
+        self._max_jobs = max_jobs
+        self._jobs: OrderedDict[UUID, SkillPackSyncJob] = OrderedDict()
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._semaphore: asyncio.Semaphore | None = None
+        self._semaphore_loop: asyncio.AbstractEventLoop | None = None
+
+    def get(self, job_id: UUID) -> SkillPackSyncJob | None:
+        return self._jobs.get(job_id)
+
+    def active_for_pack(self, pack_id: UUID) -> SkillPackSyncJob | None:
+        for job in self._jobs.values():
+            if job.pack_id == pack_id and job.active:
+                return job
+        return None
+
+    def start(
+        self,
+        *,
+        pack_id: UUID,
+        organization_id: UUID,
+        run: SkillPackSyncRunner,
+    ) -> SkillPackSyncJob:
+        """Schedule `run` for the pack, or return the pack's already-active job."""
+        existing = self.active_for_pack(pack_id)
+        if existing is not None:
+            return existing
+        job = SkillPackSyncJob(
+            id=uuid4(),
+            pack_id=pack_id,
+            organization_id=organization_id,
+            created_at=utcnow(),
+        )
+        self._jobs[job.id] = job
+        self._prune()
+        task = asyncio.create_task(self._run(job, run))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    async def wait(self, *, timeout: float | None = None) -> bool:
+        """Wait for every running job; used by tests and app shutdown.
+
+        Returns False when `timeout` elapses first; jobs still running are cancelled.
+        """
+        try:
+            async with asyncio.timeout(timeout):
+                while self._tasks:
+                    await asyncio.gather(*list(self._tasks), return_exceptions=True)
+        except TimeoutError:
+            for task in list(self._tasks):
+                task.cancel()
+            return False
+        return True
+
+    def _prune(self) -> None:
+        for job_id in [job_id for job_id, job in self._jobs.items() if not job.active]:
+            if len(self._jobs) <= self._max_jobs:
+                break
+            del self._jobs[job_id]
+
+    def _limiter(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(settings.skill_pack_sync_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def _run(self, job: SkillPackSyncJob, run: SkillPackSyncRunner) -> None:
+        async with self._limiter():
+            job.status = "running"
+            job.started_at = utcnow()
+            try:
+                job.result = await run()
+            except HTTPException as exc:
+                job.status = "failed"
+                job.error = str(exc.detail)
+            except Exception as exc:
+                logger.exception(
+                    "skill_pack.sync_job.failed",
+                    extra={"job_id": str(job.id), "pack_id": str(job.pack_id)},
+                )
+                job.status = "failed"
+                job.error = str(exc) or exc.__class__.__name__
+            else:
+                job.status = "succeeded"
+            finally:
+                job.finished_at = utcnow()
+
+
+skill_pack_sync_jobs = SkillPackSyncJobRegistry()
@@ -1,19 +1,36 @@
-"""Service helpers for querying and caching souls.directory content."""
+"""Service helpers for querying and caching souls.directory content.
+
+Agent provisioning looks up the same role souls over and over, so the sitemap and
+soul markdown are cached in memory (and, when `SOULS_DIRECTORY_CACHE_DIR` is set, on
+disk so a restarted process can provision offline). Requests share one pooled HTTP
+client, concurrent misses for the same URL share one download, and expired entries
+are revalidated with ETags.
+"""
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 import re
 import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 from html import unescape
+from pathlib import Path
 from typing import Final
 
 import httpx
 
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
 SOULS_DIRECTORY_BASE_URL: Final[str] = "https://souls.directory"
 SOULS_DIRECTORY_SITEMAP_URL: Final[str] = f"{SOULS_DIRECTORY_BASE_URL}/sitemap.xml"
 
-_SITEMAP_TTL_SECONDS: Final[int] = 60 * 60
 _SOUL_URL_MIN_PARTS: Final[int] = 6
 _LOC_PATTERN: Final[re.Pattern[str]] = re.compile(
     r"<(?:[A-Za-z0-9_]+:)?loc>(.*?)</(?:[A-Za-z0-9_]+:)?loc>",
@@ -60,40 +77,173 @@ def _parse_sitemap_soul_refs(sitemap_xml: str) -> list[SoulRef]:
     return refs
 
 
-_sitemap_cache: dict[str, object] = {
-    "loaded_at": 0.0,
-    "refs": [],
-}
+@dataclass(slots=True)
+class _CachedDocument:
+    """A fetched document plus the validators needed to revalidate it."""
+
+    content: str
+    etag: str | None
+    fetched_at: float
+
+    def is_fresh(self, ttl_seconds: float) -> bool:
+        return time.time() - self.fetched_at < ttl_seconds
+
+
+_client: httpx.AsyncClient | None = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+
+_sitemap: _CachedDocument | None = None
+_sitemap_refs: list[SoulRef] = []
+_souls: OrderedDict[str, _CachedDocument] = OrderedDict()
+_inflight: dict[str, asyncio.Task[_CachedDocument]] = {}
+_background_refreshes: set[asyncio.Task[None]] = set()
+
+
+def _http_client() -> httpx.AsyncClient:
+    """Return the pooled client for the running event loop."""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(15.0, connect=5.0),
+            headers={"User-Agent": "openclaw-mission-control/1.0"},
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+        )
+        _client_loop = loop
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the pooled client (application shutdown)."""
+    global _client, _client_loop
+    client, _client, _client_loop = _client, None, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+def _disk_path(key: str) -> Path | None:
+    root = settings.souls_directory_cache_dir.strip()
+    if not root:
+        return None
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+    return Path(root).expanduser() / f"{digest}.json"
+
+
+def _read_disk(key: str) -> _CachedDocument | None:
+    path = _disk_path(key)
+    if path is None:
+        return None
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        return _CachedDocument(
+            content=str(payload["content"]),
+            etag=payload.get("etag"),
+            fetched_at=float(payload["fetched_at"]),
+        )
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _write_disk(key: str, document: _CachedDocument) -> None:
+    path = _disk_path(key)
+    if path is None:
+        return
+    payload = {
+        "content": document.content,
+        "etag": document.etag,
+        "fetched_at": document.fetched_at,
+    }
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(payload), encoding="utf-8")
+        tmp_path.replace(path)
+    except OSError:
+        logger.warning("souls_directory.disk_cache.write_failed", extra={"key": key})
+
+
+async def _fetch_document(
+    url: str,
+    *,
+    cached: _CachedDocument | None,
+    client: httpx.AsyncClient | None,
+) -> _CachedDocument:
+    """GET `url`, sending `If-None-Match` when a cached copy has an ETag."""
+    headers = {"If-None-Match": cached.etag} if cached is not None and cached.etag else {}
+    resp = await (client or _http_client()).get(url, headers=headers)
+    if resp.status_code == httpx.codes.NOT_MODIFIED and cached is not None:
+        return _CachedDocument(content=cached.content, etag=cached.etag, fetched_at=time.time())
+    resp.raise_for_status()
+    return _CachedDocument(
+        content=resp.text,
+        etag=resp.headers.get("ETag"),
+        fetched_at=time.time(),
+    )
+
+
+async def _single_flight(
+    key: str,
+    load: Callable[[], Awaitable[_CachedDocument]],
+) -> _CachedDocument:
+    """Run `load` once per key; concurrent callers await the same fetch."""
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(load())
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    return await asyncio.shield(task)
+
+
+async def _refresh_sitemap(client: httpx.AsyncClient | None) -> _CachedDocument:
+    global _sitemap, _sitemap_refs
+    cached = _sitemap or await asyncio.to_thread(_read_disk, SOULS_DIRECTORY_SITEMAP_URL)
+    document = await _fetch_document(SOULS_DIRECTORY_SITEMAP_URL, cached=cached, client=client)
+    if _sitemap is None or document.content is not _sitemap.content:
+        _sitemap_refs = _parse_sitemap_soul_refs(document.content)
+    _sitemap = document
+    await asyncio.to_thread(_write_disk, SOULS_DIRECTORY_SITEMAP_URL, document)
+    return document
+
+
+async def _revalidate_sitemap_in_background() -> None:
+    try:
+        await _single_flight(SOULS_DIRECTORY_SITEMAP_URL, lambda: _refresh_sitemap(None))
+    except (httpx.HTTPError, OSError):
+        logger.warning("souls_directory.sitemap.revalidate_failed")
 
 
 async def list_souls_directory_refs(
     *,
     client: httpx.AsyncClient | None = None,
 ) -> list[SoulRef]:
-    """Return cached sitemap-derived soul refs, refreshing when TTL expires."""
-    now = time.time()
-    loaded_raw = _sitemap_cache.get("loaded_at")
-    loaded_at = loaded_raw if isinstance(loaded_raw, (int, float)) else 0.0
-    cached = _sitemap_cache.get("refs")
-    if cached and isinstance(cached, list) and now - loaded_at < _SITEMAP_TTL_SECONDS:
-        return cached
-
-    owns_client = client is None
-    if client is None:
-        client = httpx.AsyncClient(
-            timeout=httpx.Timeout(10.0, connect=5.0),
-            headers={"User-Agent": "openclaw-mission-control/1.0"},
-        )
-    try:
-        resp = await client.get(SOULS_DIRECTORY_SITEMAP_URL)
-        resp.raise_for_status()
-        refs = _parse_sitemap_soul_refs(resp.text)
-        _sitemap_cache["loaded_at"] = now
-        _sitemap_cache["refs"] = refs
-        return refs
-    finally:
-        if owns_client:
-            await client.aclose()
+    """Return sitemap-derived soul refs.
+
+    Fresh refs are served from memory. Once the TTL expires the stale refs are still
+    returned immediately while a single background request revalidates them; only a
+    cold cache (nothing in memory or on disk) waits on the network.
+    """
+    global _sitemap, _sitemap_refs
+    if _sitemap is None:
+        from_disk = await asyncio.to_thread(_read_disk, SOULS_DIRECTORY_SITEMAP_URL)
+        if from_disk is not None:
+            _sitemap = from_disk
+            _sitemap_refs = _parse_sitemap_soul_refs(from_disk.content)
+    if _sitemap is None or not _sitemap_refs:
+        await _single_flight(SOULS_DIRECTORY_SITEMAP_URL, lambda: _refresh_sitemap(client))
+        return _sitemap_refs
+    if not _sitemap.is_fresh(settings.souls_directory_sitemap_ttl_seconds):
+        if SOULS_DIRECTORY_SITEMAP_URL not in _inflight:
+            task = asyncio.create_task(_revalidate_sitemap_in_background())
+            _background_refreshes.add(task)
+            task.add_done_callback(_background_refreshes.discard)
+    return _sitemap_refs
+
+
+def _remember_soul(key: str, document: _CachedDocument) -> None:
+    _souls[key] = document
+    _souls.move_to_end(key)
+    while len(_souls) > settings.souls_directory_soul_cache_size:
+        _souls.popitem(last=False)
 
 
 async def fetch_soul_markdown(
@@ -102,26 +252,47 @@ async def fetch_soul_markdown(
     slug: str,
     client: httpx.AsyncClient | None = None,
 ) -> str:
-    """Fetch raw markdown content for a specific handle/slug pair."""
+    """Fetch raw markdown content for a specific handle/slug pair.
+
+    Results are kept in an LRU (and the optional disk cache). Entries older than the
+    TTL are revalidated with `If-None-Match`; if the site is unreachable the last
+    known copy is returned instead of failing.
+    """
     normalized_handle = handle.strip().strip("/")
     normalized_slug = slug.strip().strip("/")
     if normalized_slug.endswith(".md"):
         normalized_slug = normalized_slug[: -len(".md")]
     url = f"{SOULS_DIRECTORY_BASE_URL}/api/souls/" f"{normalized_handle}/{normalized_slug}.md"
 
-    owns_client = client is None
-    if client is None:
-        client = httpx.AsyncClient(
-            timeout=httpx.Timeout(15.0, connect=5.0),
-            headers={"User-Agent": "openclaw-mission-control/1.0"},
-        )
+    cached = _souls.get(url)
+    if cached is None:
+        cached = await asyncio.to_thread(_read_disk, url)
+    if cached is not None and cached.is_fresh(settings.souls_directory_soul_ttl_seconds):
+        _remember_soul(url, cached)
+        return cached.content
+
+    async def _load() -> _CachedDocument:
+        document = await _fetch_document(url, cached=cached, client=client)
+        _remember_soul(url, document)
+        await asyncio.to_thread(_write_disk, url, document)
+        return document
+
     try:
-        resp = await client.get(url)
-        resp.raise_for_status()
-        return resp.text
-    finally:
-        if owns_client:
-            await client.aclose()
+        return (await _single_flight(url, _load)).content
+    except (httpx.HTTPError, OSError):
+        if cached is None:
+            raise
+        logger.warning("souls_directory.soul.serving_stale", extra={"url": url})
+        _remember_soul(url, cached)
+        return cached.content
+
+
+def clear_cache() -> None:
+    """Forget every cached sitemap and soul entry held in memory."""
+    global _sitemap, _sitemap_refs
+    _sitemap = None
+    _sitemap_refs = []
+    _souls.clear()
 
 
 def search_souls(refs: list[SoulRef], *, query: str, limit: int = 20) -> list[SoulRef]:
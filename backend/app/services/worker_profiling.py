@@ -0,0 +1,135 @@
+"""Capture sampling profiles of queue worker processes through Redis.
+
+Workers run in their own processes and block on Redis between jobs, so the API cannot
+profile them directly. When profiling is enabled each worker starts a listener thread
+that waits on a per-queue Redis list; `request_worker_profile` pushes a request there
+and waits for the folded profile on a reply list. The first idle listener takes the
+request, so with several workers one of them is profiled.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from typing import cast
+from uuid import uuid4
+
+import redis
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.profiling import ProfilerBusyError, SamplingProfiler
+
+logger = get_logger(__name__)
+
+_REQUESTS_SUFFIX = ":profile:requests"
+_REPLY_SUFFIX = ":profile:reply:"
+_REPLY_TTL_SECONDS = 60
+_LISTEN_TIMEOUT_SECONDS = 5
+
+
+def _redis_client(redis_url: str | None = None) -> redis.Redis:
+    return redis.Redis.from_url(redis_url or settings.rq_redis_url)
+
+
+def _requests_key(queue_name: str) -> str:
+    return f"{queue_name}{_REQUESTS_SUFFIX}"
+
+
+def _reply_key(queue_name: str, request_id: str) -> str:
+    return f"{queue_name}{_REPLY_SUFFIX}{request_id}"
+
+
+def request_worker_profile(
+    seconds: float,
+    *,
+    interval_s: float,
+    queue_name: str | None = None,
+    redis_url: str | None = None,
+    grace_seconds: float = 5.0,
+) -> str | None:
+    """Ask a worker for a profile and block until its folded output (or `None`)."""
+    queue_name = queue_name or settings.rq_queue_name
+    client = _redis_client(redis_url)
+    request_id = uuid4().hex
+    client.rpush(
+        _requests_key(queue_name),
+        json.dumps(
+            {
+                "id": request_id,
+                "seconds": seconds,
+                "interval_s": interval_s,
+                "deadline": time.time() + seconds + grace_seconds,
+            },
+        ),
+    )
+    reply = cast(
+        tuple[bytes, bytes] | None,
+        client.blpop([_reply_key(queue_name, request_id)], timeout=seconds + grace_seconds),
+    )
+    if reply is None:
+        return None
+    return reply[1].decode("utf-8")
+
+
+def _serve_one(client: redis.Redis, queue_name: str, raw: bytes) -> None:
+    request = json.loads(raw)
+    seconds = min(float(request["seconds"]), float(settings.profiling_max_seconds))
+    if time.time() + seconds > float(request.get("deadline", 0)):
+        # The API would stop waiting before this capture finished.
+        return
+    interval_s = float(request["interval_s"])
+    listener_id = threading.get_ident()
+    thread_ids = {thread.ident for thread in threading.enumerate() if thread.ident != listener_id}
+    try:
+        profiler = SamplingProfiler(
+            interval_s=interval_s,
+            thread_ids={thread_id for thread_id in thread_ids if thread_id is not None},
+        ).start()
+    except ProfilerBusyError:
+        return
+    try:
+        time.sleep(seconds)
+    finally:
+        profile = profiler.stop()
+    reply_key = _reply_key(queue_name, str(request["id"]))
+    pipe = client.pipeline(transaction=False)
+    pipe.rpush(reply_key, profile.folded())
+    pipe.expire(reply_key, _REPLY_TTL_SECONDS)
+    pipe.execute()
+    logger.info(
+        "queue.worker.profile_captured",
+        extra={"queue_name": queue_name, "samples": profile.samples, "seconds": seconds},
+    )
+
+
+def _listen(queue_name: str, redis_url: str | None) -> None:
+    client = _redis_client(redis_url)
+    while True:
+        try:
+            item = cast(
+                tuple[bytes, bytes] | None,
+                client.blpop([_requests_key(queue_name)], timeout=_LISTEN_TIMEOUT_SECONDS),
+            )
+            if item is not None:
+                _serve_one(client, queue_name, item[1])
+        except Exception:
+            logger.exception("queue.worker.profile_listener_failed")
+            time.sleep(1)
+
+
+def start_worker_profile_listener(
+    *,
+    queue_name: str | None = None,
+    redis_url: str | None = None,
+) -> threading.Thread:
+    """Serve profile requests for this worker process from a daemon thread."""
+    thread = threading.Thread(
+        target=_listen,
+        args=(queue_name or settings.rq_queue_name, redis_url),
+        name="mission-control-profile-listener",
+        daemon=True,
+    )
+    thread.start()
+    return thread
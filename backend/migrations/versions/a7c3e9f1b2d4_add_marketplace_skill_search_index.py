@@ -0,0 +1,81 @@
+"""Add indexable facets and full-text search to marketplace skills.
+
+Revision ID: a7c3e9f1b2d4
+Revises: e5b8c2d4f6a1
+Create Date: 2026-10-19 12:00:00.000000
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a7c3e9f1b2d4"
+down_revision = "e5b8c2d4f6a1"
+branch_labels = None
+depends_on = None
+
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('simple', translate("
+    "coalesce(category, '') || ' ' || coalesce(risk, '') || ' ' || coalesce(source, ''), "
+    "'/-_.', '    ')), 'C')"
+)
+
+
+def upgrade() -> None:
+    """Add generated facet keys, a weighted tsvector and supporting indexes."""
+    op.add_column(
+        "marketplace_skills",
+        sa.Column(
+            "category_key",
+            sa.String(),
+            sa.Computed("lower(trim(coalesce(category, '')))", persisted=True),
+            nullable=False,
+        ),
+    )
+    op.add_column(
+        "marketplace_skills",
+        sa.Column(
+            "risk_key",
+            sa.String(),
+            sa.Computed("lower(trim(coalesce(risk, '')))", persisted=True),
+            nullable=False,
+        ),
+    )
+    op.create_index(
+        "ix_marketplace_skills_org_category_key",
+        "marketplace_skills",
+        ["organization_id", "category_key"],
+    )
+    op.create_index(
+        "ix_marketplace_skills_org_risk_key",
+        "marketplace_skills",
+        ["organization_id", "risk_key"],
+    )
+    op.execute(
+        "ALTER TABLE marketplace_skills ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR_EXPRESSION}) STORED",
+    )
+    op.execute(
+        "CREATE INDEX ix_marketplace_skills_search_vector "
+        "ON marketplace_skills USING gin (search_vector)",
+    )
+    # Lets `source_url LIKE 'prefix%'` (pack filter) use an index under any collation.
+    op.execute(
+        "CREATE INDEX ix_marketplace_skills_org_source_url_prefix "
+        "ON marketplace_skills (organization_id, source_url text_pattern_ops)",
+    )
+
+
+def downgrade() -> None:
+    """Drop search and facet indexes and their generated columns."""
+    op.drop_index("ix_marketplace_skills_org_source_url_prefix", table_name="marketplace_skills")
+    op.drop_index("ix_marketplace_skills_search_vector", table_name="marketplace_skills")
+    op.drop_column("marketplace_skills", "search_vector")
+    op.drop_index("ix_marketplace_skills_org_risk_key", table_name="marketplace_skills")
+    op.drop_index("ix_marketplace_skills_org_category_key", table_name="marketplace_skills")
+    op.drop_column("marketplace_skills", "risk_key")
+    op.drop_column("marketplace_skills", "category_key")
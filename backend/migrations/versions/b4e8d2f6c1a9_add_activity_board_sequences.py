@@ -0,0 +1,67 @@
+"""Add per-board activity event sequences for resumable task streams.
+
+Revision ID: b4e8d2f6c1a9
+Revises: a7c3e9f1b2d4
+Create Date: 2026-10-19 15:00:00.000000
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b4e8d2f6c1a9"
+down_revision = "a7c3e9f1b2d4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add the board counter and event sequence, numbering existing task events."""
+    op.add_column(
+        "boards",
+        sa.Column("last_event_sequence", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.add_column("activity_events", sa.Column("board_sequence", sa.Integer(), nullable=True))
+    op.execute(
+        """
+        UPDATE activity_events AS e
+        SET board_sequence = ranked.sequence
+        FROM (
+            SELECT a.id, row_number() OVER (
+                PARTITION BY t.board_id ORDER BY a.created_at, a.id
+            ) AS sequence
+            FROM activity_events AS a
+            JOIN tasks AS t ON t.id = a.task_id
+            WHERE t.board_id IS NOT NULL
+        ) AS ranked
+        WHERE e.id = ranked.id
+        """,
+    )
+    op.execute(
+        """
+        UPDATE boards AS b
+        SET last_event_sequence = counts.last_sequence
+        FROM (
+            SELECT t.board_id, max(a.board_sequence) AS last_sequence
+            FROM activity_events AS a
+            JOIN tasks AS t ON t.id = a.task_id
+            WHERE a.board_sequence IS NOT NULL
+            GROUP BY t.board_id
+        ) AS counts
+        WHERE b.id = counts.board_id
+        """,
+    )
+    op.create_index(
+        op.f("ix_activity_events_board_sequence"),
+        "activity_events",
+        ["board_sequence"],
+    )
+
+
+def downgrade() -> None:
+    """Drop event sequences and the board counter."""
+    op.drop_index(op.f("ix_activity_events_board_sequence"), table_name="activity_events")
+    op.drop_column("activity_events", "board_sequence")
+    op.drop_column("boards", "last_event_sequence")
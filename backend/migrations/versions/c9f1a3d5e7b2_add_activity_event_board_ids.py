@@ -0,0 +1,61 @@
+"""Store the board on activity events and index streams by (board, sequence).
+
+Revision ID: c9f1a3d5e7b2
+Revises: b4e8d2f6c1a9
+Create Date: 2026-10-19 18:00:00.000000
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c9f1a3d5e7b2"
+down_revision = "b4e8d2f6c1a9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add and backfill `activity_events.board_id`; replace the sequence-only index."""
+    op.add_column("activity_events", sa.Column("board_id", sa.Uuid(), nullable=True))
+    op.create_foreign_key(
+        "fk_activity_events_board_id_boards",
+        "activity_events",
+        "boards",
+        ["board_id"],
+        ["id"],
+    )
+    op.execute(
+        """
+        UPDATE activity_events AS e
+        SET board_id = t.board_id
+        FROM tasks AS t
+        WHERE t.id = e.task_id AND e.board_sequence IS NOT NULL
+        """,
+    )
+    # Sequences are numbered per board, so only a (board, sequence) index narrows a
+    # stream's `board_sequence > cursor` scan to one board.
+    op.drop_index(op.f("ix_activity_events_board_sequence"), table_name="activity_events")
+    op.create_index(
+        "ix_activity_events_board_id_board_sequence",
+        "activity_events",
+        ["board_id", "board_sequence"],
+    )
+
+
+def downgrade() -> None:
+    """Drop `activity_events.board_id` and restore the sequence-only index."""
+    op.drop_index("ix_activity_events_board_id_board_sequence", table_name="activity_events")
+    op.create_index(
+        op.f("ix_activity_events_board_sequence"),
+        "activity_events",
+        ["board_sequence"],
+    )
+    op.drop_constraint(
+        "fk_activity_events_board_id_boards",
+        "activity_events",
+        type_="foreignkey",
+    )
+    op.drop_column("activity_events", "board_id")
@@ -0,0 +1,51 @@
+"""Add delivery deduplication settings and keys for board webhooks.
+
+Revision ID: d3a7f1c2b9e0
+Revises: b497b348ebb4
+Create Date: 2026-10-19 09:00:00.000000
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "d3a7f1c2b9e0"
+down_revision = "b497b348ebb4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add webhook dedupe config and an idempotency index on stored payloads."""
+    op.add_column("board_webhooks", sa.Column("dedupe_header", sa.String(), nullable=True))
+    op.add_column(
+        "board_webhooks",
+        sa.Column(
+            "dedupe_content_hash",
+            sa.Boolean(),
+            nullable=False,
+            server_default=sa.false(),
+        ),
+    )
+    op.add_column("board_webhook_payloads", sa.Column("dedupe_key", sa.String(), nullable=True))
+    # Duplicate deliveries are resolved with one lookup on (webhook, key) bounded
+    # by the retention window on received_at.
+    op.create_index(
+        "ix_board_webhook_payloads_webhook_id_dedupe_key_received_at",
+        "board_webhook_payloads",
+        ["webhook_id", "dedupe_key", "received_at"],
+    )
+
+
+def downgrade() -> None:
+    """Remove webhook dedupe config and idempotency index."""
+    op.drop_index(
+        "ix_board_webhook_payloads_webhook_id_dedupe_key_received_at",
+        table_name="board_webhook_payloads",
+    )
+    op.drop_column("board_webhook_payloads", "dedupe_key")
+    op.drop_column("board_webhooks", "dedupe_content_hash")
+    op.drop_column("board_webhooks", "dedupe_header")
@@ -0,0 +1,57 @@
+"""Enforce one stored webhook payload per (webhook, dedupe key).
+
+Revision ID: e1b7c3a9d5f2
+Revises: c9f1a3d5e7b2
+Create Date: 2026-10-19 19:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e1b7c3a9d5f2"
+down_revision = "c9f1a3d5e7b2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Keep the newest payload per key, then replace the lookup index with a unique one."""
+    op.execute(
+        """
+        UPDATE board_webhook_payloads AS p
+        SET dedupe_key = NULL
+        FROM (
+            SELECT id, row_number() OVER (
+                PARTITION BY webhook_id, dedupe_key ORDER BY received_at DESC, id
+            ) AS position
+            FROM board_webhook_payloads
+            WHERE dedupe_key IS NOT NULL
+        ) AS ranked
+        WHERE p.id = ranked.id AND ranked.position > 1
+        """,
+    )
+    op.drop_index(
+        "ix_board_webhook_payloads_webhook_id_dedupe_key_received_at",
+        table_name="board_webhook_payloads",
+    )
+    op.create_index(
+        "uq_board_webhook_payloads_webhook_id_dedupe_key",
+        "board_webhook_payloads",
+        ["webhook_id", "dedupe_key"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Restore the non-unique, time-ranged dedupe lookup index."""
+    op.drop_index(
+        "uq_board_webhook_payloads_webhook_id_dedupe_key",
+        table_name="board_webhook_payloads",
+    )
+    op.create_index(
+        "ix_board_webhook_payloads_webhook_id_dedupe_key_received_at",
+        "board_webhook_payloads",
+        ["webhook_id", "dedupe_key", "received_at"],
+    )
@@ -0,0 +1,27 @@
+"""Add recorded workspace file hashes to agents.
+
+Revision ID: e5b8c2d4f6a1
+Revises: d3a7f1c2b9e0
+Create Date: 2026-10-19 10:00:00.000000
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e5b8c2d4f6a1"
+down_revision = "d3a7f1c2b9e0"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Store per-file content hashes from the last successful gateway push."""
+    op.add_column("agents", sa.Column("workspace_file_hashes", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Drop per-file content hashes."""
+    op.drop_column("agents", "workspace_file_hashes")
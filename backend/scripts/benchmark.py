@@ -0,0 +1,322 @@
+"""Reproducible benchmark of the hot API paths against a synthetic large tenant.
+
+Seeds a deterministic dataset (see `scripts/benchmark_data.py`) into the database from
+`DATABASE_URL`, then drives the app in-process through an ASGI transport. Gateway traffic goes to
+a local `FakeGateway` with fixed latency, so timings reflect Mission Control itself
+(routing, auth, ORM and serialization, Postgres and Redis) plus real websocket
+round trips. Run it against a disposable local database,
+e.g.::
+
+    AUTH_MODE=local LOCAL_AUTH_TOKEN=... DATABASE_URL=postgresql+psycopg://... \\
+        python scripts/benchmark.py --boards 2000 --tasks-per-board 150 \\
+        --output bench-$(git rev-parse --short HEAD).json
+
+Results are one JSON document with per-scenario latency percentiles and mean SQL
+statements per call, keyed by scenario name so two runs can be diffed directly.
+`--skip-seed --manifest` reuses a tenant seeded by an earlier run.
+`scripts/benchmark_skills_index.py` covers marketplace index parsing separately.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, field, fields
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_ROOT))
+
+from sqlalchemy import update  # noqa: E402
+from sqlmodel import col  # noqa: E402
+
+from scripts.benchmark_data import BenchmarkDataset, DatasetSpec  # noqa: E402
+
+RESULT_SCHEMA_VERSION = 1
+
+Operation = Callable[[int], Awaitable[None]]
+
+
+@dataclass
+class ScenarioResult:
+    """Timings for one scenario, in milliseconds."""
+
+    name: str
+    iterations: int
+    errors: int = 0
+    sql_statements_mean: float = 0.0
+    p50_ms: float = 0.0
+    p95_ms: float = 0.0
+    p99_ms: float = 0.0
+    mean_ms: float = 0.0
+    min_ms: float = 0.0
+    max_ms: float = 0.0
+    error_samples: list[str] = field(default_factory=list)
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _run_scenario(
+    name: str,
+    operation: Operation,
+    *,
+    iterations: int,
+    warmup: int,
+) -> ScenarioResult:
+    from app.core.query_stats import track_queries
+
+    for index in range(warmup):
+        try:
+            await operation(index)
+        except Exception:  # noqa: BLE001 - errors are counted in the measured loop
+            pass
+
+    result = ScenarioResult(name=name, iterations=iterations)
+    timings: list[float] = []
+    statements = 0
+    for index in range(iterations):
+        with track_queries() as queries:
+            started_at = time.perf_counter()
+            try:
+                await operation(warmup + index)
+            except Exception as exc:  # noqa: BLE001 - report, keep measuring
+                result.errors += 1
+                if len(result.error_samples) < 3:
+                    result.error_samples.append(f"{type(exc).__name__}: {exc}"[:300])
+            timings.append((time.perf_counter() - started_at) * 1000)
+        statements += queries.statements
+
+    ordered = sorted(timings)
+    result.sql_statements_mean = round(statements / max(iterations, 1), 2)
+    result.p50_ms = round(_percentile(ordered, 0.5), 3)
+    result.p95_ms = round(_percentile(ordered, 0.95), 3)
+    result.p99_ms = round(_percentile(ordered, 0.99), 3)
+    result.mean_ms = round(statistics.fmean(ordered), 3) if ordered else 0.0
+    result.min_ms = round(ordered[0], 3) if ordered else 0.0
+    result.max_ms = round(ordered[-1], 3) if ordered else 0.0
+    return result
+
+
+def _git_commit() -> str | None:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=BACKEND_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def _check(response: Any) -> None:
+    if response.status_code >= 400:
+        raise RuntimeError(f"HTTP {response.status_code}: {response.text[:200]}")
+
+
+async def _run(args: argparse.Namespace) -> dict[str, Any]:
+    from httpx import ASGITransport, AsyncClient
+
+    from app.api import tasks as tasks_api
+    from app.core.config import settings
+    from app.core.time import utcnow
+    from app.db.session import async_engine, async_session_maker, init_db
+    from app.main import app
+    from app.models.gateways import Gateway
+    from app.services.activity_log import board_sequence_cursors
+    from app.services.openclaw.fake_gateway import FakeGateway
+    from scripts.benchmark_data import generate_dataset
+
+    spec = DatasetSpec(
+        **{spec_field.name: getattr(args, spec_field.name) for spec_field in fields(DatasetSpec)},
+    )
+    manifest_path = Path(args.manifest) if args.manifest else None
+    await init_db()
+    seed_seconds: float | None = None
+    if args.skip_seed:
+        if manifest_path is None or not manifest_path.exists():
+            raise SystemExit("--skip-seed needs --manifest pointing at an earlier run")
+        dataset = BenchmarkDataset(**json.loads(manifest_path.read_text(encoding="utf-8")))
+        dataset.webhooks = [tuple(pair) for pair in dataset.webhooks]  # type: ignore[misc]
+    else:
+        started_at = time.perf_counter()
+        dataset = await generate_dataset(async_engine, spec, seed=args.seed)
+        seed_seconds = round(time.perf_counter() - started_at, 2)
+        if manifest_path is not None:
+            manifest_path.write_text(json.dumps(asdict(dataset), indent=2), encoding="utf-8")
+
+    gateway = FakeGateway(
+        latency_s=args.gateway_latency_ms / 1000,
+        seed=args.seed,
+        record_requests=False,
+    )
+    await gateway.start()
+    # Point the tenant's gateway at this run's fake (its port changes every run).
+    async with async_engine.begin() as conn:
+        await conn.execute(
+            update(Gateway)
+            .where(col(Gateway.organization_id) == UUID(dataset.organization_id))
+            .values(url=gateway.url),
+        )
+    sample_boards = dataset.board_ids[: args.sample_boards] or dataset.board_ids
+    sample_webhooks = dataset.webhooks[: args.sample_boards] or dataset.webhooks
+    user_headers = {"Authorization": f"Bearer {settings.local_auth_token}"}
+    agent_headers = {"X-Agent-Token": dataset.agent_token}
+    sse_since = utcnow() - timedelta(days=spec.history_days)
+    async with async_session_maker() as session:
+        sse_cursors = await board_sequence_cursors(
+            session,
+            [UUID(board_id) for board_id in sample_boards],
+            since=sse_since,
+        )
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://benchmark",
+        timeout=60.0,
+    ) as client:
+
+        async def board_snapshot(index: int) -> None:
+            board_id = sample_boards[index % len(sample_boards)]
+            _check(await client.get(f"/api/v1/boards/{board_id}/snapshot", headers=user_headers))
+
+        async def list_tasks(index: int) -> None:
+            board_id = sample_boards[index % len(sample_boards)]
+            _check(
+                await client.get(
+                    f"/api/v1/boards/{board_id}/tasks",
+                    params={"limit": 200},
+                    headers=user_headers,
+                ),
+            )
+
+        async def dashboard_metrics(index: int) -> None:
+            _ = index
+            _check(
+                await client.get(
+                    "/api/v1/metrics/dashboard",
+                    params={"range_key": "7d"},
+                    headers=user_headers,
+                ),
+            )
+
+        async def agent_auth(index: int) -> None:
+            _ = index
+            _check(await client.get("/api/v1/agent/healthz", headers=agent_headers))
+
+        async def sse_tick(index: int) -> None:
+            # One poll of the task stream loop; the endpoint itself never returns.
+            board_id = UUID(sample_boards[index % len(sample_boards)])
+            async with async_session_maker() as session:
+                rows = await tasks_api._fetch_task_events(
+                    session,
+                    board_id,
+                    sse_cursors.get(board_id, 0),
+                )
+                await tasks_api._stream_task_state(session, board_id=board_id, rows=rows)
+
+        async def webhook_ingest(index: int) -> None:
+            board_id, webhook_id = sample_webhooks[index % len(sample_webhooks)]
+            _check(
+                await client.post(
+                    f"/api/v1/boards/{board_id}/webhooks/{webhook_id}",
+                    json={"event": "benchmark", "sequence": index},
+                ),
+            )
+
+        scenarios: dict[str, Operation] = {
+            "board_snapshot": board_snapshot,
+            "list_tasks": list_tasks,
+            "dashboard_metrics": dashboard_metrics,
+            "agent_auth": agent_auth,
+            "sse_tick": sse_tick,
+            "webhook_ingest": webhook_ingest,
+        }
+        selected = args.scenarios or list(scenarios)
+        results = [
+            await _run_scenario(
+                name,
+                scenarios[name],
+                iterations=args.iterations,
+                warmup=args.warmup,
+            )
+            for name in selected
+        ]
+
+    await gateway.stop()
+    await async_engine.dispose()
+    return {
+        "schema_version": RESULT_SCHEMA_VERSION,
+        "git_commit": _git_commit(),
+        "started_at": utcnow().isoformat(),
+        "python": platform.python_version(),
+        "database": async_engine.dialect.name,
+        "gateway": {"latency_ms": args.gateway_latency_ms, **gateway.stats.as_dict()},
+        "dataset": {**asdict(spec), "seed": args.seed, "seed_seconds": seed_seconds},
+        "scenarios": {result.name: asdict(result) for result in results},
+    }
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    defaults = DatasetSpec()
+    for spec_field in fields(DatasetSpec):
+        parser.add_argument(
+            f"--{spec_field.name.replace('_', '-')}",
+            dest=spec_field.name,
+            type=type(getattr(defaults, spec_field.name)),
+            default=getattr(defaults, spec_field.name),
+        )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--sample-boards", type=int, default=20)
+    parser.add_argument("--gateway-latency-ms", type=float, default=5.0)
+    parser.add_argument(
+        "--scenarios",
+        nargs="+",
+        choices=(
+            "board_snapshot",
+            "list_tasks",
+            "dashboard_metrics",
+            "agent_auth",
+            "sse_tick",
+            "webhook_ingest",
+        ),
+    )
+    parser.add_argument("--manifest", help="Write (or with --skip-seed, read) the dataset.")
+    parser.add_argument("--skip-seed", action="store_true")
+    parser.add_argument("--output", help="Write results here instead of stdout.")
+    return parser
+
+
+def main() -> None:
+    """Seed the synthetic tenant, time each scenario and emit JSON results."""
+    args = _parser().parse_args()
+    report = asyncio.run(_run(args))
+    text = json.dumps(report, indent=2) + "\n"
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+    else:
+        sys.stdout.write(text)
+
+
+if __name__ == "__main__":
+    main()
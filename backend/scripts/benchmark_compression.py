@@ -0,0 +1,159 @@
+"""Benchmark response compression: bytes on the wire and CPU time per encoding.
+
+Prints one JSON object per case so runs can be compared across settings, e.g.
+`python scripts/benchmark_compression.py --tasks 2000 --events 500`. The `snapshot`
+cases compress a synthetic board snapshot once per encoding/level; the `sse` cases
+compare the middleware's shared-context stream (one compressor, sync flush after each
+event) with compressing every event independently. Brotli rows appear only when the
+optional `brotli` package is installed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+from uuid import uuid4
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_ROOT))
+
+if TYPE_CHECKING:
+    from app.core.compression import Compressor
+
+_STATUSES = ("inbox", "in_progress", "review", "done")
+
+
+def _task(index: int, board_id: str) -> dict[str, object]:
+    return {
+        "id": str(uuid4()),
+        "board_id": board_id,
+        "title": f"Synthetic task {index}",
+        "description": f"Benchmark task number {index} " + "lorem ipsum " * 12,
+        "status": _STATUSES[index % len(_STATUSES)],
+        "priority": ("low", "medium", "high")[index % 3],
+        "due_at": None,
+        "assigned_agent_id": str(uuid4()) if index % 2 else None,
+        "created_by_user_id": None,
+        "created_at": "2026-01-01T00:00:00",
+        "updated_at": "2026-01-02T00:00:00",
+        "depends_on_task_ids": [],
+        "blocked_by_task_ids": [],
+        "is_blocked": False,
+        "tags": [{"id": str(uuid4()), "name": f"tag-{index % 10}", "color": "9e9e9e"}],
+        "custom_field_values": {},
+    }
+
+
+def _snapshot(tasks: int) -> bytes:
+    board_id = str(uuid4())
+    payload = {
+        "board": {"id": board_id, "name": "Benchmark board", "slug": "benchmark"},
+        "tasks": [_task(index, board_id) for index in range(tasks)],
+        "agents": [],
+        "approvals": [],
+        "chat_messages": [],
+        "pending_approvals_count": 0,
+    }
+    return json.dumps(payload).encode()
+
+
+def _events(count: int) -> list[bytes]:
+    board_id = str(uuid4())
+    return [
+        f"event: task\ndata: {json.dumps({'type': 'task.updated', 'task': _task(i, board_id)})}\n\n".encode()
+        for i in range(count)
+    ]
+
+
+def _cases(gzip_levels: list[int], brotli_qualities: list[int]) -> list[tuple[str, int]]:
+    from app.core.compression import available_encodings
+
+    cases = [("gzip", level) for level in gzip_levels]
+    if "br" in available_encodings():
+        cases += [("br", quality) for quality in brotli_qualities]
+    return cases
+
+
+def _compressor(encoding: str, level: int) -> Compressor:
+    from app.core.compression import make_compressor
+
+    return make_compressor(
+        "br" if encoding == "br" else "gzip",
+        gzip_level=level,
+        brotli_quality=level,
+    )
+
+
+def _measure_snapshot(body: bytes, encoding: str, level: int) -> dict[str, object]:
+    started = time.process_time()
+    compressor = _compressor(encoding, level)
+    wire = len(compressor.compress(body) + compressor.finish())
+    cpu = time.process_time() - started
+    return {
+        "case": "snapshot",
+        "encoding": encoding,
+        "level": level,
+        "raw_bytes": len(body),
+        "wire_bytes": wire,
+        "ratio": round(wire / len(body), 4),
+        "cpu_ms": round(cpu * 1000, 3),
+    }
+
+
+def _measure_events(events: list[bytes], encoding: str, level: int) -> list[dict[str, object]]:
+    raw = sum(len(event) for event in events)
+    results: list[dict[str, object]] = []
+    for strategy in ("shared_sync_flush", "per_event"):
+        started = time.process_time()
+        if strategy == "shared_sync_flush":
+            shared = _compressor(encoding, level)
+            wire = sum(len(shared.compress(event) + shared.flush()) for event in events)
+            wire += len(shared.finish())
+        else:
+            wire = 0
+            for event in events:
+                own = _compressor(encoding, level)
+                wire += len(own.compress(event) + own.finish())
+        cpu = time.process_time() - started
+        results.append(
+            {
+                "case": "sse",
+                "strategy": strategy,
+                "encoding": encoding,
+                "level": level,
+                "events": len(events),
+                "raw_bytes": raw,
+                "wire_bytes": wire,
+                "ratio": round(wire / raw, 4),
+                "cpu_ms": round(cpu * 1000, 3),
+            },
+        )
+    return results
+
+
+def main() -> None:
+    """Report wire size and CPU time for snapshot and SSE payloads per encoding."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument("--events", type=int, default=500)
+    parser.add_argument("--gzip-levels", type=int, nargs="+", default=[1, 6, 9])
+    parser.add_argument("--brotli-qualities", type=int, nargs="+", default=[4, 6, 11])
+    args = parser.parse_args()
+
+    body = _snapshot(args.tasks)
+    events = _events(args.events)
+    sys.stdout.write(
+        json.dumps({"case": "snapshot", "encoding": "identity", "wire_bytes": len(body)}) + "\n",
+    )
+    for encoding, level in _cases(args.gzip_levels, args.brotli_qualities):
+        sys.stdout.write(json.dumps(_measure_snapshot(body, encoding, level)) + "\n")
+        for result in _measure_events(events, encoding, level):
+            sys.stdout.write(json.dumps(result) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,434 @@
+"""Generate a synthetic large-tenant dataset for the benchmark harness.
+
+Rows are written with chunked core `INSERT`s and every id, timestamp and choice is
+drawn from a seeded RNG, so the same `DatasetSpec` and seed always produce the same
+data. The local-auth user is made an owner of the generated organization so the
+harness can call user endpoints with `LOCAL_AUTH_TOKEN`.
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, cast
+from uuid import UUID
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_ROOT))
+
+from sqlalchemy import Table, insert, select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncEngine  # noqa: E402
+
+INSERT_CHUNK_ROWS = 5_000
+TASK_STATUSES = ("inbox", "in_progress", "review", "done")
+TASK_PRIORITIES = ("low", "medium", "high")
+EVENT_TYPES = ("task.created", "task.updated", "task.status_changed", "task.comment")
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """Size of the generated tenant."""
+
+    boards: int = 1_000
+    tasks_per_board: int = 200
+    agents_per_board: int = 3
+    tags: int = 40
+    max_tags_per_task: int = 3
+    custom_fields: int = 6
+    dependency_ratio: float = 0.3
+    approvals_per_board: int = 20
+    events_per_task: int = 4
+    memory_per_board: int = 50
+    history_days: int = 30
+
+
+@dataclass
+class BenchmarkDataset:
+    """What the harness needs to address the generated tenant."""
+
+    organization_id: str
+    board_ids: list[str]
+    webhooks: list[tuple[str, str]]
+    agent_token: str
+    spec: dict[str, Any] = field(default_factory=dict)
+    seed: int = 0
+
+
+def _table(model: type[Any]) -> Table:
+    return cast(Table, model.__table__)
+
+
+class _Rows:
+    """Buffer rows per table and flush them in chunks."""
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        self._engine = engine
+        self._pending: dict[Table, list[dict[str, Any]]] = {}
+
+    async def add(self, table: Table, row: dict[str, Any]) -> None:
+        rows = self._pending.setdefault(table, [])
+        rows.append(row)
+        if len(rows) >= INSERT_CHUNK_ROWS:
+            await self.flush(table)
+
+    async def flush(self, table: Table | None = None) -> None:
+        tables = [table] if table is not None else list(self._pending)
+        async with self._engine.begin() as conn:
+            for current in tables:
+                rows = self._pending.pop(current, [])
+                if rows:
+                    await conn.execute(insert(current), rows)
+
+
+async def generate_dataset(
+    engine: AsyncEngine,
+    spec: DatasetSpec,
+    *,
+    seed: int = 0,
+) -> BenchmarkDataset:
+    """Insert a full tenant described by `spec` and return its manifest."""
+    from app.core.agent_tokens import hash_agent_token
+    from app.core.auth import LOCAL_AUTH_EMAIL, LOCAL_AUTH_NAME, LOCAL_AUTH_USER_ID
+    from app.core.time import utcnow
+    from app.models.activity_events import ActivityEvent
+    from app.models.agents import Agent
+    from app.models.approval_task_links import ApprovalTaskLink
+    from app.models.approvals import Approval
+    from app.models.board_memory import BoardMemory
+    from app.models.board_webhooks import BoardWebhook
+    from app.models.boards import Board
+    from app.models.gateways import Gateway
+    from app.models.organization_members import OrganizationMember
+    from app.models.organizations import Organization
+    from app.models.tag_assignments import TagAssignment
+    from app.models.tags import Tag
+    from app.models.task_custom_fields import (
+        BoardTaskCustomField,
+        TaskCustomFieldDefinition,
+        TaskCustomFieldValue,
+    )
+    from app.models.task_dependencies import TaskDependency
+    from app.models.tasks import Task
+    from app.models.users import User
+
+    rng = random.Random(seed)
+    now = utcnow().replace(microsecond=0)
+    history = timedelta(days=spec.history_days)
+
+    def new_id() -> UUID:
+        return UUID(int=rng.getrandbits(128), version=4)
+
+    def past(after: datetime | None = None) -> datetime:
+        start = after or now - history
+        return start + (now - start) * rng.random()
+
+    rows = _Rows(engine)
+    org_id = new_id()
+    gateway_id = new_id()
+    await rows.add(
+        _table(Organization),
+        {"id": org_id, "name": f"Benchmark {seed}", "created_at": now, "updated_at": now},
+    )
+    await rows.add(
+        _table(Gateway),
+        {
+            "id": gateway_id,
+            "organization_id": org_id,
+            "name": "Benchmark gateway",
+            "url": "ws://benchmark-gateway.invalid/ws",
+            "token": None,
+            "disable_device_pairing": True,
+            "workspace_root": "/tmp/benchmark-workspace",
+            "allow_insecure_tls": False,
+            "created_at": now,
+            "updated_at": now,
+        },
+    )
+    await rows.flush()
+
+    async with engine.begin() as conn:
+        user_id = (
+            await conn.execute(
+                select(_table(User).c.id).where(
+                    _table(User).c.clerk_user_id == LOCAL_AUTH_USER_ID,
+                ),
+            )
+        ).scalar_one_or_none()
+        if user_id is None:
+            user_id = new_id()
+            await conn.execute(
+                insert(_table(User)),
+                {
+                    "id": user_id,
+                    "clerk_user_id": LOCAL_AUTH_USER_ID,
+                    "email": LOCAL_AUTH_EMAIL,
+                    "name": LOCAL_AUTH_NAME,
+                    "is_super_admin": False,
+                    "active_organization_id": org_id,
+                },
+            )
+        else:
+            await conn.execute(
+                _table(User)
+                .update()
+                .where(_table(User).c.id == user_id)
+                .values(active_organization_id=org_id),
+            )
+        await conn.execute(
+            insert(_table(OrganizationMember)),
+            {
+                "id": new_id(),
+                "organization_id": org_id,
+                "user_id": user_id,
+                "role": "owner",
+                "all_boards_read": True,
+                "all_boards_write": True,
+                "created_at": now,
+                "updated_at": now,
+            },
+        )
+
+    tag_ids = [new_id() for _ in range(spec.tags)]
+    for index, tag_id in enumerate(tag_ids):
+        await rows.add(
+            _table(Tag),
+            {
+                "id": tag_id,
+                "organization_id": org_id,
+                "name": f"Tag {index}",
+                "slug": f"tag-{index}",
+                "color": "9e9e9e",
+                "created_at": now,
+                "updated_at": now,
+            },
+        )
+    field_ids = [new_id() for _ in range(spec.custom_fields)]
+    for index, field_id in enumerate(field_ids):
+        await rows.add(
+            _table(TaskCustomFieldDefinition),
+            {
+                "id": field_id,
+                "organization_id": org_id,
+                "field_key": f"field_{index}",
+                "label": f"Field {index}",
+                "field_type": "text",
+                "ui_visibility": "always",
+                "required": False,
+                "created_at": now,
+                "updated_at": now,
+            },
+        )
+
+    # PBKDF2 is deliberately slow, so every agent but the benchmark one shares a
+    # decoy hash; token lookup still has to verify each of them.
+    agent_token = f"benchmark-agent-{seed}-{rng.getrandbits(64):x}"
+    decoy_hash = hash_agent_token(f"decoy-{seed}")
+    benchmark_agent_hash = hash_agent_token(agent_token)
+
+    board_ids: list[UUID] = []
+    webhooks: list[tuple[str, str]] = []
+    for board_index in range(spec.boards):
+        board_id = new_id()
+        board_ids.append(board_id)
+        board_created = past()
+        await rows.add(
+            _table(Board),
+            {
+                "id": board_id,
+                "organization_id": org_id,
+                "name": f"Board {board_index}",
+                "slug": f"board-{board_index}",
+                "description": "",
+                "gateway_id": gateway_id,
+                "board_type": "goal",
+                "goal_confirmed": True,
+                "require_approval_for_done": True,
+                "require_review_before_done": False,
+                "block_status_changes_with_pending_approval": False,
+                "only_lead_can_change_status": False,
+                "max_agents": spec.agents_per_board,
+                # Every seeded event is on a task of this board; see below.
+                "last_event_sequence": spec.tasks_per_board * spec.events_per_task,
+                "created_at": board_created,
+                "updated_at": board_created,
+            },
+        )
+        await rows.flush(_table(Board))
+
+        agent_ids = [new_id() for _ in range(spec.agents_per_board)]
+        for agent_index, agent_id in enumerate(agent_ids):
+            is_benchmark_agent = board_index == 0 and agent_index == 0
+            await rows.add(
+                _table(Agent),
+                {
+                    "id": agent_id,
+                    "board_id": board_id,
+                    "gateway_id": gateway_id,
+                    "name": f"Agent {board_index}-{agent_index}",
+                    "status": "online",
+                    "openclaw_session_id": f"agent:{agent_id}:main",
+                    "agent_token_hash": (
+                        benchmark_agent_hash if is_benchmark_agent else decoy_hash
+                    ),
+                    "is_board_lead": agent_index == 0,
+                    "last_seen_at": now,
+                    "created_at": board_created,
+                    "updated_at": board_created,
+                },
+            )
+        webhook_id = new_id()
+        webhooks.append((str(board_id), str(webhook_id)))
+        await rows.add(
+            _table(BoardWebhook),
+            {
+                "id": webhook_id,
+                "board_id": board_id,
+                "agent_id": agent_ids[0] if agent_ids else None,
+                "description": "Benchmark webhook",
+                "enabled": True,
+                "dedupe_content_hash": False,
+                "created_at": board_created,
+                "updated_at": board_created,
+            },
+        )
+        for field_id in field_ids:
+            await rows.add(
+                _table(BoardTaskCustomField),
+                {
+                    "id": new_id(),
+                    "board_id": board_id,
+                    "task_custom_field_definition_id": field_id,
+                    "created_at": board_created,
+                },
+            )
+
+        task_ids: list[UUID] = []
+        board_events: list[dict[str, Any]] = []
+        for task_index in range(spec.tasks_per_board):
+            task_id = new_id()
+            created = past(board_created)
+            status = rng.choice(TASK_STATUSES)
+            await rows.add(
+                _table(Task),
+                {
+                    "id": task_id,
+                    "board_id": board_id,
+                    "title": f"Task {board_index}-{task_index}",
+                    "description": "Synthetic benchmark task " * rng.randint(1, 8),
+                    "status": status,
+                    "priority": rng.choice(TASK_PRIORITIES),
+                    "in_progress_at": past(created) if status != "inbox" else None,
+                    "assigned_agent_id": rng.choice(agent_ids) if agent_ids else None,
+                    "auto_created": False,
+                    "created_at": created,
+                    "updated_at": past(created),
+                },
+            )
+            if task_ids and rng.random() < spec.dependency_ratio:
+                await rows.add(
+                    _table(TaskDependency),
+                    {
+                        "id": new_id(),
+                        "board_id": board_id,
+                        "task_id": task_id,
+                        "depends_on_task_id": task_ids[-1],
+                        "created_at": created,
+                    },
+                )
+            task_ids.append(task_id)
+            for tag_id in rng.sample(
+                tag_ids, rng.randint(0, min(spec.max_tags_per_task, len(tag_ids)))
+            ):
+                await rows.add(
+                    _table(TagAssignment),
+                    {"id": new_id(), "task_id": task_id, "tag_id": tag_id, "created_at": created},
+                )
+            for field_id in field_ids:
+                if rng.random() < 0.5:
+                    await rows.add(
+                        _table(TaskCustomFieldValue),
+                        {
+                            "id": new_id(),
+                            "task_id": task_id,
+                            "task_custom_field_definition_id": field_id,
+                            "value": f"value-{rng.randint(0, 99)}",
+                            "created_at": created,
+                            "updated_at": created,
+                        },
+                    )
+            for _ in range(spec.events_per_task):
+                board_events.append(
+                    {
+                        "id": new_id(),
+                        "event_type": rng.choice(EVENT_TYPES),
+                        "message": "Synthetic benchmark activity",
+                        "agent_id": rng.choice(agent_ids) if agent_ids else None,
+                        "task_id": task_id,
+                        "created_at": past(created),
+                    },
+                )
+        # Core inserts skip the flush hook that numbers events, so set the board and
+        # number them here the way the migration backfill does: in creation order.
+        board_events.sort(key=lambda event: event["created_at"])
+        for sequence, event in enumerate(board_events, start=1):
+            await rows.add(
+                _table(ActivityEvent),
+                {**event, "board_id": board_id, "board_sequence": sequence},
+            )
+
+        for _ in range(min(spec.approvals_per_board, len(task_ids))):
+            approval_id = new_id()
+            task_id = rng.choice(task_ids)
+            created = past(board_created)
+            approval_status = rng.choice(("pending", "approved", "rejected"))
+            await rows.add(
+                _table(Approval),
+                {
+                    "id": approval_id,
+                    "board_id": board_id,
+                    "task_id": task_id,
+                    "agent_id": rng.choice(agent_ids) if agent_ids else None,
+                    "action_type": "task.done",
+                    "payload": {"reason": "benchmark"},
+                    "confidence": round(rng.uniform(50, 100), 1),
+                    "status": approval_status,
+                    "created_at": created,
+                    "resolved_at": past(created) if approval_status != "pending" else None,
+                },
+            )
+            await rows.add(
+                _table(ApprovalTaskLink),
+                {
+                    "id": new_id(),
+                    "approval_id": approval_id,
+                    "task_id": task_id,
+                    "created_at": created,
+                },
+            )
+        for memory_index in range(spec.memory_per_board):
+            await rows.add(
+                _table(BoardMemory),
+                {
+                    "id": new_id(),
+                    "board_id": board_id,
+                    "content": f"Benchmark memory {memory_index} " * rng.randint(1, 6),
+                    "tags": ["benchmark"],
+                    "is_chat": rng.random() < 0.3,
+                    "source": "benchmark",
+                    "created_at": past(board_created),
+                },
+            )
+        # Parents must exist before children from the next board reference them.
+        await rows.flush()
+
+    return BenchmarkDataset(
+        organization_id=str(org_id),
+        board_ids=[str(board_id) for board_id in board_ids],
+        webhooks=webhooks,
+        agent_token=agent_token,
+        spec=asdict(spec),
+        seed=seed,
+    )
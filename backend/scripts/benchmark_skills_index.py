@@ -0,0 +1,72 @@
+"""Benchmark `skills_index.json` parsing on synthetic indexes of increasing size.
+
+Prints one JSON object per size with wall time and peak traced memory so runs can be
+compared across commits, e.g. `python scripts/benchmark_skills_index.py --sizes 25000
+50000 100000`. Time should grow linearly with the entry count; peak memory should
+stay roughly flat because only the unparsed tail of the file is buffered.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_ROOT))
+
+
+def _write_index(path: Path, entries: int) -> None:
+    with path.open("w", encoding="utf-8") as fp:
+        fp.write('{"version": 1, "skills": [')
+        for index in range(entries):
+            if index:
+                fp.write(",")
+            entry = {
+                "id": f"skill-{index}",
+                "name": f"Synthetic Skill {index}",
+                "description": f"Benchmark skill number {index} " + "lorem ipsum " * 8,
+                "path": f"skills/group-{index % 100}/skill-{index}",
+                "category": f"category-{index % 25}",
+                "risk": ("low", "medium", "high")[index % 3],
+            }
+            fp.write(json.dumps(entry))
+        fp.write("]}")
+
+
+def _measure(index_path: Path) -> dict[str, float | int]:
+    from app.api.skills_marketplace import _StreamingJSONReader
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    count = 0
+    with index_path.open(encoding="utf-8") as fp:
+        for _ in _StreamingJSONReader(fp).iter_entries():
+            count += 1
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"entries": count, "seconds": round(elapsed, 4), "peak_bytes": peak}
+
+
+def main() -> None:
+    """Generate synthetic indexes and report parse time and peak memory per size."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[25_000, 50_000, 100_000])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in args.sizes:
+            index_path = Path(tmp_dir) / f"skills_index_{size}.json"
+            _write_index(index_path, size)
+            result = _measure(index_path)
+            result["file_bytes"] = index_path.stat().st_size
+            sys.stdout.write(json.dumps(result) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -62,6 +62,17 @@ def _parse_args() -> argparse.Namespace:
         action="store_true",
         help="Overwrite editable files (e.g. USER.md, MEMORY.md) during update sync",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Number of agents to sync in parallel (default: GATEWAY_TEMPLATE_SYNC_CONCURRENCY)",
+    )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Only print the final summary (no per-agent progress lines)",
+    )
     return parser.parse_args()
 
 
@@ -71,6 +82,7 @@ async def _run() -> int:
     from app.models.users import User
     from app.services.openclaw.provisioning_db import (
         GatewayTemplateSyncOptions,
+        GatewayTemplateSyncProgress,
         OpenClawProvisioningService,
     )
 
@@ -79,6 +91,14 @@ async def _run() -> int:
     board_id = UUID(args.board_id) if args.board_id else None
     user_id = UUID(args.user_id) if args.user_id else None
 
+    def _print_progress(progress: GatewayTemplateSyncProgress) -> None:
+        detail = f" message={progress.message}" if progress.message else ""
+        sys.stdout.write(
+            f"[{progress.completed}/{progress.total}] {progress.status} "
+            f"agent={progress.agent_name} ({progress.agent_id}){detail}\n",
+        )
+        sys.stdout.flush()
+
     async with async_session_maker() as session:
         gateway = await session.get(Gateway, gateway_id)
         if gateway is None:
@@ -100,6 +120,8 @@ async def _run() -> int:
                 force_bootstrap=bool(args.force_bootstrap),
                 overwrite=bool(args.overwrite),
                 board_id=board_id,
+                concurrency=args.concurrency,
+                on_progress=None if args.quiet else _print_progress,
             ),
         )
 
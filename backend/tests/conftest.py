@@ -3,8 +3,12 @@
 
 import os
 import sys
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
@@ -13,3 +17,51 @@ if str(ROOT) not in sys.path:
 # defaults during import-time settings initialization, regardless of shell env.
 os.environ["AUTH_MODE"] = "local"
 os.environ["LOCAL_AUTH_TOKEN"] = "test-local-token-0123456789-0123456789-0123456789x"
+# Deliver agent notifications inline unless a test opts into the Redis-backed queue.
+os.environ["AGENT_NOTIFICATION_QUEUE_ENABLED"] = "false"
+# Exercise request instrumentation and `/metrics` on the app under test.
+os.environ["METRICS_ENABLED"] = "true"
+# Keep the background gateway health monitor out of app lifespans under test.
+os.environ["GATEWAY_HEALTH_INTERVAL_SECONDS"] = "0"
+
+from app.core.query_stats import (  # noqa: E402
+    SHAPE_PREVIEW_CHARS,
+    QueryStats,
+    install_query_tracking,
+    track_queries,
+)
+
+# Test engines are created per test; listeners on `Engine` cover all of them.
+install_query_tracking()
+
+
+@pytest.fixture
+def query_budget() -> Callable[..., AbstractContextManager[QueryStats]]:
+    """Assert that a block issues at most `max_statements` SQL statements.
+
+    `with query_budget(4): await client.get(...)` fails with the most frequent
+    statement shapes when the budget is exceeded; `max_repeats` additionally caps how
+    often any single statement shape may run (catching N+1 loops).
+    """
+
+    @contextmanager
+    def _budget(
+        max_statements: int,
+        *,
+        max_repeats: int | None = None,
+    ) -> Iterator[QueryStats]:
+        with track_queries(track_shapes=True) as stats:
+            yield stats
+        top = "\n".join(
+            f"  {count}x {shape[:SHAPE_PREVIEW_CHARS]}"
+            for shape, count in stats.shapes.most_common(5)
+        )
+        if stats.statements > max_statements:
+            raise AssertionError(
+                f"expected at most {max_statements} SQL statements, "
+                f"got {stats.statements}:\n{top}",
+            )
+        if max_repeats is not None and stats.repeated_shapes(max_repeats + 1):
+            raise AssertionError(f"a statement ran more than {max_repeats} times:\n{top}")
+
+    return _budget
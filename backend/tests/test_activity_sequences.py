@@ -0,0 +1,194 @@
+# ruff: noqa: INP001
+"""Per-board activity sequences and `Last-Event-ID` resume for the task stream."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel, col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api import activity as activity_api
+from app.api import tasks as tasks_api
+from app.core.time import utcnow
+from app.models.activity_events import ActivityEvent
+from app.models.boards import Board
+from app.models.organizations import Organization
+from app.models.tasks import Task
+from app.services.activity_log import (
+    board_sequence_cursors,
+    parse_event_sequence,
+    record_activity,
+)
+
+
+class _ConnectedRequest:
+    async def is_disconnected(self) -> bool:
+        return False
+
+
+async def _make_engine() -> AsyncEngine:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.connect() as conn, conn.begin():
+        await conn.run_sync(SQLModel.metadata.create_all)
+    return engine
+
+
+async def _seed_board(session: AsyncSession) -> Board:
+    organization_id = uuid4()
+    session.add(Organization(id=organization_id, name="org"))
+    board = Board(organization_id=organization_id, name="B", slug="b")
+    session.add(board)
+    await session.commit()
+    return board
+
+
+def test_parse_event_sequence_ignores_non_numeric_ids() -> None:
+    assert parse_event_sequence(" 42 ") == 42
+    assert parse_event_sequence("abc") is None
+    assert parse_event_sequence("-1") is None
+    assert parse_event_sequence(None) is None
+
+
+@pytest.mark.asyncio
+async def test_task_events_get_consecutive_board_sequences() -> None:
+    engine = await _make_engine()
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_maker() as session:
+        board = await _seed_board(session)
+        other = await _seed_board(session)
+        # The task is new in the same flush as its first event.
+        task = Task(board_id=board.id, title="First")
+        session.add(task)
+        record_activity(session, event_type="task.created", message="created", task_id=task.id)
+        await session.commit()
+        other_task = Task(board_id=other.id, title="Elsewhere")
+        session.add(other_task)
+        await session.commit()
+        record_activity(session, event_type="task.updated", message="a", task_id=task.id)
+        record_activity(session, event_type="task.updated", message="b", task_id=task.id)
+        record_activity(session, event_type="task.updated", message="c", task_id=other_task.id)
+        record_activity(session, event_type="agent.heartbeat", message="no task")
+        await session.commit()
+
+        events = (
+            await session.exec(select(ActivityEvent).order_by(col(ActivityEvent.message)))
+        ).all()
+        counters = dict(
+            (await session.exec(select(col(Board.id), col(Board.last_event_sequence)))).all(),
+        )
+
+    assert {event.message: event.board_sequence for event in events} == {
+        "created": 1,
+        "a": 2,
+        "b": 3,
+        "c": 1,
+        "no task": None,
+    }
+    assert counters == {board.id: 3, other.id: 1}
+    assert {event.message: event.board_id for event in events} == {
+        "created": board.id,
+        "a": board.id,
+        "b": board.id,
+        "c": other.id,
+        "no task": None,
+    }
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_task_stream_resumes_after_last_event_id(monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = await _make_engine()
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(tasks_api, "async_session_maker", session_maker)
+    created_at = utcnow() - timedelta(minutes=5)
+    async with session_maker() as session:
+        board = await _seed_board(session)
+        task = Task(board_id=board.id, title="First")
+        session.add(task)
+        await session.commit()
+        # Same timestamp on every event: a `since` cursor could not tell them apart.
+        for message in ("one", "two", "three"):
+            session.add(
+                ActivityEvent(
+                    event_type="task.updated",
+                    message=message,
+                    task_id=task.id,
+                    created_at=created_at,
+                ),
+            )
+            await session.commit()
+        cursors = await board_sequence_cursors(session, [board.id], since=utcnow())
+
+    async def _collect(last_event_id: str | None, count: int) -> list[dict[str, str]]:
+        stream = tasks_api._task_event_generator(
+            request=_ConnectedRequest(),  # type: ignore[arg-type]
+            board_id=board.id,
+            since_dt=created_at,
+            last_event_id=last_event_id,
+        )
+        try:
+            return [await anext(stream) for _ in range(count)]
+        finally:
+            await stream.aclose()
+
+    from_since = await _collect(None, 3)
+    resumed = await _collect("1", 2)
+
+    assert cursors == {board.id: 3}
+    assert [event["id"] for event in from_since] == ["1", "2", "3"]
+    assert [event["id"] for event in resumed] == ["2", "3"]
+    assert resumed == from_since[1:]
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("board_batch", [1, activity_api.COMMENT_FEED_BOARD_BATCH])
+async def test_comment_feed_filters_each_board_cursor_in_sql(
+    monkeypatch: pytest.MonkeyPatch,
+    board_batch: int,
+) -> None:
+    engine = await _make_engine()
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(activity_api, "COMMENT_FEED_BOARD_BATCH", board_batch)
+    loaded: list[int] = []
+    coerce = activity_api._coerce_task_comment_rows
+
+    def _counting_coerce(items):
+        loaded.append(len(items))
+        return coerce(items)
+
+    monkeypatch.setattr(activity_api, "_coerce_task_comment_rows", _counting_coerce)
+    async with session_maker() as session:
+        busy = await _seed_board(session)
+        quiet = await _seed_board(session)
+        busy_task = Task(board_id=busy.id, title="Busy")
+        quiet_task = Task(board_id=quiet.id, title="Quiet")
+        session.add_all([busy_task, quiet_task])
+        await session.commit()
+        for index in range(1, 201):
+            record_activity(
+                session, event_type="task.comment", message=f"busy-{index}", task_id=busy_task.id
+            )
+        await session.commit()
+        record_activity(
+            session, event_type="task.comment", message="quiet-1", task_id=quiet_task.id
+        )
+        await session.commit()
+
+        rows = await activity_api._fetch_task_comment_events(
+            session,
+            {busy.id: 198, quiet.id: 0},
+        )
+
+    # Counters 200 vs 1: the quiet board's cursor must not pull the busy board's history.
+    assert [event.message for event, _task, _board, _agent in rows] == [
+        "busy-199",
+        "busy-200",
+        "quiet-1",
+    ]
+    assert sum(loaded) == 3
+    await engine.dispose()
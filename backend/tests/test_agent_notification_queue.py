@@ -0,0 +1,389 @@
+# ruff: noqa: INP001
+"""Outbound agent notification queue and worker behavior."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from uuid import uuid4
+
+import pytest
+
+import app.services.notifications.dispatch as notification_dispatch
+import app.services.openclaw.gateway_dispatch as gateway_dispatch
+from app.core.config import settings
+from app.services.notifications.queue import (
+    NotificationActivity,
+    _task_from_notification,
+    decode_notification_task,
+    enqueue_agent_notifications,
+    new_agent_notification,
+    park_agent_notifications,
+    with_next_attempt,
+)
+from app.services.openclaw.gateway_rpc import GatewayConfig, OpenClawGatewayError
+
+_CONFIG = GatewayConfig(url="ws://gateway.example/ws")
+
+
+@pytest.fixture(autouse=True)
+def queue_outcomes(monkeypatch: pytest.MonkeyPatch) -> list[tuple[str, str, str]]:
+    outcomes: list[tuple[str, str, str]] = []
+
+    def _fake_record(queue_name, task_type, outcome, **_):
+        outcomes.append((queue_name, task_type, outcome))
+
+    monkeypatch.setattr(notification_dispatch, "record_queue_outcome", _fake_record)
+    return outcomes
+
+
+@dataclass
+class _FakeSession:
+    added: list[object] = field(default_factory=list)
+
+    def add(self, value: object) -> None:
+        self.added.append(value)
+
+
+def _notification(session_key: str, message: str, **kwargs):
+    return new_agent_notification(
+        board_id=kwargs.pop("board_id", uuid4()),
+        session_key=session_key,
+        agent_name="Worker",
+        message=message,
+        **kwargs,
+    )
+
+
+def test_notification_task_roundtrip_preserves_activity() -> None:
+    agent_id = uuid4()
+    item = _notification(
+        "agent:a",
+        "hello",
+        deliver=True,
+        on_failed=NotificationActivity(
+            event_type="task.lead_notify_failed",
+            message="Lead notify failed",
+            agent_id=agent_id,
+        ),
+    )
+
+    decoded = decode_notification_task(_task_from_notification(item))
+
+    assert decoded == item
+
+
+@pytest.mark.asyncio
+async def test_queue_agent_message_enqueues_without_calling_gateway(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    queued = []
+    sent = []
+
+    def _fake_enqueue(item):
+        queued.append(item)
+        return True
+
+    async def _fake_try_send(self, **kwargs):
+        sent.append(kwargs)
+
+    monkeypatch.setattr(settings, "agent_notification_queue_enabled", True)
+    monkeypatch.setattr(gateway_dispatch, "enqueue_agent_notification", _fake_enqueue)
+    monkeypatch.setattr(
+        gateway_dispatch.GatewayDispatchService, "try_send_agent_message", _fake_try_send
+    )
+    session = _FakeSession()
+
+    result = await gateway_dispatch.GatewayDispatchService(session).queue_agent_message(  # type: ignore[arg-type]
+        board_id=uuid4(),
+        session_key="agent:a",
+        config=_CONFIG,
+        agent_name="Worker",
+        message="hello",
+        on_sent=NotificationActivity(event_type="task.lead_notified", message="sent"),
+    )
+
+    assert result is True
+    assert [item.message for item in queued] == ["hello"]
+    assert sent == []
+    assert session.added == []
+
+
+@pytest.mark.asyncio
+async def test_queue_agent_message_sends_inline_when_queue_unavailable(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    async def _fake_try_send(self, **kwargs):
+        return OpenClawGatewayError("gateway down")
+
+    monkeypatch.setattr(settings, "agent_notification_queue_enabled", True)
+    monkeypatch.setattr(gateway_dispatch, "enqueue_agent_notification", lambda item: False)
+    monkeypatch.setattr(
+        gateway_dispatch.GatewayDispatchService, "try_send_agent_message", _fake_try_send
+    )
+    session = _FakeSession()
+
+    result = await gateway_dispatch.GatewayDispatchService(session).queue_agent_message(  # type: ignore[arg-type]
+        board_id=uuid4(),
+        session_key="agent:a",
+        config=_CONFIG,
+        agent_name="Worker",
+        message="hello",
+        on_failed=NotificationActivity(
+            event_type="task.lead_notify_failed", message="Lead notify failed"
+        ),
+    )
+
+    assert result is False
+    assert [event.message for event in session.added] == ["Lead notify failed: gateway down"]
+
+
+class _RecordingDispatch:
+    def __init__(self, *, transient_failures: set[str] | None = None) -> None:
+        self.sent: list[tuple[str, str]] = []
+        self.in_flight = 0
+        self.peak = 0
+        self.transient_failures = transient_failures or set()
+
+    async def send_agent_message(self, *, session_key, config, agent_name, message, deliver):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if message in self.transient_failures:
+                raise OpenClawGatewayError("connection refused")
+            self.sent.append((session_key, message))
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.mark.asyncio
+async def test_lanes_deliver_concurrently_across_sessions_in_order_within_session(
+    monkeypatch: pytest.MonkeyPatch,
+    queue_outcomes: list[tuple[str, str, str]],
+) -> None:
+    monkeypatch.setattr(settings, "agent_notification_concurrency_per_gateway", 2)
+    board_id = uuid4()
+    items = [
+        _notification(f"agent:{session}", f"{session}-{index}", board_id=board_id)
+        for index in range(3)
+        for session in ("a", "b", "c")
+    ]
+    lanes = notification_dispatch._build_lanes(items, {board_id: _CONFIG})
+    dispatch = _RecordingDispatch()
+    semaphore = asyncio.Semaphore(settings.agent_notification_concurrency_per_gateway)
+
+    delivered = await asyncio.gather(
+        *(
+            notification_dispatch._deliver_lane(_FakeSession(), dispatch, lane, semaphore)  # type: ignore[arg-type]
+            for lane in lanes[_CONFIG.url]
+        ),
+    )
+
+    assert sum(delivered) == 9
+    assert dispatch.peak == 2
+    assert (
+        queue_outcomes
+        == [
+            (settings.agent_notification_queue_name, "agent_notification", "processed"),
+        ]
+        * 9
+    )
+    for session in ("a", "b", "c"):
+        assert [message for key, message in dispatch.sent if key == f"agent:{session}"] == [
+            f"{session}-0",
+            f"{session}-1",
+            f"{session}-2",
+        ]
+
+
+@pytest.mark.asyncio
+async def test_lane_parks_failed_item_and_followers_in_order(
+    monkeypatch: pytest.MonkeyPatch,
+    queue_outcomes: list[tuple[str, str, str]],
+) -> None:
+    parked: list[list[tuple[str, int]]] = []
+
+    def _fake_park(items, *, delay_seconds):
+        assert delay_seconds > 0
+        parked.append([(item.message, item.attempts) for item in items])
+        return True
+
+    monkeypatch.setattr(settings, "agent_notification_retry_timeout_seconds", 0.05)
+    monkeypatch.setattr(notification_dispatch, "park_agent_notifications", _fake_park)
+    board_id = uuid4()
+    items = [_notification("agent:a", f"m{index}", board_id=board_id) for index in range(3)]
+    lane = notification_dispatch._build_lanes(items, {board_id: _CONFIG})[_CONFIG.url][0]
+    dispatch = _RecordingDispatch(transient_failures={"m1"})
+
+    delivered = await notification_dispatch._deliver_lane(
+        _FakeSession(),  # type: ignore[arg-type]
+        dispatch,  # type: ignore[arg-type]
+        lane,
+        asyncio.Semaphore(1),
+    )
+
+    assert delivered == 1
+    assert dispatch.sent == [("agent:a", "m0")]
+    assert parked == [[("m1", 1), ("m2", 0)]]
+    assert [outcome for _, _, outcome in queue_outcomes] == ["processed", "failed", "retried"]
+
+
+@pytest.mark.asyncio
+async def test_failing_lane_does_not_hold_the_gateway_slot_while_it_backs_off(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "agent_notification_retry_timeout_seconds", 0.5)
+    monkeypatch.setattr(notification_dispatch, "park_agent_notifications", lambda *_, **__: True)
+    board_id = uuid4()
+    items = [
+        _notification("agent:failing", "down", board_id=board_id),
+        _notification("agent:healthy", "up", board_id=board_id),
+    ]
+    lanes = notification_dispatch._build_lanes(items, {board_id: _CONFIG})[_CONFIG.url]
+    dispatch = _RecordingDispatch(transient_failures={"down"})
+    semaphore = asyncio.Semaphore(1)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    healthy_done: list[float] = []
+
+    async def _run(lane) -> int:
+        delivered = await notification_dispatch._deliver_lane(
+            _FakeSession(),  # type: ignore[arg-type]
+            dispatch,  # type: ignore[arg-type]
+            lane,
+            semaphore,
+        )
+        if lane.items[0].session_key == "agent:healthy":
+            healthy_done.append(loop.time() - started)
+        return delivered
+
+    delivered = await asyncio.gather(*(_run(lane) for lane in lanes))
+    elapsed = loop.time() - started
+
+    assert delivered == [0, 1]
+    assert dispatch.sent == [("agent:healthy", "up")]
+    # The failing lane kept retrying for the whole window, but only held the single
+    # gateway slot for its send attempts, never while sleeping between them.
+    assert elapsed >= 0.5
+    assert healthy_done[0] < 0.2
+
+
+@pytest.mark.asyncio
+async def test_lane_counts_drop_when_retries_are_exhausted(
+    monkeypatch: pytest.MonkeyPatch,
+    queue_outcomes: list[tuple[str, str, str]],
+) -> None:
+    monkeypatch.setattr(settings, "agent_notification_retry_timeout_seconds", 0.05)
+    monkeypatch.setattr(settings, "rq_dispatch_max_retries", 0)
+    board_id = uuid4()
+    items = [_notification("agent:a", f"m{index}", board_id=board_id) for index in range(2)]
+    lane = notification_dispatch._build_lanes(items, {board_id: _CONFIG})[_CONFIG.url][0]
+    dispatch = _RecordingDispatch(transient_failures={"m0"})
+
+    delivered = await notification_dispatch._deliver_lane(
+        _FakeSession(),  # type: ignore[arg-type]
+        dispatch,  # type: ignore[arg-type]
+        lane,
+        asyncio.Semaphore(1),
+    )
+
+    assert delivered == 1
+    assert [outcome for _, _, outcome in queue_outcomes] == ["failed", "dropped", "processed"]
+
+
+class _FakeRedis:
+    """Just enough of redis-py's list, sorted-set and pipeline API for the queue."""
+
+    def __init__(self) -> None:
+        self.lists: dict[str, list[str]] = {}
+        self.zsets: dict[str, dict[str, float]] = {}
+
+    def lpush(self, key: str, *values: str) -> None:
+        for value in values:
+            self.lists.setdefault(key, []).insert(0, value)
+
+    def rpush(self, key: str, *values: str) -> None:
+        self.lists.setdefault(key, []).extend(values)
+
+    def rpop(self, key: str) -> str | None:
+        values = self.lists.get(key)
+        return values.pop() if values else None
+
+    def lrange(self, key: str, start: int, end: int) -> list[str]:
+        values = self.lists.get(key, [])
+        return values[start:] if end == -1 else values[start : end + 1]
+
+    def delete(self, key: str) -> int:
+        return 1 if self.lists.pop(key, None) is not None else 0
+
+    def exists(self, key: str) -> int:
+        return 1 if self.lists.get(key) else 0
+
+    def zadd(self, key: str, mapping: dict[str, float]) -> None:
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    def zrangebyscore(self, key, low, high, *, start=0, num=None, withscores=False):
+        low = float(low)
+        high = float(high)
+        members = sorted(
+            (score, member)
+            for member, score in self.zsets.get(key, {}).items()
+            if low <= score <= high
+        )[start : None if num is None else start + num]
+        if withscores:
+            return [(member, score) for score, member in members]
+        return [member for _, member in members]
+
+    def zrem(self, key: str, *members: str) -> None:
+        for member in members:
+            self.zsets.get(key, {}).pop(member, None)
+
+    def pipeline(self, *, transaction: bool = True) -> _FakePipeline:
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    def __init__(self, client: _FakeRedis) -> None:
+        self._client = client
+        self._calls: list[tuple[str, tuple[object, ...]]] = []
+
+    def __getattr__(self, name: str):
+        def _queue(*args: object) -> None:
+            self._calls.append((name, args))
+
+        return _queue
+
+    def execute(self) -> list[object]:
+        return [getattr(self._client, name)(*args) for name, args in self._calls]
+
+
+def test_newer_notifications_wait_behind_a_parked_lane(monkeypatch: pytest.MonkeyPatch) -> None:
+    fake = _FakeRedis()
+    now = [1000.0]
+    monkeypatch.setattr("app.services.queue._redis_client", lambda *, redis_url=None: fake)
+    monkeypatch.setattr("app.services.queue._now_seconds", lambda: now[0])
+    board_id = uuid4()
+    first = _notification("agent:a", "a-1", board_id=board_id)
+    second = _notification("agent:a", "a-2", board_id=board_id)
+
+    assert park_agent_notifications([with_next_attempt(first), second], delay_seconds=30)
+    enqueue_agent_notifications(
+        [
+            _notification("agent:a", "a-3", board_id=board_id),
+            _notification("agent:b", "b-1", board_id=board_id),
+        ],
+    )
+    before_resume = notification_dispatch._dequeue_batch(block=False, block_timeout=0)
+    enqueue_agent_notifications([_notification("agent:a", "a-4", board_id=board_id)])
+    now[0] += 60
+    after_resume = notification_dispatch._dequeue_batch(block=False, block_timeout=0)
+
+    assert [item.message for item in before_resume] == ["b-1"]
+    assert [(item.message, item.attempts) for item in after_resume] == [
+        ("a-1", 1),
+        ("a-2", 0),
+        ("a-3", 0),
+        ("a-4", 0),
+    ]
+    assert notification_dispatch._dequeue_batch(block=False, block_timeout=0) == []
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from types import SimpleNamespace
 from uuid import UUID, uuid4
@@ -681,3 +682,62 @@ async def test_delete_agent_lifecycle_raises_on_non_missing_agent_error(monkeypa
             delete_files=True,
             delete_session=True,
         )
+
+
+def test_template_env_is_shared_and_override_templates_compile_once(monkeypatch):
+    compiled: list[str] = []
+    env = agent_provisioning._template_env()
+    original_from_string = env.from_string
+
+    def _counting_from_string(source, *args, **kwargs):
+        compiled.append(source)
+        return original_from_string(source, *args, **kwargs)
+
+    monkeypatch.setattr(env, "from_string", _counting_from_string)
+    monkeypatch.setattr(agent_provisioning, "_override_template_cache", OrderedDict())
+    agent = SimpleNamespace(
+        identity_template="I am {{ agent_name }}",
+        soul_template=None,
+        is_board_lead=False,
+        heartbeat_config=None,
+    )
+
+    for name in ("a", "b"):
+        rendered = agent_provisioning._render_agent_files(
+            {"agent_name": name},
+            agent,  # type: ignore[arg-type]
+            {"IDENTITY.md"},
+            include_bootstrap=False,
+        )
+        assert rendered == {"IDENTITY.md": f"I am {name}"}
+
+    assert agent_provisioning._template_env() is env
+    assert compiled == ["I am {{ agent_name }}"]
+
+
+def test_override_template_cache_evicts_least_recently_used(monkeypatch):
+    env = agent_provisioning._template_env()
+    monkeypatch.setattr(agent_provisioning, "_override_template_cache", OrderedDict())
+    monkeypatch.setattr(agent_provisioning, "_OVERRIDE_TEMPLATE_CACHE_MAX", 2)
+
+    hot = agent_provisioning._override_template(env, "hot {{ x }}")
+    agent_provisioning._override_template(env, "cold {{ x }}")
+    assert agent_provisioning._override_template(env, "hot {{ x }}") is hot
+    agent_provisioning._override_template(env, "new {{ x }}")
+
+    cached = set(agent_provisioning._override_template_cache)
+    assert agent_provisioning._content_hash("hot {{ x }}") in cached
+    assert agent_provisioning._content_hash("cold {{ x }}") not in cached
+    assert len(cached) == 2
+
+
+def test_render_agent_files_reports_missing_template():
+    agent = SimpleNamespace(identity_template=None, soul_template=None, is_board_lead=False)
+
+    with pytest.raises(FileNotFoundError, match="Missing template file: NOPE.md"):
+        agent_provisioning._render_agent_files(
+            {},
+            agent,  # type: ignore[arg-type]
+            {"NOPE.md"},
+            include_bootstrap=False,
+        )
@@ -3,6 +3,7 @@
 
 from __future__ import annotations
 
+from datetime import timedelta
 from uuid import UUID, uuid4
 
 import pytest
@@ -15,6 +16,7 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from app.api import board_webhooks
 from app.api.board_webhooks import router as board_webhooks_router
 from app.api.deps import get_board_or_404
+from app.core.time import utcnow
 from app.db.session import get_session
 from app.models.agents import Agent
 from app.models.board_memory import BoardMemory
@@ -65,6 +67,8 @@ async def _seed_webhook(
     session: AsyncSession,
     *,
     enabled: bool,
+    dedupe_header: str | None = None,
+    dedupe_content_hash: bool = False,
 ) -> tuple[Board, BoardWebhook]:
     organization_id = uuid4()
     gateway_id = uuid4()
@@ -106,6 +110,8 @@ async def _seed_webhook(
         board_id=board_id,
         description="Triage payload and create tasks for impacted services.",
         enabled=enabled,
+        dedupe_header=dedupe_header,
+        dedupe_content_hash=dedupe_content_hash,
     )
     session.add(webhook)
     await session.commit()
@@ -288,3 +294,180 @@ async def test_ingest_board_webhook_rejects_disabled_endpoint(
         assert sent_messages == []
     finally:
         await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_ingest_board_webhook_acknowledges_duplicate_delivery_without_writes(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    engine = await _make_engine()
+    session_maker = async_sessionmaker(
+        engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+    )
+    app = _build_test_app(session_maker)
+    enqueued: list[QueuedInboundDelivery] = []
+
+    async with session_maker() as session:
+        board, webhook = await _seed_webhook(
+            session,
+            enabled=True,
+            dedupe_header="X-Delivery-Id",
+        )
+
+    def _fake_enqueue(payload: QueuedInboundDelivery) -> bool:
+        enqueued.append(payload)
+        return True
+
+    monkeypatch.setattr(board_webhooks, "enqueue_webhook_delivery", _fake_enqueue)
+
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=app),
+            base_url="http://testserver",
+        ) as client:
+            first = await client.post(
+                f"/api/v1/boards/{board.id}/webhooks/{webhook.id}",
+                json={"event": "deploy"},
+                headers={"X-Delivery-Id": "delivery-1"},
+            )
+            retry = await client.post(
+                f"/api/v1/boards/{board.id}/webhooks/{webhook.id}",
+                json={"event": "deploy"},
+                headers={"X-Delivery-Id": "delivery-1"},
+            )
+            other = await client.post(
+                f"/api/v1/boards/{board.id}/webhooks/{webhook.id}",
+                json={"event": "deploy"},
+                headers={"X-Delivery-Id": "delivery-2"},
+            )
+
+        assert first.status_code == 202
+        assert first.json()["duplicate"] is False
+        assert retry.status_code == 202
+        assert retry.json()["duplicate"] is True
+        assert retry.json()["payload_id"] == first.json()["payload_id"]
+        assert other.json()["duplicate"] is False
+        assert other.json()["payload_id"] != first.json()["payload_id"]
+
+        async with session_maker() as session:
+            payloads = (
+                await session.exec(
+                    select(BoardWebhookPayload).where(
+                        col(BoardWebhookPayload.webhook_id) == webhook.id
+                    ),
+                )
+            ).all()
+            assert sorted(item.dedupe_key or "" for item in payloads) == [
+                "header:delivery-1",
+                "header:delivery-2",
+            ]
+            memory_items = (
+                await session.exec(
+                    select(BoardMemory).where(col(BoardMemory.board_id) == board.id),
+                )
+            ).all()
+            assert len(memory_items) == 2
+
+        assert len(enqueued) == 2
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_claim_delivery_keeps_one_payload_per_key_and_reuses_expired_keys() -> None:
+    engine = await _make_engine()
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    def _payload(board: Board, webhook: BoardWebhook) -> BoardWebhookPayload:
+        return BoardWebhookPayload(
+            board_id=board.id,
+            webhook_id=webhook.id,
+            payload={"event": "deploy"},
+            dedupe_key="header:delivery-1",
+        )
+
+    try:
+        async with session_maker() as session:
+            board, webhook = await _seed_webhook(session, enabled=True)
+            first = _payload(board, webhook)
+            assert await board_webhooks._claim_delivery(session, first) is None
+            await session.commit()
+
+        # A retry that arrives after the first commit hits the unique key, not a new row.
+        async with session_maker() as session:
+            assert await board_webhooks._claim_delivery(session, _payload(board, webhook)) == (
+                first.id
+            )
+            await session.rollback()
+
+        async with session_maker() as session:
+            stored = await session.get(BoardWebhookPayload, first.id)
+            assert stored is not None
+            stored.received_at = utcnow() - timedelta(
+                seconds=board_webhooks.settings.webhook_dedupe_retention_seconds + 1,
+            )
+            await session.commit()
+            reused = _payload(board, webhook)
+            assert await board_webhooks._claim_delivery(session, reused) is None
+            await session.commit()
+
+        async with session_maker() as session:
+            keys = dict(
+                (
+                    await session.exec(
+                        select(BoardWebhookPayload.id, BoardWebhookPayload.dedupe_key),
+                    )
+                ).all(),
+            )
+        assert keys == {first.id: None, reused.id: "header:delivery-1"}
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_ingest_board_webhook_dedupes_by_content_hash_within_retention_window(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    engine = await _make_engine()
+    session_maker = async_sessionmaker(
+        engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+    )
+    app = _build_test_app(session_maker)
+
+    async with session_maker() as session:
+        board, webhook = await _seed_webhook(session, enabled=True, dedupe_content_hash=True)
+
+    monkeypatch.setattr(board_webhooks, "enqueue_webhook_delivery", lambda _payload: True)
+
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=app),
+            base_url="http://testserver",
+        ) as client:
+            first = await client.post(
+                f"/api/v1/boards/{board.id}/webhooks/{webhook.id}",
+                content=b'{"event":"deploy"}',
+                headers={"Content-Type": "application/json"},
+            )
+            retry = await client.post(
+                f"/api/v1/boards/{board.id}/webhooks/{webhook.id}",
+                content=b'{"event":"deploy"}',
+                headers={"Content-Type": "application/json"},
+            )
+            monkeypatch.setattr(board_webhooks.settings, "webhook_dedupe_retention_seconds", 0)
+            after_window = await client.post(
+                f"/api/v1/boards/{board.id}/webhooks/{webhook.id}",
+                content=b'{"event":"deploy"}',
+                headers={"Content-Type": "application/json"},
+            )
+
+        assert retry.json()["duplicate"] is True
+        assert retry.json()["payload_id"] == first.json()["payload_id"]
+        assert after_window.json()["duplicate"] is False
+        assert after_window.json()["payload_id"] != first.json()["payload_id"]
+    finally:
+        await engine.dispose()
@@ -0,0 +1,166 @@
+# ruff: noqa: INP001
+"""Negotiated response compression, including per-event flushing of SSE streams."""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import zlib
+from collections.abc import AsyncIterator
+
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+
+from app.core.compression import CompressionMiddleware, negotiate_encoding
+
+_PAYLOAD = {"tasks": [{"id": index, "title": f"Task {index}"} for index in range(200)]}
+_EVENTS = [
+    f"event: task\ndata: {json.dumps({'task': {'id': index, 'status': 'inbox'}})}\n\n".encode()
+    for index in range(3)
+]
+
+
+def test_negotiate_encoding_honours_quality_values() -> None:
+    both = ("br", "gzip")
+
+    assert negotiate_encoding("gzip, deflate, br", both) == "br"
+    assert negotiate_encoding("br;q=0.5, gzip", both) == "gzip"
+    assert negotiate_encoding("*;q=0.1", both) == "br"
+    assert negotiate_encoding("gzip, deflate, br", ("gzip",)) == "gzip"
+    assert negotiate_encoding("gzip;q=0, identity", both) is None
+    assert negotiate_encoding("", both) is None
+
+
+def _build_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=512)
+
+    @app.get("/big")
+    def big() -> dict[str, object]:
+        return _PAYLOAD
+
+    @app.get("/small")
+    def small() -> dict[str, bool]:
+        return {"ok": True}
+
+    @app.get("/binary")
+    def binary() -> Response:
+        return Response(content=b"\x89PNG" * 500, media_type="image/png")
+
+    @app.get("/not-modified")
+    def not_modified() -> Response:
+        return Response(status_code=304, headers={"ETag": 'W/"abc"'})
+
+    @app.get("/chunked")
+    def chunked() -> StreamingResponse:
+        async def chunks() -> AsyncIterator[bytes]:
+            for _ in range(50):
+                yield b'{"title": "streamed task payload"},'
+
+        return StreamingResponse(chunks(), media_type="application/json")
+
+    @app.get("/events")
+    def events() -> StreamingResponse:
+        async def stream() -> AsyncIterator[bytes]:
+            for event in _EVENTS:
+                yield event
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    return app
+
+
+async def _call(app: FastAPI, path: str, accept_encoding: str | None) -> list[dict[str, object]]:
+    headers = [(b"accept-encoding", accept_encoding.encode())] if accept_encoding else []
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": headers,
+        "client": ("test", 1),
+        "server": ("test", 80),
+    }
+    sent: list[dict[str, object]] = []
+    requested = False
+
+    async def receive() -> dict[str, object]:
+        nonlocal requested
+        if requested:
+            # Streaming responses listen for a disconnect until they finish.
+            await asyncio.Event().wait()
+        requested = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict[str, object]) -> None:
+        sent.append(message)
+
+    await app(scope, receive, send)
+    return sent
+
+
+def _headers(messages: list[dict[str, object]]) -> dict[str, str]:
+    raw = messages[0]["headers"]
+    assert isinstance(raw, list)
+    return {key.decode().lower(): value.decode() for key, value in raw}
+
+
+def _body(messages: list[dict[str, object]]) -> bytes:
+    return b"".join(bytes(message.get("body", b"")) for message in messages[1:])  # type: ignore[arg-type]
+
+
+@pytest.mark.asyncio
+async def test_large_json_is_gzipped_and_small_or_binary_bodies_are_not() -> None:
+    app = _build_app()
+
+    big = await _call(app, "/big", "gzip, deflate")
+    small = await _call(app, "/small", "gzip")
+    identity = await _call(app, "/big", None)
+    binary = await _call(app, "/binary", "gzip")
+    not_modified = await _call(app, "/not-modified", "gzip")
+
+    big_headers = _headers(big)
+    assert big_headers["content-encoding"] == "gzip"
+    assert big_headers["vary"] == "Accept-Encoding"
+    assert int(big_headers["content-length"]) == len(_body(big))
+    assert json.loads(gzip.decompress(_body(big))) == _PAYLOAD
+    assert len(_body(big)) < len(json.dumps(_PAYLOAD)) / 3
+
+    assert "content-encoding" not in _headers(small)
+    assert _headers(small)["vary"] == "Accept-Encoding"
+    assert json.loads(_body(small)) == {"ok": True}
+    assert "content-encoding" not in _headers(identity)
+    assert "content-encoding" not in _headers(binary)
+    assert "content-encoding" not in _headers(not_modified)
+    assert _body(not_modified) == b""
+
+
+@pytest.mark.asyncio
+async def test_large_streamed_body_is_compressed_incrementally() -> None:
+    messages = await _call(_build_app(), "/chunked", "gzip")
+
+    headers = _headers(messages)
+    assert headers["content-encoding"] == "gzip"
+    assert "content-length" not in headers
+    assert gzip.decompress(_body(messages)) == b'{"title": "streamed task payload"},' * 50
+
+
+@pytest.mark.asyncio
+async def test_sse_events_are_decodable_as_soon_as_each_chunk_arrives() -> None:
+    messages = await _call(_build_app(), "/events", "gzip")
+
+    assert _headers(messages)["content-encoding"] == "gzip"
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    chunks = [message for message in messages[1:] if message.get("body")]
+    decoded = [decoder.decompress(bytes(chunk["body"])) for chunk in chunks]  # type: ignore[arg-type]
+    # Each event is fully decodable from its own chunk: nothing is held back.
+    assert decoded[: len(_EVENTS)] == _EVENTS
+    assert b"".join(decoded) == b"".join(_EVENTS)
+    assert decoder.eof
@@ -0,0 +1,251 @@
+# ruff: noqa: INP001
+"""ETag / If-None-Match handling for polled board snapshot and list reads."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, status
+from fastapi_pagination import add_pagination
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+import app.services.resource_versions as resource_versions
+from app.api import boards as boards_api
+from app.api.boards import router as boards_router
+from app.api.deps import ActorContext, get_board_for_actor_read, require_admin_or_agent
+from app.api.tasks import router as tasks_router
+from app.core.conditional import etag_matches, make_etag
+from app.core.time import utcnow
+from app.db.session import get_session
+from app.models.agents import Agent
+from app.models.approvals import Approval
+from app.models.board_memory import BoardMemory
+from app.models.boards import Board
+from app.models.gateways import Gateway
+from app.models.organizations import Organization
+from app.models.tasks import Task
+from app.models.users import User
+
+
+class _Headers:
+    def __init__(self, if_none_match: str | None) -> None:
+        self.headers = {"if-none-match": if_none_match} if if_none_match else {}
+
+
+def test_etag_matching_uses_weak_comparison() -> None:
+    etag = make_etag("board", 1)
+
+    assert etag.startswith('W/"')
+    assert etag == make_etag("board", 1)
+    assert etag != make_etag("board", 2)
+    assert etag_matches(_Headers(etag), etag)  # type: ignore[arg-type]
+    assert etag_matches(_Headers(f'"other", {etag[2:]}'), etag)  # type: ignore[arg-type]
+    assert etag_matches(_Headers("*"), etag)  # type: ignore[arg-type]
+    assert not etag_matches(_Headers('W/"other"'), etag)  # type: ignore[arg-type]
+    assert not etag_matches(_Headers(None), etag)  # type: ignore[arg-type]
+
+
+async def _make_engine() -> AsyncEngine:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.connect() as conn, conn.begin():
+        await conn.run_sync(SQLModel.metadata.create_all)
+    return engine
+
+
+def _build_test_app(session_maker: async_sessionmaker[AsyncSession]) -> FastAPI:
+    app = FastAPI()
+    api_v1 = APIRouter(prefix="/api/v1")
+    api_v1.include_router(boards_router)
+    api_v1.include_router(tasks_router)
+    app.include_router(api_v1)
+    add_pagination(app)
+
+    async def _override_get_session() -> AsyncSession:
+        async with session_maker() as session:
+            yield session
+
+    async def _override_board(
+        board_id: str,
+        session: AsyncSession = Depends(get_session),
+    ) -> Board:
+        board = await Board.objects.by_id(UUID(board_id)).first(session)
+        if board is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+        return board
+
+    app.dependency_overrides[get_session] = _override_get_session
+    app.dependency_overrides[get_board_for_actor_read] = _override_board
+    app.dependency_overrides[require_admin_or_agent] = lambda: ActorContext(
+        actor_type="user",
+        user=User(clerk_user_id="admin"),
+    )
+    return app
+
+
+async def _seed(session: AsyncSession) -> tuple[Board, Task, Agent]:
+    organization_id = uuid4()
+    gateway_id = uuid4()
+    session.add(Organization(id=organization_id, name="org"))
+    session.add(
+        Gateway(
+            id=gateway_id,
+            organization_id=organization_id,
+            name="gateway",
+            url="https://gateway.example.local",
+            workspace_root="/tmp/workspace",
+        ),
+    )
+    board = Board(organization_id=organization_id, gateway_id=gateway_id, name="B", slug="b")
+    session.add(board)
+    await session.flush()
+    task = Task(board_id=board.id, title="First")
+    agent = Agent(
+        board_id=board.id,
+        gateway_id=gateway_id,
+        name="Worker",
+        status="online",
+        last_seen_at=utcnow() - timedelta(minutes=8),
+    )
+    session.add(task)
+    session.add(agent)
+    await session.commit()
+    return board, task, agent
+
+
+@pytest.mark.asyncio
+async def test_board_snapshot_is_revalidated_without_rebuilding(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    engine = await _make_engine()
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_maker() as session:
+        board, task, _agent = await _seed(session)
+    builds: list[UUID] = []
+    build_board_snapshot = boards_api.build_board_snapshot
+
+    async def _counting_build(session: AsyncSession, board: Board) -> object:
+        builds.append(board.id)
+        return await build_board_snapshot(session, board)
+
+    monkeypatch.setattr(boards_api, "build_board_snapshot", _counting_build)
+    url = f"/api/v1/boards/{board.id}/snapshot"
+
+    async with AsyncClient(
+        transport=ASGITransport(app=_build_test_app(session_maker)),
+        base_url="http://test",
+    ) as client:
+        first = await client.get(url)
+        etag = first.headers["etag"]
+        unchanged = await client.get(url, headers={"If-None-Match": etag})
+
+        async with session_maker() as session:
+            task.title = "Renamed"
+            task.updated_at = utcnow()
+            session.add(task)
+            await session.commit()
+        after_task_edit = await client.get(url, headers={"If-None-Match": etag})
+
+        async with session_maker() as session:
+            session.add(BoardMemory(board_id=board.id, content="hello", is_chat=True))
+            await session.commit()
+        after_chat = await client.get(
+            url,
+            headers={"If-None-Match": after_task_edit.headers["etag"]},
+        )
+
+        # The agent is shown offline once `last_seen_at` ages past the threshold.
+        later = utcnow() + timedelta(minutes=5)
+        monkeypatch.setattr(resource_versions, "utcnow", lambda: later)
+        after_agent_offline = await client.get(
+            url,
+            headers={"If-None-Match": after_chat.headers["etag"]},
+        )
+
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "private, no-cache"
+    assert unchanged.status_code == 304
+    assert unchanged.headers["etag"] == etag
+    assert unchanged.content == b""
+    assert after_task_edit.status_code == 200
+    assert after_task_edit.json()["tasks"][0]["title"] == "Renamed"
+    assert after_chat.status_code == 200
+    assert after_chat.json()["chat_messages"][0]["content"] == "hello"
+    assert after_agent_offline.status_code == 200
+    assert len(builds) == 4
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_board_snapshot_etag_changes_when_an_approval_is_reopened() -> None:
+    engine = await _make_engine()
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_maker() as session:
+        board, task, _agent = await _seed(session)
+        approval = Approval(
+            board_id=board.id,
+            task_id=task.id,
+            action_type="task.done",
+            confidence=90.0,
+            status="approved",
+            resolved_at=utcnow(),
+        )
+        session.add(approval)
+        await session.commit()
+    url = f"/api/v1/boards/{board.id}/snapshot"
+
+    async with AsyncClient(
+        transport=ASGITransport(app=_build_test_app(session_maker)),
+        base_url="http://test",
+    ) as client:
+        first = await client.get(url)
+        async with session_maker() as session:
+            # As `PATCH /approvals/{id}` does on reopen: status only, no timestamps.
+            approval.status = "pending"
+            session.add(approval)
+            await session.commit()
+        after_reopen = await client.get(url, headers={"If-None-Match": first.headers["etag"]})
+
+    assert first.json()["pending_approvals_count"] == 0
+    assert after_reopen.status_code == 200
+    assert after_reopen.json()["pending_approvals_count"] == 1
+    assert after_reopen.json()["approvals"][0]["status"] == "pending"
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_task_list_etag_covers_filters_and_task_changes() -> None:
+    engine = await _make_engine()
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_maker() as session:
+        board, _task, _agent = await _seed(session)
+    url = f"/api/v1/boards/{board.id}/tasks"
+
+    async with AsyncClient(
+        transport=ASGITransport(app=_build_test_app(session_maker)),
+        base_url="http://test",
+    ) as client:
+        listed = await client.get(url)
+        etag = listed.headers["etag"]
+        unchanged = await client.get(url, headers={"If-None-Match": etag})
+        filtered = await client.get(
+            url,
+            params={"status": "done"},
+            headers={"If-None-Match": etag},
+        )
+        async with session_maker() as session:
+            session.add(Task(board_id=board.id, title="Second"))
+            await session.commit()
+        after_insert = await client.get(url, headers={"If-None-Match": etag})
+
+    assert listed.status_code == 200
+    assert unchanged.status_code == 304
+    assert filtered.status_code == 200
+    assert filtered.json()["items"] == []
+    assert after_insert.status_code == 200
+    assert {item["title"] for item in after_insert.json()["items"]} == {"First", "Second"}
+    await engine.dispose()
@@ -0,0 +1,122 @@
+# ruff: noqa: INP001
+"""The fake OpenClaw gateway driven through the real gateway RPC client."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from app.services.openclaw.fake_gateway import FakeGateway, GatewayFault
+from app.services.openclaw.gateway_compat import check_gateway_version_compatibility
+from app.services.openclaw.gateway_rpc import (
+    OpenClawGatewayError,
+    ensure_session,
+    get_chat_history,
+    openclaw_call,
+    send_message,
+)
+from app.services.openclaw.internal.circuit_breaker import gateway_circuits
+from app.services.openclaw.internal.session_cache import known_sessions
+from app.services.openclaw.provisioning import (
+    GatewayAgentRegistration,
+    OpenClawGatewayControlPlane,
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset_gateway_state():
+    gateway_circuits.clear()
+    known_sessions.clear()
+    yield
+    gateway_circuits.clear()
+    known_sessions.clear()
+
+
+@pytest.mark.asyncio
+async def test_handshake_sessions_and_chat_round_trip() -> None:
+    async with FakeGateway(token="gw-secret") as gateway:
+        config = gateway.config()
+
+        result = await check_gateway_version_compatibility(config)
+        await ensure_session("agent:lead:main", config=config, label="Lead")
+        await send_message("hello", session_key="agent:lead:main", config=config)
+        history = await get_chat_history("agent:lead:main", config)
+        sessions = await openclaw_call("sessions.list", config=config)
+
+    assert result.compatible
+    assert result.current_version == gateway.version
+    assert isinstance(history, dict)
+    assert [message["content"] for message in history["messages"]] == ["hello"]
+    assert sessions == {
+        "sessions": [gateway.sessions["agent:lead:main"]],
+    }
+    assert gateway.sessions["agent:lead:main"]["label"] == "Lead"
+    # One connection and one handshake per RPC, as with a real gateway.
+    assert gateway.stats.calls["connect"] == gateway.stats.connections == 5
+    assert gateway.stats.calls["chat.send"] == 1
+    assert gateway.stats.params_for("sessions.patch") == [
+        {"key": "agent:lead:main", "label": "Lead"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_wrong_token_and_unknown_methods_are_gateway_errors() -> None:
+    async with FakeGateway(token="gw-secret") as gateway:
+        bad_config = FakeGateway(token="wrong", port=gateway.port).config()
+        with pytest.raises(OpenClawGatewayError, match="token mismatch"):
+            await openclaw_call("health", config=bad_config)
+        with pytest.raises(OpenClawGatewayError, match="unknown method"):
+            await openclaw_call("no.such.method", config=gateway.config())
+
+    assert gateway.stats.errors == {"connect": 1, "no.such.method": 1}
+
+
+@pytest.mark.asyncio
+async def test_provisioning_through_injected_faults() -> None:
+    async with FakeGateway() as gateway:
+        control_plane = OpenClawGatewayControlPlane(gateway.config())
+        registration = GatewayAgentRegistration(
+            agent_id="mc-agent-1",
+            name="Worker",
+            workspace_path="/workspace/mc-agent-1",
+            heartbeat={"every": "10m"},
+        )
+        await control_plane.upsert_agent(registration)
+        # A second upsert hits "already exists" on agents.create and carries on.
+        gateway.inject_fault("config.get", GatewayFault(kind="disconnect", remaining=1))
+        with pytest.raises(OpenClawGatewayError):
+            await control_plane.upsert_agent(registration)
+        await control_plane.upsert_agent(registration)
+        await control_plane.set_agent_file(agent_id="mc-agent-1", name="SOUL.md", content="hi")
+        files = await control_plane.list_agent_files("mc-agent-1")
+
+    assert gateway.agents["mc-agent-1"]["name"] == "Worker"
+    assert gateway.config_data["agents"]["list"] == [
+        {"id": "mc-agent-1", "workspace": "/workspace/mc-agent-1", "heartbeat": {"every": "10m"}},
+    ]
+    assert files == {"SOUL.md": {"name": "SOUL.md", "size": 2, "missing": False}}
+    assert gateway.stats.calls["agents.create"] == 3
+    assert gateway.stats.errors["agents.create"] == 2
+    assert gateway.stats.errors["config.get"] == 1
+
+
+@pytest.mark.asyncio
+async def test_config_patch_rejects_a_stale_base_hash() -> None:
+    async with FakeGateway() as gateway:
+        config = gateway.config()
+        snapshot = await openclaw_call("config.get", config=config)
+        assert isinstance(snapshot, dict)
+        await openclaw_call(
+            "config.patch",
+            {"raw": json.dumps({"channels": {"demo": True}}), "baseHash": snapshot["hash"]},
+            config=config,
+        )
+        with pytest.raises(OpenClawGatewayError, match="config changed"):
+            await openclaw_call(
+                "config.patch",
+                {"raw": json.dumps({"channels": None}), "baseHash": snapshot["hash"]},
+                config=config,
+            )
+
+    assert gateway.config_data["channels"] == {"demo": True}
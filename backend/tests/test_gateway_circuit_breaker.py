@@ -0,0 +1,146 @@
+# ruff: noqa: INP001
+"""Per-gateway circuit breaker around RPC transport failures."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+import app.services.openclaw.gateway_rpc as gateway_rpc
+from app.core.config import settings
+from app.services.openclaw.internal.circuit_breaker import gateway_circuits
+from app.services.openclaw.internal.retry import GatewayBackoff
+
+_DOWN = gateway_rpc.GatewayConfig(url="ws://down.example/ws")
+_UP = gateway_rpc.GatewayConfig(url="ws://up.example/ws")
+
+
+@pytest.fixture(autouse=True)
+def _breaker_settings(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(settings, "gateway_circuit_failure_threshold", 3)
+    monkeypatch.setattr(settings, "gateway_circuit_open_seconds", 30.0)
+    gateway_circuits.clear()
+    yield
+    gateway_circuits.clear()
+
+
+def _fake_transport(monkeypatch: pytest.MonkeyPatch, calls: list[str]) -> None:
+    async def _fake_call_once(method, params, *, config, gateway_url):
+        _ = (params, gateway_url)
+        calls.append(config.url)
+        if config.url == _DOWN.url:
+            raise ConnectionRefusedError("connection refused")
+        return {"ok": True, "method": method}
+
+    monkeypatch.setattr(gateway_rpc, "_openclaw_call_once", _fake_call_once)
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_after_consecutive_transport_failures(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    calls: list[str] = []
+    _fake_transport(monkeypatch, calls)
+
+    for _ in range(3):
+        with pytest.raises(gateway_rpc.OpenClawGatewayError, match="connection refused"):
+            await gateway_rpc.openclaw_call("health", config=_DOWN)
+
+    with pytest.raises(gateway_rpc.GatewayCircuitOpenError, match="circuit open"):
+        await gateway_rpc.openclaw_call("health", config=_DOWN)
+
+    assert calls == [_DOWN.url] * 3
+    assert gateway_circuits.state(_DOWN.url).state == "open"
+    assert await gateway_rpc.openclaw_call("health", config=_UP) == {
+        "ok": True,
+        "method": "health",
+    }
+    assert gateway_circuits.state(_UP.url).state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_gateway_error_frames_do_not_count_as_transport_failures(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    async def _fake_call_once(method, params, *, config, gateway_url):
+        _ = (method, params, config, gateway_url)
+        raise gateway_rpc.OpenClawGatewayError("unknown method")
+
+    monkeypatch.setattr(gateway_rpc, "_openclaw_call_once", _fake_call_once)
+
+    for _ in range(5):
+        with pytest.raises(gateway_rpc.OpenClawGatewayError, match="unknown method"):
+            await gateway_rpc.openclaw_call("nope", config=_DOWN)
+
+    assert gateway_circuits.state(_DOWN.url).state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_half_open_circuit_admits_a_single_probe(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "gateway_circuit_open_seconds", 0.01)
+    probe_started = asyncio.Event()
+    release_probe = asyncio.Event()
+    calls = 0
+
+    async def _fake_call_once(method, params, *, config, gateway_url):
+        nonlocal calls
+        _ = (method, params, config, gateway_url)
+        calls += 1
+        probe_started.set()
+        await release_probe.wait()
+        return {"ok": True}
+
+    for _ in range(3):
+        gateway_circuits.record_failure(_DOWN.url)
+    await asyncio.sleep(0.02)
+    assert gateway_circuits.state(_DOWN.url).state == "half_open"
+    monkeypatch.setattr(gateway_rpc, "_openclaw_call_once", _fake_call_once)
+
+    probe = asyncio.create_task(gateway_rpc.openclaw_call("health", config=_DOWN))
+    await probe_started.wait()
+    with pytest.raises(gateway_rpc.GatewayCircuitOpenError):
+        await gateway_rpc.openclaw_call("health", config=_DOWN)
+    release_probe.set()
+    await probe
+
+    assert calls == 1
+    assert gateway_circuits.state(_DOWN.url).state == "closed"
+
+
+def test_failed_probe_reopens_circuit_and_cancelled_probe_frees_slot(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "gateway_circuit_open_seconds", 0.0001)
+    for _ in range(3):
+        gateway_circuits.record_failure(_DOWN.url)
+
+    assert gateway_circuits.allow(_DOWN.url) is True
+    assert gateway_circuits.allow(_DOWN.url) is False
+    gateway_circuits.release(_DOWN.url)
+    assert gateway_circuits.allow(_DOWN.url) is True
+
+    monkeypatch.setattr(settings, "gateway_circuit_open_seconds", 30.0)
+    gateway_circuits.record_failure(_DOWN.url)
+
+    assert gateway_circuits.state(_DOWN.url).state == "open"
+    assert gateway_circuits.allow(_DOWN.url) is False
+
+
+@pytest.mark.asyncio
+async def test_backoff_fails_fast_while_circuit_is_open() -> None:
+    attempts = 0
+
+    async def _call() -> bool:
+        nonlocal attempts
+        attempts += 1
+        raise gateway_rpc.GatewayCircuitOpenError("circuit open")
+
+    backoff = GatewayBackoff(timeout_s=60, base_delay_s=0.01)
+
+    with pytest.raises(gateway_rpc.GatewayCircuitOpenError):
+        await backoff.run(_call)
+
+    assert attempts == 1
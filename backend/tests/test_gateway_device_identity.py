@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import base64
+from pathlib import Path
 
 import pytest
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
 
+import app.services.openclaw.device_identity as device_identity
 from app.services.openclaw.device_identity import (
     build_device_auth_payload,
     load_or_create_device_identity,
@@ -65,3 +67,52 @@ def test_sign_device_payload_produces_valid_ed25519_signature(
     loaded = serialization.load_pem_public_key(identity.public_key_pem.encode("utf-8"))
     assert isinstance(loaded, Ed25519PublicKey)
     loaded.verify(_base64url_decode(signature), payload.encode("utf-8"))
+
+
+def test_load_or_create_device_identity_serves_cache_until_file_changes(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path,
+) -> None:
+    identity_path = tmp_path / "identity" / "device.json"
+    monkeypatch.setenv("OPENCLAW_GATEWAY_DEVICE_IDENTITY_PATH", str(identity_path))
+    first = load_or_create_device_identity()
+    reads = 0
+    original_read_text = Path.read_text
+
+    def _counting_read_text(self: Path, *args: object, **kwargs: object) -> str:
+        nonlocal reads
+        reads += 1
+        return original_read_text(self, *args, **kwargs)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(Path, "read_text", _counting_read_text)
+
+    assert load_or_create_device_identity() is first
+    assert reads == 0
+
+    replacement = device_identity._generate_identity()
+    device_identity._write_identity(identity_path, replacement)
+
+    reloaded = load_or_create_device_identity()
+    assert reads == 1
+    assert reloaded.device_id == replacement.device_id
+    assert reloaded.device_id != first.device_id
+
+
+def test_sign_device_payload_parses_each_private_key_once(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    identity = device_identity._generate_identity()
+    parses = 0
+    original_load = serialization.load_pem_private_key
+
+    def _counting_load(*args: object, **kwargs: object) -> object:
+        nonlocal parses
+        parses += 1
+        return original_load(*args, **kwargs)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(device_identity.serialization, "load_pem_private_key", _counting_load)
+
+    for index in range(3):
+        sign_device_payload(identity.private_key_pem, f"payload-{index}")
+
+    assert parses == 1
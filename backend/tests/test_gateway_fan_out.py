@@ -0,0 +1,135 @@
+# ruff: noqa: INP001
+"""Fan-out delivery of one message to many agent sessions."""
+
+from __future__ import annotations
+
+import asyncio
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+import app.services.openclaw.gateway_dispatch as gateway_dispatch
+from app.core.config import settings
+from app.models.boards import Board
+from app.models.gateways import Gateway
+from app.models.organizations import Organization
+from app.services.openclaw.gateway_dispatch import AgentMessageTarget, GatewayDispatchService
+from app.services.openclaw.gateway_resolver import gateway_configs_for_boards
+
+
+async def _seed(session: AsyncSession) -> tuple[list[Board], Board]:
+    organization = Organization(id=uuid4(), name="org")
+    other_org = Organization(id=uuid4(), name="other")
+    gateway = Gateway(
+        id=uuid4(),
+        organization_id=organization.id,
+        name="gateway",
+        url="ws://gateway.example/ws",
+        workspace_root="/tmp/workspace",
+    )
+    boards = [
+        Board(
+            id=uuid4(),
+            organization_id=organization.id,
+            gateway_id=gateway.id,
+            name=f"Board {i}",
+            slug=f"board-{i}",
+        )
+        for i in range(2)
+    ]
+    foreign = Board(
+        id=uuid4(),
+        organization_id=other_org.id,
+        gateway_id=gateway.id,
+        name="Foreign",
+        slug="foreign",
+    )
+    session.add_all([organization, other_org, gateway, *boards, foreign])
+    await session.commit()
+    return boards, foreign
+
+
+@pytest.mark.asyncio
+async def test_fan_out_resolves_gateway_once_and_sends_concurrently(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.connect() as conn, conn.begin():
+        await conn.run_sync(SQLModel.metadata.create_all)
+    in_flight = 0
+    peak = 0
+    sent: list[str] = []
+
+    async def _fake_try_send(self, *, session_key, config, agent_name, message, deliver):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        sent.append(session_key)
+
+    monkeypatch.setattr(settings, "agent_notification_concurrency_per_gateway", 3)
+    monkeypatch.setattr(GatewayDispatchService, "try_send_agent_message", _fake_try_send)
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        boards, foreign = await _seed(session)
+        configs = await gateway_configs_for_boards(session, [*boards, foreign])
+        targets = [
+            AgentMessageTarget(
+                board=boards[i % 2],
+                session_key=f"agent:{i}",
+                agent_name=f"Agent {i}",
+                message="/pause",
+                deliver=True,
+            )
+            for i in range(8)
+        ]
+        targets.append(
+            AgentMessageTarget(board=foreign, session_key="agent:x", agent_name="X", message="hi"),
+        )
+        dispatched = await GatewayDispatchService(session).fan_out_agent_messages(targets)
+    await engine.dispose()
+
+    assert set(configs) == {board.id for board in boards}
+    assert dispatched == 8
+    assert sorted(sent) == sorted(f"agent:{i}" for i in range(8))
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_fan_out_enqueues_one_batch_when_queue_enabled(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.connect() as conn, conn.begin():
+        await conn.run_sync(SQLModel.metadata.create_all)
+    batches: list[list[str]] = []
+
+    def _fake_enqueue(items):
+        batches.append([item.session_key for item in items])
+        return True
+
+    async def _unexpected_send(self, **kwargs):
+        raise AssertionError("inline send should not run when queued")
+
+    monkeypatch.setattr(settings, "agent_notification_queue_enabled", True)
+    monkeypatch.setattr(gateway_dispatch, "enqueue_agent_notifications", _fake_enqueue)
+    monkeypatch.setattr(GatewayDispatchService, "try_send_agent_message", _unexpected_send)
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        boards, _foreign = await _seed(session)
+        dispatched = await GatewayDispatchService(session).fan_out_agent_messages(
+            [
+                AgentMessageTarget(
+                    board=board, session_key=f"agent:{board.slug}", agent_name="A", message="m"
+                )
+                for board in boards
+            ],
+        )
+    await engine.dispose()
+
+    assert dispatched == 2
+    assert batches == [["agent:board-0", "agent:board-1"]]
@@ -0,0 +1,231 @@
+# ruff: noqa: INP001
+"""Cached gateway health probes and the background monitor."""
+
+from __future__ import annotations
+
+import asyncio
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+import app.services.openclaw.gateway_health as gateway_health
+import app.services.openclaw.gateway_rpc as gateway_rpc
+from app.core.config import settings
+from app.models.gateways import Gateway
+from app.models.organizations import Organization
+from app.services.openclaw.gateway_compat import GatewayVersionCheckResult
+from app.services.openclaw.gateway_rpc import GatewayConfig, OpenClawGatewayError
+from app.services.openclaw.internal.circuit_breaker import gateway_circuits
+
+_CONFIG = GatewayConfig(url="ws://gateway.example/ws")
+
+
+def _compatible(version: str = "2026.2.0") -> GatewayVersionCheckResult:
+    return GatewayVersionCheckResult(
+        compatible=True,
+        minimum_version="2026.1.30",
+        current_version=version,
+        message=None,
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_serves_cached_state_until_refresh_is_requested(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    probes = 0
+
+    async def _fake_check(config, *, minimum_version=None):
+        nonlocal probes
+        _ = (config, minimum_version)
+        probes += 1
+        return _compatible(version=f"2026.2.{probes}")
+
+    monkeypatch.setattr(gateway_health, "check_gateway_version_compatibility", _fake_check)
+    monitor = gateway_health.GatewayHealthMonitor()
+
+    first = await monitor.get(_CONFIG)
+    second = await monitor.get(_CONFIG)
+    refreshed = await monitor.get(_CONFIG, refresh=True)
+
+    assert probes == 2
+    assert first is second
+    assert first.healthy
+    assert first.latency_ms is not None
+    assert refreshed.current_version == "2026.2.2"
+
+
+@pytest.mark.asyncio
+async def test_stale_entries_are_probed_again(monkeypatch: pytest.MonkeyPatch) -> None:
+    probes = 0
+
+    async def _fake_check(config, *, minimum_version=None):
+        nonlocal probes
+        _ = (config, minimum_version)
+        probes += 1
+        return _compatible()
+
+    monkeypatch.setattr(gateway_health, "check_gateway_version_compatibility", _fake_check)
+    monkeypatch.setattr(settings, "gateway_health_max_age_seconds", 0)
+    monitor = gateway_health.GatewayHealthMonitor()
+
+    await monitor.get(_CONFIG)
+    await asyncio.sleep(0.001)
+    await monitor.get(_CONFIG)
+
+    assert probes == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_probes_share_one_gateway_connection(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    probes = 0
+
+    async def _fake_check(config, *, minimum_version=None):
+        nonlocal probes
+        _ = (config, minimum_version)
+        probes += 1
+        await asyncio.sleep(0.01)
+        return _compatible()
+
+    monkeypatch.setattr(gateway_health, "check_gateway_version_compatibility", _fake_check)
+    monitor = gateway_health.GatewayHealthMonitor()
+
+    results = await asyncio.gather(*(monitor.probe(_CONFIG) for _ in range(5)))
+
+    assert probes == 1
+    assert len({id(result) for result in results}) == 1
+
+
+@pytest.mark.asyncio
+async def test_untrusted_failures_are_reprobed_before_rejecting(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    outcomes: list[object] = [OpenClawGatewayError("connection refused"), _compatible()]
+
+    async def _fake_check(config, *, minimum_version=None):
+        _ = (config, minimum_version)
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(gateway_health, "check_gateway_version_compatibility", _fake_check)
+    monitor = gateway_health.GatewayHealthMonitor()
+
+    failed = await monitor.get(_CONFIG)
+    assert failed.connected is False
+    assert failed.problem == "connection refused"
+    assert (await monitor.get(_CONFIG)) is failed
+
+    recovered = await monitor.get(_CONFIG, trust_failures=False)
+
+    assert recovered.healthy
+    assert outcomes == []
+
+
+@pytest.mark.asyncio
+async def test_reprobe_reaches_gateway_through_an_open_circuit(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "gateway_circuit_failure_threshold", 3)
+    monkeypatch.setattr(settings, "gateway_circuit_open_seconds", 30.0)
+    gateway_circuits.clear()
+    for _ in range(3):
+        gateway_circuits.record_failure(_CONFIG.url)
+    calls = 0
+
+    async def _fake_call_once(method, params, *, config, gateway_url):
+        nonlocal calls
+        _ = (method, params, config, gateway_url)
+        calls += 1
+        return {"ok": True}
+
+    async def _fake_check(config, *, minimum_version=None):
+        _ = minimum_version
+        await gateway_rpc.openclaw_call("health", config=config)
+        return _compatible()
+
+    monkeypatch.setattr(gateway_rpc, "_openclaw_call_once", _fake_call_once)
+    monkeypatch.setattr(gateway_health, "check_gateway_version_compatibility", _fake_check)
+    monitor = gateway_health.GatewayHealthMonitor()
+
+    with pytest.raises(gateway_rpc.GatewayCircuitOpenError):
+        await gateway_rpc.openclaw_call("health", config=_CONFIG)
+    recovered = await monitor.get(_CONFIG, refresh=True, trust_failures=False)
+
+    assert recovered.healthy
+    assert calls == 1
+    assert gateway_circuits.state(_CONFIG.url).state == "closed"
+    gateway_circuits.clear()
+
+
+@pytest.mark.asyncio
+async def test_probe_timeout_is_recorded_as_disconnected(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    async def _hanging_check(config, *, minimum_version=None):
+        _ = (config, minimum_version)
+        await asyncio.sleep(1)
+
+    monkeypatch.setattr(gateway_health, "check_gateway_version_compatibility", _hanging_check)
+    monkeypatch.setattr(settings, "gateway_health_probe_timeout_seconds", 0.01)
+    monitor = gateway_health.GatewayHealthMonitor()
+
+    snapshot = await monitor.probe(_CONFIG)
+
+    assert snapshot.connected is False
+    assert snapshot.error is not None
+    assert "timed out" in snapshot.error
+
+
+@pytest.mark.asyncio
+async def test_probe_registered_gateways_refreshes_each_distinct_config(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.connect() as conn, conn.begin():
+        await conn.run_sync(SQLModel.metadata.create_all)
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    organization = Organization(id=uuid4(), name="org")
+    async with session_maker() as session:
+        session.add(organization)
+        session.add_all(
+            [
+                Gateway(
+                    organization_id=organization.id,
+                    name=name,
+                    url=url,
+                    workspace_root="/tmp/workspace",
+                )
+                for name, url in (
+                    ("a", "ws://a.example/ws"),
+                    ("a-copy", "ws://a.example/ws"),
+                    ("b", "ws://b.example/ws"),
+                    ("unset", ""),
+                )
+            ],
+        )
+        await session.commit()
+
+    probed: list[str] = []
+
+    async def _fake_check(config, *, minimum_version=None):
+        _ = minimum_version
+        probed.append(config.url)
+        return _compatible()
+
+    monkeypatch.setattr(gateway_health, "async_session_maker", session_maker)
+    monkeypatch.setattr(gateway_health, "check_gateway_version_compatibility", _fake_check)
+    monitor = gateway_health.GatewayHealthMonitor()
+
+    count = await monitor.probe_registered_gateways()
+
+    assert count == 2
+    assert sorted(probed) == ["ws://a.example/ws", "ws://b.example/ws"]
+    assert monitor.cached(GatewayConfig(url="ws://b.example/ws")) is not None
+    await engine.dispose()
@@ -0,0 +1,196 @@
+# ruff: noqa: INP001
+"""Concurrent fan-out behavior for gateway-main lead broadcasts."""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+import app.services.openclaw.coordination_service as coordination_service
+from app.models.agents import Agent
+from app.models.boards import Board
+from app.models.gateways import Gateway
+from app.models.organizations import Organization
+from app.schemas.gateway_coordination import GatewayLeadBroadcastRequest
+from app.services.openclaw.gateway_rpc import OpenClawGatewayError
+from app.services.openclaw.provisioning_db import LeadAgentRequest, OpenClawProvisioningService
+
+
+@dataclass
+class _BoardStub:
+    name: str
+    id: UUID = field(default_factory=uuid4)
+
+
+@dataclass
+class _LeadStub:
+    name: str
+    openclaw_session_id: str | None
+    id: UUID = field(default_factory=uuid4)
+
+
+@dataclass
+class _ActorStub:
+    name: str = "Gateway Main"
+
+
+async def _collect(service, boards, **kwargs):
+    return [
+        item
+        async for item in service.iter_gateway_lead_broadcast(
+            actor_agent=_ActorStub(),
+            gateway=None,
+            config=None,
+            boards=boards,
+            payload=GatewayLeadBroadcastRequest(content="status?"),
+            **kwargs,
+        )
+    ]
+
+
+@asynccontextmanager
+async def _no_session():
+    yield None
+
+
+@pytest.mark.asyncio
+async def test_lead_broadcast_streams_results_with_bounded_concurrency_and_deadline(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    boards = [
+        _BoardStub(name=name)
+        for name in ("slow", "fast-1", "fast-2", "broken", "unreachable", "new")
+    ]
+    reconcile_calls: list[int] = []
+    provisioned: list[str] = []
+    in_flight = 0
+    peak = 0
+
+    async def _fake_reconcile(self, requests):
+        reconcile_calls.append(len(requests))
+        return {
+            request.board.id: _LeadStub(name=f"lead-{request.board.name}", openclaw_session_id="s")
+            for request in requests
+            if request.board.name in {"slow", "fast-1", "fast-2"}
+        }
+
+    async def _fake_provision(self, *, request):
+        provisioned.append(request.board.name)
+        if request.board.name == "broken":
+            raise OpenClawGatewayError("provision failed")
+        if request.board.name == "unreachable":
+            await asyncio.sleep(10)
+        return _LeadStub(name=f"lead-{request.board.name}", openclaw_session_id="s"), True
+
+    async def _fake_dispatch(self, *, session_key, config, agent_name, message, deliver):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        try:
+            await asyncio.sleep(10 if agent_name == "lead-slow" else 0.01)
+        finally:
+            in_flight -= 1
+
+    monkeypatch.setattr(
+        coordination_service.OpenClawProvisioningService,
+        "reconcile_board_lead_agents",
+        _fake_reconcile,
+    )
+    monkeypatch.setattr(
+        coordination_service.OpenClawProvisioningService,
+        "ensure_board_lead_agent",
+        _fake_provision,
+    )
+    monkeypatch.setattr(coordination_service, "async_session_maker", _no_session)
+    monkeypatch.setattr(
+        coordination_service.GatewayCoordinationService,
+        "_dispatch_gateway_message",
+        _fake_dispatch,
+    )
+    service = coordination_service.GatewayCoordinationService(None)  # type: ignore[arg-type]
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    results = await _collect(service, boards, concurrency=2, board_timeout_seconds=0.2)
+    elapsed = loop.time() - started
+
+    assert reconcile_calls == [6]
+    assert sorted(provisioned) == ["broken", "new", "unreachable"]
+    assert peak == 2
+    by_board = {item.board_id: item for item in results}
+    assert [by_board[board.id].ok for board in boards] == [False, True, True, False, False, True]
+    assert by_board[boards[1].id].lead_agent_name == "lead-fast-1"
+    assert by_board[boards[5].id].lead_agent_name == "lead-new"
+    assert by_board[boards[3].id].error
+    assert by_board[boards[4].id].error
+    # Slow dispatch and hung provisioning are each cut off at the per-board deadline.
+    assert elapsed < 1
+
+
+@pytest.mark.asyncio
+async def test_reconcile_board_lead_agents_updates_existing_leads_in_one_pass() -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.connect() as conn, conn.begin():
+        await conn.run_sync(SQLModel.metadata.create_all)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        organization = Organization(id=uuid4(), name="org")
+        gateway = Gateway(
+            id=uuid4(),
+            organization_id=organization.id,
+            name="gateway",
+            url="https://gateway.example.local",
+            workspace_root="/tmp/workspace",
+        )
+        boards = [
+            Board(
+                id=uuid4(),
+                organization_id=organization.id,
+                gateway_id=gateway.id,
+                name=f"Board {i}",
+                slug=f"board-{i}",
+            )
+            for i in range(3)
+        ]
+        session.add_all([organization, gateway, *boards])
+        for board in boards:
+            session.add(
+                Agent(
+                    board_id=board.id,
+                    gateway_id=gateway.id,
+                    name="Old Name",
+                    is_board_lead=True,
+                ),
+            )
+        await session.commit()
+
+        commits = 0
+        original_commit = session.commit
+
+        async def _counting_commit() -> None:
+            nonlocal commits
+            commits += 1
+            await original_commit()
+
+        session.commit = _counting_commit  # type: ignore[method-assign]
+        service = OpenClawProvisioningService(session)
+        leads = await service.reconcile_board_lead_agents(
+            [
+                LeadAgentRequest(board=board, gateway=gateway, config=None, user=None)
+                for board in boards
+            ],
+        )
+
+    await engine.dispose()
+    assert commits == 1
+    assert set(leads) == {board.id for board in boards}
+    assert {agent.name for agent in leads.values()} == {"Lead Agent"}
+    assert {agent.openclaw_session_id for agent in leads.values()} == {
+        OpenClawProvisioningService.lead_session_key(board) for board in boards
+    }
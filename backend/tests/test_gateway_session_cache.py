@@ -0,0 +1,107 @@
+# ruff: noqa: INP001
+"""Known-session cache behavior for gateway chat dispatch."""
+
+from __future__ import annotations
+
+import pytest
+
+import app.services.openclaw.gateway_dispatch as gateway_dispatch
+import app.services.openclaw.gateway_rpc as gateway_rpc
+from app.services.openclaw.gateway_rpc import GatewayConfig, OpenClawGatewayError
+from app.services.openclaw.internal.session_cache import known_sessions
+
+_CONFIG = GatewayConfig(url="ws://gateway.example/ws")
+
+
+@pytest.fixture(autouse=True)
+def _clear_known_sessions():
+    known_sessions.clear()
+    yield
+    known_sessions.clear()
+
+
+class _GatewayRecorder:
+    def __init__(self, *, missing_once: bool = False) -> None:
+        self.calls: list[str] = []
+        self.missing_once = missing_once
+
+    async def ensure_session(self, session_key, *, config, label=None):
+        self.calls.append("sessions.patch")
+        gateway_rpc._record_session_state(
+            "sessions.patch",
+            {"key": session_key, "label": label},
+            {"ok": True},
+            config,
+        )
+
+    async def send_message(self, message, *, session_key, config, deliver=False):
+        self.calls.append("chat.send")
+        if self.missing_once:
+            self.missing_once = False
+            raise OpenClawGatewayError("unknown session")
+
+
+def _patch_gateway(monkeypatch: pytest.MonkeyPatch, recorder: _GatewayRecorder) -> None:
+    monkeypatch.setattr(gateway_dispatch, "ensure_session", recorder.ensure_session)
+    monkeypatch.setattr(gateway_dispatch, "send_message", recorder.send_message)
+
+
+async def _send(label: str = "Worker") -> None:
+    await gateway_dispatch.GatewayDispatchService(None).send_agent_message(  # type: ignore[arg-type]
+        session_key="agent:mc-1:main",
+        config=_CONFIG,
+        agent_name=label,
+        message="hello",
+    )
+
+
+@pytest.mark.asyncio
+async def test_send_agent_message_skips_ensure_for_known_session(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    recorder = _GatewayRecorder()
+    _patch_gateway(monkeypatch, recorder)
+
+    await _send()
+    await _send()
+    await _send(label="Renamed")
+
+    assert recorder.calls == [
+        "sessions.patch",
+        "chat.send",
+        "chat.send",
+        "sessions.patch",
+        "chat.send",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_send_agent_message_re_ensures_after_missing_session_error(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    recorder = _GatewayRecorder(missing_once=True)
+    _patch_gateway(monkeypatch, recorder)
+    known_sessions.remember(_CONFIG.url, "agent:mc-1:main", label="Worker")
+
+    await _send()
+
+    assert recorder.calls == ["chat.send", "sessions.patch", "chat.send"]
+
+
+def test_session_rpcs_update_known_sessions() -> None:
+    gateway_rpc._record_session_state(
+        "sessions.list",
+        None,
+        {"sessions": [{"key": "a", "label": "A"}, {"key": "b"}, {"nokey": True}]},
+        _CONFIG,
+    )
+    assert known_sessions.is_known(_CONFIG.url, "a", label="A")
+    assert known_sessions.is_known(_CONFIG.url, "b")
+    assert not known_sessions.is_known(_CONFIG.url, "b", label="B")
+
+    gateway_rpc._record_session_state("sessions.reset", {"key": "a"}, {}, _CONFIG)
+    gateway_rpc._record_session_state("sessions.delete", {"key": "b"}, {}, _CONFIG)
+
+    assert not known_sessions.is_known(_CONFIG.url, "a")
+    assert not known_sessions.is_known(_CONFIG.url, "b")
+    assert not known_sessions.is_known("ws://other.example/ws", "a")
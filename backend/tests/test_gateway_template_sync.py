@@ -0,0 +1,262 @@
+# ruff: noqa: INP001
+"""Concurrency behavior for gateway template sync fan-out."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from uuid import UUID, uuid4
+
+import pytest
+
+import app.services.openclaw.provisioning as agent_provisioning
+import app.services.openclaw.provisioning_db as provisioning_db
+from app.schemas.gateways import GatewayTemplatesSyncResult
+
+
+@dataclass
+class _AgentStub:
+    name: str
+    id: UUID = field(default_factory=uuid4)
+    board_id: UUID | None = None
+
+
+@dataclass
+class _BoardStub:
+    id: UUID = field(default_factory=uuid4)
+
+
+def _sync_ctx(progress: list[provisioning_db.GatewayTemplateSyncProgress]):
+    return provisioning_db._SyncContext(
+        session=None,  # type: ignore[arg-type]
+        gateway=None,  # type: ignore[arg-type]
+        control_plane=None,  # type: ignore[arg-type]
+        backoff=provisioning_db._template_sync_backoff(),
+        options=provisioning_db.GatewayTemplateSyncOptions(user=None),
+        provisioner=None,  # type: ignore[arg-type]
+        session_lock=asyncio.Lock(),
+        progress=provisioning_db._SyncProgress(on_progress=progress.append),
+    )
+
+
+def _result() -> GatewayTemplatesSyncResult:
+    return GatewayTemplatesSyncResult(
+        gateway_id=uuid4(),
+        include_main=False,
+        reset_sessions=False,
+        agents_updated=0,
+        agents_skipped=0,
+        main_updated=False,
+    )
+
+
+@pytest.mark.asyncio
+async def test_sync_agents_concurrently_bounds_parallelism_and_reports_progress(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    in_flight = 0
+    peak = 0
+
+    async def _fake_sync_one_agent(ctx, result, agent, board):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        result.agents_updated += 1
+        ctx.progress.report(agent, "updated")
+        return False
+
+    monkeypatch.setattr(provisioning_db, "_sync_one_agent", _fake_sync_one_agent)
+    progress: list[provisioning_db.GatewayTemplateSyncProgress] = []
+    ctx = _sync_ctx(progress)
+    ctx.progress.total = 10
+    result = _result()
+    targets = [(_AgentStub(name=f"agent-{i}"), _BoardStub()) for i in range(10)]
+
+    stopped = await provisioning_db._sync_agents_concurrently(
+        ctx,
+        result,
+        targets,  # type: ignore[arg-type]
+        concurrency=3,
+    )
+
+    assert stopped is False
+    assert peak == 3
+    assert result.agents_updated == 10
+    assert [item.completed for item in progress] == list(range(1, 11))
+    assert {item.total for item in progress} == {10}
+
+
+@pytest.mark.asyncio
+async def test_sync_agents_concurrently_stops_starting_agents_after_fatal_timeout(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    started: list[str] = []
+
+    async def _fake_sync_one_agent(ctx, result, agent, board):
+        started.append(agent.name)
+        await asyncio.sleep(0)
+        return agent.name == "agent-0"
+
+    monkeypatch.setattr(provisioning_db, "_sync_one_agent", _fake_sync_one_agent)
+    targets = [(_AgentStub(name=f"agent-{i}"), _BoardStub()) for i in range(5)]
+
+    stopped = await provisioning_db._sync_agents_concurrently(
+        _sync_ctx([]),
+        _result(),
+        targets,  # type: ignore[arg-type]
+        concurrency=1,
+    )
+
+    assert stopped is True
+    assert started == ["agent-0"]
+
+
+@pytest.mark.asyncio
+async def test_control_plane_limits_in_flight_rpcs_per_gateway(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    in_flight = 0
+    peak = 0
+
+    async def _fake_openclaw_call(method, params=None, config=None):
+        nonlocal in_flight, peak
+        _ = (method, params, config)
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {"ok": True}
+
+    monkeypatch.setattr(agent_provisioning, "openclaw_call", _fake_openclaw_call)
+    cp = agent_provisioning.OpenClawGatewayControlPlane(
+        agent_provisioning.GatewayClientConfig(url="ws://gateway.example/ws", token=None),
+        max_in_flight=2,
+    )
+
+    await asyncio.gather(
+        *(cp.set_agent_file(agent_id="a", name=f"F{i}.md", content="x") for i in range(6)),
+    )
+
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_set_agent_files_writes_concurrently_and_surfaces_errors_after_all_writes() -> None:
+    class _ControlPlaneStub:
+        def __init__(self) -> None:
+            self.writes: list[str] = []
+
+        async def set_agent_file(self, *, agent_id, name, content):
+            _ = (agent_id, content)
+            await asyncio.sleep(0)
+            if name == "BAD.md":
+                raise agent_provisioning.OpenClawGatewayError("disk full")
+            self.writes.append(name)
+
+    class _Manager(agent_provisioning.BaseAgentLifecycleManager):
+        def _agent_id(self, agent):
+            return "agent-x"
+
+        def _build_context(self, *, agent, auth_token, user, board):
+            return {}
+
+    cp = _ControlPlaneStub()
+    mgr = _Manager(None, cp)  # type: ignore[arg-type]
+
+    with pytest.raises(agent_provisioning.OpenClawGatewayError, match="disk full"):
+        await mgr._set_agent_files(
+            agent_id="agent-x",
+            rendered={"AGENTS.md": "a", "BAD.md": "b", "TOOLS.md": "c"},
+            existing_files={},
+            action="provision",
+        )
+
+    assert sorted(cp.writes) == ["AGENTS.md", "TOOLS.md"]
+
+
+class _RecordingControlPlane:
+    def __init__(self) -> None:
+        self.writes: list[str] = []
+
+    async def set_agent_file(self, *, agent_id, name, content):
+        _ = (agent_id, content)
+        self.writes.append(name)
+
+
+class _HashingManager(agent_provisioning.BaseAgentLifecycleManager):
+    def _agent_id(self, agent):
+        return "agent-x"
+
+    def _build_context(self, *, agent, auth_token, user, board):
+        return {}
+
+
+@dataclass
+class _HashedAgentStub:
+    name: str = "Worker"
+    is_board_lead: bool = False
+    workspace_file_hashes: dict[str, str] | None = None
+
+
+@pytest.mark.asyncio
+async def test_set_agent_files_skips_files_unchanged_since_last_push() -> None:
+    cp = _RecordingControlPlane()
+    mgr = _HashingManager(None, cp)  # type: ignore[arg-type]
+    agent = _HashedAgentStub(
+        workspace_file_hashes={
+            "AGENTS.md": agent_provisioning._content_hash("same"),
+            "TOOLS.md": agent_provisioning._content_hash("old"),
+        },
+    )
+
+    await mgr._set_agent_files(
+        agent=agent,  # type: ignore[arg-type]
+        agent_id="agent-x",
+        rendered={"AGENTS.md": "same", "TOOLS.md": "new", "SOUL.md": "soul"},
+        existing_files={
+            "AGENTS.md": {"name": "AGENTS.md", "missing": False, "size": 4},
+            "TOOLS.md": {"name": "TOOLS.md", "missing": False},
+        },
+        action="update",
+    )
+
+    assert sorted(cp.writes) == ["SOUL.md", "TOOLS.md"]
+    assert agent.workspace_file_hashes == {
+        "AGENTS.md": agent_provisioning._content_hash("same"),
+        "TOOLS.md": agent_provisioning._content_hash("new"),
+        "SOUL.md": agent_provisioning._content_hash("soul"),
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("existing_entry", "overwrite"),
+    [
+        (None, False),
+        ({"name": "AGENTS.md", "missing": True}, False),
+        ({"name": "AGENTS.md", "missing": False, "size": 99}, False),
+        ({"name": "AGENTS.md", "missing": False}, True),
+    ],
+)
+async def test_set_agent_files_rewrites_matching_hash_when_gateway_copy_is_not_trusted(
+    existing_entry: dict[str, object] | None,
+    overwrite: bool,
+) -> None:
+    cp = _RecordingControlPlane()
+    mgr = _HashingManager(None, cp)  # type: ignore[arg-type]
+    agent = _HashedAgentStub(
+        workspace_file_hashes={"AGENTS.md": agent_provisioning._content_hash("same")},
+    )
+
+    await mgr._set_agent_files(
+        agent=agent,  # type: ignore[arg-type]
+        agent_id="agent-x",
+        rendered={"AGENTS.md": "same"},
+        existing_files={"AGENTS.md": existing_entry} if existing_entry else {},
+        action="update",
+        overwrite=overwrite,
+    )
+
+    assert cp.writes == ["AGENTS.md"]
@@ -6,8 +6,8 @@ from uuid import uuid4
 import pytest
 from fastapi import HTTPException
 
-import app.services.openclaw.admin_service as admin_service
 import app.services.openclaw.gateway_compat as gateway_compat
+import app.services.openclaw.gateway_health as gateway_health
 import app.services.openclaw.session_service as session_service
 from app.schemas.gateway_api import GatewayResolveQuery
 from app.services.openclaw.admin_service import GatewayAdminLifecycleService
@@ -16,6 +16,11 @@ from app.services.openclaw.gateway_rpc import GatewayConfig, OpenClawGatewayErro
 from app.services.openclaw.session_service import GatewaySessionService
 
 
+@pytest.fixture(autouse=True)
+def _reset_gateway_health_cache() -> None:
+    gateway_health.gateway_health.clear()
+
+
 def test_extract_connect_server_version_uses_server_version_as_source_of_truth() -> None:
     payload = {
         "version": "dev",
@@ -239,7 +244,7 @@ async def test_admin_service_rejects_incompatible_gateway(
             message="Gateway version 2026.1.0 is not supported.",
         )
 
-    monkeypatch.setattr(admin_service, "check_gateway_version_compatibility", _fake_check)
+    monkeypatch.setattr(gateway_health, "check_gateway_version_compatibility", _fake_check)
 
     service = GatewayAdminLifecycleService(session=object())  # type: ignore[arg-type]
     with pytest.raises(HTTPException) as exc_info:
@@ -257,7 +262,7 @@ async def test_admin_service_maps_gateway_transport_errors(
         _ = (config, minimum_version)
         raise OpenClawGatewayError("connection refused")
 
-    monkeypatch.setattr(admin_service, "check_gateway_version_compatibility", _fake_check)
+    monkeypatch.setattr(gateway_health, "check_gateway_version_compatibility", _fake_check)
 
     service = GatewayAdminLifecycleService(session=object())  # type: ignore[arg-type]
     with pytest.raises(HTTPException) as exc_info:
@@ -275,7 +280,7 @@ async def test_admin_service_maps_gateway_scope_errors_with_guidance(
         _ = (config, minimum_version)
         raise OpenClawGatewayError("missing scope: operator.read")
 
-    monkeypatch.setattr(admin_service, "check_gateway_version_compatibility", _fake_check)
+    monkeypatch.setattr(gateway_health, "check_gateway_version_compatibility", _fake_check)
 
     service = GatewayAdminLifecycleService(session=object())  # type: ignore[arg-type]
     with pytest.raises(HTTPException) as exc_info:
@@ -298,7 +303,7 @@ async def test_gateway_status_reports_incompatible_version(
             message="Gateway version 2026.1.0 is not supported.",
         )
 
-    monkeypatch.setattr(session_service, "check_gateway_version_compatibility", _fake_check)
+    monkeypatch.setattr(gateway_health, "check_gateway_version_compatibility", _fake_check)
 
     service = GatewaySessionService(session=object())  # type: ignore[arg-type]
     response = await service.get_status(
@@ -319,7 +324,7 @@ async def test_gateway_status_surfaces_scope_error_guidance(
         _ = (config, minimum_version)
         raise OpenClawGatewayError("missing scope: operator.read")
 
-    monkeypatch.setattr(session_service, "check_gateway_version_compatibility", _fake_check)
+    monkeypatch.setattr(gateway_health, "check_gateway_version_compatibility", _fake_check)
 
     service = GatewaySessionService(session=object())  # type: ignore[arg-type]
     response = await service.get_status(
@@ -351,7 +356,7 @@ async def test_gateway_status_returns_sessions_when_version_compatible(
         assert method == "sessions.list"
         return {"sessions": [{"key": "agent:main"}]}
 
-    monkeypatch.setattr(session_service, "check_gateway_version_compatibility", _fake_check)
+    monkeypatch.setattr(gateway_health, "check_gateway_version_compatibility", _fake_check)
     monkeypatch.setattr(session_service, "openclaw_call", _fake_openclaw_call)
 
     service = GatewaySessionService(session=object())  # type: ignore[arg-type]
@@ -0,0 +1,132 @@
+# ruff: noqa: INP001
+"""Asynchronous logging queue, drop accounting and per-event sampling."""
+
+from __future__ import annotations
+
+import io
+import json
+import logging
+import queue
+import sys
+from collections.abc import Iterator
+
+import pytest
+
+from app.core.config import settings
+from app.core.logging import (
+    AppLogger,
+    BoundedQueueHandler,
+    JsonFormatter,
+    LogSamplingFilter,
+    collect_logging_metrics,
+    get_logger,
+    parse_log_sample_rates,
+    reset_request_id,
+    set_request_id,
+)
+
+
+def _record(msg: str, *args: object, level: int = logging.INFO) -> logging.LogRecord:
+    return logging.LogRecord("tests.logging", level, __file__, 1, msg, args, None)
+
+
+@pytest.fixture
+def _reconfigure_logging() -> Iterator[None]:
+    yield
+    AppLogger.configure(force=True)
+
+
+def test_parse_log_sample_rates_skips_malformed_entries() -> None:
+    assert parse_log_sample_rates(" a.b=0.5, c=2 ,d=-1,bad,e=x,=0.1,") == {
+        "a.b": 0.5,
+        "c": 1.0,
+        "d": 0.0,
+    }
+
+
+def test_sampling_filter_only_thins_low_level_configured_events() -> None:
+    sampling = LogSamplingFilter({"hot.event": 0.0, "warm.event": 1.0})
+
+    kept = [
+        sampling.filter(_record("hot.event")),
+        sampling.filter(_record("hot.event extra=%s", 1)),
+        sampling.filter(_record("hot.event", level=logging.WARNING)),
+        sampling.filter(_record("warm.event")),
+        sampling.filter(_record("other.event")),
+    ]
+
+    assert kept == [False, False, True, True, True]
+    assert sampling.sampled_out == {"hot.event": 2}
+
+
+def test_full_queue_drops_and_then_reports_the_drops() -> None:
+    log_queue: queue.Queue[logging.LogRecord] = queue.Queue(2)
+    handler = BoundedQueueHandler(log_queue)
+
+    for index in range(5):
+        handler.handle(_record("event.%s", index))
+    assert handler.dropped == 3
+    assert [log_queue.get_nowait().getMessage() for _ in range(2)] == ["event.0", "event.1"]
+
+    handler.handle(_record("event.after"))
+    notice = log_queue.get_nowait()
+    assert notice.levelno == logging.WARNING
+    assert notice.getMessage() == "logging.records_dropped"
+    assert notice.__dict__["dropped"] == 3
+    assert log_queue.get_nowait().getMessage() == "event.after"
+    assert handler.dropped == 3
+
+
+def test_prepare_renders_arguments_and_exceptions_on_the_calling_thread() -> None:
+    handler = BoundedQueueHandler(queue.Queue())
+    items = ["first"]
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = _record("items=%s", items)
+        record.exc_info = sys.exc_info()
+
+    prepared = handler.prepare(record)
+    items.append("second")
+
+    assert prepared.getMessage() == "items=['first']"
+    assert prepared.exc_info is None
+    payload = json.loads(JsonFormatter().format(prepared))
+    assert payload["message"] == "items=['first']"
+    assert "ValueError: boom" in payload["exception"]
+    # The original record is untouched for other handlers.
+    assert record.exc_info is not None
+
+
+@pytest.mark.usefixtures("_reconfigure_logging")
+def test_async_pipeline_writes_from_the_listener_thread(monkeypatch: pytest.MonkeyPatch) -> None:
+    stream = io.StringIO()
+    monkeypatch.setattr(sys, "stdout", stream)
+    monkeypatch.setattr(settings, "log_format", "json")
+    monkeypatch.setattr(settings, "log_async", True)
+    monkeypatch.setattr(settings, "log_sample_rates", "tests.sampled=0")
+    AppLogger.configure(force=True)
+    logger = get_logger("tests.logging_pipeline")
+
+    token = set_request_id("req-123")
+    try:
+        logger.info("tests.kept", extra={"board_id": "b1"})
+        logger.info("tests.sampled")
+    finally:
+        reset_request_id(token)
+    rendered_metrics = "\n".join(
+        line for metric in collect_logging_metrics() for line in metric.render()
+    )
+    assert AppLogger.stats().dropped == 0
+    AppLogger.shutdown()
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    kept = [line for line in lines if line["message"].startswith("tests.")]
+    assert len(kept) == 1
+    assert kept[0]["message"] == "tests.kept"
+    assert kept[0]["board_id"] == "b1"
+    assert kept[0]["request_id"] == "req-123"
+    assert kept[0]["logger"] == "tests.logging_pipeline"
+    assert 'mission_control_log_records_sampled_out_total{event="tests.sampled"} 1' in (
+        rendered_metrics
+    )
@@ -0,0 +1,189 @@
+# ruff: noqa: INP001
+"""Sampling profiler, the diagnostics endpoint and per-request profiling."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import defaultdict
+
+import pytest
+from fastapi import APIRouter, FastAPI, HTTPException
+from httpx import ASGITransport, AsyncClient
+
+import app.core.profiling as profiling
+import app.services.worker_profiling as worker_profiling
+from app.api.deps import require_super_admin_auth
+from app.api.diagnostics import router as diagnostics_router
+from app.core.auth import AuthContext
+from app.core.config import settings
+from app.core.profiling import ProfilerBusyError, RequestProfilingMiddleware, SamplingProfiler
+from app.models.users import User
+from app.services.admin_access import require_super_admin
+
+
+def _busy_loop(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(200))
+
+
+def _run_busy_thread() -> tuple[threading.Thread, threading.Event]:
+    stop = threading.Event()
+    thread = threading.Thread(target=_busy_loop, args=(stop,), name="busy-worker")
+    thread.start()
+    return thread, stop
+
+
+@pytest.fixture
+def _profiling_enabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "profiling_enabled", True)
+
+
+def test_sampler_attributes_time_to_the_busy_thread_and_is_exclusive() -> None:
+    thread, stop = _run_busy_thread()
+    profiler = SamplingProfiler(interval_s=0.001, thread_ids={thread.ident or 0}).start()
+    try:
+        with pytest.raises(ProfilerBusyError):
+            SamplingProfiler().start()
+        time.sleep(0.15)
+    finally:
+        profile = profiler.stop()
+        stop.set()
+        thread.join()
+
+    assert profile.samples > 10
+    lines = profile.folded().splitlines()
+    assert all(line.startswith("busy-worker;") for line in lines)
+    assert any("_busy_loop (tests/test_profiling.py:" in line for line in lines)
+    heaviest_count = int(lines[0].rsplit(" ", 1)[1])
+    assert heaviest_count == max(profile.stacks.values())
+    # The lock is released, so the next capture can start.
+    SamplingProfiler().start().stop()
+
+
+def test_super_admin_guard() -> None:
+    require_super_admin(
+        AuthContext(actor_type="user", user=User(clerk_user_id="a", is_super_admin=True))
+    )
+    with pytest.raises(HTTPException) as exc_info:
+        require_super_admin(AuthContext(actor_type="user", user=User(clerk_user_id="b")))
+    assert exc_info.value.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_profile_endpoint_is_opt_in(monkeypatch: pytest.MonkeyPatch) -> None:
+    app = FastAPI()
+    api = APIRouter(prefix="/api/v1")
+    api.include_router(diagnostics_router)
+    app.include_router(api)
+    admin = AuthContext(actor_type="user", user=User(clerk_user_id="admin", is_super_admin=True))
+    app.dependency_overrides[require_super_admin_auth] = lambda: admin
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        monkeypatch.setattr(settings, "profiling_enabled", False)
+        disabled = await client.get("/api/v1/diagnostics/profile", params={"seconds": 0.05})
+        monkeypatch.setattr(settings, "profiling_enabled", True)
+        too_long = await client.get("/api/v1/diagnostics/profile", params={"seconds": 3600})
+        thread, stop = _run_busy_thread()
+        try:
+            response = await client.get(
+                "/api/v1/diagnostics/profile",
+                params={"seconds": 0.1, "interval_ms": 1},
+            )
+        finally:
+            stop.set()
+            thread.join()
+
+    assert disabled.status_code == 404
+    assert too_long.status_code == 422
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "busy-worker;" in response.text
+    assert "_busy_loop" in response.text
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("_profiling_enabled")
+async def test_request_profile_header_is_honoured_for_super_admins_only(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    app = FastAPI()
+    app.add_middleware(RequestProfilingMiddleware)
+
+    @app.get("/work")
+    async def work() -> dict[str, int]:
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            sum(range(200))
+        return {"ok": 1}
+
+    is_admin = {"value": False}
+
+    async def _fake_is_super_admin(scope: object) -> bool:
+        return is_admin["value"]
+
+    monkeypatch.setattr(profiling, "_is_super_admin", _fake_is_super_admin)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        plain = await client.get("/work", headers={"X-Profile": "folded"})
+        is_admin["value"] = True
+        profiled = await client.get("/work", headers={"X-Profile": "folded"})
+        unprofiled = await client.get("/work")
+
+    assert plain.json() == {"ok": 1}
+    assert unprofiled.json() == {"ok": 1}
+    assert profiled.status_code == 200
+    assert profiled.headers["x-profile-status-code"] == "200"
+    assert int(profiled.headers["x-profile-samples"]) > 0
+    assert "work (tests/test_profiling.py:" in profiled.text
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.lists: dict[str, list[bytes]] = defaultdict(list)
+        self.changed = threading.Condition()
+
+    def rpush(self, key: str, value: str | bytes) -> None:
+        with self.changed:
+            self.lists[key].append(value.encode("utf-8") if isinstance(value, str) else value)
+            self.changed.notify_all()
+
+    def blpop(self, keys: list[str], timeout: float = 0) -> tuple[bytes, bytes] | None:
+        with self.changed:
+            self.changed.wait_for(lambda: self.lists[keys[0]], timeout=timeout or None)
+            if not self.lists[keys[0]]:
+                return None
+            return keys[0].encode("utf-8"), self.lists[keys[0]].pop(0)
+
+    def expire(self, key: str, seconds: int) -> None:
+        del key, seconds
+
+    def pipeline(self, transaction: bool = True) -> _FakeRedis:
+        return self
+
+    def execute(self) -> list[object]:
+        return []
+
+
+def test_worker_profile_round_trip_through_redis(monkeypatch: pytest.MonkeyPatch) -> None:
+    fake = _FakeRedis()
+    monkeypatch.setattr(worker_profiling, "_redis_client", lambda redis_url=None: fake)
+    results: list[str | None] = []
+    requester = threading.Thread(
+        target=lambda: results.append(
+            worker_profiling.request_worker_profile(0.1, interval_s=0.001, queue_name="q"),
+        ),
+    )
+    requester.start()
+    request = fake.blpop(["q:profile:requests"], timeout=5)
+    assert request is not None
+
+    thread, stop = _run_busy_thread()
+    try:
+        worker_profiling._serve_one(fake, "q", request[1])  # type: ignore[arg-type]
+    finally:
+        stop.set()
+        thread.join()
+    requester.join(timeout=5)
+
+    assert results and results[0] is not None
+    assert "busy-worker;" in results[0]
@@ -0,0 +1,175 @@
+# ruff: noqa: INP001
+"""Prometheus exposition, HTTP instrumentation and the `/metrics` endpoint."""
+
+from __future__ import annotations
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from httpx import ASGITransport, AsyncClient
+
+import app.services.openclaw.gateway_rpc as gateway_rpc
+import app.services.queue as queue
+from app.core import metrics as app_metrics
+from app.core.config import settings
+from app.core.metrics import (
+    GATEWAY_RPC_DURATION,
+    GATEWAY_RPC_ERRORS,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUEST_SQL_STATEMENTS,
+    HTTP_SSE_STREAMS_OPEN,
+    MetricsMiddleware,
+    MetricsRegistry,
+)
+from app.core.query_stats import record_statement
+from app.main import app as main_app
+from app.services.openclaw.internal.circuit_breaker import gateway_circuits
+
+
+@pytest.fixture(autouse=True)
+def _reset_metrics():
+    app_metrics.metrics.reset()
+    gateway_circuits.clear()
+    yield
+    app_metrics.metrics.reset()
+    gateway_circuits.clear()
+
+
+def test_histogram_renders_cumulative_buckets_and_escaped_labels() -> None:
+    registry = MetricsRegistry()
+    latency = registry.histogram("demo_seconds", "Demo latency.", ("path",), buckets=(0.1, 1.0))
+    requests = registry.counter("demo_total", "Demo requests.", ("path",))
+
+    child = latency.labels('/a"b')
+    for value in (0.05, 0.5, 0.5, 3.0):
+        child.observe(value)
+    requests.labels("/x").inc(2)
+
+    text = registry.render()
+
+    assert "# TYPE demo_seconds histogram" in text
+    assert 'demo_seconds_bucket{path="/a\\"b",le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{path="/a\\"b",le="1"} 3' in text
+    assert 'demo_seconds_bucket{path="/a\\"b",le="+Inf"} 4' in text
+    assert 'demo_seconds_count{path="/a\\"b"} 4' in text
+    assert 'demo_total{path="/x"} 2' in text
+    assert latency.labels('/a"b') is child
+
+
+def test_metric_bases_are_abstract() -> None:
+    with pytest.raises(TypeError, match="abstract"):
+        app_metrics._Child()  # type: ignore[abstract]
+    with pytest.raises(TypeError, match="abstract"):
+        app_metrics._Metric("demo", "Demo.")  # type: ignore[abstract]
+
+
+@pytest.mark.asyncio
+async def test_middleware_labels_by_route_template_and_tracks_streams() -> None:
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    open_streams: list[float] = []
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int) -> dict[str, int]:
+        record_statement("SELECT 1", 0.001)
+        record_statement("SELECT 2", 0.001)
+        return {"id": item_id}
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def _events():
+            open_streams.append(HTTP_SSE_STREAMS_OPEN.labels("/stream").value)
+            yield b"data: hello\n\n"
+
+        return StreamingResponse(_events(), media_type="text/event-stream")
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        for item_id in (1, 2):
+            assert (await client.get(f"/items/{item_id}")).status_code == 200
+        assert (await client.get("/nope/123")).status_code == 404
+        assert (await client.get("/stream")).status_code == 200
+
+    assert HTTP_REQUEST_DURATION.labels("GET", "/items/{item_id}", "2xx").count == 2
+    assert HTTP_REQUEST_DURATION.labels("GET", "unmatched", "4xx").count == 1
+    assert HTTP_REQUEST_SQL_STATEMENTS.labels("GET", "/items/{item_id}").sum == 4
+    assert open_streams == [1]
+    assert HTTP_SSE_STREAMS_OPEN.labels("/stream").value == 0
+
+
+@pytest.mark.asyncio
+async def test_gateway_rpc_latency_and_errors_are_counted(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    async def _fake_call_once(method, params, *, config, gateway_url):
+        _ = (params, gateway_url)
+        if method == "broken":
+            raise ConnectionRefusedError("connection refused")
+        return {"ok": True, "url": config.url}
+
+    monkeypatch.setattr(gateway_rpc, "_openclaw_call_once", _fake_call_once)
+    config = gateway_rpc.GatewayConfig(url="ws://gateway.example:18789/ws?token=secret")
+
+    await gateway_rpc.openclaw_call("health", config=config)
+    with pytest.raises(gateway_rpc.OpenClawGatewayError):
+        await gateway_rpc.openclaw_call("broken", config=config)
+
+    label = "ws://gateway.example:18789"
+    assert GATEWAY_RPC_DURATION.labels("health", label).count == 1
+    assert GATEWAY_RPC_DURATION.labels("broken", label).count == 1
+    assert GATEWAY_RPC_ERRORS.labels("broken", label, "transport_error").value == 1
+    assert "secret" not in app_metrics.metrics.render()
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_exposes_queue_stats(monkeypatch: pytest.MonkeyPatch) -> None:
+    def _fake_stats(queue_name: str, **_: object) -> queue.QueueStats:
+        return queue.QueueStats(
+            ready=3,
+            scheduled=1,
+            outcomes={("webhook_delivery", "processed"): 7},
+        )
+
+    monkeypatch.setattr(queue, "read_queue_stats", _fake_stats)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=main_app),
+        base_url="http://test",
+    ) as client:
+        await client.get("/health")
+        response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert 'mission_control_http_request_duration_seconds_count{method="GET",' in body
+    assert 'route="/health",status="2xx"} 1' in body
+    assert 'mission_control_queue_depth{queue="default",state="ready"} 3' in body
+    assert (
+        'mission_control_queue_tasks_total{queue="default",task_type="webhook_delivery",'
+        'outcome="processed"} 7'
+    ) in body
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_requires_configured_scrape_token(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "metrics_token", "scrape-secret")
+    monkeypatch.setattr(
+        queue,
+        "read_queue_stats",
+        lambda queue_name, **_: queue.QueueStats(ready=0, scheduled=0, outcomes={}),
+    )
+
+    async with AsyncClient(
+        transport=ASGITransport(app=main_app),
+        base_url="http://test",
+    ) as client:
+        missing = await client.get("/metrics")
+        wrong = await client.get("/metrics", headers={"Authorization": "Bearer nope"})
+        allowed = await client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+
+    assert missing.status_code == 401
+    assert wrong.status_code == 401
+    assert allowed.status_code == 200
+    assert "mission_control_http_request_duration_seconds" in allowed.text
@@ -0,0 +1,98 @@
+# ruff: noqa: INP001
+"""Per-request SQL statement tracking, debug headers and N+1 warnings."""
+
+from __future__ import annotations
+
+import logging
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core import error_handling
+from app.core.error_handling import install_error_handling
+from app.core.query_stats import record_statement, track_queries
+
+
+@pytest.mark.asyncio
+async def test_nested_scopes_count_statements_and_shapes() -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    try:
+        with track_queries(track_shapes=True) as outer:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                with track_queries() as inner:
+                    for value in range(3):
+                        await conn.execute(text("SELECT :value"), {"value": value})
+    finally:
+        await engine.dispose()
+
+    assert inner.statements == 3
+    assert inner.shapes == {}
+    assert outer.statements == 4
+    assert outer.duration_s > 0
+    assert outer.repeated_shapes(3) == [("SELECT ?", 3)]
+
+
+def _app_with_queries(statements: int) -> tuple[FastAPI, list[object]]:
+    engines: list[object] = []
+    app = FastAPI()
+    install_error_handling(app)
+
+    @app.get("/items")
+    async def items() -> dict[str, int]:
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        engines.append(engine)
+        async with engine.connect() as conn:
+            for item_id in range(statements):
+                await conn.execute(text("SELECT :id"), {"id": item_id})
+        await engine.dispose()
+        return {"ok": statements}
+
+    return app, engines
+
+
+@pytest.mark.asyncio
+async def test_debug_mode_adds_query_headers_and_flags_repeated_statements(
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    monkeypatch.setattr(error_handling.settings, "request_query_debug", True)
+    monkeypatch.setattr(error_handling.settings, "request_query_repeat_threshold", 3)
+    app, _ = _app_with_queries(4)
+
+    with caplog.at_level(logging.WARNING, logger=error_handling.logger.name):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get("/items")
+
+    assert response.headers["x-db-query-count"] == "4"
+    assert float(response.headers["x-db-query-time-ms"]) >= 0
+    repeated = [record for record in caplog.records if record.msg == "db.query.repeated_statement"]
+    assert len(repeated) == 1
+    assert getattr(repeated[0], "count") == 4
+    assert getattr(repeated[0], "statement") == "SELECT ?"
+
+
+@pytest.mark.asyncio
+async def test_query_headers_are_off_by_default() -> None:
+    app, _ = _app_with_queries(1)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/items")
+
+    assert response.status_code == 200
+    assert "x-db-query-count" not in response.headers
+
+
+def test_query_budget_fixture_reports_the_offending_statements(query_budget) -> None:
+    with pytest.raises(AssertionError, match=r"at most 2 SQL statements, got 3:\n  3x SELECT 1"):
+        with query_budget(2):
+            for _ in range(3):
+                record_statement("SELECT 1", 0.0)
+
+    with pytest.raises(AssertionError, match="more than 1 times"):
+        with query_budget(10, max_repeats=1):
+            record_statement("SELECT 1", 0.0)
+            record_statement("SELECT 1", 0.0)
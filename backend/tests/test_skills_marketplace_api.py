@@ -3,7 +3,10 @@
 
 from __future__ import annotations
 
+import asyncio
+import io
 import json
+import subprocess
 from pathlib import Path
 from uuid import uuid4
 
@@ -14,11 +17,13 @@ from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async
 from sqlmodel import SQLModel, col, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+import app.api.skills_marketplace as skills_marketplace
 from app.api.deps import require_org_admin
 from app.api.gateways import router as gateways_router
 from app.api.skills_marketplace import (
     PackSkillCandidate,
     _collect_pack_skills_from_repo,
+    _StreamingJSONReader,
     _validate_pack_source_url,
 )
 from app.api.skills_marketplace import router as skills_marketplace_router
@@ -27,7 +32,9 @@ from app.models.gateways import Gateway
 from app.models.organization_members import OrganizationMember
 from app.models.organizations import Organization
 from app.models.skills import GatewayInstalledSkill, MarketplaceSkill, SkillPack
+from app.schemas.skills_marketplace import SkillPackSyncResponse
 from app.services.organizations import OrganizationContext
+from app.services.skill_pack_sync_jobs import SkillPackSyncJobRegistry, skill_pack_sync_jobs
 
 
 async def _make_engine() -> AsyncEngine:
@@ -225,7 +232,7 @@ async def test_delete_gateway_removes_installed_skill_rows() -> None:
 
 
 @pytest.mark.asyncio
-async def test_list_marketplace_skills_marks_installed_cards() -> None:
+async def test_list_marketplace_skills_marks_installed_cards(query_budget) -> None:
     engine = await _make_engine()
     session_maker = async_sessionmaker(
         engine,
@@ -264,10 +271,12 @@ async def test_list_marketplace_skills_marks_installed_cards() -> None:
             transport=ASGITransport(app=app),
             base_url="http://testserver",
         ) as client:
-            response = await client.get(
-                "/api/v1/skills/marketplace",
-                params={"gateway_id": str(gateway.id)},
-            )
+            # Cards and their installations load in a fixed number of queries.
+            with query_budget(3, max_repeats=1):
+                response = await client.get(
+                    "/api/v1/skills/marketplace",
+                    params={"gateway_id": str(gateway.id)},
+                )
 
         assert response.status_code == 200
         cards = response.json()
@@ -396,6 +405,265 @@ async def test_sync_pack_clones_and_upserts_skills(monkeypatch: pytest.MonkeyPat
         await engine.dispose()
 
 
+@pytest.mark.asyncio
+async def test_list_marketplace_filters_on_normalized_facets_and_pages_with_total() -> None:
+    engine = await _make_engine()
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        async with session_maker() as session:
+            organization, gateway = await _seed_base(session)
+            session.add_all(
+                [
+                    MarketplaceSkill(
+                        organization_id=organization.id,
+                        name=f"Skill {index}",
+                        category=category,
+                        risk=risk,
+                        source_url=f"https://github.com/example/pack/tree/main/skills/{index}",
+                    )
+                    for index, (category, risk) in enumerate(
+                        [
+                            (" Testing ", "LOW"),
+                            ("testing", None),
+                            ("TESTING", "  "),
+                            (None, "high"),
+                        ],
+                    )
+                ],
+            )
+            await session.commit()
+
+        app = _build_test_app(session_maker, organization=organization)
+        async with AsyncClient(
+            transport=ASGITransport(app=app),
+            base_url="http://testserver",
+        ) as client:
+            url = "/api/v1/skills/marketplace"
+            gateway_param = {"gateway_id": str(gateway.id)}
+            testing = await client.get(
+                url,
+                params={**gateway_param, "category": "Testing", "limit": 2},
+            )
+            testing_tail = await client.get(
+                url,
+                params={**gateway_param, "category": "testing", "limit": 2, "offset": 2},
+            )
+            past_end = await client.get(
+                url,
+                params={**gateway_param, "category": "testing", "limit": 2, "offset": 9},
+            )
+            unrated = await client.get(url, params={**gateway_param, "risk": "uncategorized"})
+            uncategorized = await client.get(
+                url,
+                params={**gateway_param, "category": "uncategorized"},
+            )
+            searched = await client.get(url, params={**gateway_param, "search": "skill 3"})
+    finally:
+        await engine.dispose()
+
+    assert len(testing.json()) == 2
+    assert testing.headers["X-Total-Count"] == "3"
+    assert len(testing_tail.json()) == 1
+    assert testing_tail.headers["X-Total-Count"] == "3"
+    assert past_end.json() == []
+    assert past_end.headers["X-Total-Count"] == "3"
+    assert sorted(item["name"] for item in unrated.json()) == ["Skill 1", "Skill 2"]
+    assert [item["name"] for item in uncategorized.json()] == ["Skill 3"]
+    assert [item["name"] for item in searched.json()] == ["Skill 3"]
+
+
+def test_marketplace_search_tsquery_prefix_matches_every_word() -> None:
+    query = skills_marketplace._marketplace_search_tsquery("Code-Review  helper!")
+
+    assert query is not None
+    assert query.compile().params == {
+        "to_tsquery_1": "simple",
+        "to_tsquery_2": "code:* & review:* & helper:*",
+    }
+    assert skills_marketplace._marketplace_search_tsquery("  !!  ") is None
+
+
+@pytest.mark.asyncio
+async def test_upsert_pack_skills_counts_rows_from_database_in_chunks(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    engine = await _make_engine()
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(skills_marketplace, "PACK_SKILL_UPSERT_CHUNK_SIZE", 2)
+    base = "https://github.com/example/pack/tree/main/skills"
+    candidates = [
+        PackSkillCandidate(
+            name=f"Skill {name}",
+            description=None,
+            source_url=f"{base}/{name}",
+            metadata={"skill_dir": name},
+        )
+        for name in ("a", "b", "c")
+    ]
+    try:
+        async with session_maker() as session:
+            organization, _gateway = await _seed_base(session)
+            first = await skills_marketplace._upsert_pack_skills(
+                session,
+                organization_id=organization.id,
+                candidates=candidates,
+            )
+            await session.commit()
+
+            candidates[1] = PackSkillCandidate(
+                name="Skill b",
+                description="now described",
+                source_url=f"{base}/b",
+                metadata={"skill_dir": "b"},
+            )
+            candidates[2] = PackSkillCandidate(
+                name="Skill c",
+                description=None,
+                source_url=f"{base}/c",
+                metadata={"skill_dir": "c", "pack_branch": "main"},
+            )
+            second = await skills_marketplace._upsert_pack_skills(
+                session,
+                organization_id=organization.id,
+                candidates=[*candidates, candidates[0]],
+            )
+            await session.commit()
+
+            rows = (
+                await session.exec(
+                    select(MarketplaceSkill).where(
+                        col(MarketplaceSkill.organization_id) == organization.id,
+                    ),
+                )
+            ).all()
+    finally:
+        await engine.dispose()
+
+    assert first == (3, 0)
+    assert second == (0, 2)
+    by_source = {row.source_url: row for row in rows}
+    assert len(by_source) == 3
+    assert by_source[f"{base}/b"].description == "now described"
+    assert by_source[f"{base}/c"].metadata_ == {"skill_dir": "c", "pack_branch": "main"}
+
+
+@pytest.mark.asyncio
+async def test_sync_pack_job_runs_in_background_and_reports_status(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    engine = await _make_engine()
+    session_maker = async_sessionmaker(
+        engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+    )
+    try:
+        async with session_maker() as session:
+            organization, _gateway = await _seed_base(session)
+            pack = SkillPack(
+                organization_id=organization.id,
+                name="Background Pack",
+                source_url="https://github.com/example/background-pack",
+            )
+            session.add(pack)
+            await session.commit()
+            await session.refresh(pack)
+
+        app = _build_test_app(session_maker, organization=organization)
+
+        def _fake_collect_pack_skills(source_url: str) -> list[PackSkillCandidate]:
+            return [
+                PackSkillCandidate(
+                    name="Skill Gamma",
+                    description=None,
+                    source_url=f"{source_url}/tree/main/skills/gamma",
+                ),
+            ]
+
+        monkeypatch.setattr(
+            "app.api.skills_marketplace._collect_pack_skills",
+            _fake_collect_pack_skills,
+        )
+        monkeypatch.setattr("app.api.skills_marketplace.async_session_maker", session_maker)
+
+        async with AsyncClient(
+            transport=ASGITransport(app=app),
+            base_url="http://testserver",
+        ) as client:
+            started = await client.post(f"/api/v1/skills/packs/{pack.id}/sync-jobs")
+            await skill_pack_sync_jobs.wait()
+            finished = await client.get(
+                f"/api/v1/skills/packs/sync-jobs/{started.json()['id']}",
+            )
+            missing = await client.get(f"/api/v1/skills/packs/sync-jobs/{uuid4()}")
+
+        assert started.status_code == 202
+        assert started.json()["pack_id"] == str(pack.id)
+        assert finished.status_code == 200
+        body = finished.json()
+        assert body["status"] == "succeeded"
+        assert body["result"]["created"] == 1
+        assert body["finished_at"] is not None
+        assert missing.status_code == 404
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_sync_job_wait_cancels_jobs_still_running_at_timeout() -> None:
+    registry = SkillPackSyncJobRegistry()
+
+    async def _hang() -> SkillPackSyncResponse:
+        await asyncio.Event().wait()
+        raise AssertionError
+
+    job = registry.start(pack_id=uuid4(), organization_id=uuid4(), run=_hang)
+
+    assert await registry.wait(timeout=0.05) is False
+    assert await registry.wait(timeout=1) is True
+    assert job.finished_at is not None
+
+
+def _git(repo_dir: Path, *args: str) -> None:
+    subprocess.run(
+        ["git", "-C", str(repo_dir), "-c", "user.name=t", "-c", "user.email=t@e", *args],
+        check=True,
+        capture_output=True,
+    )
+
+
+def _add_skill(repo_dir: Path, name: str) -> None:
+    skill_dir = repo_dir / "skills" / name
+    skill_dir.mkdir(parents=True)
+    (skill_dir / "SKILL.md").write_text(f"# {name.title()}\n", encoding="utf-8")
+    _git(repo_dir, "add", "-A")
+    _git(repo_dir, "commit", "-m", f"add {name}")
+
+
+def test_collect_pack_skills_fetches_into_existing_mirror(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    upstream = tmp_path / "upstream"
+    upstream.mkdir()
+    _git(upstream, "init", "-b", "main")
+    _add_skill(upstream, "alpha")
+    source_url = upstream.as_uri()
+    monkeypatch.setattr(skills_marketplace.settings, "skill_pack_mirror_dir", str(tmp_path / "m"))
+    monkeypatch.setattr(skills_marketplace, "_validate_pack_source_url", lambda _url: None)
+
+    first = skills_marketplace._collect_pack_skills(source_url=source_url)
+    mirror_dir = skills_marketplace._pack_mirror_dir(source_url)
+    marker = mirror_dir / ".git" / "mirror-marker"
+    marker.write_text("kept", encoding="utf-8")
+    _add_skill(upstream, "beta")
+    second = skills_marketplace._collect_pack_skills(source_url=source_url)
+
+    assert [skill.name for skill in first] == ["Alpha"]
+    assert sorted(skill.name for skill in second) == ["Alpha", "Beta"]
+    assert marker.exists()
+
+
 def test_validate_pack_source_url_allows_https_github_repo_with_optional_dot_git() -> None:
     _validate_pack_source_url("https://github.com/org/repo")
     _validate_pack_source_url("https://github.com/org/repo.git")
@@ -880,3 +1148,46 @@ def test_collect_pack_skills_from_repo_streams_large_index(tmp_path: Path) -> No
         skills[0].source_url == "https://github.com/example/oversized-pack/tree/main/skills/ignored"
     )
     assert skills[0].name == "Huge Index Skill"
+
+
+class _TrackingReader(io.StringIO):
+    def __init__(self, text: str) -> None:
+        super().__init__(text)
+        self.consumed = 0
+
+    def read(self, size: int | None = -1, /) -> str:
+        chunk = super().read(size)
+        self.consumed += len(chunk)
+        return chunk
+
+
+def test_streaming_index_reader_yields_lazily_with_bounded_buffer(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(skills_marketplace, "SKILLS_INDEX_READ_CHUNK_BYTES", 64)
+    entries = [{"name": f"skill-{index}", "path": f"skills/{index}"} for index in range(2000)]
+    text = json.dumps({"version": 1234567890, "skills": entries, "generated": True})
+    fp = _TrackingReader(text)
+    reader = _StreamingJSONReader(fp)
+
+    iterator = reader.iter_entries()
+    assert next(iterator) == entries[0]
+    assert fp.consumed < len(text) // 10
+
+    max_buffer = 0
+    decoded = [entries[0]]
+    for entry in iterator:
+        decoded.append(entry)
+        max_buffer = max(max_buffer, len(reader._buffer))
+
+    assert decoded == entries
+    assert max_buffer <= 4 * 64
+
+
+@pytest.mark.parametrize(
+    "text",
+    ['[{"a": 1} {"b": 2}]', '{"skills": [{"a": 1}], "x": 1', '[{"a": 1}, 2]', '{"skills" []}'],
+)
+def test_streaming_index_reader_rejects_malformed_json(text: str) -> None:
+    with pytest.raises(RuntimeError, match="not valid JSON"):
+        list(_StreamingJSONReader(io.StringIO(text)).iter_entries())
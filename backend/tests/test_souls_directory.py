@@ -3,6 +3,13 @@
 
 from __future__ import annotations
 
+import asyncio
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.services import souls_directory
 from app.services.souls_directory import SoulRef, _parse_sitemap_soul_refs, search_souls
 
 
@@ -31,3 +38,145 @@ def test_search_souls_matches_handle_or_slug() -> None:
     ]
     assert search_souls(refs, query="writer", limit=20) == [refs[1]]
     assert search_souls(refs, query="thedaviddias", limit=20) == [refs[0], refs[1]]
+
+
+_SITEMAP = """<urlset>
+  <url><loc>https://souls.directory/souls/someone/code-reviewer</loc></url>
+</urlset>
+"""
+
+
+@pytest.fixture
+def souls_cache(monkeypatch: pytest.MonkeyPatch, tmp_path):
+    monkeypatch.setattr(settings, "souls_directory_cache_dir", str(tmp_path))
+    souls_directory.clear_cache()
+    yield tmp_path
+    souls_directory.clear_cache()
+
+
+@pytest.mark.asyncio
+async def test_soul_markdown_is_cached_and_revalidated_with_etag(
+    monkeypatch: pytest.MonkeyPatch,
+    souls_cache,
+) -> None:
+    _ = souls_cache
+    requests: list[str | None] = []
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, text="# Reviewer", headers={"ETag": '"v1"'})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(_handler)) as client:
+        first = await souls_directory.fetch_soul_markdown(
+            handle="someone", slug="code-reviewer", client=client
+        )
+        second = await souls_directory.fetch_soul_markdown(
+            handle="someone", slug="code-reviewer.md", client=client
+        )
+        monkeypatch.setattr(settings, "souls_directory_soul_ttl_seconds", 0)
+        revalidated = await souls_directory.fetch_soul_markdown(
+            handle="someone", slug="code-reviewer", client=client
+        )
+
+    assert first == second == revalidated == "# Reviewer"
+    assert requests == [None, '"v1"']
+
+
+@pytest.mark.asyncio
+async def test_concurrent_soul_misses_share_one_download(souls_cache) -> None:
+    _ = souls_cache
+    calls = 0
+
+    async def _handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        _ = request
+        calls += 1
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, text="# Reviewer")
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(_handler)) as client:
+        results = await asyncio.gather(
+            *(
+                souls_directory.fetch_soul_markdown(
+                    handle="someone", slug="code-reviewer", client=client
+                )
+                for _ in range(5)
+            ),
+        )
+
+    assert calls == 1
+    assert results == ["# Reviewer"] * 5
+
+
+@pytest.mark.asyncio
+async def test_disk_cache_serves_content_when_offline(
+    monkeypatch: pytest.MonkeyPatch,
+    souls_cache,
+) -> None:
+
+    def _online(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/sitemap.xml":
+            return httpx.Response(200, text=_SITEMAP)
+        return httpx.Response(200, text="# Reviewer")
+
+    def _offline(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("offline", request=request)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(_online)) as client:
+        refs = await souls_directory.list_souls_directory_refs(client=client)
+        await souls_directory.fetch_soul_markdown(
+            handle="someone", slug="code-reviewer", client=client
+        )
+
+    souls_directory.clear_cache()
+    monkeypatch.setattr(settings, "souls_directory_soul_ttl_seconds", 0)
+    async with httpx.AsyncClient(transport=httpx.MockTransport(_offline)) as client:
+        assert await souls_directory.list_souls_directory_refs(client=client) == refs
+        assert (
+            await souls_directory.fetch_soul_markdown(
+                handle="someone", slug="code-reviewer", client=client
+            )
+            == "# Reviewer"
+        )
+
+    assert refs == [SoulRef(handle="someone", slug="code-reviewer")]
+    assert len(list(souls_cache.glob("*.json"))) == 2
+
+
+@pytest.mark.asyncio
+async def test_expired_sitemap_is_served_stale_while_one_refresh_runs(
+    monkeypatch: pytest.MonkeyPatch,
+    souls_cache,
+) -> None:
+    _ = souls_cache
+    fetches = 0
+
+    async def _first(request: httpx.Request) -> httpx.Response:
+        nonlocal fetches
+        _ = request
+        fetches += 1
+        return httpx.Response(200, text=_SITEMAP)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(_first)) as client:
+        await souls_directory.list_souls_directory_refs(client=client)
+
+    refreshed = asyncio.Event()
+
+    async def _fake_refresh(client):
+        nonlocal fetches
+        _ = client
+        fetches += 1
+        await asyncio.sleep(0.01)
+        refreshed.set()
+
+    monkeypatch.setattr(settings, "souls_directory_sitemap_ttl_seconds", 0)
+    monkeypatch.setattr(souls_directory, "_refresh_sitemap", _fake_refresh)
+    stale = await asyncio.gather(
+        *(souls_directory.list_souls_directory_refs() for _ in range(3)),
+    )
+    await refreshed.wait()
+
+    assert all(refs == [SoulRef(handle="someone", slug="code-reviewer")] for refs in stale)
+    assert fetches == 2
@@ -11,6 +11,10 @@
 export interface GatewaysStatusResponse {
   connected: boolean;
   gateway_url: string;
+  gateway_version?: string | null;
+  latency_ms?: number | null;
+  checked_at?: string | null;
+  circuit_state?: string | null;
   sessions_count?: number | null;
   sessions?: unknown[] | null;
   main_session?: unknown | null;
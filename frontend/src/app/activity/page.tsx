@@ -778,6 +778,8 @@ export default function ActivityPage() {
       const backoff = createExponentialBackoff(SSE_RECONNECT_BACKOFF);
       let reconnectTimeout: number | undefined;
       let connectTimer: number | undefined;
+      // Board sequence of the last task event; lets a reconnect resume exactly after it.
+      let lastEventId: string | null = null;
 
       const connect = async () => {
         try {
@@ -790,7 +792,10 @@ export default function ActivityPage() {
               boardId,
               since ? { since } : undefined,
               {
-                headers: { Accept: "text/event-stream" },
+                headers: {
+                  Accept: "text/event-stream",
+                  ...(lastEventId ? { "Last-Event-ID": lastEventId } : {}),
+                },
                 signal: abortController.signal,
               },
             );
@@ -825,6 +830,8 @@ export default function ActivityPage() {
                   eventType = line.slice(6).trim();
                 } else if (line.startsWith("data:")) {
                   data += line.slice(5).trim();
+                } else if (line.startsWith("id:")) {
+                  lastEventId = line.slice(3).trim();
                 }
               }
               if (eventType === "task" && data) {
@@ -1655,6 +1655,8 @@ export default function BoardDetailPage() {
     const abortController = new AbortController();
     const backoff = createExponentialBackoff(SSE_RECONNECT_BACKOFF);
     let reconnectTimeout: number | undefined;
+    // Board sequence of the last task event; lets a reconnect resume exactly after it.
+    let lastEventId: string | null = null;
 
     const connect = async () => {
       try {
@@ -1663,7 +1665,10 @@ export default function BoardDetailPage() {
           boardId,
           since ? { since } : undefined,
           {
-            headers: { Accept: "text/event-stream" },
+            headers: {
+              Accept: "text/event-stream",
+              ...(lastEventId ? { "Last-Event-ID": lastEventId } : {}),
+            },
             signal: abortController.signal,
           },
         );
@@ -1698,6 +1703,8 @@ export default function BoardDetailPage() {
                 eventType = line.slice(6).trim();
               } else if (line.startsWith("data:")) {
                 data += line.slice(5).trim();
+              } else if (line.startsWith("id:")) {
+                lastEventId = line.slice(3).trim();
               }
             }
             if (eventType === "task" && data) {